@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Accuracy/runtime benchmark of NANDRAD solver settings over the BESTEST cases.
+
+For every case a tight-tolerance baseline is simulated first; then every
+combination of the requested <SolverParameter> settings is simulated and
+compared against it. Per run the NandradSolver wall time and peak memory
+(resident set size via os.wait4) are recorded together with the annual and
+peak loads, their deviation from the baseline, hourly RMSE against the
+baseline and the ASHRAE 140 result (reference_checks) of the run.
+
+The non-dominated runs per case (wall time vs. largest annual/peak
+deviation) form the Pareto front; the fastest run on the front that still
+passes ASHRAE 140 is the recommended setting.
+
+Outputs (--out-dir):
+- benchmark_solver.tsv   all runs incl. baseline
+- benchmark_pareto.tsv   Pareto front per case (recommended = fastest passing run)
+
+Setting values are given in the unit used in the project files (e.g.
+MaxTimeStep in h, DiscMinDx in mm).
+
+Run:
+    python benchmark_solver.py --cases 600,900,960 \\
+        --setting RelTol=1e-4,1e-5,1e-6 --setting MaxTimeStep=0.5,1,2 --setting MaxOrder=2,5
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from generate_nandrad_cases import Patch, build_case
+from reference_checks import ANNUAL_METRICS, check_references, load_reference_table
+from run_all_validations import discover_cases, setup_logging
+from validate_nandrad import nandrad_aggregates, read_nandrad_hourly
+
+
+# <SolverParameter> entries that can be benchmarked -> element type in the project file
+SETTINGS: dict[str, str] = {
+    "RelTol": "Parameter",
+    "AbsTol": "Parameter",
+    "MaxTimeStep": "Parameter",
+    "DiscMinDx": "Parameter",
+    "DiscStretchFactor": "Parameter",
+    "MaxKrylovDim": "IntPara",
+    "PreILUWidth": "IntPara",
+    "MaxOrder": "IntPara",
+    "DiscMaxElementsPerLayer": "IntPara",
+}
+
+# Tight-tolerance, fine-grid reference run
+BASELINE: dict[str, float] = {
+    "RelTol": 1e-7,
+    "AbsTol": 1e-12,
+    "MaxTimeStep": 0.25,
+    "DiscStretchFactor": 1.5,
+    "DiscMaxElementsPerLayer": 40,
+}
+
+DEFAULT_GRID: dict[str, list[float]] = {
+    "RelTol": [1e-4, 1e-5, 1e-6],
+    "MaxTimeStep": [0.5, 1, 2],
+    "DiscStretchFactor": [2, 4],
+}
+
+# =========================
+# Project patching
+# =========================
+
+def solver_patches(settings: dict[str, float]) -> list[Patch]:
+    """Set <SolverParameter> entries (IBK:Parameter / IBK:IntPara by name)."""
+    patches = []
+    for name, value in settings.items():
+        if SETTINGS[name] == "IntPara":
+            patches.append(Patch("set_text", f"SolverParameter/{{urn:ibk}}IntPara[@name='{name}']",
+                                 (str(int(value)),)))
+        else:
+            patches.append(Patch("set_text", f"SolverParameter@{name}", (f"{value:g}",)))
+    return patches
+
+
+def relocate_patches(nandrad_dir: Path) -> list[Patch]:
+    """Resolve ${Project Directory} so the project can be run from another folder."""
+    return [Patch("rename", "*", (("${Project Directory}",), nandrad_dir.resolve().as_posix()))]
+
+
+def parse_setting(spec: str) -> tuple[str, list[float]]:
+    """Parse NAME=v1,v2,... for a <SolverParameter> entry."""
+    name, sep, values = spec.partition("=")
+    name = name.strip()
+    if not sep or name not in SETTINGS:
+        raise ValueError(f"Invalid setting '{spec}', expected NAME=v1,v2 with NAME one of {', '.join(SETTINGS)}")
+    return name, [float(v) for v in values.split(",") if v.strip()]
+
+
+# =========================
+# Measured solver run
+# =========================
+
+def run_measured(cmd: Sequence[str], cwd: Path) -> tuple[int, float, float]:
+    """Run a command; returns (exit code, wall time [s], peak resident memory [MB]).
+
+    Peak memory comes from the rusage of the child (os.wait4, POSIX only);
+    it is NaN on other platforms.
+    """
+    start = time.perf_counter()
+    proc = subprocess.Popen(list(cmd), cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    if not hasattr(os, "wait4"):
+        return proc.wait(), time.perf_counter() - start, float("nan")
+
+    _, status, usage = os.wait4(proc.pid, 0)
+    wall = time.perf_counter() - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    # ru_maxrss is in KiB on Linux, in bytes on macOS
+    peak_mb = usage.ru_maxrss / (1024.0 ** 2 if sys.platform == "darwin" else 1024.0)
+    return proc.returncode, wall, peak_mb
+
+
+# =========================
+# Single benchmark run
+# =========================
+
+@dataclass
+class RunResult:
+    case: str
+    settings: dict[str, float]
+    returncode: int
+    wall_s: float
+    peak_mem_mb: float
+    aggregates: pd.DataFrame
+    hourly: dict[str, np.ndarray]
+
+
+def run_case_settings(
+    case: str,
+    settings: dict[str, float],
+    run_id: str,
+    exec_path: Path,
+    nandrad_dir: Path,
+    work_dir: Path,
+    variant: str = "v1",
+    keep: bool = False,
+) -> RunResult:
+    """Simulate one case with the given solver settings and read the hourly results back."""
+    case_dir = work_dir / f"Case{case}"
+    case_dir.mkdir(parents=True, exist_ok=True)
+    project = case_dir / f"{run_id}.nandrad"
+    patches = relocate_patches(nandrad_dir) + solver_patches(settings)
+    project.write_bytes(build_case(f"Case{case}_{variant}.nandrad", patches, str(nandrad_dir)))
+
+    try:
+        # the solver runs inside case_dir, so both paths must be absolute
+        returncode, wall, peak = run_measured([str(exec_path.resolve()), "-x", str(project.resolve())],
+                                              cwd=case_dir)
+    except OSError as e:
+        logging.warning("Case %s %s: cannot start %s: %s", case, run_id, exec_path, e)
+        returncode, wall, peak = 127, 0.0, float("nan")
+    hourly: dict[str, np.ndarray] = {}
+    aggregates = pd.DataFrame(columns=["case", "metric", "engine", "value"])
+    try:
+        if returncode == 0:
+            hourly = read_nandrad_hourly(case_dir / run_id / "results", case)
+            aggregates = nandrad_aggregates(case, hourly)
+    except (LookupError, FileNotFoundError) as e:
+        logging.warning("Case %s %s: cannot read results: %s", case, run_id, e)
+        returncode = returncode or 1
+    finally:
+        if not keep:
+            shutil.rmtree(case_dir / run_id, ignore_errors=True)
+            project.unlink(missing_ok=True)
+    logging.info("Case %s %s: %.1f s, %.0f MB, exit %d", case, run_id, wall, peak, returncode)
+    return RunResult(case, settings, returncode, wall, peak, aggregates, hourly)
+
+
+# =========================
+# Comparison
+# =========================
+
+def compare_to_baseline(run: RunResult, baseline: RunResult, references: pd.DataFrame) -> dict[str, object]:
+    """One benchmark row: timing, annual values, deviations from the baseline, ASHRAE 140 status."""
+    row: dict[str, object] = {
+        "case": run.case,
+        **run.settings,
+        "wall_s": round(run.wall_s, 3),
+        "peak_mem_MB": round(run.peak_mem_mb, 1),
+        "status": "OK" if run.returncode == 0 else "FAIL",
+    }
+    if run.returncode != 0:
+        row.update(max_dev=np.nan, ashrae_pass=False)
+        return row
+
+    own = run.aggregates.set_index("metric")["value"]
+    base = baseline.aggregates.set_index("metric")["value"]
+    deviations = []
+    for metric in ANNUAL_METRICS:
+        if metric not in own.index:
+            continue
+        row[metric] = round(float(own[metric]), 4)
+        if metric in base.index:
+            ref = float(base[metric])
+            # Temperatures: absolute deviation in K, loads: relative deviation in %
+            if metric.startswith("temp_"):
+                dev = abs(float(own[metric]) - ref)
+            else:
+                dev = abs(float(own[metric]) - ref) / abs(ref) * 100.0 if abs(ref) > 1e-9 else 0.0
+            row[f"dev_{metric}"] = round(dev, 4)
+            deviations.append(dev)
+    row["max_dev"] = round(max(deviations), 4) if deviations else np.nan
+
+    for key, values in run.hourly.items():
+        if key in baseline.hourly:
+            diff = values - baseline.hourly[key]
+            row[f"rmse_{key}"] = round(float(np.sqrt(np.nanmean(diff ** 2))), 4)
+
+    checked = check_references(run.aggregates, references)
+    statuses = checked["status_NANDRAD"]
+    row["ashrae_pass"] = bool(len(statuses)) and not (statuses == "FAIL").any()
+    return row
+
+
+def pareto_front(df: pd.DataFrame, cost: str = "wall_s", error: str = "max_dev") -> pd.Series:
+    """True for rows not dominated in (cost, error) by another row of the same case."""
+    front = pd.Series(False, index=df.index)
+    valid = df[(df["status"] == "OK") & df[cost].notna() & df[error].notna()]
+    for _, group in valid.groupby("case", sort=False):
+        c = group[cost].to_numpy(dtype=float)
+        e = group[error].to_numpy(dtype=float)
+        dominated = ((c[None, :] <= c[:, None]) & (e[None, :] <= e[:, None])
+                     & ((c[None, :] < c[:, None]) | (e[None, :] < e[:, None]))).any(axis=1)
+        front[group.index[~dominated]] = True
+    return front
+
+
+# =========================
+# Benchmark
+# =========================
+
+def run_benchmark(
+    cases: Sequence[str],
+    grid: dict[str, list[float]],
+    exec_path: Path,
+    nandrad_dir: Path,
+    work_dir: Path,
+    references: pd.DataFrame,
+    jobs: int = 1,
+    keep: bool = False,
+) -> pd.DataFrame:
+    """Run baseline and settings grid for all cases; returns one row per run."""
+    combos = [dict(zip(grid, values)) for values in itertools.product(*grid.values())]
+    rows: list[dict[str, object]] = []
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        baselines = dict(zip(cases, pool.map(
+            lambda case: run_case_settings(case, BASELINE, "baseline", exec_path, nandrad_dir, work_dir, keep=keep),
+            cases)))
+
+        def _run(item: tuple[str, int, dict[str, float]]) -> dict[str, object]:
+            case, i, settings = item
+            run = run_case_settings(case, settings, f"run{i:03d}", exec_path, nandrad_dir, work_dir, keep=keep)
+            return compare_to_baseline(run, baselines[case], references)
+
+        for case, base in baselines.items():
+            row = compare_to_baseline(base, base, references)
+            row["baseline"] = True
+            rows.append(row)
+        items = [(case, i, settings) for case in cases if baselines[case].returncode == 0
+                 for i, settings in enumerate(combos)]
+        rows.extend(pool.map(_run, items))
+
+    df = pd.DataFrame(rows)
+    df["baseline"] = df["baseline"].eq(True)
+    df["pareto"] = pareto_front(df[~df["baseline"]]).reindex(df.index, fill_value=False)
+    # Unset settings (empty) keep the value of the project file
+    first = ["case", "baseline", *(k for k in SETTINGS if k in df.columns)]
+    return df[first + [c for c in df.columns if c not in first]]
+
+
+def recommend(df: pd.DataFrame) -> pd.DataFrame:
+    """Pareto front per case with the fastest ASHRAE 140 passing run marked as recommended."""
+    front = df[df["pareto"]].sort_values(["case", "wall_s"]).copy()
+    passing = front[front["ashrae_pass"].eq(True)]
+    front["recommended"] = front.index.isin(passing.groupby("case", sort=False).head(1).index)
+    return front
+
+
+# =========================
+# CLI
+# =========================
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark NANDRAD solver settings (runtime vs. accuracy).")
+    parser.add_argument("--cases", default=None, help="Comma-separated cases (default: all Case*_v1.nandrad)")
+    parser.add_argument("-s", "--setting", action="append", default=[], metavar="NAME=V1,V2",
+                        help=f"Setting values to sweep (NAME: {', '.join(SETTINGS)}); repeatable. "
+                             f"Default grid: {DEFAULT_GRID}")
+    parser.add_argument("--data-dir", type=Path, default=Path.cwd() / "data", help="Root data directory")
+    parser.add_argument("--out-dir", type=Path, default=Path.cwd() / "validation_results",
+                        help="Directory for the benchmark TSVs")
+    parser.add_argument("--work-dir", type=Path, default=Path.cwd() / "benchmark_work",
+                        help="Directory for the temporary projects and solver outputs")
+    parser.add_argument("--nandrad-exec", type=Path,
+        default=(Path("C:/Program Files/VICUS-Software/VICUS/NandradSolver.exe") if os.name == "nt"
+                 else Path.cwd() / "bin" / "NandradSolver")
+    )
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Concurrent solver runs (default: 1; more distorts the timings)")
+    parser.add_argument("--keep", action="store_true", help="Keep projects and solver outputs")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    setup_logging()
+
+    try:
+        grid = dict(parse_setting(spec) for spec in args.setting) or DEFAULT_GRID
+    except ValueError as e:
+        logging.error("%s", e)
+        return 2
+    if not args.nandrad_exec.exists():
+        logging.error("NANDRAD solver not found: %s", args.nandrad_exec)
+        return 2
+
+    cases = ([c.strip() for c in args.cases.split(",") if c.strip()] if args.cases
+             else discover_cases(args.data_dir, "v1"))
+    n_runs = len(cases) * (1 + int(np.prod([len(v) for v in grid.values()])))
+    logging.info("Benchmark: %d case(s), %d run(s), settings %s", len(cases), n_runs, ", ".join(grid))
+
+    references = load_reference_table(args.data_dir / "reference")
+    df = run_benchmark(cases, grid, args.nandrad_exec, args.data_dir / "nandrad", args.work_dir,
+                       references, max(1, args.jobs), args.keep)
+
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    df.to_csv(args.out_dir / "benchmark_solver.tsv", sep="\t", index=False)
+    front = recommend(df)
+    front.to_csv(args.out_dir / "benchmark_pareto.tsv", sep="\t", index=False)
+    logging.info("Saved: %s, %s", args.out_dir / "benchmark_solver.tsv", args.out_dir / "benchmark_pareto.tsv")
+
+    for row in front[front["recommended"]].itertuples(index=False):
+        settings = ", ".join(f"{k}={getattr(row, k):g}" for k in grid)
+        logging.info("Case %s: %s (%.1f s, max. deviation %.3f)", row.case, settings, row.wall_s, row.max_dev)
+    return 0 if (df["status"] == "OK").all() else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Bisection of NandradSolver builds that regress BESTEST cases.
+
+Takes an ordered list of NandradSolver binaries (oldest first, the first
+one known good) and the cases that fail with the newest one. Every tested
+binary simulates these cases and is checked like run_all_validations
+--quick, restricted to the annual and peak values (only the load or
+free-float air temperature series are read, NANDRAD values against the
+reference bands).
+A binary is bad if it fails to run a case or if a check is FAIL that
+passes with the first binary; a binary search over the list then finds the
+first bad build in about log2(N) steps.
+
+Every successful run is stored in bisect_cache.tsv (key: SHA-256 of the
+binary, hash of the case project, case), so binaries listed twice, the end
+points of a repeated bisection or an interrupted bisection are never
+simulated again. Failed runs (solver not started, non-zero exit code,
+unreadable results) are not cached and are retried by the next bisection.
+
+Outputs (--out-dir):
+- bisect_cache.tsv      NANDRAD aggregates of every run (reused by later bisections)
+- bisect_steps.tsv      tested binaries in test order with verdict and new FAIL checks
+- bisect_diverged.tsv   metrics that differ between the last good and the first bad binary
+- bisect_report.md      summary
+
+Run:
+    python bisect_solver.py --cases 600,900 builds/r1200/NandradSolver builds/r1250/NandradSolver ...
+    python bisect_solver.py --cases 600 --binary-list builds.txt
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import logging
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from benchmark_solver import relocate_patches, run_measured
+from generate_nandrad_cases import build_case
+from reference_checks import ANNUAL_METRICS, check_references, load_reference_table
+from report_tables import md_table
+from run_all_validations import quick_keys, setup_logging
+from validate_nandrad import nandrad_aggregates, nandrad_command, read_nandrad_hourly
+
+
+CACHE_FILE = "bisect_cache.tsv"
+CACHE_COLUMNS = ["binary", "project", "case", "exit_code", "wall_s", "metric", "value"]
+STEP_COLUMNS = ["index", "binary", "sha256", "verdict", "new_fail", "errors", "simulated", "cached"]
+DIVERGED_COLUMNS = ["case", "metric", "good", "bad", "delta", "rel_delta", "ref_min", "ref_max",
+                    "status_good", "status_bad"]
+
+
+def _digest(path: Path, algorithm: str = "sha256") -> str:
+    h = hashlib.new(algorithm)
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+# =========================
+# Run cache
+# =========================
+
+@dataclass
+class CaseRun:
+    case: str
+    exit_code: int
+    wall_s: float
+    aggregates: pd.DataFrame
+
+
+class RunCache:
+    """Quick aggregates per (binary hash, project hash, case); successful runs are appended to bisect_cache.tsv."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.runs: dict[tuple[str, str, str], CaseRun] = {}
+        self._lock = threading.Lock()
+        if path.exists():
+            df = pd.read_csv(path, sep="\t", dtype={"binary": str, "project": str, "case": str, "metric": str},
+                             keep_default_na=False, na_values=[""])
+            # rows of failed runs written by older versions are ignored, so these runs are retried
+            df = df[df["exit_code"] == 0]
+            for (binary, project, case), group in df.groupby(["binary", "project", "case"], sort=False):
+                rows = group[group["metric"].notna()]
+                aggregates = pd.DataFrame({"case": case, "metric": rows["metric"], "engine": "NANDRAD",
+                                           "value": rows["value"].astype(float)}).reset_index(drop=True)
+                self.runs[(binary, project, case)] = CaseRun(case, int(group["exit_code"].iloc[-1]),
+                                                             float(group["wall_s"].iloc[-1]), aggregates)
+            logging.info("Run cache: %d run(s) from %s", len(self.runs), path)
+
+    def get(self, binary: str, project: str, case: str) -> Optional[CaseRun]:
+        return self.runs.get((binary, project, case))
+
+    def add(self, binary: str, project: str, run: CaseRun) -> None:
+        if run.exit_code != 0:
+            return
+        agg = run.aggregates
+        rows = pd.DataFrame({
+            "binary": binary,
+            "project": project,
+            "case": run.case,
+            "exit_code": run.exit_code,
+            "wall_s": round(run.wall_s, 3),
+            "metric": agg["metric"].tolist() if len(agg) else [""],
+            "value": agg["value"].tolist() if len(agg) else [np.nan],
+        }, columns=CACHE_COLUMNS)
+        with self._lock:
+            self.runs[(binary, project, run.case)] = run
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            rows.to_csv(self.path, sep="\t", index=False, mode="a", header=not self.path.exists())
+
+
+# =========================
+# Solver runs
+# =========================
+
+def run_case(exec_path: Path, case: str, nandrad_dir: Path, work_dir: Path, variant: str = "v1",
+             keep: bool = False) -> CaseRun:
+    """Simulate one case with the given binary and compute the quick NANDRAD aggregates."""
+    case_dir = work_dir / f"Case{case}"
+    case_dir.mkdir(parents=True, exist_ok=True)
+    project = case_dir / f"Case{case}_{variant}.nandrad"
+    project.write_bytes(build_case(project.name, relocate_patches(nandrad_dir), str(nandrad_dir)))
+
+    try:
+        exit_code, wall, _ = run_measured(nandrad_command(exec_path.resolve(), project.resolve()), cwd=case_dir)
+    except OSError as e:
+        logging.warning("Case %s: cannot start %s: %s", case, exec_path, e)
+        exit_code, wall = 127, 0.0
+    aggregates = pd.DataFrame(columns=["case", "metric", "engine", "value"])
+    try:
+        if exit_code == 0:
+            hourly = read_nandrad_hourly(project.with_suffix("") / "results", case, quick_keys(case))
+            if not hourly:
+                raise FileNotFoundError("no load/temperature outputs")
+            aggregates = nandrad_aggregates(case, hourly)
+            aggregates = aggregates[aggregates["metric"].isin(ANNUAL_METRICS)].reset_index(drop=True)
+    except (LookupError, FileNotFoundError, ValueError) as e:
+        logging.warning("Case %s: cannot read results of %s: %s", case, exec_path, e)
+        exit_code = exit_code or 1
+    finally:
+        if not keep:
+            shutil.rmtree(case_dir, ignore_errors=True)
+    return CaseRun(case, exit_code, wall, aggregates)
+
+
+@dataclass
+class Evaluation:
+    index: int
+    binary: Path
+    sha256: str
+    runs: dict[str, CaseRun]
+    checked: pd.DataFrame
+    simulated: int
+    cached: int
+
+    @property
+    def errors(self) -> list[str]:
+        return [case for case, run in self.runs.items() if run.exit_code != 0]
+
+    def fails(self) -> set[tuple[str, str]]:
+        failed = self.checked[self.checked["status_NANDRAD"] == "FAIL"]
+        return set(zip(failed["case"], failed["metric"]))
+
+    def aggregates(self) -> pd.DataFrame:
+        frames = [run.aggregates for run in self.runs.values() if len(run.aggregates)]
+        return (pd.concat(frames, ignore_index=True) if frames
+                else pd.DataFrame(columns=["case", "metric", "engine", "value"]))
+
+
+class Bisector:
+    """Evaluates binaries on the case set (through the run cache) and bisects the ordered list."""
+
+    def __init__(self, binaries: Sequence[Path], cases: Sequence[str], nandrad_dir: Path, work_dir: Path,
+                 references: pd.DataFrame, cache: RunCache, variant: str = "v1", jobs: int = 1,
+                 keep: bool = False):
+        self.binaries = list(binaries)
+        self.cases = list(cases)
+        self.nandrad_dir = nandrad_dir
+        self.work_dir = work_dir
+        self.references = references
+        self.cache = cache
+        self.variant = variant
+        self.jobs = jobs
+        self.keep = keep
+        self.projects = {case: _digest(nandrad_dir / f"Case{case}_{variant}.nandrad", "sha1") for case in cases}
+        self.evaluations: dict[int, Evaluation] = {}
+        self._hashes: dict[Path, str] = {}
+
+    def sha256(self, binary: Path) -> str:
+        if binary not in self._hashes:
+            self._hashes[binary] = _digest(binary)
+        return self._hashes[binary]
+
+    def evaluate(self, index: int) -> Evaluation:
+        """Runs (or cached results) of all cases with binary number index, checked against the references."""
+        if index in self.evaluations:
+            return self.evaluations[index]
+        binary = self.binaries[index]
+        sha = self.sha256(binary)
+        runs: dict[str, CaseRun] = {}
+        missing = []
+        for case in self.cases:
+            cached = self.cache.get(sha, self.projects[case], case)
+            if cached is not None:
+                runs[case] = cached
+            else:
+                missing.append(case)
+
+        def _run(case: str) -> CaseRun:
+            run = run_case(binary, case, self.nandrad_dir, self.work_dir / sha[:12], self.variant, self.keep)
+            self.cache.add(sha, self.projects[case], run)
+            logging.info("  Case %s: %.1f s, exit %d", case, run.wall_s, run.exit_code)
+            return run
+
+        logging.info("Binary %d/%d %s (%s): %d case(s) to simulate, %d cached", index + 1, len(self.binaries),
+                     binary, sha[:12], len(missing), len(runs))
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            runs.update(zip(missing, pool.map(_run, missing)))
+        runs = {case: runs[case] for case in self.cases}
+
+        evaluation = Evaluation(index, binary, sha, runs, pd.DataFrame(), len(missing), len(self.cases) - len(missing))
+        evaluation.checked = check_references(evaluation.aggregates(), self.references)
+        self.evaluations[index] = evaluation
+        return evaluation
+
+    def is_bad(self, evaluation: Evaluation) -> bool:
+        """Bad: a case did not run, or a check fails that passes with the first (good) binary."""
+        good = self.evaluate(0)
+        return bool(evaluation.errors) or bool(evaluation.fails() - good.fails())
+
+    def bisect(self) -> Optional[int]:
+        """Index of the first bad binary, None if the last binary is not bad.
+
+        Raises ValueError if the first binary cannot run all cases.
+        """
+        first = self.evaluate(0)
+        if first.errors:
+            raise ValueError(f"First binary {first.binary} does not run case(s) {', '.join(first.errors)}")
+        good, bad = 0, len(self.binaries) - 1
+        if bad == good or not self.is_bad(self.evaluate(bad)):
+            return None
+        while bad - good > 1:
+            mid = (good + bad) // 2
+            if self.is_bad(self.evaluate(mid)):
+                bad = mid
+            else:
+                good = mid
+            logging.info("Bisect: good %d, bad %d (%d binaries left)", good + 1, bad + 1, bad - good - 1)
+        return bad
+
+
+# =========================
+# Report
+# =========================
+
+def diverged_metrics(good: Evaluation, bad: Evaluation, atol: float = 1e-9) -> pd.DataFrame:
+    """NANDRAD aggregates that differ between the last good and the first bad binary; new FAIL first,
+    then by relative change."""
+    keys = ["case", "metric"]
+    g = good.aggregates().reindex(columns=keys + ["value"])
+    b = bad.aggregates().reindex(columns=keys + ["value"])
+    df = g.merge(b, on=keys, how="outer", suffixes=("_good", "_bad")).rename(
+        columns={"value_good": "good", "value_bad": "bad"})
+    band = pd.concat([good.checked, bad.checked]).drop_duplicates(keys)[keys + ["ref_min", "ref_max"]]
+    df = df.merge(band, on=keys, how="left")
+    for name, evaluation in (("good", good), ("bad", bad)):
+        status = evaluation.checked[keys + ["status_NANDRAD"]].rename(columns={"status_NANDRAD": f"status_{name}"})
+        df = df.merge(status, on=keys, how="left")
+    df[["status_good", "status_bad"]] = df[["status_good", "status_bad"]].fillna("—")
+
+    df["delta"] = df["bad"] - df["good"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        df["rel_delta"] = df["delta"] / df["good"].abs()
+    changed = ((df["delta"].abs() > atol) | (df["good"].isna() != df["bad"].isna())
+               | (df["status_good"] != df["status_bad"]))
+    df = df[changed].copy()
+    new_fail = ((df["status_bad"] == "FAIL") & (df["status_good"] != "FAIL")).to_numpy()
+    order = df["rel_delta"].abs().fillna(np.inf).to_numpy()
+    df = df.iloc[np.lexsort((-order, ~new_fail))]
+    return df.reset_index(drop=True)[DIVERGED_COLUMNS]
+
+
+def steps_table(bisector: Bisector, order: Sequence[int]) -> pd.DataFrame:
+    """One row per tested binary in test order."""
+    good = bisector.evaluations[0].fails()
+    rows = []
+    for index in order:
+        ev = bisector.evaluations[index]
+        new_fail = sorted(ev.fails() - good)
+        rows.append({
+            "index": index + 1,
+            "binary": str(ev.binary),
+            "sha256": ev.sha256,
+            "verdict": "bad" if bisector.is_bad(ev) else "good",
+            "new_fail": ", ".join(f"{case}:{metric}" for case, metric in new_fail),
+            "errors": ", ".join(ev.errors),
+            "simulated": ev.simulated,
+            "cached": ev.cached,
+        })
+    return pd.DataFrame(rows, columns=STEP_COLUMNS)
+
+
+def write_report(out_dir: Path, steps: pd.DataFrame, diverged: pd.DataFrame, first_bad: Optional[Evaluation],
+                 last_good: Optional[Evaluation], cases: Sequence[str], n_binaries: int) -> None:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    steps.to_csv(out_dir / "bisect_steps.tsv", sep="\t", index=False)
+    diverged.to_csv(out_dir / "bisect_diverged.tsv", sep="\t", index=False)
+
+    lines = ["# Solver-Bisektion", "", f"Cases: {', '.join(cases)} | {n_binaries} Binaries | "
+             f"{len(steps)} getestet, {int(steps['simulated'].sum())} Simulationen, "
+             f"{int(steps['cached'].sum())} aus dem Cache", ""]
+    if first_bad is None:
+        lines += ["Keine Regression: das letzte Binary besteht dieselben Checks wie das erste.", ""]
+    else:
+        lines += [f"**Erstes fehlerhaftes Binary:** `{first_bad.binary}` (Nr. {first_bad.index + 1}, "
+                  f"SHA-256 `{first_bad.sha256[:12]}`)",
+                  f"Letztes gutes Binary: `{last_good.binary}` (Nr. {last_good.index + 1})", ""]
+        if first_bad.errors:
+            lines += [f"Abbruch/fehlende Ergebnisse in Case {', '.join(first_bad.errors)}.", ""]
+        lines += ["## Abweichende Kennwerte (neue FAIL zuerst)", ""]
+        lines += (md_table(diverged.round(4).fillna("")) if len(diverged) else ["Keine Unterschiede."]) + [""]
+    lines += ["## Getestete Binaries", ""] + md_table(steps.drop(columns="sha256").fillna("")) + [""]
+    (out_dir / "bisect_report.md").write_text("\n".join(lines), encoding="utf-8")
+    logging.info("Bisect report: %s", out_dir / "bisect_report.md")
+
+
+# =========================
+# CLI
+# =========================
+
+def read_binary_list(path: Path) -> list[Path]:
+    """One binary per line (oldest first); empty lines and # comments are ignored."""
+    lines = (line.split("#", 1)[0].strip() for line in path.read_text(encoding="utf-8").splitlines())
+    return [Path(line) for line in lines if line]
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Find the first NandradSolver build that regresses the given BESTEST cases (binary search)."
+    )
+    parser.add_argument("binaries", nargs="*", type=Path,
+                        help="NandradSolver binaries, oldest (known good) first")
+    parser.add_argument("--binary-list", type=Path, default=None,
+                        help="Text file with one binary per line, oldest first (appended to the positional ones)")
+    parser.add_argument("--cases", required=True, help="Comma-separated cases that fail with the newest binary")
+    parser.add_argument("--variant", default="v1", help="Case variant (default: v1)")
+    parser.add_argument("--data-dir", type=Path, default=Path.cwd() / "data", help="Root data directory")
+    parser.add_argument("--out-dir", type=Path, default=Path.cwd() / "bisect",
+                        help="Directory for the report and the run cache (default: bisect)")
+    parser.add_argument("--work-dir", type=Path, default=Path.cwd() / "bisect_work",
+                        help="Directory for the temporary projects and solver outputs")
+    parser.add_argument("--atol", type=float, default=1e-9,
+                        help="Differences up to this value count as identical (default: 1e-9)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Concurrent solver runs per binary (default: CPU count)")
+    parser.add_argument("--keep", action="store_true", help="Keep projects and solver outputs")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    setup_logging()
+    args = parse_args(argv)
+    t0 = time.perf_counter()
+
+    binaries = list(args.binaries) + (read_binary_list(args.binary_list) if args.binary_list else [])
+    cases = [c.strip() for c in args.cases.split(",") if c.strip()]
+    missing = [str(b) for b in binaries if not b.exists()]
+    if len(binaries) < 2 or missing or not cases:
+        logging.error("Need at least two existing binaries and one case%s",
+                      f" (not found: {', '.join(missing)})" if missing else "")
+        return 2
+    nandrad_dir = args.data_dir / "nandrad"
+    for case in cases:
+        if not (nandrad_dir / f"Case{case}_{args.variant}.nandrad").exists():
+            logging.error("Project not found: %s", nandrad_dir / f"Case{case}_{args.variant}.nandrad")
+            return 2
+
+    bisector = Bisector(binaries, cases, nandrad_dir, args.work_dir, load_reference_table(args.data_dir / "reference"),
+                        RunCache(args.out_dir / CACHE_FILE), args.variant, max(1, args.jobs), args.keep)
+    try:
+        first_bad = bisector.bisect()
+    except ValueError as e:
+        logging.error("%s", e)
+        return 2
+
+    steps = steps_table(bisector, list(bisector.evaluations))
+    if first_bad is None:
+        write_report(args.out_dir, steps, pd.DataFrame(columns=DIVERGED_COLUMNS), None, None, cases, len(binaries))
+        logging.warning("No regression: %s passes the same checks as %s", binaries[-1], binaries[0])
+        return 1
+
+    # last good: the nearest tested good binary before the first bad one
+    bad = bisector.evaluations[first_bad]
+    good = bisector.evaluations[max(i for i in bisector.evaluations if i < first_bad)]
+    diverged = diverged_metrics(good, bad, args.atol)
+    write_report(args.out_dir, steps, diverged, bad, good, cases, len(binaries))
+
+    logging.info("Bisected %d binaries in %.1f s (%d tested, %d simulation(s))", len(binaries),
+                 time.perf_counter() - t0, len(steps), int(steps["simulated"].sum()))
+    logging.warning("First bad binary: %s (#%d); last good: %s (#%d)", bad.binary, first_bad + 1,
+                    good.binary, good.index + 1)
+    for case in bad.errors:
+        logging.warning("  Case %s: solver failed or wrote no results", case)
+    for row in diverged.head(25).itertuples(index=False):
+        logging.warning("  Case %s %s: %s -> %s (%s -> %s)", row.case, row.metric, row.good, row.bad,
+                        row.status_good, row.status_bad)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
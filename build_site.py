@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Static site of the validation results (GitHub Pages).
+
+Builds a _site/ tree from the overview report, the per-case dashboards and
+the comparison figures:
+
+    _site/index.html               overview (links to the case pages)
+    _site/cases.html               search and filter over all cases
+    _site/index.json               one record per case (status, failing metrics, links)
+    _site/cases/Case{N}_{v}.html   case dashboards, sharing assets/plotly.min.js
+    _site/comparison/*             comparison figures
+    _site/overview_*.{md,tsv}      overview tables
+
+The build is incremental: _site/.manifest.json stores a hash of the inputs of
+every page (input files plus the sources of this script and of
+case_dashboard.py). Pages whose inputs did not change are not touched, so a
+run after changing one case re-renders only that case; pages whose inputs
+disappeared are removed. --force rebuilds everything.
+
+Also called by run_all_validations.py --site.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import re
+import shutil
+from pathlib import Path
+from typing import Callable, Optional, Sequence, Union
+
+import pandas as pd
+from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+import case_dashboard
+from case_dashboard import CaseDashboard
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+MANIFEST = ".manifest.json"
+PLOTLY_ASSET = "assets/plotly.min.js"
+OVERVIEW_FILES = ("overview_report.md", "overview_report.tsv", "overview_programs.tsv",
+                  "overview_sensitivity.tsv", "overview_solver.tsv")
+DASHBOARD_REGEX = re.compile(r"Case(\w+?)_(v\d\w*)_dashboard\.html$")
+
+# Changes to the page templates invalidate every page
+TEMPLATE_HASH = hashlib.sha256(
+    Path(__file__).read_bytes() + Path(case_dashboard.__file__).read_bytes()
+).hexdigest()
+
+SiteInput = Union[Path, str]
+
+
+# =========================
+# Incremental build
+# =========================
+
+def inputs_hash(inputs: Sequence[SiteInput]) -> str:
+    """Hash of the template sources and all inputs (file contents or literal strings)."""
+    h = hashlib.sha256(TEMPLATE_HASH.encode())
+    for item in inputs:
+        if isinstance(item, Path):
+            h.update(str(item.name).encode())
+            h.update(item.read_bytes() if item.exists() else b"<missing>")
+        else:
+            h.update(item.encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class SiteBuilder:
+    """Writes the pages of one site directory, skipping pages whose inputs are unchanged."""
+
+    def __init__(self, site_dir: Path, force: bool = False):
+        self.site_dir = site_dir
+        self.force = force
+        try:
+            self.previous: dict[str, str] = json.loads((site_dir / MANIFEST).read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            self.previous = {}
+        self.current: dict[str, str] = {}
+        self.rendered: list[str] = []
+
+    def build(self, target: str, inputs: Sequence[SiteInput], render: Callable[[Path], None]) -> bool:
+        """Call render(path) unless target exists and was built from the same inputs.
+
+        Returns True if the page was rendered.
+        """
+        key = inputs_hash(inputs)
+        self.current[target] = key
+        path = self.site_dir / target
+        if not self.force and self.previous.get(target) == key and path.exists():
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        render(path)
+        self.rendered.append(target)
+        return True
+
+    def copy(self, target: str, source: Path) -> bool:
+        return self.build(target, [source], lambda path: shutil.copyfile(source, path))
+
+    def write(self, target: str, text: str) -> bool:
+        return self.build(target, [text], lambda path: path.write_text(text, encoding="utf-8"))
+
+    def finish(self) -> list[str]:
+        """Remove pages of the previous build that were not built this time and save the manifest.
+
+        Returns the removed targets.
+        """
+        removed = sorted(set(self.previous) - set(self.current))
+        for target in removed:
+            path = self.site_dir / target
+            path.unlink(missing_ok=True)
+            if path.parent != self.site_dir and not any(path.parent.iterdir()):
+                path.parent.rmdir()
+        (self.site_dir / MANIFEST).write_text(json.dumps(self.current, indent=1, sort_keys=True), encoding="utf-8")
+        return removed
+
+
+# =========================
+# Inputs
+# =========================
+
+def find_dashboards(results_dir: Path) -> dict[tuple[str, str], Path]:
+    """(case, variant) -> Case{N}_{variant}_dashboard.html below results_dir."""
+    dashboards: dict[tuple[str, str], Path] = {}
+    for path in sorted(results_dir.glob("Case*_*/Case*_dashboard.html")):
+        m = DASHBOARD_REGEX.match(path.name)
+        if m:
+            dashboards[(m.group(1), m.group(2))] = path
+    return dashboards
+
+
+def case_page(case: str, variant: str) -> str:
+    return f"cases/Case{case}_{variant}.html"
+
+
+def case_record(case: str, variant: str, report: pd.DataFrame, site: dict[str, bool]) -> dict:
+    """Entry of index.json: description, status counts and links of one case variant."""
+    # imported here: run_all_validations pulls in the whole validation toolchain
+    from run_all_validations import get_case_info
+
+    title, description = get_case_info(case)
+    status = report["Status"].astype(str)
+    n_fail = int((status == "FAIL").sum())
+    n_error = int((status == "ERROR").sum())
+    comparison = f"comparison/Case{case}_{variant}_comprehensive_comparison.svg"
+    return {
+        "case": case,
+        "variant": variant,
+        "title": title,
+        "description": description,
+        "series": "600" if case.startswith("6") else "900" if case.startswith("9") else case[:1] + "00",
+        "free_float": case.endswith("FF"),
+        "result": "ERROR" if n_error else "FAIL" if n_fail else "PASS",
+        "metrics": int(len(report)),
+        "pass": int((status == "PASS").sum()),
+        "fail": n_fail,
+        "failing": report.loc[status == "FAIL", "Metrik"].astype(str).tolist(),
+        "overview": f"index.html#case-{case}" if site.get("overview") else None,
+        "dashboard": case_page(case, variant) if site.get("dashboard") else None,
+        "comparison": comparison if site.get("comparison") else None,
+    }
+
+
+def build_index(overview: Optional[pd.DataFrame], variant: str, dashboards: dict[tuple[str, str], Path],
+                comparisons: set[str]) -> list[dict]:
+    """Records of all overview cases (variant) plus all further dashboards (from their validation report)."""
+    records: list[dict] = []
+    seen: set[tuple[str, str]] = set()
+    if overview is not None:
+        for case, report in overview.groupby("Case", sort=False):
+            case = str(case)
+            seen.add((case, variant))
+            records.append(case_record(case, variant, report, {
+                "overview": True,
+                "dashboard": (case, variant) in dashboards,
+                "comparison": f"Case{case}_{variant}_comprehensive_comparison.svg" in comparisons,
+            }))
+    for (case, var), path in dashboards.items():
+        if (case, var) in seen:
+            continue
+        report_tsv = path.with_name(f"Case{case}_{var}_validation_report.tsv")
+        report = (pd.read_csv(report_tsv, sep="\t") if report_tsv.exists()
+                  else pd.DataFrame(columns=["Metrik", "Status"]))
+        records.append(case_record(case, var, report, {
+            "dashboard": True,
+            "comparison": f"Case{case}_{var}_comprehensive_comparison.svg" in comparisons,
+        }))
+    return records
+
+
+# =========================
+# Pages
+# =========================
+
+NAV_STYLE = "margin:8px 0 16px 0;font-size:1.05em;"
+
+
+def overview_page(overview_html: str, variant: str, case_pages: set[tuple[str, str]]) -> str:
+    """Overview report with a navigation bar and the dashboard links of its cases (#case-links)."""
+    nav = (f'<p style="{NAV_STYLE}"><a href="cases.html">Alle Cases durchsuchen</a> | '
+           f'<a href="overview_report.md">Markdown</a> | <a href="overview_report.tsv">TSV</a></p>')
+    page = overview_html.replace("</h1>", "</h1>\n" + nav, 1)
+    links = json.dumps({case: case_page(case, var) for case, var in sorted(case_pages) if var == variant})
+    return page.replace('<script id="case-links" type="application/json">{}</script>',
+                        f'<script id="case-links" type="application/json">{links}</script>', 1)
+
+
+def render_case(dashboard_html: Path, case: str, variant: str) -> Callable[[Path], None]:
+    def render(path: Path) -> None:
+        dashboard, tables_html = CaseDashboard.from_html(dashboard_html, case, variant)
+        nav = (f'<p style="{NAV_STYLE}"><a href="../index.html">Übersicht</a> | '
+               f'<a href="../cases.html">Alle Cases</a></p>')
+        dashboard.write(path, nav + "\n" + tables_html, include_plotlyjs=f"../{PLOTLY_ASSET}")
+    return render
+
+
+CASES_PAGE = """<!DOCTYPE html>
+<html lang="de">
+<head>
+<meta charset="utf-8">
+<title>BESTEST Validierung &ndash; Cases</title>
+<style>
+body { font-family: Arial, sans-serif; margin: 20px; }
+h1 { color: #333; }
+.filters { display: flex; gap: 12px; flex-wrap: wrap; margin: 10px 0; }
+.filters input[type=search] { width: 320px; padding: 4px; }
+table { border-collapse: collapse; width: 100%; margin-top: 15px; }
+th { background-color: #343a40; color: white; padding: 10px; text-align: left; cursor: pointer; }
+td { padding: 8px; border-bottom: 1px solid #dee2e6; vertical-align: top; }
+.PASS { color: #155724; font-weight: bold; }
+.FAIL { color: #721c24; font-weight: bold; }
+.ERROR { color: #856404; font-weight: bold; }
+.failing { color: #721c24; font-size: 0.9em; }
+</style>
+</head>
+<body>
+<h1>BESTEST Validierung &ndash; Cases</h1>
+<p style="NAV_STYLE"><a href="index.html">Übersicht</a></p>
+<div class="filters">
+<input type="search" id="query" placeholder="Case, Beschreibung oder Metrik ...">
+<select id="result"><option value="">Alle Ergebnisse</option><option>PASS</option><option>FAIL</option><option>ERROR</option></select>
+<select id="series"><option value="">Alle Serien</option><option value="600">Leichtbau (600)</option><option value="900">Schwerbau (900)</option></select>
+<select id="variant"><option value="">Alle Varianten</option></select>
+<label><input type="checkbox" id="ff"> nur Free-Float</label>
+</div>
+<p id="count"></p>
+<table>
+<thead><tr><th data-key="case">Case</th><th data-key="variant">Variante</th><th data-key="title">Beschreibung</th>
+<th data-key="result">Ergebnis</th><th data-key="fail">PASS / FAIL</th><th>Links</th></tr></thead>
+<tbody id="rows"></tbody>
+</table>
+<script>
+let CASES = [];
+let sortKey = "case", sortDir = 1;
+const $ = id => document.getElementById(id);
+const esc = s => String(s).replace(/[&<>"]/g, c => ({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"}[c]));
+
+function matches(c) {
+  const q = $("query").value.trim().toLowerCase();
+  if ($("result").value && c.result !== $("result").value) return false;
+  if ($("series").value && c.series !== $("series").value) return false;
+  if ($("variant").value && c.variant !== $("variant").value) return false;
+  if ($("ff").checked && !c.free_float) return false;
+  if (!q) return true;
+  return [c.case, c.title, c.description, ...c.failing].some(s => String(s).toLowerCase().includes(q));
+}
+
+function show() {
+  const rows = CASES.filter(matches).sort((a, b) =>
+    (a[sortKey] > b[sortKey] ? 1 : a[sortKey] < b[sortKey] ? -1 : 0) * sortDir);
+  $("rows").innerHTML = rows.map(c => {
+    const links = [["overview", "Übersicht"], ["dashboard", "Dashboard"], ["comparison", "Vergleich"]]
+      .filter(([k]) => c[k]).map(([k, label]) => `<a href="${esc(c[k])}">${label}</a>`).join(" | ");
+    const failing = c.failing.length ? `<div class="failing">${c.failing.map(esc).join(", ")}</div>` : "";
+    return `<tr><td>${esc(c.case)}</td><td>${esc(c.variant)}</td><td><b>${esc(c.title)}</b><br>${esc(c.description)}${failing}</td>` +
+           `<td class="${c.result}">${c.result}</td><td>${c.pass} / ${c.fail}</td><td>${links}</td></tr>`;
+  }).join("");
+  $("count").textContent = `${rows.length} von ${CASES.length} Cases`;
+}
+
+document.querySelectorAll("th[data-key]").forEach(th => th.addEventListener("click", () => {
+  sortDir = sortKey === th.dataset.key ? -sortDir : 1;
+  sortKey = th.dataset.key;
+  show();
+}));
+["query", "result", "series", "variant", "ff"].forEach(id => $(id).addEventListener("input", show));
+
+fetch("index.json").then(r => r.json()).then(data => {
+  CASES = data.cases;
+  [...new Set(CASES.map(c => c.variant))].sort().forEach(v => $("variant").add(new Option(v, v)));
+  const params = new URLSearchParams(location.search);
+  ["query", "result", "series", "variant"].forEach(id => { if (params.has(id)) $(id).value = params.get(id); });
+  show();
+});
+</script>
+</body>
+</html>
+""".replace("NAV_STYLE", NAV_STYLE)
+
+
+# =========================
+# Build
+# =========================
+
+def build_site(site_dir: Path, results_dir: Path, comparison_dir: Path, overview_dir: Optional[Path] = None,
+               variant: str = "v1", force: bool = False) -> SiteBuilder:
+    """Build or update the site in site_dir; overview_dir defaults to results_dir if it holds an
+    overview report, else to the project root."""
+    if overview_dir is None:
+        overview_dir = results_dir if (results_dir / "overview_report.html").exists() else PROJECT_ROOT
+    site_dir.mkdir(parents=True, exist_ok=True)
+    builder = SiteBuilder(site_dir, force)
+
+    dashboards = find_dashboards(results_dir) if results_dir.is_dir() else {}
+    comparisons = sorted(p for p in comparison_dir.glob("*") if p.is_file()) if comparison_dir.is_dir() else []
+
+    # Case pages share one plotly.js
+    if dashboards:
+        builder.build(PLOTLY_ASSET, [get_plotlyjs_version()],
+                      lambda path: path.write_text(get_plotlyjs(), encoding="utf-8"))
+    for (case, var), path in dashboards.items():
+        builder.build(case_page(case, var), [path], render_case(path, case, var))
+
+    for path in comparisons:
+        builder.copy(f"comparison/{path.name}", path)
+
+    overview_html = overview_dir / "overview_report.html"
+    if overview_html.exists():
+        pages = "\n".join(f"{c}_{v}" for c, v in dashboards)
+        builder.build("index.html", [overview_html, variant, pages], lambda path: path.write_text(
+            overview_page(overview_html.read_text(encoding="utf-8"), variant, set(dashboards)), encoding="utf-8"))
+        for name in OVERVIEW_FILES:
+            if (overview_dir / name).exists():
+                builder.copy(name, overview_dir / name)
+    else:
+        logging.warning("No overview report in %s", overview_dir)
+
+    overview_tsv = overview_dir / "overview_report.tsv"
+    overview = (pd.read_csv(overview_tsv, sep="\t", dtype={"Case": str})
+                if overview_html.exists() and overview_tsv.exists() else None)
+    records = build_index(overview, variant, dashboards, {p.name for p in comparisons})
+    builder.write("index.json", json.dumps({"variant": variant, "cases": records}, ensure_ascii=False, indent=1))
+    builder.write("cases.html", CASES_PAGE)
+
+    removed = builder.finish()
+    logging.info("Site %s: %d page(s) rendered, %d unchanged, %d removed",
+                 site_dir, len(builder.rendered), len(builder.current) - len(builder.rendered), len(removed))
+    return builder
+
+
+# =========================
+# CLI
+# =========================
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Build the static result site (overview, case dashboards, search index) incrementally."
+    )
+    parser.add_argument("--results-dir", type=Path, default=Path.cwd() / "validation_results",
+                        help="Validation results with the case dashboards (default: validation_results)")
+    parser.add_argument("--site-dir", type=Path, default=Path.cwd() / "_site",
+                        help="Output directory of the site (default: _site)")
+    parser.add_argument("--comparison-dir", type=Path, default=PROJECT_ROOT / "comparison",
+                        help="Comparison figures (default: comparison/)")
+    parser.add_argument("--overview-dir", type=Path, default=None,
+                        help="Directory of overview_report.* (default: results dir if present, else project root)")
+    parser.add_argument("--variant", default="v1", help="Variant of the overview report (default: v1)")
+    parser.add_argument("--force", action="store_true", help="Rebuild all pages")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    # Imported here: run_all_validations imports this module.
+    from run_all_validations import setup_logging
+
+    setup_logging()
+    args = parse_args(argv)
+    build_site(args.site_dir, args.results_dir, args.comparison_dir, args.overview_dir, args.variant, args.force)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Single-page dashboard of one validated case.
+
+Instead of ~30 hourly HTML files, ~40 monthly SVGs and a separate
+validation report, validate_nandrad collects the hourly and monthly tables
+of a case in a CaseDashboard and writes one self-contained HTML file
+(Case{N}_{variant}_dashboard.html):
+
+- validation and agreement tables as plain HTML,
+- monthly tables (engines and reference min/max) as JSON,
+- hourly series as base64-encoded float32 arrays (start + hourly step),
+- plotly.js embedded once (or loaded from the CDN or a shared script).
+
+Charts are drawn in the browser only when their section is opened, so the
+page opens immediately regardless of the number of series.
+
+CaseDashboard.from_html() reads a written page back, so that build_site.py
+can publish it with a shared plotly.js instead of one copy per case.
+"""
+
+from __future__ import annotations
+
+import base64
+import html
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+
+REF_COLUMNS = ("min", "max")
+
+_DATA_BLOCK = re.compile(r'<script id="case-data" type="application/json">(.*?)</script>', re.S)
+_TABLES_BLOCK = re.compile(r'<section id="tables">\n?(.*?)\n?</section>|</h1>\n(.*?)\n<h2>Monatswerte</h2>', re.S)
+
+
+def _float32_blob(values: pd.Series) -> str:
+    return base64.b64encode(np.ascontiguousarray(values.to_numpy(dtype="<f4")).tobytes()).decode("ascii")
+
+
+def _json_values(values: pd.Series) -> list[Optional[float]]:
+    return [None if pd.isna(v) else round(float(v), 6) for v in values]
+
+
+class CaseDashboard:
+    """Collects the hourly and monthly tables of one case variant and writes the dashboard page."""
+
+    def __init__(self, case: str, variant: str):
+        self.case = case
+        self.variant = variant
+        self.hourly: list[dict] = []
+        self.monthly: list[dict] = []
+
+    def add_hourly(self, title: str, y_label: str, df: pd.DataFrame) -> None:
+        """Hourly series (one column per engine) on a regular hourly index."""
+        self.hourly.append({
+            "title": title,
+            "label": y_label,
+            "start": df.index[0].isoformat() if len(df.index) else "",
+            "series": {col: _float32_blob(df[col]) for col in df.columns},
+        })
+
+    def add_monthly(self, title: str, df_m: pd.DataFrame, statistic: str = "Summe") -> None:
+        """Monthly values (statistic: label of the aggregation) per engine; 'min'/'max' columns
+        are drawn as reference markers."""
+        self.monthly.append({
+            "title": title,
+            "statistic": statistic,
+            "months": [str(i) for i in df_m.index],
+            "series": {col: _json_values(df_m[col]) for col in df_m.columns if col not in REF_COLUMNS},
+            "refs": ({c: _json_values(df_m[c]) for c in REF_COLUMNS}
+                     if set(REF_COLUMNS).issubset(df_m.columns) else None),
+        })
+
+    @classmethod
+    def from_html(cls, path: Path, case: str, variant: str) -> tuple["CaseDashboard", str]:
+        """Dashboard data and tables HTML of a page written by write()."""
+        page = path.read_text(encoding="utf-8")
+        data = _DATA_BLOCK.search(page)
+        if data is None:
+            raise ValueError(f"No dashboard data in {path}")
+        content = json.loads(data.group(1))
+        dashboard = cls(case, variant)
+        dashboard.hourly = content["hourly"]
+        dashboard.monthly = content["monthly"]
+        tables = _TABLES_BLOCK.search(page)
+        return dashboard, (tables.group(1) or tables.group(2) or "") if tables else ""
+
+    def write(self, out_html: Path, tables_html: str = "", include_plotlyjs: str = "inline") -> None:
+        """Write the page; include_plotlyjs: 'inline' (self-contained), 'cdn' or the URL of a plotly.js script."""
+        if include_plotlyjs == "inline":
+            plotly_tag = f"<script>{get_plotlyjs()}</script>"
+        else:
+            src = (f"https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js" if include_plotlyjs == "cdn"
+                   else include_plotlyjs)
+            plotly_tag = f'<script src="{src}"></script>'
+
+        def sections(kind: str, items: list[dict]) -> str:
+            return "\n".join(
+                f'<details data-kind="{kind}" data-index="{i}"><summary>{html.escape(item["title"])}'
+                f'{" (Monats" + item["statistic"].lower() + ")" if "statistic" in item else ""}</summary>'
+                f'<div class="chart"></div></details>'
+                for i, item in enumerate(items)
+            )
+
+        data = json.dumps({"hourly": self.hourly, "monthly": self.monthly}, ensure_ascii=False, separators=(",", ":"))
+        data = data.replace("</", "<\\/")   # keep "</script>" in titles from closing the data block
+        page = f"""<!DOCTYPE html>
+<html lang="de">
+<head>
+<meta charset="utf-8">
+<title>Case {self.case} {self.variant} &ndash; Validierung</title>
+<style>
+body {{ font-family: Arial, sans-serif; margin: 20px; }}
+h1 {{ color: #333; }}
+.summary {{ margin: 10px 0; font-size: 1.1em; }}
+.pass {{ color: #155724; font-weight: bold; }}
+.fail {{ color: #721c24; font-weight: bold; }}
+.skip {{ color: #383d41; }}
+table {{ border-collapse: collapse; width: 100%; margin-top: 15px; }}
+th {{ background-color: #343a40; color: white; padding: 10px; text-align: left; }}
+td {{ padding: 8px; border-bottom: 1px solid #dee2e6; }}
+details {{ margin: 6px 0; border: 1px solid #dee2e6; border-radius: 4px; padding: 4px 10px; }}
+summary {{ cursor: pointer; font-weight: bold; }}
+.chart {{ height: 450px; }}
+</style>
+{plotly_tag}
+</head>
+<body>
+<h1>ASHRAE 140 Validierung &mdash; Case {self.case} ({self.variant})</h1>
+<section id="tables">
+{tables_html}
+</section>
+<h2>Monatswerte</h2>
+{sections("monthly", self.monthly)}
+<h2>Stundenwerte</h2>
+{sections("hourly", self.hourly)}
+<script id="case-data" type="application/json">{data}</script>
+<script>
+const DATA = JSON.parse(document.getElementById("case-data").textContent);
+const HOUR = 3600e3;
+
+function decode(blob) {{
+  const bytes = Uint8Array.from(atob(blob), c => c.charCodeAt(0));
+  return new Float32Array(bytes.buffer);
+}}
+
+function hourlyChart(div, item) {{
+  const start = Date.parse(item.start);
+  const traces = Object.entries(item.series).map(([name, blob]) => {{
+    const y = decode(blob);
+    const x = Array.from(y, (_, i) => new Date(start + i * HOUR));
+    return {{x: x, y: Array.from(y), name: name, type: "scattergl", mode: "lines", line: {{width: 1}}}};
+  }});
+  Plotly.newPlot(div, traces, {{title: item.title, yaxis: {{title: item.label}},
+                                margin: {{t: 40}}}}, {{responsive: true}});
+}}
+
+function monthlyChart(div, item) {{
+  const traces = Object.entries(item.series).map(([name, y]) => ({{x: item.months, y: y, name: name, type: "bar"}}));
+  if (item.refs) {{
+    traces.push({{x: item.months, y: item.refs.min, name: "Reference Min", mode: "markers", type: "scatter",
+                 marker: {{symbol: "line-ew-open", size: 18, color: "black", line: {{width: 2}}}}}});
+    traces.push({{x: item.months, y: item.refs.max, name: "Reference Max", mode: "markers", type: "scatter",
+                 marker: {{symbol: "cross-thin-open", size: 14, color: "black", line: {{width: 2}}}}}});
+  }}
+  Plotly.newPlot(div, traces, {{title: item.title + " | Fall {self.case}", yaxis: {{title: item.title}},
+                                xaxis: {{title: "Monat"}}, barmode: "group", margin: {{t: 40}}}}, {{responsive: true}});
+}}
+
+document.querySelectorAll("details[data-kind]").forEach(el => el.addEventListener("toggle", () => {{
+  const div = el.querySelector(".chart");
+  if (!el.open || div.dataset.drawn) return;
+  div.dataset.drawn = "1";
+  const item = DATA[el.dataset.kind][Number(el.dataset.index)];
+  (el.dataset.kind === "hourly" ? hourlyChart : monthlyChart)(div, item);
+}}));
+</script>
+</body>
+</html>
+"""
+        out_html.write_text(page, encoding="utf-8")
+        logging.info("Saved case dashboard: %s", out_html)
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Run-to-run regression comparison of two validation result sets.
+
+Compares e.g. the validation_results/ of two NandradSolver builds. Both
+result sets are opened through their results_api index and aligned on
+case, variant, metric and engine:
+
+- checks: status changes per metric (PASS -> FAIL first),
+- aggregates: base, new, difference and relative difference per metric,
+- hourly series: mean difference, RMSE and the largest difference with its
+  time stamp per series, ranked by the largest difference relative to the
+  range of the base series.
+
+Hourly files with identical content are skipped without parsing them, and
+series with the same content hash in both indexes are not loaded; the
+differences of all remaining series of a file are computed in one pass over
+the (memory-mapped) matrices. Writes regression_status.tsv,
+regression_metrics.tsv, regression_hourly.tsv and regression_report.md to
+--out-dir; exits with 1 if a check changed to FAIL.
+
+    python compare_results.py validation_results_old validation_results --out-dir regression
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import logging
+import time
+import warnings
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from report_tables import md_table
+from results_api import Filter, ResultsRun, open_run
+from run_all_validations import setup_logging
+
+
+STATUS_COLUMNS = ["case", "variant", "Metrik", "base", "new", "status_base", "status_new", "change"]
+METRIC_COLUMNS = ["case", "variant", "metric", "engine", "base", "new", "delta", "rel_delta"]
+HOURLY_COLUMNS = ["case", "variant", "metric", "engine", "n", "missing_hours", "mean_delta", "rmse",
+                  "max_abs_delta", "max_time", "base_range", "rel_max"]
+
+
+def _file_digest(path: Path) -> str:
+    return hashlib.sha1(path.read_bytes()).hexdigest()
+
+
+# =========================
+# Checks and aggregates
+# =========================
+
+def compare_status(base: ResultsRun, new: ResultsRun, case: Filter = None, variant: Filter = None) -> pd.DataFrame:
+    """Checks whose NANDRAD status differs; regressions (now FAIL) first, fixes last."""
+    keys = ["case", "variant", "Metrik"]
+    b = base.checks(case, variant)
+    n = new.checks(case, variant)
+    if b.empty and n.empty:
+        return pd.DataFrame(columns=STATUS_COLUMNS + ["rank"])
+    df = b.reindex(columns=keys + ["NANDRAD", "Status"]).merge(
+        n.reindex(columns=keys + ["NANDRAD", "Status"]), on=keys, how="outer", suffixes=("_base", "_new"))
+    df = df.rename(columns={"NANDRAD_base": "base", "NANDRAD_new": "new",
+                            "Status_base": "status_base", "Status_new": "status_new"})
+    df[["status_base", "status_new"]] = df[["status_base", "status_new"]].fillna("—")
+    df = df[df["status_base"] != df["status_new"]].copy()
+    df["change"] = df["status_base"] + " → " + df["status_new"]
+    # 0: now FAIL, 1: other changes, 2: no longer FAIL
+    df["rank"] = np.select([df["status_new"] == "FAIL", df["status_base"] == "FAIL"], [0, 2], default=1)
+    return df.sort_values(["rank", "case", "variant", "Metrik"], kind="stable").reset_index(drop=True)[
+        STATUS_COLUMNS + ["rank"]]
+
+
+def compare_aggregates(base: ResultsRun, new: ResultsRun, case: Filter = None, variant: Filter = None,
+                       atol: float = 0.0) -> pd.DataFrame:
+    """Aggregates that differ by more than atol (or exist in one result set only), largest relative change first."""
+    keys = ["case", "variant", "metric", "engine"]
+    b = base.aggregates(case, variant).reindex(columns=keys + ["value"])
+    n = new.aggregates(case, variant).reindex(columns=keys + ["value"])
+    df = b.merge(n, on=keys, how="outer", suffixes=("_base", "_new")).rename(
+        columns={"value_base": "base", "value_new": "new"})
+    df["delta"] = df["new"] - df["base"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        df["rel_delta"] = df["delta"] / df["base"].abs()
+    changed = (df["delta"].abs() > atol) | (df["base"].isna() != df["new"].isna())
+    df = df[changed].copy()
+    order = df["rel_delta"].abs().fillna(np.inf).to_numpy()
+    df = df.iloc[np.lexsort((-df["delta"].abs().fillna(0.0).to_numpy(), -order))]
+    return df.reset_index(drop=True)[METRIC_COLUMNS]
+
+
+# =========================
+# Hourly series
+# =========================
+
+def _series_stats(view_b, view_n, engines: list[str]) -> list[dict]:
+    """Difference statistics of the given engines of one hourly output (aligned on the common hours;
+    missing_hours counts the hours of only one of both)."""
+    tb = np.asarray(view_b.times).view("i8")
+    tn = np.asarray(view_n.times).view("i8")
+    if len(tb) == len(tn) and np.array_equal(tb, tn):
+        ib = in_ = slice(None)
+        times = tb
+    else:
+        times, ib, in_ = np.intersect1d(tb, tn, assume_unique=True, return_indices=True)
+    missing = len(tb) + len(tn) - 2 * len(times)
+    jb = [view_b.columns.index(e) for e in engines]
+    jn = [view_n.columns.index(e) for e in engines]
+    vb = np.asarray(view_b.values[:, jb])[ib]
+    vn = np.asarray(view_n.values[:, jn])[in_]
+    d = vn - vb
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        valid = ~np.isnan(d)
+        n = valid.sum(axis=0)
+        mean = np.nanmean(d, axis=0)
+        rmse = np.sqrt(np.nanmean(d ** 2, axis=0))
+        abs_d = np.where(valid, np.abs(d), -1.0)
+        imax = abs_d.argmax(axis=0) if len(times) else np.zeros(len(engines), dtype=int)
+        max_abs = abs_d[imax, np.arange(len(engines))] if len(times) else np.full(len(engines), np.nan)
+        base_range = np.nanmax(vb, axis=0) - np.nanmin(vb, axis=0)
+    stamps = pd.to_datetime(times[imax]) if len(times) else [pd.NaT] * len(engines)
+    return [{
+        "case": view_b.case, "variant": view_b.variant, "metric": view_b.metric, "engine": engine,
+        "n": int(n[k]), "missing_hours": missing, "mean_delta": mean[k], "rmse": rmse[k],
+        "max_abs_delta": max_abs[k] if n[k] else np.nan, "max_time": stamps[k] if n[k] else pd.NaT,
+        "base_range": base_range[k],
+        "rel_max": max_abs[k] / base_range[k] if n[k] and base_range[k] > 0 else np.nan,
+    } for k, engine in enumerate(engines)]
+
+
+def compare_hourly(base: ResultsRun, new: ResultsRun, case: Filter = None, variant: Filter = None,
+                   atol: float = 0.0) -> tuple[pd.DataFrame, dict[str, int]]:
+    """Differences of all hourly series present in both result sets, largest relative deviation first.
+
+    Returns the table of differing series and counts (series compared, identical, skipped files).
+    """
+    keys = ["case", "variant", "metric"]
+    fb = base.list_files(case, variant, kind="hourly")
+    fn = new.list_files(case, variant, kind="hourly")
+    pairs = fb.merge(fn, on=keys, suffixes=("_base", "_new"))
+    counts = {"files": len(pairs), "identical_files": 0, "series": 0, "identical_series": 0}
+    rows: list[dict] = []
+    for p in pairs.itertuples(index=False):
+        if p.size_base == p.size_new and (
+                _file_digest(base.out_dir / p.file_base) == _file_digest(new.out_dir / p.file_new)):
+            counts["identical_files"] += 1
+            continue
+        hb = base.hourly_hashes(p.case, p.variant, p.metric)
+        hn = new.hourly_hashes(p.case, p.variant, p.metric)
+        common = [e for e in hb if e in hn]
+        engines = [e for e in common if hb[e] != hn[e]]
+        counts["series"] += len(common)
+        counts["identical_series"] += len(common) - len(engines)
+        if engines:
+            rows.extend(_series_stats(base.hourly(p.case, p.variant, p.metric),
+                                      new.hourly(p.case, p.variant, p.metric), engines))
+    df = pd.DataFrame(rows, columns=HOURLY_COLUMNS)
+    df = df[~(df["max_abs_delta"] <= atol) | (df["missing_hours"] > 0)]
+    df = df.sort_values(["rel_max", "max_abs_delta"], ascending=False, na_position="last", kind="stable")
+    return df.reset_index(drop=True), counts
+
+
+# =========================
+# Report
+# =========================
+
+def write_report(out_dir: Path, base_dir: Path, new_dir: Path, status: pd.DataFrame, metrics: pd.DataFrame,
+                 hourly: pd.DataFrame, counts: dict[str, int], top: int = 25) -> None:
+    """Write the three TSVs and the Markdown summary (top entries of each table)."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    status.drop(columns="rank").to_csv(out_dir / "regression_status.tsv", sep="\t", index=False)
+    metrics.to_csv(out_dir / "regression_metrics.tsv", sep="\t", index=False)
+    hourly.to_csv(out_dir / "regression_hourly.tsv", sep="\t", index=False)
+
+    n_regressed = int((status["rank"] == 0).sum())
+    n_fixed = int((status["rank"] == 2).sum())
+    lines = [
+        "# Regressionsvergleich",
+        "",
+        f"Basis: `{base_dir}` | Neu: `{new_dir}`",
+        "",
+        f"**{n_regressed} neue FAIL** | {n_fixed} behoben | {len(status) - n_regressed - n_fixed} sonstige "
+        f"Statusänderungen | {len(metrics)} geänderte Kennwerte | {len(hourly)} abweichende Stundenreihen "
+        f"({counts['identical_series']} von {counts['series']} Reihen und {counts['identical_files']} von "
+        f"{counts['files']} Dateien identisch)",
+        "",
+    ]
+    sections = [
+        ("Statusänderungen", status.drop(columns="rank")),
+        ("Kennwerte (größte relative Änderung zuerst)", metrics.round(4)),
+        ("Stundenwerte (größte Abweichung bezogen auf die Spannweite der Basisreihe zuerst)",
+         hourly.assign(max_time=hourly["max_time"].astype(str)).round(4)),
+    ]
+    for title, df in sections:
+        lines += [f"## {title}", ""]
+        if df.empty:
+            lines += ["Keine Unterschiede.", ""]
+            continue
+        lines += md_table(df.head(top).fillna(""))
+        if len(df) > top:
+            lines.append(f"\n… {len(df) - top} weitere Zeilen in der TSV.")
+        lines.append("")
+    (out_dir / "regression_report.md").write_text("\n".join(lines), encoding="utf-8")
+    logging.info("Regression report: %s", out_dir / "regression_report.md")
+
+
+# =========================
+# CLI
+# =========================
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compare two validation result sets (e.g. two NandradSolver builds) and rank the differences."
+    )
+    parser.add_argument("base", type=Path, help="Result set of the reference build (e.g. validation_results_old)")
+    parser.add_argument("new", type=Path, help="Result set to check (e.g. validation_results)")
+    parser.add_argument("--out-dir", type=Path, default=Path.cwd() / "regression",
+                        help="Output directory of the report (default: regression)")
+    parser.add_argument("-c", "--case", action="append", default=None, help="Case or pattern, e.g. '9*' (repeatable)")
+    parser.add_argument("-v", "--variant", action="append", default=None, help="Variant or pattern (repeatable)")
+    parser.add_argument("--atol", type=float, default=1e-9,
+                        help="Differences up to this value count as identical (default: 1e-9)")
+    parser.add_argument("--top", type=int, default=25, help="Rows per table in the Markdown report (default: 25)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    setup_logging()
+    args = parse_args(argv)
+    t0 = time.perf_counter()
+
+    base = open_run(args.base)
+    new = open_run(args.new)
+    status = compare_status(base, new, args.case, args.variant)
+    metrics = compare_aggregates(base, new, args.case, args.variant, args.atol)
+    hourly, counts = compare_hourly(base, new, args.case, args.variant, args.atol)
+    write_report(args.out_dir, args.base, args.new, status, metrics, hourly, counts, args.top)
+
+    regressed = status[status["rank"] == 0]
+    logging.info("Compared in %.1f s: %d new FAIL, %d status change(s), %d changed metric(s), "
+                 "%d differing hourly series (%d identical)",
+                 time.perf_counter() - t0, len(regressed), len(status), len(metrics), len(hourly),
+                 counts["identical_series"])
+    for row in regressed.head(args.top).itertuples(index=False):
+        logging.warning("  Case %s (%s): %s %s", row.case, row.variant, row.Metrik, row.change)
+    return 1 if len(regressed) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
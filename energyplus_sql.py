@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EnergyPlus results from eplusout.sql (Output:SQLite) instead of eplusout.eso.
+
+The ESO is a text file that has to be parsed completely before the first
+series can be read, so loading it costs time proportional to everything
+EnergyPlus wrote. The SQLite output stores the same values in tables:
+
+- ReportDataDictionary   one row per reported (key, variable, frequency)
+- ReportData             one row per value (dictionary index, time index, value)
+- Time                   time stamps incl. the warm-up flag
+
+SqlOutput looks a variable up in the (small) dictionary and reads only its
+ReportData rows through an index on (ReportDataDictionaryIndex, TimeIndex),
+returned as a NumPy array, so a lookup costs the same no matter how many
+variables the file contains. EnergyPlus does not create this index itself;
+index_sql() adds it once after the run (SqlOutput does it on first use if
+the file is writable and falls back to a table scan otherwise).
+
+Variable matching follows esoreader (case-insensitive substring of the
+variable name, case-insensitive key, empty key = all keys, exact reporting
+frequency); warm-up days are excluded as in the ESO.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+
+INDEX_NAME = "rdDictTime"
+
+_LOOKUP = """
+SELECT ReportDataDictionaryIndex, KeyValue FROM ReportDataDictionary
+WHERE instr(lower(Name), lower(?)) > 0 AND lower(ReportingFrequency) = lower(?)
+  AND (? = '' OR lower(KeyValue) = lower(?))
+ORDER BY ReportDataDictionaryIndex
+"""
+
+_VALUES = """
+SELECT rd.Value FROM ReportData rd JOIN Time t ON t.TimeIndex = rd.TimeIndex
+WHERE rd.ReportDataDictionaryIndex = ? AND coalesce(t.WarmupFlag, 0) = 0
+ORDER BY rd.TimeIndex
+"""
+
+
+def index_sql(path: Path) -> bool:
+    """Create the lookup index in an eplusout.sql; returns False if the file cannot be written."""
+    try:
+        with closing(sqlite3.connect(path)) as con:
+            con.execute(f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} "
+                        f"ON ReportData (ReportDataDictionaryIndex, TimeIndex, Value)")
+            con.commit()
+        return True
+    except sqlite3.OperationalError as e:
+        logging.warning("Cannot index %s (%s) — lookups scan the whole table.", path, e)
+        return False
+
+
+class SqlOutput:
+    """Indexed read access to the report variables of an eplusout.sql."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._con = self._connect()
+        indexed = self._con.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?",
+                                    (INDEX_NAME,)).fetchone()
+        if not indexed and index_sql(path):
+            self._con.close()
+            self._con = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(f"file:{self.path.resolve().as_posix()}?mode=ro", uri=True, check_same_thread=False)
+
+    def close(self) -> None:
+        self._con.close()
+
+    def keys(self, var: str, key: Optional[str] = None, frequency: str = "Hourly") -> list[tuple[int, str]]:
+        """(dictionary index, key) of the matching report variables."""
+        return self._con.execute(_LOOKUP, (var, frequency, key or "", key or "")).fetchall()
+
+    def series(self, var: str, key: Optional[str] = None, frequency: str = "Hourly") -> np.ndarray:
+        """Values of one report variable (float64, warm-up excluded); LookupError unless exactly one matches."""
+        matches = self.keys(var, key, frequency)
+        if len(matches) != 1:
+            raise LookupError(f"SQLite var '{var}' (key='{key}', freq='{frequency}') matched {len(matches)} "
+                              f"variables{'; specify key' if matches else ''}.")
+        rows = self._con.execute(_VALUES, (matches[0][0],))
+        return np.fromiter((row[0] for row in rows), dtype=float)
@@ -2,28 +2,80 @@
 # -*- coding: utf-8 -*-
 
 """
-Extract ASHRAE 140 BESTEST reference data from RESULTS5-2A-Update.xlsx.
+Extract ASHRAE 140 BESTEST reference data from RESULTS5-2A-Update.xlsx and
+the raw program tables in data/Validation_data_BESTEST/.
 
-Reads the Excel file and produces consolidated TSV reference files:
+Produces consolidated TSV reference files:
   - data/reference/annual-references.tsv       (annual heating/cooling + peak loads)
   - data/reference/free-float-references.tsv    (free-float max/min/avg temperatures)
   - data/reference/monthly-references.tsv       (monthly heating & cooling min/max, Case 600 & 900)
+  - data/reference/program-results.tsv          (per-program results, long format)
 
-Run once:
-    python extract_references.py
+The workbook is opened read-only and every sheet is streamed once; the
+blocks are sliced from that in-memory range. Outputs are cached by the md5
+of all inputs (data/reference/references.hash), so calling
+ensure_references() with unchanged inputs only costs the hashing.
+
+Run:
+    python extract_references.py            # regenerate if inputs changed
+    python extract_references.py --force    # always regenerate
 """
 
 from __future__ import annotations
 
+import argparse
+import hashlib
+import logging
 import re
 from pathlib import Path
+from typing import Optional, Sequence
 
-import openpyxl
 import pandas as pd
 
 
-EXCEL_PATH = Path("validation_results/RESULTS5-2A-Update.xlsx")
-OUT_DIR = Path("data/reference")
+DATA_DIR = Path("data")
+EXCEL_NAME = "RESULTS5-2A-Update.xlsx"
+BESTEST_NAME = "Validation_data_BESTEST"
+HASH_NAME = "references.hash"
+
+# Bump when the output format changes, so cached outputs are regenerated
+EXTRACTOR_VERSION = "2"
+
+OUTPUT_FILES = (
+    "annual-references.tsv",
+    "free-float-references.tsv",
+    "monthly-references.tsv",
+    "program-results.tsv",
+)
+
+MONTH_LABELS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
+                "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+PROGRAMS = ("BSIMAC", "CSE", "DeST", "EnergyPlus", "ESP-r", "NewHASP", "TRNSYS")
+
+# (file relative to BESTEST dir, metric, layout, scale to report unit)
+# layout "simple":  one value column per program
+# layout "grouped": one column group per program (value, month, day, hour)
+PROGRAM_TABLES: list[tuple[str, str, str, float]] = [
+    ("Annual Heating Loads.txt", "heating", "simple", 1e-3),           # kWh -> MWh
+    ("Annual Sensible Cooling Loads.txt", "cooling", "simple", 1.0),
+    ("Annual Hourly Integrated Peak Heating Loads.txt", "peak_heating", "grouped", 1.0),
+    ("Annual Hourly Integrated Peak Sensible Cooling Loads.txt", "peak_cooling", "simple", 1.0),
+    ("Free-Float Temperature Output MAX.txt", "temp_max", "grouped", 1.0),
+    ("Free-Float Temperature Output MIN.txt", "temp_min", "grouped", 1.0),
+    ("Free-Float Temperature Output AVR.txt", "temp_avg", "grouped", 1.0),
+    ("Low Mass Basic Sensitivity Tests/Annual Heating.txt", "delta_heating", "simple", 1.0),
+    ("Low Mass Basic Sensitivity Tests/Annual Cooling.txt", "delta_cooling", "simple", 1.0),
+    ("Low Mass Basic Sensitivity Tests/Peak Heating.txt", "delta_peak_heating", "simple", 1.0),
+    ("Low Mass Basic Sensitivity Tests/Peak Cooling.txt", "delta_peak_cooling", "simple", 1.0),
+    ("High Mass Basic Sensitivity Tests/Annual Heating.txt", "delta_heating", "simple", 1.0),
+    ("High Mass Basic Sensitivity Tests/Annual Cooling.txt", "delta_cooling", "simple", 1.0),
+    ("High Mass Basic Sensitivity Tests/Peak Heating.txt", "delta_peak_heating", "simple", 1.0),
+    ("High Mass Basic Sensitivity Tests/Peak Cooling.txt", "delta_peak_cooling", "simple", 1.0),
+]
+
+# Placeholders for "not reported" in the program tables
+MISSING_TOKENS = {"", "-1", "-999"}
 
 
 # ---------------------------------------------------------------------------
@@ -47,63 +99,136 @@ def _extract_case_number(label: str) -> str | None:
     return m.group(1) if m else None
 
 
-def _read_block(ws, first_data_row: int, last_data_row: int,
+def _case_sort_key(case: str) -> tuple[int, bool]:
+    return int(re.sub(r"FF$", "", case)), "FF" in case
+
+
+def _to_float(value, missing: tuple = ()) -> float | None:
+    """Convert a cell value to float; None and the given sentinels become None."""
+    if value is None or value in missing:
+        return None
+    return float(value)
+
+
+def _sheet_values(ws, max_row: int, max_col: int) -> list[tuple]:
+    """Stream rows 1..max_row, columns 1..max_col of a read-only worksheet.
+
+    Short rows are padded with None, so values[r - 1][c - 1] addresses
+    cell (r, c) like ws.cell(row=r, column=c) would.
+    """
+    values = []
+    for row in ws.iter_rows(min_row=1, max_row=max_row, max_col=max_col, values_only=True):
+        values.append(tuple(row) + (None,) * (max_col - len(row)))
+    values.extend([(None,) * max_col] * (max_row - len(values)))
+    return values
+
+
+def _read_block(values: list[tuple], first_data_row: int, last_data_row: int,
                 case_col: int, min_col: int, max_col: int) -> dict[str, tuple[float | None, float | None]]:
-    """Read a block of rows from a worksheet and return {case: (min, max)}."""
+    """Read a block of rows from streamed sheet values and return {case: (min, max)}."""
     result: dict[str, tuple[float | None, float | None]] = {}
-    for r in range(first_data_row, last_data_row + 1):
-        label = ws.cell(row=r, column=case_col).value
-        case = _extract_case_number(label)
+    for row in values[first_data_row - 1:last_data_row]:
+        case = _extract_case_number(row[case_col - 1])
         if not case:
             continue
-        v_min = ws.cell(row=r, column=min_col).value
-        v_max = ws.cell(row=r, column=max_col).value
         # Treat None / -1 as missing
-        if v_min is not None and v_min != -1:
-            v_min = float(v_min)
-        else:
-            v_min = None
-        if v_max is not None and v_max != -1:
-            v_max = float(v_max)
-        else:
-            v_max = None
-        result[case] = (v_min, v_max)
+        result[case] = (_to_float(row[min_col - 1], missing=(-1,)),
+                        _to_float(row[max_col - 1], missing=(-1,)))
     return result
 
 
-def _read_monthly_block(ws, header_row: int, case_col: int, min_col: int, max_col: int,
+def _read_monthly_block(values: list[tuple], min_col: int, max_col: int,
                         cases: list[tuple[str, int]]) -> dict[str, list[tuple[float | None, float | None]]]:
     """Read monthly blocks (12 rows per case) and return {case: [(min,max) x 12]}."""
     result = {}
     for case_label, start_row in cases:
-        months = []
-        for offset in range(12):
-            r = start_row + offset
-            v_min = ws.cell(row=r, column=min_col).value
-            v_max = ws.cell(row=r, column=max_col).value
-            if v_min is not None:
-                v_min = float(v_min)
-            if v_max is not None:
-                v_max = float(v_max)
-            months.append((v_min, v_max))
-        result[case_label] = months
+        rows = values[start_row - 1:start_row + 11]
+        result[case_label] = [(_to_float(r[min_col - 1]), _to_float(r[max_col - 1])) for r in rows]
+    return result
+
+
+def _program_header(line: str) -> list[tuple[int, str]]:
+    """(column, program) of every program label in the header line."""
+    labels = [(i, t.strip()) for i, t in enumerate(line.split("\t")) if t.strip() and t.strip() != "Case"]
+    return [(i, "EnergyPlus" if n == "Energy+" else n) for i, n in labels]
+
+
+def _read_program_table(path: Path, layout: str) -> dict[str, list[float | None]]:
+    """Parse one raw program table into {case: [value per program]}.
+
+    The tab layout of these files is not uniform (stray empty columns,
+    empty groups for programs without results), so values are located
+    by content rather than by fixed column positions.
+    """
+    lines = path.read_text(encoding="utf-8").splitlines()
+    header = _program_header(lines[0]) if lines else []
+    if tuple(name for _, name in header) != PROGRAMS:
+        raise ValueError(f"Unexpected program header in {path}: {[name for _, name in header]}")
+    label_cols = [col for col, _ in header]
+
+    result: dict[str, list[float | None]] = {}
+    for line in lines[1:]:
+        tokens = line.split("\t")
+        case = tokens[0].strip()
+        if not re.fullmatch(r"\d+(?:FF)?", case):
+            continue
+        values: list[float | None] = [None] * len(PROGRAMS)
+        if layout == "simple":
+            cells = [t.strip() for t in tokens[1:] if t.strip()]
+            if len(cells) != len(PROGRAMS):
+                logging.warning("%s: skipping case %s (%d values)", path.name, case, len(cells))
+                continue
+            values = [None if c in MISSING_TOKENS else float(c) for c in cells]
+        else:
+            # value columns carry a decimal point, date columns never do;
+            # a value belongs to the program label in its column, some rows
+            # are shifted by one stray column against the header
+            for col, token in enumerate(tokens[1:], start=1):
+                if not re.fullmatch(r"-?\d+\.\d+", token.strip()):
+                    continue
+                k = min(range(len(PROGRAMS)), key=lambda j: abs(label_cols[j] - col))
+                if abs(label_cols[k] - col) > 1 or values[k] is not None:
+                    raise ValueError(f"{path.name}: cannot assign value '{token.strip()}' in column {col} "
+                                     f"of case {case} to a program")
+                values[k] = float(token)
+        result[case] = values
     return result
 
 
+def _inputs_digest(excel_path: Path, bestest_dir: Path) -> str:
+    """md5 over the extractor version and all input files (names and contents)."""
+    md5 = hashlib.md5(EXTRACTOR_VERSION.encode())
+    inputs = [excel_path] + sorted(bestest_dir / rel for rel, *_ in PROGRAM_TABLES)
+    for path in inputs:
+        md5.update(path.name.encode())
+        md5.update(path.read_bytes())
+    return md5.hexdigest()
+
+
 # ---------------------------------------------------------------------------
-# Main extraction
+# Extraction
 # ---------------------------------------------------------------------------
 
-def main() -> None:
-    print(f"Reading {EXCEL_PATH} ...")
-    wb = openpyxl.load_workbook(str(EXCEL_PATH), data_only=True)
+def extract_workbook(excel_path: Path, out_dir: Path) -> None:
+    """Write the annual, free-float and monthly reference TSVs from the workbook."""
+    import openpyxl
+
+    logging.info("Reading %s ...", excel_path)
+    wb = openpyxl.load_workbook(str(excel_path), read_only=True, data_only=True)
+    try:
+        # Tables 1: annual loads, B(2)=label, K(11)=Min, L(12)=Max
+        ws1 = _sheet_values(wb["Tables 1"], max_row=108, max_col=12)
+        # Tables 2: peaks and free-float, B(2)=label, AI(35)=Min, AJ(36)=Max
+        ws2 = _sheet_values(wb["Tables 2"], max_row=144, max_col=36)
+        # Tables M1: monthly loads, K(11)=Min, L(12)=Max
+        wsm = _sheet_values(wb["Tables M1"], max_row=66, max_col=12)
+    finally:
+        wb.close()
 
     # -----------------------------------------------------------------------
     # 1. Annual heating & cooling  (Tables 1, Tables B8-1 and B8-2)
     # -----------------------------------------------------------------------
-    ws1 = wb["Tables 1"]
-
-    # Table B8-1: Annual Heating (rows 11-56), cols: B(2)=label, K(11)=Min, L(12)=Max
+    # Table B8-1: Annual Heating (rows 11-56)
     heating = _read_block(ws1, 11, 56, case_col=2, min_col=11, max_col=12)
 
     # Table B8-2: Annual Cooling (rows 63-108), same col layout
@@ -112,9 +237,7 @@ def main() -> None:
     # -----------------------------------------------------------------------
     # 2. Peak heating & cooling  (Tables 2, Tables B8-3 and B8-4)
     # -----------------------------------------------------------------------
-    ws2 = wb["Tables 2"]
-
-    # Table B8-3: Peak Heating (rows 11-56), cols: B(2)=label, AI(35)=Min, AJ(36)=Max
+    # Table B8-3: Peak Heating (rows 11-56)
     peak_heating = _read_block(ws2, 11, 56, case_col=2, min_col=35, max_col=36)
 
     # Table B8-4: Peak Cooling (rows 63-108)
@@ -133,27 +256,16 @@ def main() -> None:
     # -----------------------------------------------------------------------
     # 4. Monthly heating & cooling  (Tables M1, Tables B8-M1 and B8-M2)
     # -----------------------------------------------------------------------
-    wsm = wb["Tables M1"]
-
     # Monthly Heating: Case 600 starts at row 11, Case 900 starts at row 24
-    monthly_heating = _read_monthly_block(
-        wsm, header_row=7, case_col=2, min_col=11, max_col=12,
-        cases=[("600", 11), ("900", 24)],
-    )
+    monthly_heating = _read_monthly_block(wsm, min_col=11, max_col=12, cases=[("600", 11), ("900", 24)])
 
     # Monthly Cooling: Case 600 starts at row 42, Case 900 starts at row 55
-    monthly_cooling = _read_monthly_block(
-        wsm, header_row=38, case_col=2, min_col=11, max_col=12,
-        cases=[("600", 42), ("900", 55)],
-    )
+    monthly_cooling = _read_monthly_block(wsm, min_col=11, max_col=12, cases=[("600", 42), ("900", 55)])
 
     # -----------------------------------------------------------------------
     # Write annual-references.tsv
     # -----------------------------------------------------------------------
-    all_cases = sorted(
-        set(heating.keys()) | set(cooling.keys()),
-        key=lambda c: (int(re.sub(r"FF$", "", c)), "FF" in c),
-    )
+    all_cases = sorted(set(heating.keys()) | set(cooling.keys()), key=_case_sort_key)
     rows_annual = []
     for case in all_cases:
         h_min, h_max = heating.get(case, (None, None))
@@ -172,17 +284,14 @@ def main() -> None:
             "peak_cooling_max": pc_max,
         })
     df_annual = pd.DataFrame(rows_annual)
-    out_annual = OUT_DIR / "annual-references.tsv"
+    out_annual = out_dir / "annual-references.tsv"
     df_annual.to_csv(out_annual, sep="\t", index=False, float_format="%.6f")
-    print(f"  Written {out_annual}  ({len(df_annual)} cases)")
+    logging.info("  Written %s  (%d cases)", out_annual, len(df_annual))
 
     # -----------------------------------------------------------------------
     # Write free-float-references.tsv
     # -----------------------------------------------------------------------
-    ff_cases = sorted(
-        set(ff_max.keys()) | set(ff_min.keys()) | set(ff_avg.keys()),
-        key=lambda c: (int(re.sub(r"FF$", "", c)), "FF" in c),
-    )
+    ff_cases = sorted(set(ff_max.keys()) | set(ff_min.keys()) | set(ff_avg.keys()), key=_case_sort_key)
     rows_ff = []
     for case in ff_cases:
         tmax_min, tmax_max = ff_max.get(case, (None, None))
@@ -198,19 +307,14 @@ def main() -> None:
             "temp_avg_max": tavg_max,
         })
     df_ff = pd.DataFrame(rows_ff)
-    out_ff = OUT_DIR / "free-float-references.tsv"
+    out_ff = out_dir / "free-float-references.tsv"
     df_ff.to_csv(out_ff, sep="\t", index=False, float_format="%.6f")
-    print(f"  Written {out_ff}  ({len(df_ff)} cases)")
+    logging.info("  Written %s  (%d cases)", out_ff, len(df_ff))
 
     # -----------------------------------------------------------------------
     # Write monthly-references.tsv  (replaces existing file)
     # -----------------------------------------------------------------------
-    month_labels = ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
-                    "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
-    monthly_cases = sorted(
-        set(monthly_heating.keys()) | set(monthly_cooling.keys()),
-        key=lambda c: int(c),
-    )
+    monthly_cases = sorted(set(monthly_heating.keys()) | set(monthly_cooling.keys()), key=int)
 
     # Build column list
     cols = ["Month"]
@@ -221,7 +325,7 @@ def main() -> None:
         ])
 
     rows_m: list[dict] = []
-    for i, month in enumerate(month_labels):
+    for i, month in enumerate(MONTH_LABELS):
         row: dict = {"Month": month}
         for case in monthly_cases:
             h = monthly_heating.get(case, [(None, None)] * 12)
@@ -235,11 +339,70 @@ def main() -> None:
         rows_m.append(row)
 
     df_m = pd.DataFrame(rows_m, columns=cols)
-    out_m = OUT_DIR / "monthly-references.tsv"
+    out_m = out_dir / "monthly-references.tsv"
     df_m.to_csv(out_m, sep="\t", index=False)
-    print(f"  Written {out_m}  ({len(monthly_cases)} cases x 12 months)")
+    logging.info("  Written %s  (%d cases x 12 months)", out_m, len(monthly_cases))
+
+
+def extract_program_tables(bestest_dir: Path, out_dir: Path) -> None:
+    """Write program-results.tsv (Case, metric, program, value) from the raw tables.
+
+    Units: heating/cooling [MWh], peak_* [kW], temp_* [°C]. delta_* metrics
+    are the sensitivity differences as published (case minus its base case).
+    Results a program did not report are left out.
+    """
+    rows: list[tuple[str, str, str, float]] = []
+    for rel, metric, layout, scale in PROGRAM_TABLES:
+        table = _read_program_table(bestest_dir / rel, layout)
+        for case, values in table.items():
+            rows.extend((case, metric, program, v * scale)
+                        for program, v in zip(PROGRAMS, values) if v is not None)
+
+    df = pd.DataFrame(rows, columns=["Case", "metric", "program", "value"])
+    out = out_dir / "program-results.tsv"
+    df.to_csv(out, sep="\t", index=False, float_format="%.6f")
+    logging.info("  Written %s  (%d values, %d cases)", out, len(df), df["Case"].nunique())
+
+
+def ensure_references(data_dir: Path = DATA_DIR, force: bool = False) -> bool:
+    """Regenerate the reference TSVs in data_dir/reference if their inputs changed.
+
+    Returns True if the files were (re)written, False if the cached outputs
+    are current.
+    """
+    excel_path = data_dir / EXCEL_NAME
+    bestest_dir = data_dir / BESTEST_NAME
+    out_dir = data_dir / "reference"
+    hash_path = out_dir / HASH_NAME
+
+    digest = _inputs_digest(excel_path, bestest_dir)
+    outputs_exist = all((out_dir / name).exists() for name in OUTPUT_FILES)
+    if not force and outputs_exist and hash_path.exists() and hash_path.read_text().strip() == digest:
+        logging.debug("Reference TSVs are up to date (%s)", digest)
+        return False
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    extract_workbook(excel_path, out_dir)
+    extract_program_tables(bestest_dir, out_dir)
+    hash_path.write_text(digest + "\n")
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
 
-    print("Done.")
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR, help="Data directory (default: data)")
+    parser.add_argument("--force", action="store_true", help="Regenerate even if the inputs are unchanged")
+    args = parser.parse_args(argv)
+
+    if ensure_references(args.data_dir, force=args.force):
+        logging.info("Done.")
+    else:
+        logging.info("Reference TSVs are up to date.")
 
 
 if __name__ == "__main__":
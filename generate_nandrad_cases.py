@@ -3,12 +3,26 @@
 
 Reads Case600_v1.nandrad and Case900_v1.nandrad as templates, applies
 case-specific modifications, and writes the results to data/nandrad/.
+
+Each case is compiled into a list of patches (see CASES). A patch locates
+its targets through an ElementIndex built once per parsed template (by
+tag, by id, by IBK:Parameter name), so no modifier walks the whole tree.
+Cases are generated in a process pool, and a file is only rewritten if
+its bytes changed, which keeps mtimes (and downstream caches) stable.
+
+Usage:
+    python generate_nandrad_cases.py [--cases 660,960] [--jobs N]
 """
 
+import argparse
 import copy
 import os
 import re
 import xml.etree.ElementTree as ET
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 NANDRAD_DIR = os.path.join(BASE_DIR, "data", "nandrad")
@@ -25,228 +39,289 @@ def _ibk(tag):
 # Template loading helpers
 # ---------------------------------------------------------------------------
 
-def load_template(name):
-    """Load a .nandrad XML file, injecting IBK namespace for parsing."""
-    path = os.path.join(NANDRAD_DIR, name)
+@lru_cache(maxsize=None)
+def _template_text(nandrad_dir, name):
+    """Read a .nandrad file once per process, injecting the IBK namespace for parsing."""
+    path = os.path.join(nandrad_dir, name)
     with open(path, "r", encoding="utf-8") as f:
         text = f.read()
     # Inject xmlns:IBK on root element so ET can parse IBK: prefixed tags
-    text = text.replace(
+    return text.replace(
         '<NandradProject fileVersion="2.0">',
         f'<NandradProject fileVersion="2.0" xmlns:IBK="{IBK_NS}">'
     )
-    return ET.ElementTree(ET.fromstring(text))
 
 
-def deep_copy_tree(tree):
-    """Return an independent deep copy of an ElementTree."""
-    root_copy = copy.deepcopy(tree.getroot())
-    return ET.ElementTree(root_copy)
+def load_template(name, nandrad_dir=NANDRAD_DIR):
+    """Parse a .nandrad XML file into a fresh ElementTree."""
+    return ET.ElementTree(ET.fromstring(_template_text(nandrad_dir, name)))
 
 
-def write_tree(tree, case_name):
-    """Write tree to data/nandrad/Case{case_name}_v1.nandrad.
+def render(root):
+    """Serialize a project to the bytes of a .nandrad file.
 
     Strips the injected xmlns:IBK declaration from output so the file
     matches the original NANDRAD format.
     """
-    path = os.path.join(NANDRAD_DIR, f"Case{case_name}_v1.nandrad")
-    raw = ET.tostring(tree.getroot(), encoding="unicode", xml_declaration=False)
+    raw = ET.tostring(root, encoding="unicode", xml_declaration=False)
     # Remove the injected namespace declaration
     raw = raw.replace(f' xmlns:IBK="{IBK_NS}"', '')
-    # Write with XML declaration
-    with open(path, "w", encoding="utf-8") as f:
-        f.write('<?xml version="1.0" encoding="UTF-8" ?>\n')
-        f.write(raw)
-        f.write('\n')
-    print(f"  Written: {path}")
+    return ('<?xml version="1.0" encoding="UTF-8" ?>\n' + raw + '\n').encode("utf-8")
+
+
+def write_if_changed(path, data):
+    """Write data to path unless the file already has exactly these bytes.
+
+    Returns True if the file was written.
+    """
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    with open(path, "wb") as f:
+        f.write(data)
+    return True
 
 
 # ---------------------------------------------------------------------------
-# Modification helpers
+# Element index and patches
 # ---------------------------------------------------------------------------
 
-def find_project(root):
-    return root.find("Project")
+class ElementIndex:
+    """Lookup tables over the Project subtree of a parsed template.
+
+    Selectors (see select()):
+        "Zone"                          all elements with this tag
+        "ConstructionType#3"            elements with tag and id attribute
+        "@RadiationLoadFractionFloor"   IBK:Parameter elements by name
+        "WindowGlazingSystem@SHGCHemis" IBK:Parameter by name, direct child of tag
+        "<head>/<path>"                 ElementTree path relative to each head match
+        "*"                             every element (document order)
+    """
 
+    def __init__(self, root):
+        self.by_tag = defaultdict(list)
+        self.by_id = defaultdict(list)
+        self.params = defaultdict(list)
+        self.parent = {}
+        self.elements = []
+        self.add(root.find("Project"), None)
+
+    def add(self, elem, parent):
+        """Register elem and its subtree (document order)."""
+        stack = [(elem, parent)]
+        while stack:
+            e, p = stack.pop()
+            self.parent[e] = p
+            self.elements.append(e)
+            self.by_tag[e.tag].append(e)
+            if "id" in e.attrib:
+                self.by_id[(e.tag, e.get("id"))].append(e)
+            if e.tag == _ibk("Parameter"):
+                name = e.get("name", "")
+                self.params[("*", name)].append(e)
+                if p is not None:
+                    self.params[(p.tag, name)].append(e)
+            stack.extend((c, e) for c in reversed(e))
+
+    def remove(self, elem):
+        """Detach elem from its parent and drop its subtree from the tables."""
+        self.parent[elem].remove(elem)
+        gone = set(elem.iter())
+        self.elements = [e for e in self.elements if e not in gone]
+        for table in (self.by_tag, self.by_id, self.params):
+            for key, elems in table.items():
+                table[key] = [e for e in elems if e not in gone]
+
+    def select(self, selector):
+        head, _, path = selector.partition("/")
+        if head == "*":
+            elems = self.elements
+        elif "@" in head:
+            owner, name = head.split("@", 1)
+            elems = self.params[(owner or "*", name)]
+        elif "#" in head:
+            elems = self.by_id[tuple(head.split("#", 1))]
+        else:
+            elems = self.by_tag[_ibk(head[4:]) if head.startswith("IBK:") else head]
+        if path:
+            return [sub for e in elems for sub in e.findall(path)]
+        return list(elems)
+
+
+@dataclass(frozen=True)
+class Patch:
+    """One edit of a template.
+
+    op:
+        set_attr      args (attr, value)
+        sub_attr      args (attr, regex, replacement)
+        replace_attr  args (attr, old, new)
+        set_text      args (value,) or (value, only_if_text_contains)
+        sub_text      args (regex, replacement)
+        remove        args () or (attr, substrings): remove matches (whose attr contains one)
+        append        args (element,): append a copy to the first match
+        ensure        args (element,): like append, unless a child with same tag and id exists
+        rename        args (olds, new): replace substrings in all attributes and texts
+    """
+    op: str
+    selector: str
+    args: tuple = ()
+
+
+def apply_patches(root, patches):
+    """Apply patches in order to a parsed project (modified in place)."""
+    index = ElementIndex(root)
+    for patch in patches:
+        op, args = patch.op, patch.args
+        elems = index.select(patch.selector)
+        if op == "set_attr":
+            for e in elems:
+                e.set(args[0], args[1])
+        elif op == "sub_attr":
+            for e in elems:
+                e.set(args[0], re.sub(args[1], args[2], e.get(args[0], "")))
+        elif op == "replace_attr":
+            for e in elems:
+                e.set(args[0], e.get(args[0], "").replace(args[1], args[2]))
+        elif op == "set_text":
+            for e in elems:
+                if len(args) < 2 or args[1] in (e.text or ""):
+                    e.text = args[0]
+        elif op == "sub_text":
+            for e in elems:
+                e.text = re.sub(args[0], args[1], e.text or "")
+        elif op == "remove":
+            for e in elems:
+                if not args or any(s in e.get(args[0], "") for s in args[1]):
+                    index.remove(e)
+        elif op in ("append", "ensure"):
+            if not elems:
+                continue
+            parent, new = elems[0], args[0]
+            if op == "ensure" and any(c.tag == new.tag and c.get("id") == new.get("id") for c in parent):
+                continue
+            new = copy.deepcopy(new)
+            parent.append(new)
+            index.add(new, parent)
+        elif op == "rename":
+            olds, new_name = args
+            for e in elems:
+                # Check attributes
+                for attr_name, attr_val in list(e.attrib.items()):
+                    for old in olds:
+                        if old in attr_val:
+                            e.set(attr_name, attr_val.replace(old, new_name))
+                # Check text
+                if e.text:
+                    for old in olds:
+                        if old in e.text:
+                            e.text = e.text.replace(old, new_name)
+        else:
+            raise ValueError(f"Unknown patch op '{op}'")
+    return root
 
-def update_zone_display_name(root, case_label):
+
+# ---------------------------------------------------------------------------
+# Modification helpers (each returns a patch list)
+# ---------------------------------------------------------------------------
+
+def update_zone_display_name(case_label):
     """Update the Zone displayName to include the case label."""
-    project = find_project(root)
-    for zone in project.iter("Zone"):
-        old = zone.get("displayName", "")
-        # Replace "Case XXX..." pattern
-        new = re.sub(r"Case \d+[\w ]*\.", f"Case {case_label}.", old)
-        zone.set("displayName", new)
+    # Replace "Case XXX..." pattern
+    return [Patch("sub_attr", "Zone", ("displayName", r"Case \d+[\w ]*\.", f"Case {case_label}."))]
 
 
-def update_comment(root, case_label):
+def update_comment(case_label):
     """Update ProjectInfo Comment to reference the case."""
-    project = find_project(root)
-    pi = project.find("ProjectInfo")
-    if pi is not None:
-        comment = pi.find("Comment")
-        if comment is not None:
-            old = comment.text or ""
-            new = re.sub(r"Case\d+", f"Case{case_label.replace(' ', '')}", old)
-            comment.text = new
+    return [Patch("sub_text", "ProjectInfo/Comment", (r"Case\d+", f"Case{case_label.replace(' ', '')}"))]
 
 
-def replace_glazing(root, u_value, shgc_hemis, shgc_angles, shgc_values, display_name):
+def replace_glazing(u_value, shgc_hemis, shgc_angles, shgc_values, display_name):
     """Replace the WindowGlazingSystem properties."""
-    project = find_project(root)
-    for wgs in project.iter("WindowGlazingSystem"):
-        wgs.set("displayName", display_name)
-        for child in list(wgs):
-            if child.tag == _ibk("Parameter"):
-                name = child.get("name", "")
-                if name == "ThermalTransmittance":
-                    child.text = str(u_value)
-                elif name == "SHGCHemis":
-                    child.text = str(shgc_hemis)
-            elif child.tag == "LinearSplineParameter":
-                for sub in child:
-                    if sub.tag == "X":
-                        sub.text = shgc_angles
-                    elif sub.tag == "Y":
-                        sub.text = shgc_values
-
-
-def update_solar_distribution(root, floor, ceiling, walls):
+    return [
+        Patch("set_attr", "WindowGlazingSystem", ("displayName", display_name)),
+        Patch("set_text", "WindowGlazingSystem@ThermalTransmittance", (str(u_value),)),
+        Patch("set_text", "WindowGlazingSystem@SHGCHemis", (str(shgc_hemis),)),
+        Patch("set_text", "WindowGlazingSystem/LinearSplineParameter/X", (shgc_angles,)),
+        Patch("set_text", "WindowGlazingSystem/LinearSplineParameter/Y", (shgc_values,)),
+    ]
+
+
+def update_solar_distribution(floor, ceiling, walls):
     """Update SolarLoadsDistributionModel fractions.
 
     The 'lost' fraction goes to RadiationLoadFractionZone (zone air node).
     """
-    project = find_project(root)
     zone_frac = round(100.0 - floor - ceiling - walls, 1)
-    for child in project.iter(_ibk("Parameter")):
-        name = child.get("name", "")
-        if name == "RadiationLoadFractionFloor":
-            child.text = str(floor)
-        elif name == "RadiationLoadFractionCeiling":
-            child.text = str(ceiling)
-        elif name == "RadiationLoadFractionWalls":
-            child.text = str(walls)
-        elif name == "RadiationLoadFractionZone":
-            child.text = str(zone_frac)
-
-
-def set_thermostat_2020(root):
+    return [
+        Patch("set_text", "@RadiationLoadFractionFloor", (str(floor),)),
+        Patch("set_text", "@RadiationLoadFractionCeiling", (str(ceiling),)),
+        Patch("set_text", "@RadiationLoadFractionWalls", (str(walls),)),
+        Patch("set_text", "@RadiationLoadFractionZone", (str(zone_frac),)),
+    ]
+
+
+def set_thermostat(heating, cooling):
+    """Set constant heating/cooling set points [C] in the thermostat schedule."""
+    return [Patch("set_text", "DailyCycle/Values",
+                  (f"CoolingSetpointSchedule [C]:{cooling:g};HeatingSetpointSchedule [C]:{heating:g};",
+                   "CoolingSetpointSchedule"))]
+
+
+def set_thermostat_2020():
     """Change thermostat schedule from 20,27 deadband to 20,20."""
-    project = find_project(root)
-    for dc in project.iter("DailyCycle"):
-        values_elem = dc.find("Values")
-        if values_elem is not None and "CoolingSetpointSchedule" in (values_elem.text or ""):
-            values_elem.text = "CoolingSetpointSchedule [C]:20;HeatingSetpointSchedule [C]:20;"
+    return set_thermostat(heating=20, cooling=20)
 
 
-def remove_hvac(root, case_suffix):
+def remove_hvac(case_suffix):
     """Remove Thermostats and IdealHeatingCoolingModels + related schedules/objectlists."""
-    project = find_project(root)
-    models = project.find("Models")
-    if models is not None:
-        for tag in ("Thermostats", "IdealHeatingCoolingModels"):
-            elem = models.find(tag)
-            if elem is not None:
-                models.remove(elem)
-
-    # Remove thermostat and idealheatcool schedule groups
-    schedules = project.find("Schedules")
-    if schedules is not None:
-        sg = schedules.find("ScheduleGroups")
-        if sg is not None:
-            to_remove = []
-            for group in sg.findall("ScheduleGroup"):
-                ol = group.get("objectList", "")
-                if "Thermostat" in ol:
-                    to_remove.append(group)
-            for g in to_remove:
-                sg.remove(g)
-
-    # Remove thermostat and idealheatcool object lists
-    ol_section = project.find("ObjectLists")
-    if ol_section is not None:
-        to_remove = []
-        for ol in ol_section.findall("ObjectList"):
-            name = ol.get("name", "")
-            if "Thermostat" in name or "IdealHeatCool" in name:
-                to_remove.append(ol)
-        for o in to_remove:
-            ol_section.remove(o)
-
-    # Rename remaining object list references with FF suffix
-    _rename_testfall_suffix(root, case_suffix)
-
-
-def _rename_testfall_suffix(root, case_suffix):
+    return [
+        Patch("remove", "Project/Models/Thermostats"),
+        Patch("remove", "Project/Models/IdealHeatingCoolingModels"),
+        # Remove thermostat and idealheatcool schedule groups
+        Patch("remove", "Project/Schedules/ScheduleGroups/ScheduleGroup", ("objectList", ("Thermostat",))),
+        # Remove thermostat and idealheatcool object lists
+        Patch("remove", "Project/ObjectLists/ObjectList", ("name", ("Thermostat", "IdealHeatCool"))),
+        # Rename remaining object list references with FF suffix
+        *_rename_testfall_suffix(case_suffix),
+    ]
+
+
+def _rename_testfall_suffix(case_suffix):
     """Rename 'Testfall 600' -> 'Testfall {case_suffix}' in schedules, models, object lists."""
-    project = find_project(root)
-    # Walk all elements and update text/attributes containing the old pattern
-    old_patterns = ["Testfall 600", "Testfall 900"]
-    new_name = f"Testfall {case_suffix}"
-    for elem in project.iter():
-        # Check attributes
-        for attr_name, attr_val in list(elem.attrib.items()):
-            for old in old_patterns:
-                if old in attr_val:
-                    elem.set(attr_name, attr_val.replace(old, new_name))
-        # Check text
-        if elem.text:
-            for old in old_patterns:
-                if old in elem.text:
-                    elem.text = elem.text.replace(old, new_name)
-
-
-def update_wall_insulation_low_mass(root, thickness, mat_id):
+    return [Patch("rename", "*", (("Testfall 600", "Testfall 900"), f"Testfall {case_suffix}"))]
+
+
+def update_wall_insulation_low_mass(thickness, mat_id):
     """Update the wall ConstructionType (id=3) middle layer for low-mass cases.
 
     In Case600, wall is: Plasterboard(0.012) / Fiberglass(0.066, matId=1010002) / WoodSiding(0.009)
     For Case680: replace fiberglass with foam insulation (different thickness and matId).
     """
-    project = find_project(root)
-    for ct in project.iter("ConstructionType"):
-        if ct.get("id") == "3":
-            ct.set("displayName", "Low-Mass Case: Exterior Wall (increased insulation)")
-            ml = ct.find("MaterialLayers")
-            if ml is not None:
-                layers = ml.findall("MaterialLayer")
-                if len(layers) >= 2:
-                    # Middle layer (index 1) is the insulation
-                    layers[1].set("thickness", str(thickness))
-                    layers[1].set("matId", str(mat_id))
-
-
-def update_roof_insulation(root, thickness):
+    # Middle layer (index 1) is the insulation
+    layer = "ConstructionType#3/MaterialLayers/MaterialLayer[2]"
+    return [
+        Patch("set_attr", "ConstructionType#3", ("displayName", "Low-Mass Case: Exterior Wall (increased insulation)")),
+        Patch("set_attr", layer, ("thickness", str(thickness))),
+        Patch("set_attr", layer, ("matId", str(mat_id))),
+    ]
+
+
+def update_roof_insulation(thickness):
     """Update the roof ConstructionType (id=2) fiberglass layer thickness."""
-    project = find_project(root)
-    for ct in project.iter("ConstructionType"):
-        if ct.get("id") == "2":
-            ct.set("displayName", ct.get("displayName", "").replace("Roof", "Roof (increased insulation)"))
-            ml = ct.find("MaterialLayers")
-            if ml is not None:
-                layers = ml.findall("MaterialLayer")
-                if len(layers) >= 2:
-                    # Middle layer (index 1) is the fiberglass
-                    layers[1].set("thickness", str(thickness))
-
-
-def add_foam_material(root):
+    return [
+        Patch("replace_attr", "ConstructionType#2", ("displayName", "Roof", "Roof (increased insulation)")),
+        # Middle layer (index 1) is the fiberglass
+        Patch("set_attr", "ConstructionType#2/MaterialLayers/MaterialLayer[2]", ("thickness", str(thickness))),
+    ]
+
+
+def add_foam_material():
     """Add Foam Insulation material (id=1010008) if not already present."""
-    project = find_project(root)
-    materials = project.find("Materials")
-    if materials is None:
-        return
-    # Check if already present
-    for mat in materials.findall("Material"):
-        if mat.get("id") == "1010008":
-            return
-    # Add it
-    foam = ET.SubElement(materials, "Material")
-    foam.set("id", "1010008")
-    foam.set("displayName", "Foam Insulation")
-    _add_ibk_param(foam, "Density", "kg/m3", "10")
-    _add_ibk_param(foam, "HeatCapacity", "J/kgK", "1400")
-    _add_ibk_param(foam, "Conductivity", "W/mK", "0.04")
+    return [Patch("ensure", "Project/Materials", (_material("1010008", "Foam Insulation", "10", "1400", "0.04"),))]
 
 
 def _add_ibk_param(parent, name, unit, value):
@@ -257,30 +332,25 @@ def _add_ibk_param(parent, name, unit, value):
     p.text = value
 
 
-def update_wall_insulation_high_mass(root, thickness):
+def update_wall_insulation_high_mass(thickness):
     """Update the wall ConstructionType (id=3) foam insulation layer for high-mass cases.
 
     In Case900, wall is: ConcreteBlock(0.1) / FoamInsulation(0.0615, matId=1010008) / WoodSiding(0.009)
     For Case980: increase foam insulation thickness to 0.2452m.
     """
-    project = find_project(root)
-    for ct in project.iter("ConstructionType"):
-        if ct.get("id") == "3":
-            ct.set("displayName", "High-Mass Case: Exterior Wall (increased insulation)")
-            ml = ct.find("MaterialLayers")
-            if ml is not None:
-                layers = ml.findall("MaterialLayer")
-                if len(layers) >= 2:
-                    # Middle layer (index 1) is the foam insulation
-                    layers[1].set("thickness", str(thickness))
+    return [
+        Patch("set_attr", "ConstructionType#3", ("displayName", "High-Mass Case: Exterior Wall (increased insulation)")),
+        # Middle layer (index 1) is the foam insulation
+        Patch("set_attr", "ConstructionType#3/MaterialLayers/MaterialLayer[2]", ("thickness", str(thickness))),
+    ]
 
 
 # ---------------------------------------------------------------------------
 # Case 960 — Two-zone sunspace (special handling)
 # ---------------------------------------------------------------------------
 
-def generate_case960(tree600, tree900):
-    """Generate Case 960 — two-zone sunspace.
+def case960_patches():
+    """Patches turning Case 600 into Case 960 — two-zone sunspace.
 
     Back zone: lightweight (Case 600 construction), no south windows,
                heated/cooled with 20,27 thermostat, 200W internal gains.
@@ -288,166 +358,110 @@ def generate_case960(tree600, tree900):
                free-floating, 0W internal gains.
     Common wall: 0.20m concrete block between zones.
     """
-    tree = deep_copy_tree(tree600)
-    root = tree.getroot()
-    project = find_project(root)
-
-    # --- Zone setup ---
-    zones = project.find("Zones")
-    # Update existing zone (id=3) as back zone
-    for zone in zones.findall("Zone"):
-        zone.set("displayName", "Case 960.Back Zone(ID=3)")
-        # Back zone: 8x6x2.7
-        for p in zone.findall(_ibk("Parameter")):
-            if p.get("name") == "Area":
-                p.text = "48"
-            elif p.get("name") == "Volume":
-                p.text = "129.6"
+    patches = [
+        # --- Zone setup ---
+        # Update existing zone (id=3) as back zone, 8x6x2.7
+        Patch("set_attr", "Project/Zones/Zone", ("displayName", "Case 960.Back Zone(ID=3)")),
+        Patch("set_text", "Zone@Area", ("48",)),
+        Patch("set_text", "Zone@Volume", ("129.6",)),
+    ]
 
     # Add sun zone (id=4)
-    sun_zone = ET.SubElement(zones, "Zone")
+    sun_zone = ET.Element("Zone")
     sun_zone.set("id", "4")
     sun_zone.set("displayName", "Case 960.Sun Zone(ID=4)")
     sun_zone.set("type", "Active")
     _add_ibk_param(sun_zone, "Area", "m2", "16")
     _add_ibk_param(sun_zone, "Volume", "m3", "43.2")
+    patches.append(Patch("append", "Project/Zones", (sun_zone,)))
 
     # --- Construction Instances ---
-    ci_section = project.find("ConstructionInstances")
-
-    # Remove existing south wall and window surfaces (ids 7, 9, 11) from back zone
+    # Remove existing south wall (id=7) and window surfaces (id=9,11) from back zone
     # Back zone loses its south-facing windows — replaced by common wall
-    to_remove = []
-    for ci in ci_section.findall("ConstructionInstance"):
-        cid = ci.get("id")
-        # Remove south wall (id=7) and window surfaces (id=9,11)
-        if cid in ("7", "9", "11"):
-            to_remove.append(ci)
-    for ci in to_remove:
-        ci_section.remove(ci)
-
-    # Add common wall between back zone and sun zone (id=20)
-    common_wall = _make_construction_instance(
-        ci_id="20", display_name="Common Wall Back-Sun (ID=20)",
-        ct_id="4", orientation="180", inclination="90",
-        area="21.6",  # 8m x 2.7m
-        interface_a_zone="3", interface_a_usage="Wall",
-        interface_a_htc="1.8",
-        interface_b_zone="4", interface_b_usage="Wall",
-        interface_b_htc="1.8",
-        interior=True  # Both sides are interior
-    )
-    ci_section.append(common_wall)
-
-    # Add sun zone surfaces
-    # Sun zone floor (id=30)
-    sun_floor = _make_exterior_ci(
-        ci_id="30", display_name="Sun Zone Floor (ID=30)",
-        ct_id="5", orientation="270", inclination="180", area="16",
-        interface_a_zone="4", interface_a_usage="Floor", interface_a_htc="3.7",
-        interface_b_htc="5.2", solar_abs="0.6"
-    )
-    ci_section.append(sun_floor)
-
-    # Sun zone ceiling (id=31)
-    sun_ceiling = _make_exterior_ci(
-        ci_id="31", display_name="Sun Zone Ceiling (ID=31)",
-        ct_id="2", orientation="90", inclination="0", area="16",
-        interface_a_zone="4", interface_a_usage="Ceiling", interface_a_htc="1.7",
-        interface_b_htc="21.8", solar_abs="0.6", ext_solar_abs="0.6"
-    )
-    ci_section.append(sun_ceiling)
-
-    # Sun zone east wall (id=32)
-    sun_east = _make_exterior_ci(
-        ci_id="32", display_name="Sun Zone Wall East (ID=32)",
-        ct_id="6", orientation="90", inclination="90", area="5.4",
-        interface_a_zone="4", interface_a_usage="Wall", interface_a_htc="1.8",
-        interface_b_htc="21.6", solar_abs="0.6", ext_solar_abs="0.6"
-    )
-    ci_section.append(sun_east)
-
-    # Sun zone west wall (id=33)
-    sun_west = _make_exterior_ci(
-        ci_id="33", display_name="Sun Zone Wall West (ID=33)",
-        ct_id="6", orientation="270", inclination="90", area="5.4",
-        interface_a_zone="4", interface_a_usage="Wall", interface_a_htc="1.8",
-        interface_b_htc="21.6", solar_abs="0.6", ext_solar_abs="0.6"
-    )
-    ci_section.append(sun_west)
-
-    # Sun zone south wall + windows (id=34, 35)
-    sun_south_left = _make_exterior_ci_with_window(
-        ci_id="34", display_name="Sun Zone Surface south left (ID=34)",
-        ct_id="6", orientation="180", inclination="90", area="6",
-        interface_a_zone="4", interface_a_htc="4.5",
-        interface_b_htc="17.8",
-        win_id="40", win_display="Sun Zone Window left (ID=40)",
-        win_area="5.99", glazing_id="1040003"
-    )
-    ci_section.append(sun_south_left)
-
-    sun_south_right = _make_exterior_ci_with_window(
-        ci_id="35", display_name="Sun Zone Surface south right (ID=35)",
-        ct_id="6", orientation="180", inclination="90", area="6",
-        interface_a_zone="4", interface_a_htc="4.5",
-        interface_b_htc="17.8",
-        win_id="41", win_display="Sun Zone Window right (ID=41)",
-        win_area="5.99", glazing_id="1040003"
-    )
-    ci_section.append(sun_south_right)
+    patches += [Patch("remove", f"ConstructionInstance#{cid}") for cid in ("7", "9", "11")]
+
+    instances = [
+        # Add common wall between back zone and sun zone (id=20)
+        _make_construction_instance(
+            ci_id="20", display_name="Common Wall Back-Sun (ID=20)",
+            ct_id="4", orientation="180", inclination="90",
+            area="21.6",  # 8m x 2.7m
+            interface_a_zone="3", interface_a_usage="Wall",
+            interface_a_htc="1.8",
+            interface_b_zone="4", interface_b_usage="Wall",
+            interface_b_htc="1.8",
+            interior=True  # Both sides are interior
+        ),
+        # Sun zone floor (id=30)
+        _make_exterior_ci(
+            ci_id="30", display_name="Sun Zone Floor (ID=30)",
+            ct_id="5", orientation="270", inclination="180", area="16",
+            interface_a_zone="4", interface_a_usage="Floor", interface_a_htc="3.7",
+            interface_b_htc="5.2", solar_abs="0.6"
+        ),
+        # Sun zone ceiling (id=31)
+        _make_exterior_ci(
+            ci_id="31", display_name="Sun Zone Ceiling (ID=31)",
+            ct_id="2", orientation="90", inclination="0", area="16",
+            interface_a_zone="4", interface_a_usage="Ceiling", interface_a_htc="1.7",
+            interface_b_htc="21.8", solar_abs="0.6", ext_solar_abs="0.6"
+        ),
+        # Sun zone east wall (id=32)
+        _make_exterior_ci(
+            ci_id="32", display_name="Sun Zone Wall East (ID=32)",
+            ct_id="6", orientation="90", inclination="90", area="5.4",
+            interface_a_zone="4", interface_a_usage="Wall", interface_a_htc="1.8",
+            interface_b_htc="21.6", solar_abs="0.6", ext_solar_abs="0.6"
+        ),
+        # Sun zone west wall (id=33)
+        _make_exterior_ci(
+            ci_id="33", display_name="Sun Zone Wall West (ID=33)",
+            ct_id="6", orientation="270", inclination="90", area="5.4",
+            interface_a_zone="4", interface_a_usage="Wall", interface_a_htc="1.8",
+            interface_b_htc="21.6", solar_abs="0.6", ext_solar_abs="0.6"
+        ),
+        # Sun zone south wall + windows (id=34, 35)
+        _make_exterior_ci_with_window(
+            ci_id="34", display_name="Sun Zone Surface south left (ID=34)",
+            ct_id="6", orientation="180", inclination="90", area="6",
+            interface_a_zone="4", interface_a_htc="4.5",
+            interface_b_htc="17.8",
+            win_id="40", win_display="Sun Zone Window left (ID=40)",
+            win_area="5.99", glazing_id="1040003"
+        ),
+        _make_exterior_ci_with_window(
+            ci_id="35", display_name="Sun Zone Surface south right (ID=35)",
+            ct_id="6", orientation="180", inclination="90", area="6",
+            interface_a_zone="4", interface_a_htc="4.5",
+            interface_b_htc="17.8",
+            win_id="41", win_display="Sun Zone Window right (ID=41)",
+            win_area="5.99", glazing_id="1040003"
+        ),
+    ]
+    patches += [Patch("append", "Project/ConstructionInstances", (ci,)) for ci in instances]
 
     # --- Construction Types ---
-    ct_section = project.find("ConstructionTypes")
-
-    # Add common wall construction type (id=4): single concrete block layer
-    ct_common = ET.SubElement(ct_section, "ConstructionType")
-    ct_common.set("id", "4")
-    ct_common.set("displayName", "Common Wall: Concrete Block")
-    ml = ET.SubElement(ct_common, "MaterialLayers")
-    layer = ET.SubElement(ml, "MaterialLayer")
-    layer.set("thickness", "0.20")
-    layer.set("matId", "1010007")
-
-    # Add high-mass floor construction type (id=5) from Case 900
-    ct_floor = ET.SubElement(ct_section, "ConstructionType")
-    ct_floor.set("id", "5")
-    ct_floor.set("displayName", "High-Mass Case: Raised Floor")
-    ml2 = ET.SubElement(ct_floor, "MaterialLayers")
-    layer1 = ET.SubElement(ml2, "MaterialLayer")
-    layer1.set("thickness", "0.08")
-    layer1.set("matId", "1010009")
-    layer2 = ET.SubElement(ml2, "MaterialLayer")
-    layer2.set("thickness", "1.007")
-    layer2.set("matId", "1010005")
-
-    # Add high-mass exterior wall construction type (id=6) from Case 900
-    ct_hmwall = ET.SubElement(ct_section, "ConstructionType")
-    ct_hmwall.set("id", "6")
-    ct_hmwall.set("displayName", "High-Mass Case: Exterior Wall")
-    ml3 = ET.SubElement(ct_hmwall, "MaterialLayers")
-    layer_a = ET.SubElement(ml3, "MaterialLayer")
-    layer_a.set("thickness", "0.1")
-    layer_a.set("matId", "1010007")
-    layer_b = ET.SubElement(ml3, "MaterialLayer")
-    layer_b.set("thickness", "0.0615")
-    layer_b.set("matId", "1010008")
-    layer_c = ET.SubElement(ml3, "MaterialLayer")
-    layer_c.set("thickness", "0.009")
-    layer_c.set("matId", "1010003")
+    construction_types = [
+        # Common wall construction type (id=4): single concrete block layer
+        _construction_type("4", "Common Wall: Concrete Block", [("0.20", "1010007")]),
+        # High-mass floor construction type (id=5) from Case 900
+        _construction_type("5", "High-Mass Case: Raised Floor", [("0.08", "1010009"), ("1.007", "1010005")]),
+        # High-mass exterior wall construction type (id=6) from Case 900
+        _construction_type("6", "High-Mass Case: Exterior Wall",
+                           [("0.1", "1010007"), ("0.0615", "1010008"), ("0.009", "1010003")]),
+    ]
+    patches += [Patch("append", "Project/ConstructionTypes", (ct,)) for ct in construction_types]
 
     # --- Materials: add high-mass materials not in Case 600 ---
-    materials = project.find("Materials")
-    _ensure_material(materials, "1010007", "Concrete Block", "1400", "1000", "0.51")
-    _ensure_material(materials, "1010008", "Foam Insulation", "10", "1400", "0.04")
-    _ensure_material(materials, "1010009", "Concrete Slab", "1400", "1000", "1.13")
+    patches += [
+        Patch("ensure", "Project/Materials", (_material("1010007", "Concrete Block", "1400", "1000", "0.51"),)),
+        Patch("ensure", "Project/Materials", (_material("1010008", "Foam Insulation", "10", "1400", "0.04"),)),
+        Patch("ensure", "Project/Materials", (_material("1010009", "Concrete Slab", "1400", "1000", "1.13"),)),
+    ]
 
     # --- Schedules: add sun zone internal loads (0W) + ventilation ---
-    schedules = project.find("Schedules")
-    sg = schedules.find("ScheduleGroups")
-
     # Sun zone internal loads schedule (0W)
-    sun_il_group = ET.SubElement(sg, "ScheduleGroup")
+    sun_il_group = ET.Element("ScheduleGroup")
     sun_il_group.set("objectList", "InternalLoads-Testfall 960SZ")
     sun_sched = ET.SubElement(sun_il_group, "Schedule")
     sun_sched.set("type", "AllDays")
@@ -460,15 +474,16 @@ def generate_case960(tree600, tree900):
     ET.SubElement(dc, "Values").text = "EquipmentHeatLoadPerAreaSchedule [W/m2]:0;LightingHeatLoadPerAreaSchedule [W/m2]:0;PersonHeatLoadPerAreaSchedule [W/m2]:0;"
 
     # Sun zone ventilation schedule (empty)
-    sun_vent_group = ET.SubElement(sg, "ScheduleGroup")
+    sun_vent_group = ET.Element("ScheduleGroup")
     sun_vent_group.set("objectList", "Ventilation-Testfall 960SZ")
+    patches += [
+        Patch("append", "Project/Schedules/ScheduleGroups", (sun_il_group,)),
+        Patch("append", "Project/Schedules/ScheduleGroups", (sun_vent_group,)),
+    ]
 
     # --- Models ---
-    models = project.find("Models")
-
     # Add ventilation model for sun zone
-    vent_models = models.find("NaturalVentilationModels")
-    sun_vent = ET.SubElement(vent_models, "NaturalVentilationModel")
+    sun_vent = ET.Element("NaturalVentilationModel")
     sun_vent.set("id", "5")
     sun_vent.set("displayName", "Testfall 960SZ")
     sun_vent.set("modelType", "Constant")
@@ -476,8 +491,7 @@ def generate_case960(tree600, tree900):
     _add_ibk_param(sun_vent, "VentilationRate", "1/h", "0.414")
 
     # Add internal loads model for sun zone
-    il_models = models.find("InternalLoadsModels")
-    sun_il = ET.SubElement(il_models, "InternalLoadsModel")
+    sun_il = ET.Element("InternalLoadsModel")
     sun_il.set("id", "2")
     sun_il.set("displayName", "Testfall 960SZ")
     sun_il.set("modelType", "Scheduled")
@@ -485,46 +499,60 @@ def generate_case960(tree600, tree900):
     _add_ibk_param(sun_il, "EquipmentRadiationFraction", "---", "0.6")
     _add_ibk_param(sun_il, "PersonRadiationFraction", "---", "0")
     _add_ibk_param(sun_il, "LightingRadiationFraction", "---", "0")
+    patches += [
+        Patch("append", "Project/Models/NaturalVentilationModels", (sun_vent,)),
+        Patch("append", "Project/Models/InternalLoadsModels", (sun_il,)),
+    ]
 
     # --- Object Lists: add sun zone object lists ---
-    ol_section = project.find("ObjectLists")
-
-    _add_object_list(ol_section, "InternalLoads-Testfall 960SZ", "4", "Zone")
-    _add_object_list(ol_section, "Ventilation-Testfall 960SZ", "4", "Zone")
+    patches += [
+        Patch("append", "Project/ObjectLists", (_object_list("InternalLoads-Testfall 960SZ", "4", "Zone"),)),
+        Patch("append", "Project/ObjectLists", (_object_list("Ventilation-Testfall 960SZ", "4", "Zone"),)),
+    ]
 
-    # Update existing back zone object lists to filter only zone 3
-    # (Thermostat and IdealHeatCool should only apply to back zone)
-    # They already filter on id=3, so no change needed.
+    # Existing back zone object lists (Thermostat, IdealHeatCool) already
+    # filter on zone id=3, so no change needed.
 
     # Update zone display name
-    update_zone_display_name(root, "960")
+    patches += update_zone_display_name("960")
 
     # Solar distribution: use back zone defaults (same as Case 600)
     # Sun zone has different distribution but SurfaceTypeFactor model
     # applies globally — we keep the back zone values since it's the
     # primary controlled zone.
 
-    return tree
+    return patches
 
 
-def _ensure_material(materials, mid, name, density, cp, conductivity):
-    """Add material if not already present."""
-    for mat in materials.findall("Material"):
-        if mat.get("id") == mid:
-            return
-    m = ET.SubElement(materials, "Material")
+def _material(mid, name, density, cp, conductivity):
+    m = ET.Element("Material")
     m.set("id", mid)
     m.set("displayName", name)
     _add_ibk_param(m, "Density", "kg/m3", density)
     _add_ibk_param(m, "HeatCapacity", "J/kgK", cp)
     _add_ibk_param(m, "Conductivity", "W/mK", conductivity)
+    return m
+
+
+def _construction_type(ct_id, display_name, layers):
+    """Create a ConstructionType element from [(thickness, matId), ...]."""
+    ct = ET.Element("ConstructionType")
+    ct.set("id", ct_id)
+    ct.set("displayName", display_name)
+    ml = ET.SubElement(ct, "MaterialLayers")
+    for thickness, mat_id in layers:
+        layer = ET.SubElement(ml, "MaterialLayer")
+        layer.set("thickness", thickness)
+        layer.set("matId", mat_id)
+    return ct
 
 
-def _add_object_list(ol_section, name, filter_id, ref_type):
-    ol = ET.SubElement(ol_section, "ObjectList")
+def _object_list(name, filter_id, ref_type):
+    ol = ET.Element("ObjectList")
     ol.set("name", name)
     ET.SubElement(ol, "FilterID").text = filter_id
     ET.SubElement(ol, "ReferenceType").text = ref_type
+    return ol
 
 
 def _make_construction_instance(ci_id, display_name, ct_id, orientation, inclination,
@@ -628,137 +656,157 @@ def _make_exterior_ci_with_window(ci_id, display_name, ct_id, orientation, incli
 
 
 # ---------------------------------------------------------------------------
-# Main generation
+# Case definitions
 # ---------------------------------------------------------------------------
 
-def main():
-    print("Loading templates...")
-    tree600 = load_template("Case600_v1.nandrad")
-    tree900 = load_template("Case900_v1.nandrad")
+LOW_E_ARGON_GLAZING = dict(
+    u_value=1.19, shgc_hemis=0.377,
+    shgc_angles="0 10 20 30 40 50 60 70 80 90 ",
+    shgc_values="0.440 0.443 0.438 0.432 0.422 0.403 0.361 0.278 0.148 0 ",
+)
+SINGLE_PANE_GLAZING = dict(
+    u_value=5.16, shgc_hemis=0.787,
+    shgc_angles="0 10 20 30 40 50 60 70 80 90 ",
+    shgc_values="0.864 0.864 0.862 0.859 0.851 0.831 0.785 0.673 0.424 0 ",
+)
 
-    # -----------------------------------------------------------------------
-    # Group A: Low-mass variants (based on Case 600)
-    # -----------------------------------------------------------------------
-    print("\n--- Group A: Low-mass variants ---")
 
-    # Case 660: Low-E Argon Windows
-    print("Generating Case 660...")
-    t = deep_copy_tree(tree600)
-    r = t.getroot()
-    update_zone_display_name(r, "660")
-    replace_glazing(r,
-        u_value=1.19, shgc_hemis=0.377,
-        shgc_angles="0 10 20 30 40 50 60 70 80 90 ",
-        shgc_values="0.440 0.443 0.438 0.432 0.422 0.403 0.361 0.278 0.148 0 ",
-        display_name="Low-E Argon Window Case 660")
-    update_solar_distribution(r, floor=64.5, ceiling=17.0, walls=15.8)
-    write_tree(t, "660")
+def _increased_insulation_low_mass():
+    return [
+        *add_foam_material(),
+        *update_wall_insulation_low_mass(thickness=0.250, mat_id=1010008),
+        *update_roof_insulation(thickness=0.400),
+    ]
 
-    # Case 670: Single-Pane Windows
-    print("Generating Case 670...")
-    t = deep_copy_tree(tree600)
-    r = t.getroot()
-    update_zone_display_name(r, "670")
-    replace_glazing(r,
-        u_value=5.16, shgc_hemis=0.787,
-        shgc_angles="0 10 20 30 40 50 60 70 80 90 ",
-        shgc_values="0.864 0.864 0.862 0.859 0.851 0.831 0.785 0.673 0.424 0 ",
-        display_name="Single-Pane Window Case 670")
-    update_solar_distribution(r, floor=64.1, ceiling=16.6, walls=15.3)
-    write_tree(t, "670")
 
-    # Case 680: Increased Insulation
-    print("Generating Case 680...")
-    t = deep_copy_tree(tree600)
-    r = t.getroot()
-    update_zone_display_name(r, "680")
-    add_foam_material(r)
-    update_wall_insulation_low_mass(r, thickness=0.250, mat_id=1010008)
-    update_roof_insulation(r, thickness=0.400)
-    write_tree(t, "680")
+def _increased_insulation_high_mass():
+    return [
+        *update_wall_insulation_high_mass(thickness=0.2452),
+        *update_roof_insulation(thickness=0.4),
+    ]
 
-    # Case 680FF: Free-Float Increased Insulation
-    print("Generating Case 680FF...")
-    t = deep_copy_tree(tree600)
-    r = t.getroot()
-    add_foam_material(r)
-    update_wall_insulation_low_mass(r, thickness=0.250, mat_id=1010008)
-    update_roof_insulation(r, thickness=0.400)
-    remove_hvac(r, "680FF")
-    update_zone_display_name(r, "680 FF")
-    write_tree(t, "680FF")
 
+# case -> (template, patch list)
+CASES = {
+    # Group A: Low-mass variants (based on Case 600)
+    # Case 660: Low-E Argon Windows
+    "660": ("Case600_v1.nandrad", [
+        *update_zone_display_name("660"),
+        *replace_glazing(**LOW_E_ARGON_GLAZING, display_name="Low-E Argon Window Case 660"),
+        *update_solar_distribution(floor=64.5, ceiling=17.0, walls=15.8),
+    ]),
+    # Case 670: Single-Pane Windows
+    "670": ("Case600_v1.nandrad", [
+        *update_zone_display_name("670"),
+        *replace_glazing(**SINGLE_PANE_GLAZING, display_name="Single-Pane Window Case 670"),
+        *update_solar_distribution(floor=64.1, ceiling=16.6, walls=15.3),
+    ]),
+    # Case 680: Increased Insulation
+    "680": ("Case600_v1.nandrad", [
+        *update_zone_display_name("680"),
+        *_increased_insulation_low_mass(),
+    ]),
+    # Case 680FF: Free-Float Increased Insulation
+    "680FF": ("Case600_v1.nandrad", [
+        *_increased_insulation_low_mass(),
+        *remove_hvac("680FF"),
+        *update_zone_display_name("680 FF"),
+    ]),
     # Case 685: 20,20 Thermostat
-    print("Generating Case 685...")
-    t = deep_copy_tree(tree600)
-    r = t.getroot()
-    update_zone_display_name(r, "685")
-    set_thermostat_2020(r)
-    write_tree(t, "685")
-
+    "685": ("Case600_v1.nandrad", [
+        *update_zone_display_name("685"),
+        *set_thermostat_2020(),
+    ]),
     # Case 695: Increased Insulation + 20,20 Thermostat
-    print("Generating Case 695...")
-    t = deep_copy_tree(tree600)
-    r = t.getroot()
-    update_zone_display_name(r, "695")
-    add_foam_material(r)
-    update_wall_insulation_low_mass(r, thickness=0.250, mat_id=1010008)
-    update_roof_insulation(r, thickness=0.400)
-    set_thermostat_2020(r)
-    write_tree(t, "695")
-
-    # -----------------------------------------------------------------------
-    # Group B: High-mass variants (based on Case 900)
-    # -----------------------------------------------------------------------
-    print("\n--- Group B: High-mass variants ---")
+    "695": ("Case600_v1.nandrad", [
+        *update_zone_display_name("695"),
+        *_increased_insulation_low_mass(),
+        *set_thermostat_2020(),
+    ]),
 
+    # Group B: High-mass variants (based on Case 900)
     # Case 980: High-Mass Increased Insulation
-    print("Generating Case 980...")
-    t = deep_copy_tree(tree900)
-    r = t.getroot()
-    update_zone_display_name(r, "980")
-    update_wall_insulation_high_mass(r, thickness=0.2452)
-    update_roof_insulation(r, thickness=0.4)
-    write_tree(t, "980")
-
+    "980": ("Case900_v1.nandrad", [
+        *update_zone_display_name("980"),
+        *_increased_insulation_high_mass(),
+    ]),
     # Case 980FF: Free-Float High-Mass Increased Insulation
-    print("Generating Case 980FF...")
-    t = deep_copy_tree(tree900)
-    r = t.getroot()
-    update_wall_insulation_high_mass(r, thickness=0.2452)
-    update_roof_insulation(r, thickness=0.4)
-    remove_hvac(r, "980FF")
-    update_zone_display_name(r, "980 FF")
-    write_tree(t, "980FF")
-
+    "980FF": ("Case900_v1.nandrad", [
+        *_increased_insulation_high_mass(),
+        *remove_hvac("980FF"),
+        *update_zone_display_name("980 FF"),
+    ]),
     # Case 985: High-Mass 20,20 Thermostat
-    print("Generating Case 985...")
-    t = deep_copy_tree(tree900)
-    r = t.getroot()
-    update_zone_display_name(r, "985")
-    set_thermostat_2020(r)
-    write_tree(t, "985")
-
+    "985": ("Case900_v1.nandrad", [
+        *update_zone_display_name("985"),
+        *set_thermostat_2020(),
+    ]),
     # Case 995: High-Mass Increased Insulation + 20,20 Thermostat
-    print("Generating Case 995...")
-    t = deep_copy_tree(tree900)
-    r = t.getroot()
-    update_zone_display_name(r, "995")
-    update_wall_insulation_high_mass(r, thickness=0.2452)
-    update_roof_insulation(r, thickness=0.4)
-    set_thermostat_2020(r)
-    write_tree(t, "995")
-
-    # -----------------------------------------------------------------------
+    "995": ("Case900_v1.nandrad", [
+        *update_zone_display_name("995"),
+        *_increased_insulation_high_mass(),
+        *set_thermostat_2020(),
+    ]),
+
     # Group C: Special case
-    # -----------------------------------------------------------------------
-    print("\n--- Group C: Case 960 (sunspace) ---")
+    # Case 960: two-zone sunspace
+    "960": ("Case600_v1.nandrad", case960_patches()),
+}
+
+
+# ---------------------------------------------------------------------------
+# Main generation
+# ---------------------------------------------------------------------------
+
+def build_case(template, patches, nandrad_dir=NANDRAD_DIR):
+    """Apply patches to a freshly parsed template and return the file bytes."""
+    return render(apply_patches(load_template(template, nandrad_dir).getroot(), patches))
 
-    print("Generating Case 960...")
-    t = generate_case960(tree600, tree900)
-    write_tree(t, "960")
 
-    print("\nDone! Generated 11 NANDRAD case files.")
+def generate_case(case, nandrad_dir=NANDRAD_DIR):
+    """Generate data/nandrad/Case{case}_v1.nandrad; returns (path, written)."""
+    template, patches = CASES[case]
+    path = os.path.join(nandrad_dir, f"Case{case}_v1.nandrad")
+    return path, write_if_changed(path, build_case(template, patches, nandrad_dir))
+
+
+def generate_cases(cases, nandrad_dir=NANDRAD_DIR, jobs=None):
+    """Generate the given cases, in a process pool if jobs > 1.
+
+    Returns [(path, written), ...] in the order of cases.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if jobs <= 1 or len(cases) <= 1:
+        return [generate_case(case, nandrad_dir) for case in cases]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(cases))) as pool:
+        return list(pool.map(generate_case, cases, [nandrad_dir] * len(cases)))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate NANDRAD input files for BESTEST cases.")
+    parser.add_argument("--cases", default=None,
+                        help=f"Comma-separated case filter (default: all of {', '.join(CASES)})")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--nandrad-dir", default=NANDRAD_DIR,
+                        help="Directory with the templates and generated files")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    cases = [c.strip() for c in args.cases.split(",")] if args.cases else list(CASES)
+    unknown = [c for c in cases if c not in CASES]
+    if unknown:
+        raise SystemExit(f"Unknown case(s): {', '.join(unknown)}")
+
+    print(f"Generating {len(cases)} case(s)...")
+    results = generate_cases(cases, args.nandrad_dir, args.jobs)
+    for path, written in results:
+        print(f"  {'Written' if written else 'Unchanged'}: {path}")
+
+    n_written = sum(written for _, written in results)
+    print(f"\nDone! {n_written} written, {len(results) - n_written} unchanged.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Monthly bar charts (SVG) of the validation outputs.
+
+A case writes about 40 monthly charts that only differ in their values,
+titles and the number of engines. Drawing each of them with a new
+Matplotlib figure costs ~0.2 s, almost all of it text layout and glyph
+rendering. MonthlyCharts therefore builds one SVG template per layout
+(engine columns, month labels, with or without reference markers) that
+holds everything static - frame, month labels, legend - and per chart only
+fills in bar heights, reference markers, the y axis and the labels.
+Tick positions and colours are those of Matplotlib (MaxNLocator, default
+colour cycle) in a seaborn-whitegrid look; no Matplotlib backend is
+involved, text stays text.
+
+svg_precision sets the decimals of the written coordinates (default 2).
+
+Used by validate_nandrad.py (save_monthly_bar_with_ref, --svg-precision).
+"""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Optional
+from xml.sax.saxutils import escape
+
+import numpy as np
+import pandas as pd
+from matplotlib import rcParamsDefault
+from matplotlib.colors import to_hex
+from matplotlib.ticker import MaxNLocator
+
+
+REF_COLUMNS = ("min", "max")
+COLORS = [to_hex(c) for c in rcParamsDefault["axes.prop_cycle"].by_key()["color"]]
+
+# Geometry [pt] of a 10 x 6 in figure
+WIDTH, HEIGHT = 720.0, 432.0
+PLOT_LEFT, PLOT_RIGHT, PLOT_TOP, PLOT_BOTTOM = 78.0, 708.0, 48.0, 364.0
+BAR_WIDTH = 0.8          # total width of a month's bar group (in month units)
+FONT = "DejaVu Sans, Arial, Helvetica, sans-serif"
+TEXT_COLOR = "#262626"
+GRID_COLOR = "#cccccc"
+MARKER_SIZE = 5.0        # half marker extent [pt]
+
+
+def _text_width(text: str, size: float) -> float:
+    return 0.6 * size * len(text)
+
+
+# =========================
+# Template
+# =========================
+
+class MonthlyBarChart:
+    """SVG template with one bar series per engine and optional reference min/max markers."""
+
+    def __init__(self, columns: tuple[str, ...], months: tuple[str, ...], with_refs: bool, precision: int = 2):
+        self.columns = columns
+        self.months = months
+        self.with_refs = with_refs
+        self.precision = precision
+
+        n = len(months)
+        self.dx = (PLOT_RIGHT - PLOT_LEFT) / n
+        self.centers = PLOT_LEFT + (np.arange(n) + 0.5) * self.dx
+        bar = BAR_WIDTH / len(columns)
+        self.bar_width = bar * self.dx
+        self.offsets = [((j - (len(columns) - 1) / 2) * bar - bar / 2) * self.dx for j in range(len(columns))]
+        self.locator = MaxNLocator(nbins="auto", steps=[1, 2, 2.5, 5, 10])
+
+        f = self._f
+        static = [
+            f'<text x="{f(PLOT_LEFT + (PLOT_RIGHT - PLOT_LEFT) / 2)}" y="{f(HEIGHT - 8)}" '
+            f'text-anchor="middle" font-size="11">Monat</text>',
+        ]
+        for x, label in zip(self.centers, months):
+            static.append(f'<text transform="translate({f(x)} {f(PLOT_BOTTOM + 10)}) rotate(-45)" '
+                          f'text-anchor="end" dominant-baseline="middle" font-size="10">{escape(label)}</text>')
+        self.labels = "\n".join(static)
+        self.frame = (f'<rect x="{f(PLOT_LEFT)}" y="{f(PLOT_TOP)}" width="{f(PLOT_RIGHT - PLOT_LEFT)}" '
+                      f'height="{f(PLOT_BOTTOM - PLOT_TOP)}" fill="none" stroke="{GRID_COLOR}" stroke-width="1.25"/>')
+        self.legend = self._legend()
+
+    def _f(self, value: float) -> str:
+        text = f"{value:.{self.precision}f}"
+        return text.rstrip("0").rstrip(".") if "." in text else text
+
+    def _marker(self, x: float, y: float, kind: str) -> str:
+        f, m = self._f, MARKER_SIZE
+        path = f"M{f(x - m)} {f(y)}H{f(x + m)}"
+        if kind == "+":
+            path += f"M{f(x)} {f(y - m)}V{f(y + m)}"
+        return path
+
+    def _legend(self) -> str:
+        """One row between title and plot, so that it never hides bars or markers."""
+        f = self._f
+        entries = [(col, COLORS[j % len(COLORS)], "bar") for j, col in enumerate(self.columns)]
+        if self.with_refs:
+            entries += [("Reference Min", "black", "_"), ("Reference Max", "black", "+")]
+        widths = [34.0 + _text_width(label, 10) + 12.0 for label, _, _ in entries]
+        x = PLOT_LEFT + (PLOT_RIGHT - PLOT_LEFT - sum(widths)) / 2
+        y = PLOT_TOP - 12
+        parts = []
+        for (label, color, kind), width in zip(entries, widths):
+            if kind == "bar":
+                parts.append(f'<rect x="{f(x)}" y="{f(y - 4)}" width="20" height="8" fill="{color}"/>')
+            else:
+                parts.append(f'<path d="{self._marker(x + 10, y, kind)}" stroke="{color}" stroke-width="2"/>')
+            parts.append(f'<text x="{f(x + 26)}" y="{f(y)}" dominant-baseline="middle" font-size="10">'
+                         f'{escape(label)}</text>')
+            x += width
+        return "\n".join(parts)
+
+    def render(self, df_m: pd.DataFrame, title: str, ylabel: str) -> str:
+        """SVG document of the chart for one monthly table."""
+        f = self._f
+        values = [df_m[col].to_numpy(dtype=float) for col in self.columns]
+        refs = [df_m[c].to_numpy(dtype=float) for c in REF_COLUMNS] if self.with_refs else []
+        finite = np.concatenate([v[np.isfinite(v)] for v in values + refs] + [np.zeros(1)])
+        lo, hi = float(finite.min()), float(finite.max())
+        if hi - lo <= 0.0:
+            hi = lo + 1.0
+        # bars start at zero (which is always within lo..hi), 5 % headroom on the data side
+        margin = 0.05 * (hi - lo)
+        y_min = lo - margin if lo < 0.0 else 0.0
+        y_max = hi + margin if hi > 0.0 else 0.0
+        ticks = self.locator.tick_values(y_min, y_max)
+        ticks = ticks[(ticks >= y_min - 1e-9) & (ticks <= y_max + 1e-9)]
+        scale = (PLOT_BOTTOM - PLOT_TOP) / (y_max - y_min)
+
+        def y(value: float) -> float:
+            return PLOT_BOTTOM - (value - y_min) * scale
+
+        step = ticks[1] - ticks[0] if len(ticks) > 1 else 1.0
+        decimals = max(0, -int(np.floor(np.log10(step)))) if step < 1 else 0
+        parts = []
+        for tick in ticks:
+            parts.append(f'<path d="M{f(PLOT_LEFT)} {f(y(tick))}H{f(PLOT_RIGHT)}" stroke="{GRID_COLOR}" '
+                         f'stroke-width="0.8"/>')
+            parts.append(f'<text x="{f(PLOT_LEFT - 6)}" y="{f(y(tick))}" text-anchor="end" '
+                         f'dominant-baseline="middle" font-size="10">{tick:.{decimals}f}</text>')
+
+        zero = y(0.0)
+        for j, vals in enumerate(values):
+            color = COLORS[j % len(COLORS)]
+            for x, value in zip(self.centers + self.offsets[j], vals):
+                if not np.isfinite(value):
+                    continue
+                top = min(y(value), zero)
+                parts.append(f'<rect x="{f(x)}" y="{f(top)}" width="{f(self.bar_width)}" '
+                             f'height="{f(abs(y(value) - zero))}" fill="{color}"/>')
+        if self.with_refs:
+            for kind, vals in zip(("_", "+"), refs):
+                path = "".join(self._marker(x, y(v), kind) for x, v in zip(self.centers, vals) if np.isfinite(v))
+                if path:
+                    parts.append(f'<path d="{path}" stroke="black" stroke-width="2" fill="none"/>')
+
+        return "\n".join([
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{f(WIDTH)}pt" height="{f(HEIGHT)}pt" '
+            f'viewBox="0 0 {f(WIDTH)} {f(HEIGHT)}" font-family="{FONT}" fill="{TEXT_COLOR}">',
+            f'<rect width="{f(WIDTH)}" height="{f(HEIGHT)}" fill="white"/>',
+            *parts,
+            self.frame,
+            self.labels,
+            f'<text x="{f(PLOT_LEFT + (PLOT_RIGHT - PLOT_LEFT) / 2)}" y="20" text-anchor="middle" '
+            f'font-size="12">{escape(title)}</text>',
+            f'<text transform="translate(16 {f(PLOT_TOP + (PLOT_BOTTOM - PLOT_TOP) / 2)}) rotate(-90)" '
+            f'text-anchor="middle" dominant-baseline="middle" font-size="11">{escape(ylabel)}</text>',
+            self.legend,
+            "</svg>\n",
+        ])
+
+
+# =========================
+# Renderer
+# =========================
+
+class MonthlyCharts:
+    """Writes monthly bar charts, reusing one MonthlyBarChart template per layout."""
+
+    def __init__(self, svg_precision: Optional[int] = None):
+        self.svg_precision = 2 if svg_precision is None else svg_precision
+        self._templates: dict[tuple, MonthlyBarChart] = {}
+
+    def template(self, columns: tuple[str, ...], months: tuple[str, ...], with_refs: bool) -> MonthlyBarChart:
+        key = (columns, months, with_refs)
+        if key not in self._templates:
+            self._templates[key] = MonthlyBarChart(columns, months, with_refs, self.svg_precision)
+        return self._templates[key]
+
+    def save(self, df_m: pd.DataFrame, title: str, ylabel: str, out_svg: Path) -> None:
+        """Monthly bars of all columns except min/max; min/max (if both present) as reference markers."""
+        columns = tuple(c for c in df_m.columns if c not in REF_COLUMNS)
+        months = tuple(str(i) for i in df_m.index)
+        chart = self.template(columns, months, set(REF_COLUMNS).issubset(df_m.columns))
+        out_svg.write_text(chart.render(df_m, title, ylabel), encoding="utf-8")
+        logging.info("Saved monthly SVG: %s", out_svg)
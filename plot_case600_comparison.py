@@ -4,19 +4,28 @@
 Reads existing hourly TSV outputs and raw simulation data to produce
 a multi-panel Matplotlib figure comparing NANDRAD, EnergyPlus, and TRNSYS.
 
+All inputs of a case are read once into a CaseResult; the panels only draw
+from that object, so load_case_result() and render() can be used
+independently (and from several processes). Reference tables are read once
+per process. --all renders the cases on a process pool (--jobs).
+
 Usage:
     source .venv/bin/activate
     python plot_case600_comparison.py                     # Case 600 v1
     python plot_case600_comparison.py -c 900 -v v1        # single case
     python plot_case600_comparison.py --all                # all cases
+    python plot_case600_comparison.py --all --formats svg  # SVG only (no PNG)
 """
 
 import argparse
+import functools
 import glob as globmod
 import os
 import sys
 import locale
 import datetime as dt
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 
 import numpy as np
 import pandas as pd
@@ -25,6 +34,8 @@ matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 import matplotlib.dates
 
+from results_api import RUN_DIR_REGEX, output_path
+
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
@@ -51,55 +62,78 @@ except locale.Error:
 
 
 # ---------------------------------------------------------------------------
-# I/O helpers  (use module-level RESULTS_DIR / TAG / CASE set by generate())
+# I/O helpers
 # ---------------------------------------------------------------------------
-_ctx = {}  # mutable context dict set per-case
-
-
-def _tsv_path(metric, suffix):
-    return os.path.join(_ctx["results_dir"],
-                        f"{_ctx['tag']}_{metric}_{suffix}.tsv")
-
-
-def read_hourly(metric):
-    path = _tsv_path(metric, "hourly")
+RESULTS_DIR = "validation_results"
+
+# metrics read per case (file name part of validate_nandrad outputs)
+MONTHLY_METRICS = ["Heizenergie", "Kühlenergie",
+                   "Transmittierte_kurzwellige_Strahlung_Fenster",
+                   "Kurzwellige_Strahlungslasten_Süd"]
+ORIENTATIONS = {"Nord": "Nord", "Ost": "Ost", "Süd": "Süd",
+                "West": "West", "Horiz.": "Horizontal"}
+YEARLY_METRICS = (["Heizenergie", "Kühlenergie"] +
+                  [f"Kurzwellige_Strahlungslasten_{k}"
+                   for k in ORIENTATIONS.values()])
+PEAK_METRICS = ["Heizenergie", "Kühlenergie"]
+
+
+@dataclass
+class CaseResult:
+    """Everything the comparison figure of one case needs, read once."""
+    case: str
+    variant: str
+    monthly: dict = field(default_factory=dict)      # metric -> monthly integral
+    yearly: dict = field(default_factory=dict)       # metric -> yearly sum per engine
+    global_max: dict = field(default_factory=dict)   # metric -> Series/MaxValue table
+    air_temperature: pd.DataFrame = None             # hourly
+    window_conduction: pd.DataFrame = None           # monthly sum of all windows
+    n_windows: int = 0
+    ventilation: dict = field(default_factory=dict)  # engine -> monthly [kWh]
+
+    @property
+    def tag(self):
+        return f"Case{self.case}_{self.variant}"
+
+
+def read_hourly(path):
     return pd.read_csv(path, sep="\t", parse_dates=["Datetime"],
                        index_col="Datetime")
 
 
-def read_monthly_integral(metric):
-    path = _tsv_path(metric, "monthly_integral")
+def read_monthly_integral(path):
     return pd.read_csv(path, sep="\t", index_col=0, parse_dates=True)
 
 
-def read_yearly_sum(metric):
-    path = _tsv_path(metric, "yearly_sum")
+def read_yearly_sum(path):
     df = pd.read_csv(path, sep="\t", index_col=0)
     return df.iloc[0]
 
 
-def read_global_max(metric):
-    path = _tsv_path(metric, "hourly_global_max")
+def read_global_max(path):
     return pd.read_csv(path, sep="\t")
 
 
+@functools.lru_cache(maxsize=None)
 def read_monthly_refs():
     path = os.path.join(REF_DIR, "monthly-references.tsv")
     return pd.read_csv(path, sep="\t", index_col="Month")
 
 
+@functools.lru_cache(maxsize=None)
 def read_annual_refs():
     path = os.path.join(REF_DIR, "annual-references.tsv")
     return pd.read_csv(path, sep="\t", index_col="Case")
 
 
+@functools.lru_cache(maxsize=None)
 def read_ff_refs():
     path = os.path.join(REF_DIR, "free-float-references.tsv")
     return pd.read_csv(path, sep="\t", index_col="Case")
 
 
-def read_nandrad_ventilation():
-    path = os.path.join(DATA_DIR, "nandrad", _ctx["tag"], "results",
+def read_nandrad_ventilation(tag):
+    path = os.path.join(DATA_DIR, "nandrad", tag, "results",
                         "VentilationHeatLoad-mean-Hourly.tsv")
     df = pd.read_csv(path, sep="\t")
     s = pd.to_numeric(df.iloc[:, 1], errors="coerce")
@@ -109,12 +143,15 @@ def read_nandrad_ventilation():
     return s
 
 
-def read_ep_infiltration():
+def read_ep_infiltration(case):
     try:
         import esoreader
     except ImportError:
         return None
-    eso_path = os.path.join(DATA_DIR, "energyplus", "eplusout.eso")
+    # per-case output folder (validate_nandrad), older runs wrote into data/energyplus
+    eso_path = os.path.join(DATA_DIR, "energyplus", f"Case{case}", "eplusout.eso")
+    if not os.path.isfile(eso_path):
+        eso_path = os.path.join(DATA_DIR, "energyplus", "eplusout.eso")
     if not os.path.isfile(eso_path):
         return None
     eso = esoreader.read_from_path(eso_path)
@@ -138,6 +175,52 @@ def read_ep_infiltration():
     return net_wh
 
 
+def load_case_result(case, variant, results_root=RESULTS_DIR):
+    """Read all inputs of the comparison figure; missing files are left out."""
+    result = CaseResult(case=case, variant=variant)
+    tag = result.tag
+
+    def _load(target, key, reader, path):
+        if os.path.isfile(path):
+            target[key] = reader(path)
+
+    for metric in MONTHLY_METRICS:
+        _load(result.monthly, metric, read_monthly_integral,
+              output_path(results_root, case, variant, metric, "monthly_integral"))
+    for metric in YEARLY_METRICS:
+        _load(result.yearly, metric, read_yearly_sum,
+              output_path(results_root, case, variant, metric, "yearly_sum"))
+    for metric in PEAK_METRICS:
+        _load(result.global_max, metric, read_global_max,
+              output_path(results_root, case, variant, metric, "hourly_global_max"))
+
+    path = output_path(results_root, case, variant, "Lufttemperatur", "hourly")
+    if os.path.isfile(path):
+        result.air_temperature = read_hourly(path)
+
+    # Sum all window conduction files of this case
+    files = sorted(globmod.glob(
+        str(output_path(results_root, case, variant, "Wärmeleitung_Fenster_*", "hourly"))))
+    if files:
+        df = None
+        for f in files:
+            tmp = read_hourly(f)
+            df = tmp if df is None else df.add(tmp, fill_value=0.0)
+        result.window_conduction = df.resample("ME").sum() / 1000.0
+        result.n_windows = len(files)
+
+    try:
+        s_nan = read_nandrad_ventilation(tag).iloc[:8759]
+        result.ventilation["NANDRAD"] = s_nan.resample("ME").sum().abs() / 1000.0
+    except Exception:
+        pass
+    s_ep = read_ep_infiltration(case)
+    if s_ep is not None:
+        s_ep = s_ep.iloc[:8759]
+        result.ventilation["EnergyPlus"] = s_ep.resample("ME").sum().abs() / 1000.0
+    return result
+
+
 # ---------------------------------------------------------------------------
 # Plotting helpers
 # ---------------------------------------------------------------------------
@@ -176,10 +259,10 @@ def grouped_bar(ax, df_monthly, title, ylabel, ref_min=None, ref_max=None,
     ax.tick_params(labelsize=8)
 
 
-def _safe_panel(ax, func, fallback_title):
-    """Call func(ax); on failure show placeholder text."""
+def _safe_panel(ax, func, result, fallback_title):
+    """Call func(ax, result); on failure show placeholder text."""
     try:
-        func(ax)
+        func(ax, result)
     except Exception as e:
         ax.text(0.5, 0.5, f"Daten nicht verfügbar\n({e})",
                 ha="center", va="center", transform=ax.transAxes,
@@ -191,9 +274,9 @@ def _safe_panel(ax, func, fallback_title):
 # Panel builders
 # ---------------------------------------------------------------------------
 
-def panel_monthly_heating(ax):
-    case = _ctx["case"]
-    df = read_monthly_integral("Heizenergie")
+def panel_monthly_heating(ax, result):
+    case = result.case
+    df = result.monthly["Heizenergie"]
     ref_min = ref_max = None
     if case in MONTHLY_REF_CASES:
         refs = read_monthly_refs()
@@ -203,9 +286,9 @@ def panel_monthly_heating(ax):
                 ref_min=ref_min, ref_max=ref_max)
 
 
-def panel_monthly_cooling(ax):
-    case = _ctx["case"]
-    df = read_monthly_integral("Kühlenergie")
+def panel_monthly_cooling(ax, result):
+    case = result.case
+    df = result.monthly["Kühlenergie"]
     ref_min = ref_max = None
     if case in MONTHLY_REF_CASES:
         refs = read_monthly_refs()
@@ -215,14 +298,16 @@ def panel_monthly_cooling(ax):
                 ref_min=ref_min, ref_max=ref_max)
 
 
-def panel_air_temperature(ax):
-    df = read_hourly("Lufttemperatur")
+def panel_air_temperature(ax, result):
+    df = result.air_temperature
+    if df is None:
+        raise FileNotFoundError("Lufttemperatur")
     for eng in ENGINES:
         if eng in df.columns:
             ax.plot(df.index, df[eng], label=eng, color=COLORS[eng],
                     lw=0.3, alpha=0.8)
     # Add free-float reference lines if applicable
-    case = _ctx["case"]
+    case = result.case
     ff_key = case if case.endswith("FF") else None
     if ff_key is None and case == "960":
         ff_key = "960"
@@ -246,20 +331,9 @@ def panel_air_temperature(ax):
     ax.xaxis.set_major_formatter(matplotlib.dates.DateFormatter("%b"))
 
 
-def panel_ventilation(ax):
-    engines_found = []
-    monthly_data = {}
-    try:
-        s_nan = read_nandrad_ventilation().iloc[:8759]
-        monthly_data["NANDRAD"] = s_nan.resample("ME").sum().abs() / 1000.0
-        engines_found.append("NANDRAD")
-    except Exception:
-        pass
-    s_ep = read_ep_infiltration()
-    if s_ep is not None:
-        s_ep = s_ep.iloc[:8759]
-        monthly_data["EnergyPlus"] = s_ep.resample("ME").sum().abs() / 1000.0
-        engines_found.append("EnergyPlus")
+def panel_ventilation(ax, result):
+    monthly_data = result.ventilation
+    engines_found = list(monthly_data)
     if not engines_found:
         ax.text(0.5, 0.5, "Daten nicht verfügbar",
                 ha="center", va="center", transform=ax.transAxes, fontsize=9)
@@ -284,21 +358,17 @@ def panel_ventilation(ax):
     ax.tick_params(labelsize=8)
 
 
-def panel_transmitted_solar(ax):
-    df = read_monthly_integral(
-        "Transmittierte_kurzwellige_Strahlung_Fenster") / 1000.0
+def panel_transmitted_solar(ax, result):
+    df = result.monthly["Transmittierte_kurzwellige_Strahlung_Fenster"] / 1000.0
     grouped_bar(ax, df, "Transmittierte Solarstrahlung Fenster", "[kWh/m²]")
 
 
-def panel_radiation_by_orientation(ax):
-    orientations = {"Nord": "Nord", "Ost": "Ost", "Süd": "Süd",
-                    "West": "West", "Horiz.": "Horizontal"}
+def panel_radiation_by_orientation(ax, result):
     data = {eng: [] for eng in ENGINES}
     labels = []
-    for label, file_key in orientations.items():
-        try:
-            s = read_yearly_sum(f"Kurzwellige_Strahlungslasten_{file_key}")
-        except Exception:
+    for label, file_key in ORIENTATIONS.items():
+        s = result.yearly.get(f"Kurzwellige_Strahlungslasten_{file_key}")
+        if s is None:
             continue
         labels.append(label)
         for eng in ENGINES:
@@ -326,46 +396,36 @@ def panel_radiation_by_orientation(ax):
     ax.tick_params(labelsize=8)
 
 
-def panel_window_conduction(ax):
-    # Discover all window conduction files for this case
-    pattern = os.path.join(_ctx["results_dir"],
-                           f"{_ctx['tag']}_Wärmeleitung_Fenster_*_hourly.tsv")
-    files = sorted(globmod.glob(pattern))
-    if not files:
+def panel_window_conduction(ax, result):
+    monthly = result.window_conduction
+    if monthly is None:
         raise FileNotFoundError("No window conduction files found")
-    # Read and sum all windows
-    df = None
-    for f in files:
-        tmp = pd.read_csv(f, sep="\t", parse_dates=["Datetime"],
-                          index_col="Datetime")
-        df = tmp if df is None else df.add(tmp, fill_value=0.0)
-    monthly = df.resample("ME").sum() / 1000.0
     engines = [e for e in ENGINES
                if e in monthly.columns and monthly[e].abs().sum() > 0.01]
     if not engines:
         engines = [e for e in ENGINES if e in monthly.columns]
-    n_win = len(files)
+    n_win = result.n_windows
     title = ("Fenster-Wärmeleitung" if n_win == 1
              else f"Fenster-Wärmeleitung ({n_win} Fenster)")
     grouped_bar(ax, monthly, title, "[kWh]", engines=engines)
 
 
-def panel_monthly_radiation_south(ax):
-    df = read_monthly_integral("Kurzwellige_Strahlungslasten_Süd") / 1000.0
+def panel_monthly_radiation_south(ax, result):
+    df = result.monthly["Kurzwellige_Strahlungslasten_Süd"] / 1000.0
     grouped_bar(ax, df, "Einfallende Solarstrahlung Süd (monatlich)",
                 "[kWh/m²]")
 
 
-def panel_annual_balance(ax):
-    case = _ctx["case"]
+def panel_annual_balance(ax, result):
+    case = result.case
     case_num = case.rstrip("F")  # strip FF suffix for ref lookup
     # Strip remaining F for case numbers like "600F" -> "600"
     case_num = case_num.rstrip("F")
 
-    heat_yr = read_yearly_sum("Heizenergie")
-    cool_yr = read_yearly_sum("Kühlenergie")
-    heat_max = read_global_max("Heizenergie")
-    cool_max = read_global_max("Kühlenergie")
+    heat_yr = result.yearly["Heizenergie"]
+    cool_yr = result.yearly["Kühlenergie"]
+    heat_max = result.global_max["Heizenergie"]
+    cool_max = result.global_max["Kühlenergie"]
 
     categories = ["Heizenergie\n[MWh]", "Kühlenergie\n[MWh]",
                   "Heiz-Spitze\n[kW]", "Kühl-Spitze\n[kW]"]
@@ -437,42 +497,31 @@ def panel_annual_balance(ax):
 # Main figure generation
 # ---------------------------------------------------------------------------
 
-def generate(case, variant, open_result=False):
-    """Generate the comprehensive comparison for one case/variant."""
-    tag = f"Case{case}_{variant}"
-    results_dir = os.path.join("validation_results", tag)
-    if not os.path.isdir(results_dir):
-        print(f"SKIP: {results_dir} not found")
-        return False
-
-    # Set module context
-    _ctx["case"] = case
-    _ctx["variant"] = variant
-    _ctx["tag"] = tag
-    _ctx["results_dir"] = results_dir
-
+def render(result, out_dir, formats=("svg", "png"), dpi=200):
+    """Draw the comprehensive comparison of a CaseResult; returns the file base path."""
+    case = result.case
     fig, axes = plt.subplots(5, 2, figsize=(20, 22))
     fig.suptitle(f"BESTEST Case {case} — Umfassender Simulationsvergleich\n"
                  f"NANDRAD / EnergyPlus v9.0.1 / TRNSYS",
                  fontsize=14, fontweight="bold", y=0.995)
 
     # Row 0: Heating & Cooling monthly
-    _safe_panel(axes[0, 0], panel_monthly_heating, "Monatliche Heizenergie")
-    _safe_panel(axes[0, 1], panel_monthly_cooling, "Monatliche Kühlenergie")
+    _safe_panel(axes[0, 0], panel_monthly_heating, result, "Monatliche Heizenergie")
+    _safe_panel(axes[0, 1], panel_monthly_cooling, result, "Monatliche Kühlenergie")
 
     # Row 1: Air temperature & Ventilation
-    _safe_panel(axes[1, 0], panel_air_temperature, "Lufttemperatur")
-    _safe_panel(axes[1, 1], panel_ventilation, "Lüftungswärmeverluste")
+    _safe_panel(axes[1, 0], panel_air_temperature, result, "Lufttemperatur")
+    _safe_panel(axes[1, 1], panel_ventilation, result, "Lüftungswärmeverluste")
 
     # Row 2: Transmitted solar & Radiation by orientation
-    _safe_panel(axes[2, 0], panel_transmitted_solar,
+    _safe_panel(axes[2, 0], panel_transmitted_solar, result,
                 "Transmittierte Solarstrahlung")
-    _safe_panel(axes[2, 1], panel_radiation_by_orientation,
+    _safe_panel(axes[2, 1], panel_radiation_by_orientation, result,
                 "Solarstrahlung nach Orientierung")
 
     # Row 3: Window conduction & South radiation monthly
-    _safe_panel(axes[3, 0], panel_window_conduction, "Fenster-Wärmeleitung")
-    _safe_panel(axes[3, 1], panel_monthly_radiation_south,
+    _safe_panel(axes[3, 0], panel_window_conduction, result, "Fenster-Wärmeleitung")
+    _safe_panel(axes[3, 1], panel_monthly_radiation_south, result,
                 "Solarstrahlung Süd")
 
     # Row 4: Annual energy balance (spanning full width)
@@ -480,17 +529,34 @@ def generate(case, variant, open_result=False):
     axes[4, 1].remove()
     gs = axes[0, 0].get_gridspec()
     ax_bottom = fig.add_subplot(gs[4, :])
-    _safe_panel(ax_bottom, panel_annual_balance, "Jährliche Energiebilanz")
+    _safe_panel(ax_bottom, panel_annual_balance, result, "Jährliche Energiebilanz")
 
     fig.tight_layout(rect=[0, 0, 1, 0.97])
 
-    base = os.path.join(results_dir, f"{tag}_comprehensive_comparison")
-    fig.savefig(f"{base}.svg", bbox_inches="tight")
-    fig.savefig(f"{base}.png", dpi=200, bbox_inches="tight")
+    base = os.path.join(out_dir, f"{result.tag}_comprehensive_comparison")
+    for fmt in formats:
+        if fmt == "png":
+            fig.savefig(f"{base}.png", dpi=dpi, bbox_inches="tight")
+        else:
+            fig.savefig(f"{base}.{fmt}", bbox_inches="tight")
     plt.close(fig)
+    return base
+
+
+def generate(case, variant, open_result=False, results_root=RESULTS_DIR,
+             formats=("svg", "png"), dpi=200):
+    """Generate the comprehensive comparison for one case/variant."""
+    tag = f"Case{case}_{variant}"
+    results_dir = os.path.join(results_root, tag)
+    if not os.path.isdir(results_dir):
+        print(f"SKIP: {results_dir} not found")
+        return False
+
+    base = render(load_case_result(case, variant, results_root),
+                  results_dir, formats=formats, dpi=dpi)
     print(f"OK   {tag}")
 
-    if open_result:
+    if open_result and "png" in formats:
         try:
             import subprocess
             subprocess.Popen(["xdg-open", f"{base}.png"],
@@ -501,6 +567,26 @@ def generate(case, variant, open_result=False):
     return True
 
 
+def _generate_job(job):
+    case, variant, results_root, formats, dpi = job
+    try:
+        return generate(case, variant, results_root=results_root,
+                        formats=formats, dpi=dpi)
+    except Exception as e:
+        print(f"FAIL Case{case}_{variant}: {e}")
+        return False
+
+
+def find_results(results_root=RESULTS_DIR):
+    """(case, variant) of all validation_results/Case*_v*/ directories."""
+    found = []
+    for d in sorted(globmod.glob(os.path.join(results_root, "Case*_v*/"))):
+        m = RUN_DIR_REGEX.fullmatch(os.path.basename(d.rstrip("/")))
+        if m:
+            found.append((m.group(1), m.group(2)))
+    return found
+
+
 # ---------------------------------------------------------------------------
 # CLI
 # ---------------------------------------------------------------------------
@@ -514,32 +600,34 @@ def main():
                         help="Variant (e.g., v1, v2)")
     parser.add_argument("--all", action="store_true",
                         help="Generate for all existing validation results")
+    parser.add_argument("--results-dir", default=RESULTS_DIR,
+                        help="Folder with the Case*_v*/ validation results")
+    parser.add_argument("--formats", default="svg,png",
+                        help="Comma-separated output formats (e.g. svg or svg,png)")
+    parser.add_argument("--dpi", type=int, default=200,
+                        help="PNG resolution")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Parallel processes for --all")
     parser.add_argument("--open", action="store_true",
                         help="Open result with xdg-open")
     args = parser.parse_args()
+    formats = tuple(f.strip() for f in args.formats.split(",") if f.strip())
 
     if args.all:
-        # Discover all Case*_v*/ directories
-        dirs = sorted(globmod.glob("validation_results/Case*_v*/"))
-        if not dirs:
-            print("ERROR: No validation_results/Case*_v*/ found.")
+        cases = find_results(args.results_dir)
+        if not cases:
+            print(f"ERROR: No {args.results_dir}/Case*_v*/ found.")
             sys.exit(1)
-        ok = fail = 0
-        for d in dirs:
-            name = os.path.basename(d.rstrip("/"))
-            # Parse CaseXXX_vN
-            parts = name.rsplit("_", 1)
-            if len(parts) != 2:
-                continue
-            case = parts[0].replace("Case", "")
-            variant = parts[1]
-            if generate(case, variant):
-                ok += 1
-            else:
-                fail += 1
-        print(f"\nDone: {ok} generated, {fail} skipped.")
+        jobs = [(case, variant, args.results_dir, formats, args.dpi)
+                for case, variant in cases]
+        with ProcessPoolExecutor(max_workers=max(min(args.jobs, len(jobs)), 1)) as pool:
+            done = list(pool.map(_generate_job, jobs))
+        ok = sum(done)
+        print(f"\nDone: {ok} generated, {len(done) - ok} skipped.")
     else:
-        if not generate(args.case, args.variant, open_result=args.open):
+        if not generate(args.case, args.variant, open_result=args.open,
+                        results_root=args.results_dir, formats=formats,
+                        dpi=args.dpi):
             sys.exit(1)
 
 
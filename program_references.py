@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Per-program ASHRAE 140 results as a dense (case x metric x program) array.
+
+data/reference/program-results.tsv (written by extract_references.py) holds
+the individual results of the reference programs (BSIMAC, CSE, DeST,
+EnergyPlus, ESP-r, NewHASP, TRNSYS). It is loaded once per suite into a
+ProgramMatrix; reference bands (optionally excluding one program, or as
+percentiles) and the rank of a simulation result among the programs are
+vectorized reductions over the program axis.
+"""
+
+from __future__ import annotations
+
+import logging
+import warnings
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from reference_checks import METRICS
+
+
+PROGRAM_RESULTS_FILE = "program-results.tsv"
+
+
+# =========================
+# Program matrix
+# =========================
+
+@dataclass(frozen=True)
+class ProgramMatrix:
+    """Program results on a (case, metric, program) grid; NaN = not reported."""
+    cases: tuple[str, ...]
+    metrics: tuple[str, ...]
+    programs: tuple[str, ...]
+    values: np.ndarray
+
+    @property
+    def empty(self) -> bool:
+        return self.values.size == 0
+
+    def grid(self) -> pd.MultiIndex:
+        """(case, metric) index matching values.reshape(-1, n_programs)."""
+        return pd.MultiIndex.from_product([self.cases, self.metrics], names=["case", "metric"])
+
+    def select(self, exclude: Optional[str] = None) -> np.ndarray:
+        """Values with the given program left out (same shape minus one program)."""
+        if exclude is None:
+            return self.values
+        if exclude not in self.programs:
+            raise ValueError(f"Unknown program '{exclude}', expected one of {', '.join(self.programs)}")
+        keep = [i for i, p in enumerate(self.programs) if p != exclude]
+        return self.values[:, :, keep]
+
+
+def load_program_matrix(ref_dir: Path) -> ProgramMatrix:
+    """Load program-results.tsv into a ProgramMatrix (empty if the file is missing)."""
+    path = ref_dir / PROGRAM_RESULTS_FILE
+    if not path.exists():
+        logging.warning("Program results not found: %s", path)
+        return ProgramMatrix((), (), (), np.empty((0, 0, 0)))
+
+    df = pd.read_csv(path, sep="\t", dtype={"Case": str})
+    case_codes, cases = pd.factorize(df["Case"].str.strip())
+    metric_codes, metrics = pd.factorize(df["metric"])
+    program_codes, programs = pd.factorize(df["program"])
+
+    values = np.full((len(cases), len(metrics), len(programs)), np.nan)
+    values[case_codes, metric_codes, program_codes] = df["value"].to_numpy(dtype=float)
+    return ProgramMatrix(tuple(cases), tuple(metrics), tuple(programs), values)
+
+
+# =========================
+# Reductions
+# =========================
+
+def program_bands(
+    matrix: ProgramMatrix,
+    exclude: Optional[str] = None,
+    percentiles: Sequence[float] = (),
+) -> pd.DataFrame:
+    """Reference bands from the program results.
+
+    Returns one row per (case, metric) with at least one program value:
+    ref_min, ref_max, n_programs and a column p<q> per requested percentile.
+    With exclude, the band is computed without that program (e.g. to check
+    EnergyPlus against the others).
+    """
+    values = matrix.select(exclude)
+    flat = values.reshape(-1, values.shape[-1]) if values.size else np.empty((0, 0))
+    n = np.sum(~np.isnan(flat), axis=1)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        bands = pd.DataFrame({
+            "ref_min": np.nanmin(flat, axis=1) if flat.size else np.empty(0),
+            "ref_max": np.nanmax(flat, axis=1) if flat.size else np.empty(0),
+            "n_programs": n,
+        }, index=matrix.grid())
+        for q in percentiles:
+            bands[f"p{q:g}"] = np.nanpercentile(flat, q, axis=1) if flat.size else np.empty(0)
+
+    return bands[n > 0].reset_index()
+
+
+def sensitivity_bands(matrix: ProgramMatrix) -> pd.DataFrame:
+    """Reference table (case, metric, ref_min, ref_max) for the delta_* metrics."""
+    bands = program_bands(matrix)
+    return bands.loc[bands["metric"].str.startswith("delta_"),
+                     ["case", "metric", "ref_min", "ref_max"]].reset_index(drop=True)
+
+
+def program_ranks(
+    matrix: ProgramMatrix,
+    aggregates: pd.DataFrame,
+    engine: str = "NANDRAD",
+    exclude: Optional[str] = None,
+) -> pd.DataFrame:
+    """Rank an engine's aggregates among the program results.
+
+    Returns one row per (case, metric) present in both, with the engine
+    value, every program value, the program band, the rank of the engine
+    value (1 = lowest) among n = programs + 1 values and the deviation
+    from the program mean in percent.
+    """
+    programs = [p for p in matrix.programs if p != exclude]
+    cols = ["case", "metric", engine, *programs, "ref_min", "ref_max", "rank", "n", "dev_mean_pct"]
+    if matrix.empty or aggregates.empty:
+        return pd.DataFrame(columns=cols)
+
+    own = (aggregates[aggregates["engine"] == engine]
+           .drop_duplicates(["case", "metric"], keep="last")
+           .set_index(["case", "metric"])["value"])
+    grid = matrix.grid()
+    pos = grid.get_indexer(own.index)
+    own = own[pos >= 0]
+    pos = pos[pos >= 0]
+
+    values = matrix.select(exclude)
+    table = values.reshape(-1, values.shape[-1])[pos]
+    v = own.to_numpy(dtype=float)
+    valid = ~np.isnan(table)
+
+    with warnings.catch_warnings(), np.errstate(invalid="ignore", divide="ignore"):
+        warnings.simplefilter("ignore", RuntimeWarning)
+        mean = np.nanmean(table, axis=1)
+        result = pd.DataFrame(table, columns=programs, index=own.index)
+        result.insert(0, engine, v)
+        result["ref_min"] = np.nanmin(table, axis=1)
+        result["ref_max"] = np.nanmax(table, axis=1)
+        result["rank"] = 1 + np.sum(valid & (table < v[:, None]), axis=1)
+        result["n"] = 1 + valid.sum(axis=1)
+        result["dev_mean_pct"] = np.where(np.abs(mean) > 0, (v - mean) / np.abs(mean) * 100.0, np.nan)
+
+    result = result[valid.any(axis=1) & ~np.isnan(v)].reset_index()
+    result["metric"] = pd.Categorical(result["metric"], categories=list(dict.fromkeys([*METRICS, *matrix.metrics])),
+                                      ordered=True)
+    case_order = pd.unique(aggregates["case"])
+    result["case"] = pd.Categorical(result["case"], categories=case_order, ordered=True)
+    result = result.sort_values(["case", "metric"]).reset_index(drop=True)
+    result[["case", "metric"]] = result[["case", "metric"]].astype(str)
+    return result[cols]
+
+
+def to_program_report(ranked: pd.DataFrame, engine: str = "NANDRAD") -> pd.DataFrame:
+    """Convert program_ranks() output into the German overview layout."""
+    programs = [c for c in ranked.columns if c not in
+                ("case", "metric", engine, "ref_min", "ref_max", "rank", "n", "dev_mean_pct")]
+    labels = {k: label for k, (label, _) in METRICS.items()}
+    digits = ranked["metric"].map({k: d for k, (_, d) in METRICS.items()}).fillna(3).astype(int)
+
+    report = pd.DataFrame({
+        "Case": ranked["case"],
+        "Metrik": ranked["metric"].map(labels).fillna(ranked["metric"]),
+        engine: [round(v, d) for v, d in zip(ranked[engine], digits)],
+    })
+    for p in programs:
+        report[p] = ranked[p].round(3).astype(object).where(ranked[p].notna(), "")
+    report["Programm-Min"] = ranked["ref_min"].round(3)
+    report["Programm-Max"] = ranked["ref_max"].round(3)
+    report["Rang"] = ranked["rank"].astype(int).astype(str) + "/" + ranked["n"].astype(int).astype(str)
+    report["Abw. Mittel [%]"] = ranked["dev_mean_pct"].round(1)
+    return report
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Prune the EnergyPlus Output:Variable requests to what the validation reads.
+
+The BESTEST IDFs in data/energyplus/ request many more report variables
+than validate_nandrad compares (sunlit areas, transmitted energies, solar
+angles, ...), each of them written hourly into eplusout.eso. The variable,
+key and frequency set actually used is derived from the metric definitions
+in validate_nandrad.py (the ep_var/ep_key and ep_subtract_var/ep_subtract_key
+arguments of the validate() calls, read from the source so that it always
+matches the validator); keys that are not literals (e.g. the window keys
+from --windows) or None are requested as '*'.
+
+prepare_idf() replaces all Output:Variable objects of an IDF by the part of
+this set that the IDF requests (pruning never adds a variable; '*' keys are
+narrowed to the keys the validation reads) and writes the result next to the
+EnergyPlus outputs; validate_nandrad runs this copy unless --ep-all-outputs
+is given (with --ep-sqlite it also adds Output:SQLite, see energyplus_sql).
+Other objects (meters, Output:VariableDictionary, ...) are left unchanged.
+
+The CLI lists the derived set and, per case IDF, the number of report
+variables and Output:Variable objects before and after. With an EnergyPlus executable (--run) each IDF is
+simulated in its original and its pruned form; the ESO size, the EnergyPlus
+run time and whether all series read by the validation are identical are
+written to energyplus_pruning.tsv.
+
+Run:
+    python prune_energyplus_outputs.py --list
+    python prune_energyplus_outputs.py --cases 600,900 --run --ep-exec /path/to/energyplus
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import logging
+import os
+import re
+import shutil
+import subprocess
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple, Optional, Sequence
+
+import pandas as pd
+
+from generate_nandrad_cases import write_if_changed
+
+
+VALIDATOR = Path(__file__).resolve().with_name("validate_nandrad.py")
+# validate_nandrad reads every EnergyPlus series with frequency="Hourly"
+FREQUENCY = "Hourly"
+# (variable, key) keyword pairs of the validate() calls
+VARIABLE_KEYWORDS = (("ep_var", "ep_key"), ("ep_subtract_var", "ep_subtract_key"))
+
+RESULT_COLUMNS = ["idf", "objects_before", "objects_after", "variables_before", "variables_after",
+                  "eso_MB_before", "eso_MB_after", "eso_reduction_pct", "runtime_s_before", "runtime_s_after", "runtime_reduction_pct",
+                  "series_checked", "series_equal"]
+
+_OUTPUT_VARIABLE = re.compile(r"\s*Output:Variable\s*,", re.I)
+_OUTPUT_SQLITE = re.compile(r"\s*Output:SQLite\s*,", re.I)
+_BLANK_LINES = re.compile(r"(?:[ \t]*\n)*")
+_BLOCK_HEADER = "! Output:Variable set of validate_nandrad (prune_energyplus_outputs.py)\n\n"
+
+
+class OutputVariable(NamedTuple):
+    key: str
+    variable: str
+    frequency: str = FREQUENCY
+
+
+# =========================
+# Required outputs
+# =========================
+
+@lru_cache(maxsize=None)
+def required_outputs(source: Path = VALIDATOR) -> tuple[OutputVariable, ...]:
+    """Output:Variable set read by the validate() calls in source (sorted; '*' replaces specific keys)."""
+    tree = ast.parse(source.read_text(encoding="utf-8"), filename=str(source))
+    keys: dict[str, set[str]] = {}
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call):
+            continue
+        kwargs = {kw.arg: kw.value for kw in node.keywords if kw.arg}
+        for var_kw, key_kw in VARIABLE_KEYWORDS:
+            if var_kw not in kwargs:
+                continue
+            var = kwargs[var_kw]
+            if not (isinstance(var, ast.Constant) and isinstance(var.value, str)):
+                raise ValueError(f"{source.name}:{var.lineno}: {var_kw} is not a string literal")
+            key = kwargs.get(key_kw)
+            literal = isinstance(key, ast.Constant) and isinstance(key.value, str) and key.value
+            keys.setdefault(var.value, set()).add(key.value if literal else "*")
+    if not keys:
+        raise ValueError(f"No EnergyPlus variables found in {source}")
+
+    outputs = []
+    for variable, names in keys.items():
+        for key in (["*"] if "*" in names else sorted(names)):
+            outputs.append(OutputVariable(key, variable))
+    return tuple(sorted(outputs, key=lambda o: (o.variable, o.key)))
+
+
+# =========================
+# IDF rewriting
+# =========================
+
+def _object_spans(text: str) -> list[tuple[int, int]]:
+    """(start, end) of every IDF object (class name up to and including ';'), '!' comments skipped."""
+    spans = []
+    start = None
+    in_comment = False
+    for i, ch in enumerate(text):
+        if in_comment:
+            in_comment = ch != "\n"
+        elif ch == "!":
+            in_comment = True
+        elif ch == ";" and start is not None:
+            spans.append((start, i + 1))
+            start = None
+        elif start is None and not ch.isspace():
+            start = i
+    return spans
+
+
+def _fields(obj: str) -> list[str]:
+    code = "\n".join(line.split("!", 1)[0] for line in obj.splitlines())
+    return [f.strip() for f in re.split(r"[,;]", code)]
+
+
+def requested_outputs(text: str) -> list[OutputVariable]:
+    """Output:Variable objects of an IDF (an empty key value means all keys, as in EnergyPlus)."""
+    outputs = []
+    for start, end in _object_spans(text):
+        if _OUTPUT_VARIABLE.match(text, start):
+            fields = _fields(text[start:end]) + ["", "", ""]
+            outputs.append(OutputVariable(fields[1] or "*", fields[2], fields[3] or FREQUENCY))
+    return outputs
+
+
+def select_outputs(requested: Sequence[OutputVariable], required: Sequence[OutputVariable]) -> list[OutputVariable]:
+    """The required outputs that the IDF already requests (variable and key matched case-insensitively).
+
+    Pruning never adds variables: a variable the case does not report (e.g.
+    window outputs of a case without windows) stays absent. A required '*'
+    key is narrowed to the keys the IDF requests.
+    """
+    by_variable: dict[str, set[str]] = {}
+    for out in requested:
+        by_variable.setdefault(out.variable.lower(), set()).add(out.key.upper())
+    selected = []
+    for out in required:
+        keys = by_variable.get(out.variable.lower(), set())
+        if "*" in keys:
+            selected.append(out)
+        elif out.key == "*":
+            selected.extend(OutputVariable(key, out.variable) for key in sorted(keys))
+        elif out.key.upper() in keys:
+            selected.append(out)
+    return selected
+
+
+def output_variable_block(outputs: Sequence[OutputVariable]) -> str:
+    """Output:Variable objects in the layout of the IDF editor."""
+    lines = []
+    for out in outputs:
+        lines += [
+            "Output:Variable,",
+            f"    {out.key + ',':<24} !- Key Value",
+            f"    {out.variable + ',':<24} !- Variable Name",
+            f"    {out.frequency + ';':<24} !- Reporting Frequency",
+            "",
+        ]
+    return _BLOCK_HEADER + "\n".join(lines)
+
+
+def prune_idf(text: str, required: Sequence[OutputVariable]
+              ) -> tuple[str, list[OutputVariable], list[OutputVariable]]:
+    """Replace the Output:Variable objects of an IDF by the required ones it requests;
+    returns (new text, requested outputs, kept outputs)."""
+    text = text.replace(_BLOCK_HEADER, "")   # block of an earlier pass
+    requested = requested_outputs(text)
+    removed = []
+    for start, end in _object_spans(text):
+        if not _OUTPUT_VARIABLE.match(text, start):
+            continue
+        # remove whole lines (indent, trailing '!-' comment, line break and following blank lines)
+        # if the object is alone on them
+        line_start = text.rfind("\n", 0, start) + 1
+        if text[line_start:start].strip():
+            line_start = start
+        line_end = text.find("\n", end)
+        line_end = len(text) if line_end < 0 else line_end + 1
+        rest = text[end:line_end].strip()
+        if rest and not rest.startswith("!"):
+            line_end = end
+        elif line_start != start or not text[line_start:start].strip():
+            line_end += len(_BLANK_LINES.match(text, line_end).group(0))
+        removed.append((line_start, line_end))
+
+    selected = select_outputs(requested, required)
+    if not removed:
+        return text, requested, selected
+    parts = []
+    pos = 0
+    for i, (start, end) in enumerate(removed):
+        parts.append(text[pos:start])
+        if i == 0 and selected:
+            parts.append(output_variable_block(selected))
+        pos = end
+    parts.append(text[pos:])
+    return "".join(parts), requested, selected
+
+
+def with_sqlite(text: str) -> str:
+    """IDF text with an Output:SQLite object (eplusout.sql, see energyplus_sql), unless it already has one."""
+    if any(_OUTPUT_SQLITE.match(text, start) for start, _ in _object_spans(text)):
+        return text
+    return text.rstrip("\n") + "\n\nOutput:SQLite,\n    Simple;                  !- Option Type\n"
+
+
+def prepare_idf(idf_file: Path, out_dir: Path, prune: bool = True, sqlite: bool = False) -> Path:
+    """Copy of idf_file in out_dir with pruned outputs and/or Output:SQLite (only rewritten if its content
+    changed); idf_file itself if there is nothing to change."""
+    text = idf_file.read_text(encoding="latin1")
+    if not (prune or sqlite):
+        return idf_file
+    if prune:
+        text, before, after = prune_idf(text, required_outputs())
+    if sqlite:
+        text = with_sqlite(text)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    target = out_dir / idf_file.name
+    if write_if_changed(target, text.encode("latin1")) and prune:
+        logging.info("Pruned EnergyPlus outputs: %s (%d -> %d Output:Variable)", target, len(before), len(after))
+    return target
+
+
+# =========================
+# Size / runtime comparison
+# =========================
+
+def _run(ep_exec: Path, idf_file: Path, epw_file: Path, workdir: Path, out_dir: Path) -> float:
+    """Run EnergyPlus (cwd: folder of the original IDF); returns the wall time [s]."""
+    shutil.rmtree(out_dir, ignore_errors=True)
+    out_dir.mkdir(parents=True)
+    start = time.perf_counter()
+    subprocess.run([str(ep_exec), "-w", str(epw_file), "-d", str(out_dir), str(idf_file)], check=True, cwd=workdir,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def _same_series(full_eso: Path, pruned_eso: Path, outputs: Sequence[OutputVariable]) -> tuple[int, int]:
+    """(series checked, series identical) of outputs present in the full ESO."""
+    import esoreader
+
+    full = esoreader.read_from_path(str(full_eso))
+    pruned = esoreader.read_from_path(str(pruned_eso))
+    checked = equal = 0
+    for out in outputs:
+        key = "" if out.key == "*" else out.key
+        try:
+            a = full.to_frame(out.variable, frequency=out.frequency, key=key)
+        except Exception:
+            continue   # not reported for this case (e.g. no such surface)
+        checked += a.shape[1]
+        try:
+            b = pruned.to_frame(out.variable, frequency=out.frequency, key=key)
+        except Exception:
+            continue
+        common = a.columns.intersection(b.columns)
+        equal += sum(bool(a[c].equals(b[c])) for c in common)
+    return checked, equal
+
+
+def compare_idf(idf_file: Path, ep_exec: Optional[Path], epw_file: Path, work_dir: Path,
+                keep: bool = False) -> dict[str, object]:
+    """Output:Variable counts of idf_file before/after pruning and, with ep_exec, ESO size and run time of both."""
+    outputs = required_outputs()
+    case_dir = work_dir / idf_file.stem
+    _, before, after = prune_idf(idf_file.read_text(encoding="latin1"), outputs)
+    pruned_idf = prepare_idf(idf_file, case_dir)
+    row: dict[str, object] = {
+        "idf": idf_file.name,
+        "objects_before": len(before),
+        "objects_after": len(after),
+        "variables_before": len({o.variable.lower() for o in before}),
+        "variables_after": len({o.variable.lower() for o in after}),
+    }
+    if ep_exec is not None:
+        runs = {}
+        for label, idf in (("before", idf_file), ("after", pruned_idf)):
+            out = case_dir / label
+            row[f"runtime_s_{label}"] = round(_run(ep_exec, idf, epw_file, idf_file.parent, out), 2)
+            row[f"eso_MB_{label}"] = round((out / "eplusout.eso").stat().st_size / 1e6, 3)
+            runs[label] = out / "eplusout.eso"
+        row["eso_reduction_pct"] = round(100.0 * (1.0 - row["eso_MB_after"] / row["eso_MB_before"]), 1)
+        row["runtime_reduction_pct"] = round(100.0 * (1.0 - row["runtime_s_after"] / row["runtime_s_before"]), 1)
+        row["series_checked"], row["series_equal"] = _same_series(runs["before"], runs["after"], outputs)
+    if not keep:
+        shutil.rmtree(case_dir, ignore_errors=True)
+    return row
+
+
+def find_idfs(energy_dir: Path, cases: Optional[Sequence[str]] = None) -> list[Path]:
+    """Case IDFs in energy_dir; cases: Case{N}.idf and Case{N}_*.idf of the given cases."""
+    idfs = sorted(energy_dir.glob("Case*.idf"))
+    if not cases:
+        return idfs
+    return [p for p in idfs if any(p.stem == f"Case{c}" or p.stem.startswith(f"Case{c}_") for c in cases)]
+
+
+# =========================
+# CLI
+# =========================
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Derive the EnergyPlus outputs read by validate_nandrad and prune the case IDFs to them."
+    )
+    parser.add_argument("--cases", default=None, help="Comma-separated cases (default: all Case*.idf)")
+    parser.add_argument("--list", action="store_true", help="Only print the derived Output:Variable set")
+    parser.add_argument("--data-dir", type=Path, default=Path.cwd() / "data", help="Root data directory")
+    parser.add_argument("--out-dir", type=Path, default=Path.cwd() / "validation_results",
+                        help="Directory for energyplus_pruning.tsv")
+    parser.add_argument("--work-dir", type=Path, default=Path.cwd() / "pruning_work",
+                        help="Directory for the pruned IDFs and EnergyPlus outputs")
+    parser.add_argument("--run", action="store_true",
+                        help="Simulate original and pruned IDF and compare ESO size, run time and series")
+    parser.add_argument("--ep-exec", type=Path,
+        default=(Path("C:/EnergyPlusV9-0-1/energyplus.exe") if os.name == "nt"
+                 else Path("/home/hirth/Applikationen/EnergyPlus-9-0-1/energyplus"))
+    )
+    parser.add_argument("--epw", type=Path, default=Path.cwd() / "data" / "climate" / "725650TYCST.epw",
+                        help="Path to the EPW file")
+    parser.add_argument("--keep", action="store_true", help="Keep pruned IDFs and EnergyPlus outputs")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    # Imported here: run_all_validations imports this module (via validate_nandrad).
+    from run_all_validations import setup_logging
+
+    setup_logging()
+
+    outputs = required_outputs()
+    if args.list:
+        print(output_variable_block(outputs), end="")
+        return 0
+    if args.run and not args.ep_exec.exists():
+        logging.error("EnergyPlus not found: %s", args.ep_exec)
+        return 2
+
+    cases = [c.strip() for c in args.cases.split(",") if c.strip()] if args.cases else None
+    idfs = find_idfs(args.data_dir / "energyplus", cases)
+    logging.info("%d Output:Variable entries used by the validation, %d IDF(s)", len(outputs), len(idfs))
+    rows = []
+    for idf in idfs:
+        try:
+            rows.append(compare_idf(idf, args.ep_exec if args.run else None, args.epw, args.work_dir, args.keep))
+        except subprocess.CalledProcessError as e:
+            logging.error("%s: EnergyPlus failed (exit %d)", idf.name, e.returncode)
+            rows.append({"idf": idf.name})
+    df = pd.DataFrame(rows).reindex(columns=RESULT_COLUMNS)
+
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    df.to_csv(args.out_dir / "energyplus_pruning.tsv", sep="\t", index=False)
+    logging.info("Saved: %s", args.out_dir / "energyplus_pruning.tsv")
+    logging.info("Report variables: %d -> %d (Output:Variable objects: %d -> %d)",
+                 int(df["variables_before"].sum()), int(df["variables_after"].sum()),
+                 int(df["objects_before"].sum()), int(df["objects_after"].sum()))
+    if args.run and df["eso_MB_before"].notna().any():
+        logging.info("ESO size: %.1f -> %.1f MB, EnergyPlus run time: %.1f -> %.1f s",
+                     df["eso_MB_before"].sum(), df["eso_MB_after"].sum(),
+                     df["runtime_s_before"].sum(), df["runtime_s_after"].sum())
+        mismatch = df[df["series_equal"] < df["series_checked"]]
+        for row in mismatch.itertuples(index=False):
+            logging.warning("%s: only %d of %d validated series identical", row.idf, row.series_equal,
+                            row.series_checked)
+        return 1 if len(mismatch) or df["eso_MB_before"].isna().any() else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Vectorized ASHRAE 140 reference checking.
+
+Simulation results are handled as a long table of scalar aggregates
+(case x metric x engine -> value), the reference bands from data/reference/
+as a long table (case x metric -> ref_min, ref_max). A single merge of both
+tables checks every case, metric and engine at once.
+
+Metric keys:
+- heating, cooling              annual energy [MWh]
+- peak_heating, peak_cooling    hourly integrated peak load [kW]
+- heating_<Mon>, cooling_<Mon>  monthly energy [kWh] (Mon = Jan ... Dec)
+- temp_max, temp_min, temp_avg  free-float air temperature [°C]
+- delta_<metric>                sensitivity delta case minus base case
+                                (SENSITIVITY_BASES), same unit as <metric>
+"""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+# =========================
+# Metric definitions
+# =========================
+
+ENGINES = ("NANDRAD", "EnergyPlus", "TRNSYS")
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
+          "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+# metric key -> (report label, rounding digits); order defines report order
+METRICS: dict[str, tuple[str, int]] = {
+    **{f"heating_{m}": (f"Heizenergie {m} [kWh]", 2) for m in MONTHS},
+    **{f"cooling_{m}": (f"Kühlenergie {m} [kWh]", 2) for m in MONTHS},
+    "heating":      ("Jährliche Heizenergie [MWh]", 4),
+    "cooling":      ("Jährliche Kühlenergie [MWh]", 4),
+    "peak_heating": ("Spitzenheizlast [kW]", 4),
+    "peak_cooling": ("Spitzenkühllast [kW]", 4),
+    "temp_max":     ("Max. Lufttemperatur [°C]", 2),
+    "temp_min":     ("Min. Lufttemperatur [°C]", 2),
+    "temp_avg":     ("Mittl. Lufttemperatur [°C]", 2),
+    "delta_heating":      ("Δ Jährliche Heizenergie [MWh]", 4),
+    "delta_cooling":      ("Δ Jährliche Kühlenergie [MWh]", 4),
+    "delta_peak_heating": ("Δ Spitzenheizlast [kW]", 4),
+    "delta_peak_cooling": ("Δ Spitzenkühllast [kW]", 4),
+}
+
+# ASHRAE 140 basic sensitivity tests: case -> base case of the published delta
+SENSITIVITY_BASES: dict[str, str] = {
+    "610": "600", "620": "600", "630": "620", "640": "600", "650": "600",
+    "660": "600", "670": "600", "680": "600", "685": "600", "695": "685",
+    "900": "600", "910": "900", "920": "900", "930": "920", "940": "900",
+    "950": "900", "960": "900", "980": "900", "985": "900", "995": "985",
+}
+DELTA_METRICS = ("heating", "cooling", "peak_heating", "peak_cooling")
+# annual, peak and free-float metrics (the quick checks, without monthly sums)
+ANNUAL_METRICS = ("heating", "cooling", "peak_heating", "peak_cooling", "temp_max", "temp_min", "temp_avg")
+
+AGGREGATE_COLUMNS = ["case", "metric", "engine", "value"]
+REPORT_COLUMNS = ["Case", "Metrik", "NANDRAD", "EnergyPlus", "TRNSYS", "Ref Min", "Ref Max",
+                  "Status", "Status EnergyPlus", "Status TRNSYS"]
+
+
+# =========================
+# Aggregates
+# =========================
+
+def aggregates_from_hourly(
+    case: str,
+    heating: Optional[pd.DataFrame] = None,
+    cooling: Optional[pd.DataFrame] = None,
+    air_temp: Optional[pd.DataFrame] = None,
+    free_float: bool = False,
+) -> pd.DataFrame:
+    """Reduce hourly comparison frames (one column per engine) to scalar aggregates.
+
+    Heating/cooling frames are hourly energies in kWh on a datetime index.
+    Free-float cases only yield temperature metrics, all other cases yield
+    annual, peak and monthly loads. A missing heating/cooling frame counts
+    as zero NANDRAD load, so that the case shows up as FAIL, not as absent.
+    """
+    parts: list[pd.DataFrame] = []
+
+    def _add(metric_values: pd.DataFrame) -> None:
+        # metric_values: index = metric key, columns = engines
+        long = metric_values.rename_axis(index="metric", columns="engine").stack().rename("value")
+        parts.append(long.reset_index())
+
+    if free_float:
+        if air_temp is not None:
+            _add(pd.DataFrame({
+                "temp_max": air_temp.max(),
+                "temp_min": air_temp.min(),
+                "temp_avg": air_temp.mean(),
+            }).T)
+    else:
+        for kind, df in (("heating", heating), ("cooling", cooling)):
+            if df is None:
+                _add(pd.DataFrame({"NANDRAD": [0.0, 0.0]}, index=[kind, f"peak_{kind}"]))
+                continue
+            annual = pd.DataFrame({kind: df.sum() / 1000.0, f"peak_{kind}": df.max()}).T
+            monthly = df.resample("ME").sum().iloc[:12]
+            monthly.index = [f"{kind}_{m}" for m in MONTHS[:len(monthly)]]
+            _add(pd.concat([monthly, annual]))
+
+    if not parts:
+        return pd.DataFrame(columns=AGGREGATE_COLUMNS)
+    result = pd.concat(parts, ignore_index=True)
+    result.insert(0, "case", case)
+    result["value"] = pd.to_numeric(result["value"], errors="coerce")
+    return result[AGGREGATE_COLUMNS]
+
+
+def delta_aggregates(aggregates: pd.DataFrame) -> pd.DataFrame:
+    """Derive sensitivity deltas (delta_<metric>) from already computed aggregates.
+
+    One row per sensitivity case, metric and engine for which both the case
+    and its base case have a value; the case column holds the sensitivity
+    case, as in the published delta tables.
+    """
+    src = aggregates.loc[aggregates["metric"].isin(DELTA_METRICS), AGGREGATE_COLUMNS]
+    pairs = pd.DataFrame(list(SENSITIVITY_BASES.items()), columns=["case", "base"])
+    merged = (pairs.merge(src, on="case")
+              .merge(src.rename(columns={"case": "base", "value": "base_value"}),
+                     on=["base", "metric", "engine"]))
+    merged["value"] = merged["value"] - merged["base_value"]
+    merged["metric"] = "delta_" + merged["metric"]
+    return merged[AGGREGATE_COLUMNS].reset_index(drop=True)
+
+
+def read_aggregates(path: Path) -> pd.DataFrame:
+    """Load an aggregates TSV written by validate_nandrad."""
+    df = pd.read_csv(path, sep="\t", dtype={"case": str})
+    df["case"] = df["case"].str.strip()
+    return df
+
+
+# =========================
+# References
+# =========================
+
+def load_reference_table(ref_dir: Path) -> pd.DataFrame:
+    """Build the long reference table (case, metric, ref_min, ref_max).
+
+    Combines annual-references.tsv, free-float-references.tsv and
+    monthly-references.tsv; missing files are skipped with a warning.
+    """
+    frames: list[pd.DataFrame] = []
+
+    def _bands(path: Path, metrics: list[str]) -> None:
+        if not path.exists():
+            logging.warning("Reference file not found: %s", path)
+            return
+        df = pd.read_csv(path, sep="\t", dtype={"Case": str})
+        cases = df["Case"].str.strip()
+        for m in metrics:
+            frames.append(pd.DataFrame({
+                "case": cases,
+                "metric": m,
+                "ref_min": df.get(f"{m}_min"),
+                "ref_max": df.get(f"{m}_max"),
+            }))
+
+    _bands(ref_dir / "annual-references.tsv", ["heating", "cooling", "peak_heating", "peak_cooling"])
+    _bands(ref_dir / "free-float-references.tsv", ["temp_max", "temp_min", "temp_avg"])
+
+    monthly_path = ref_dir / "monthly-references.tsv"
+    if monthly_path.exists():
+        monthly = pd.read_csv(monthly_path, sep="\t").set_index("Month")
+        long = monthly.rename_axis(columns="column").stack().rename("value").reset_index()
+        parts = long["column"].str.extract(r"^Case(?P<case>\w+?)_(?P<kind>heating|cooling)_(?P<bound>min|max)$")
+        long = pd.concat([long, parts], axis=1).dropna(subset=["case"])
+        long["metric"] = long["kind"] + "_" + long["Month"].str.strip()
+        wide = long.pivot_table(index=["case", "metric"], columns="bound", values="value", aggfunc="first")
+        frames.append(wide.rename(columns={"min": "ref_min", "max": "ref_max"}).reset_index())
+    else:
+        logging.warning("Reference file not found: %s", monthly_path)
+
+    if not frames:
+        return pd.DataFrame(columns=["case", "metric", "ref_min", "ref_max"])
+    refs = pd.concat(frames, ignore_index=True)[["case", "metric", "ref_min", "ref_max"]]
+    refs[["ref_min", "ref_max"]] = refs[["ref_min", "ref_max"]].apply(pd.to_numeric, errors="coerce")
+    return refs
+
+
+# =========================
+# Checking
+# =========================
+
+# Metrics whose range test uses the value rounded to 2 decimals (as the original
+# monthly check did); all other metrics are tested with the unrounded value.
+ROUNDED_CHECKS = frozenset(k for k in METRICS if k.split("_")[-1] in MONTHS)
+
+
+def checked_value(metric, value):
+    """Value tested against the reference band of metric (scalars or arrays of metrics and values)."""
+    values = np.asarray(value, dtype=float)
+    return np.where(np.isin(np.asarray(metric, dtype=object), list(ROUNDED_CHECKS)), np.round(values, 2), values)
+
+
+def check_references(aggregates: pd.DataFrame, references: pd.DataFrame) -> pd.DataFrame:
+    """Join aggregates against reference bands and classify every engine value.
+
+    The range test uses checked_value() (monthly energies rounded to 2
+    decimals, all other metrics unrounded); the returned values are rounded to
+    the report precision of their metric. Status is PASS/FAIL, or SKIP if the
+    band or the engine value is missing. Returns one row per (case, metric) with a reference band,
+    ordered by case (first appearance) and metric (METRICS order).
+    """
+    cols = ["case", "metric", *ENGINES, "ref_min", "ref_max", *(f"status_{e}" for e in ENGINES)]
+    if aggregates.empty or references.empty:
+        return pd.DataFrame(columns=cols)
+
+    wide = (aggregates.drop_duplicates(["case", "metric", "engine"], keep="last")
+            .pivot(index=["case", "metric"], columns="engine", values="value")
+            .reindex(columns=list(ENGINES))
+            .reset_index())
+    merged = wide.merge(references, on=["case", "metric"], how="inner")
+
+    digits = merged["metric"].map({k: d for k, (_, d) in METRICS.items()}).fillna(4).to_numpy()
+    scale = 10.0 ** digits
+    ref_min = merged["ref_min"].to_numpy(dtype=float)
+    ref_max = merged["ref_max"].to_numpy(dtype=float)
+    no_band = np.isnan(ref_min) | np.isnan(ref_max)
+    for engine in ENGINES:
+        values = merged[engine].to_numpy(dtype=float)
+        tested = checked_value(merged["metric"].to_numpy(dtype=object), values)
+        merged[f"status_{engine}"] = np.select(
+            [no_band | np.isnan(values), (tested >= ref_min) & (tested <= ref_max)],
+            ["SKIP", "PASS"],
+            default="FAIL",
+        )
+        merged[engine] = np.round(values * scale) / scale
+
+    case_order = pd.unique(aggregates["case"])
+    merged["case"] = pd.Categorical(merged["case"], categories=case_order, ordered=True)
+    merged["metric"] = pd.Categorical(merged["metric"], categories=list(METRICS), ordered=True)
+    merged = merged.sort_values(["case", "metric"]).reset_index(drop=True)
+    merged["case"] = merged["case"].astype(str)
+    merged["metric"] = merged["metric"].astype(str)
+    return merged[cols]
+
+
+def to_report(checked: pd.DataFrame) -> pd.DataFrame:
+    """Convert checked rows into the report layout used by the TSV/HTML writers."""
+    labels = {k: label for k, (label, _) in METRICS.items()}
+    report = pd.DataFrame({
+        "Case": checked["case"],
+        "Metrik": checked["metric"].map(labels).fillna(checked["metric"]),
+        **{e: checked[e].astype(object).where(checked[e].notna(), "") for e in ENGINES},
+        "Ref Min": checked["ref_min"],
+        "Ref Max": checked["ref_max"],
+        "Status": checked["status_NANDRAD"],
+        "Status EnergyPlus": checked["status_EnergyPlus"],
+        "Status TRNSYS": checked["status_TRNSYS"],
+    }, columns=REPORT_COLUMNS)
+    return report
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Table rendering for the HTML and Markdown reports.
+
+The writers build table rows column by column with vectorized pandas string
+operations instead of formatting each row in a Python loop:
+
+- html_rows() / html_table(): HTML table body, optional cell style per
+  Status* column or per row,
+- md_rows(): Markdown table lines (FAIL in bold).
+
+Large tables (the metric rows of the overview) are not written as HTML at
+all: table_json() stores them once as compact column-wise JSON (strings
+dictionary-encoded as labels + integer codes, numbers as plain arrays) and
+TABLE_SCRIPT renders them in the browser as a sortable, filterable table
+that only creates the DOM rows currently scrolled into view, so that the
+page stays responsive with 100k rows.
+"""
+
+from __future__ import annotations
+
+import json
+from functools import reduce
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def _cells(df: pd.DataFrame) -> list[pd.Series]:
+    """Cell texts as str(value) (missing values as 'nan', independent of the pandas string dtype)."""
+    return [pd.Series(df[c].to_numpy(dtype=object).astype(str), index=df.index, dtype=object) for c in df.columns]
+
+
+def _join(parts: list[pd.Series], sep: str) -> pd.Series:
+    return reduce(lambda a, b: a + sep + b, parts)
+
+
+# =========================
+# HTML / Markdown
+# =========================
+
+def html_rows(df: pd.DataFrame, status_bg: Optional[Callable[[str], str]] = None,
+              row_style: Optional[pd.Series] = None) -> str:
+    """<tr> rows of df; status_bg colours the Status* columns, row_style (CSS per row, same index as df)
+    all cells."""
+    if df.empty:
+        return ""
+    cells = []
+    for col, text in zip(df.columns, _cells(df)):
+        if row_style is not None:
+            cells.append('<td style="' + row_style + '">' + text + "</td>")
+        elif status_bg is not None and str(col).startswith("Status"):
+            cells.append('<td style="background:' + text.map(status_bg) + ';font-weight:bold;">' + text + "</td>")
+        else:
+            cells.append("<td>" + text + "</td>")
+    return "".join("<tr>" + _join(cells, "") + "</tr>")
+
+
+def html_table(df: pd.DataFrame, status_bg: Optional[Callable[[str], str]] = None) -> str:
+    """Render a DataFrame as HTML table; status_bg colours the Status* columns."""
+    head = "".join(f"<th>{c}</th>" for c in df.columns)
+    return f"""<table>
+<thead><tr>{head}</tr></thead>
+<tbody>
+{html_rows(df, status_bg)}
+</tbody>
+</table>"""
+
+
+def md_rows(df: pd.DataFrame) -> pd.Series:
+    """Markdown table line per row of df (FAIL in bold)."""
+    cells = [text.mask(text == "FAIL", "**FAIL**") for text in _cells(df)]
+    return "| " + _join(cells, " | ") + " |"
+
+
+def md_table(df: pd.DataFrame) -> list[str]:
+    """Render a DataFrame as Markdown table lines (FAIL in bold)."""
+    lines = ["| " + " | ".join(map(str, df.columns)) + " |", "|" + "------|" * len(df.columns)]
+    return lines + (md_rows(df).tolist() if not df.empty else [])
+
+
+# =========================
+# Client-side table
+# =========================
+
+def table_json(df: pd.DataFrame, precision: int = 6) -> str:
+    """Column-wise JSON of df: {"n": rows, "columns": [{"name", "labels", "codes"} | {"name", "values"}]}.
+
+    Numeric columns are written as arrays (null for NaN), all other columns as
+    the sorted distinct labels plus one integer code per row.
+    """
+    parts = []
+    for col in df.columns:
+        values = df[col]
+        name = json.dumps(str(col), ensure_ascii=False)
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            parts.append(f'{{"name":{name},"values":'
+                         f'{values.astype(float).to_json(orient="values", double_precision=precision)}}}')
+        else:
+            codes, labels = pd.factorize(values.astype(str).mask(values.isna(), ""), sort=True)
+            parts.append(f'{{"name":{name},"labels":{json.dumps(labels.tolist(), ensure_ascii=False)},'
+                         f'"codes":{json.dumps(np.asarray(codes).tolist())}}}')
+    data = f'{{"n":{len(df)},"columns":[{",".join(parts)}]}}'
+    return data.replace("</", "<\\/")   # keep "</script>" in labels from closing the data block
+
+
+TABLE_CSS = """
+.vt-filters { display: flex; gap: 12px; flex-wrap: wrap; align-items: center; margin: 10px 0; }
+.vt-filters input[type=search] { width: 320px; padding: 4px; }
+.vt-scroll { height: 70vh; overflow-y: auto; border: 1px solid #ccc; }
+.vt-scroll table { table-layout: fixed; margin: 0; }
+.vt-scroll thead th { position: sticky; top: 0; cursor: pointer; user-select: none; z-index: 1; }
+.vt-scroll td { height: 20px; white-space: nowrap; overflow: hidden; text-overflow: ellipsis; }
+.vt-spacer td { border: none; padding: 0; }
+.st-PASS { background: #d4edda; font-weight: bold; }
+.st-FAIL { background: #f8d7da; font-weight: bold; }
+.st-SKIP, .st-N\\/A { background: #e2e3e5; font-weight: bold; }
+.st-ERROR { background: #fff3cd; font-weight: bold; }
+"""
+
+
+TABLE_SCRIPT = """
+function VirtualTable(root, data, options) {
+  options = options || {};
+  const ROW = options.rowHeight || 33, OVERSCAN = 20;
+  const n = data.n, collator = new Intl.Collator("de", {numeric: true});
+  const cols = data.columns.map(c => {
+    if (c.values) {
+      const v = Float64Array.from(c.values, x => x === null ? NaN : x);
+      return {name: c.name, num: true, v: v, text: i => Number.isNaN(v[i]) ? "" : String(v[i])};
+    }
+    const codes = Int32Array.from(c.codes);
+    const order = c.labels.map((_, k) => k).sort((a, b) => collator.compare(c.labels[a], c.labels[b]));
+    const rank = new Int32Array(c.labels.length);
+    order.forEach((k, r) => rank[k] = r);
+    return {name: c.name, num: false, labels: c.labels, codes: codes, rank: rank,
+            text: i => c.labels[codes[i]]};
+  });
+  const byName = Object.fromEntries(cols.map(c => [c.name, c]));
+  const esc = s => String(s).replace(/[&<>"]/g, ch => ({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"}[ch]));
+
+  root.innerHTML = '<div class="vt-filters"></div><p class="vt-count"></p><div class="vt-scroll"><table>' +
+    "<thead><tr>" + cols.map((c, j) => `<th data-col="${j}">${esc(c.name)}</th>`).join("") + "</tr></thead>" +
+    "<tbody></tbody></table></div>";
+  const filters = root.querySelector(".vt-filters"), scroll = root.querySelector(".vt-scroll");
+  const body = root.querySelector("tbody"), count = root.querySelector(".vt-count");
+
+  const query = document.createElement("input");
+  query.type = "search";
+  query.placeholder = options.placeholder || "Filter ...";
+  filters.appendChild(query);
+  const selects = (options.selects || []).filter(name => byName[name] && !byName[name].num).map(name => {
+    const c = byName[name], sel = document.createElement("select");
+    sel.add(new Option(`${name}: alle`, ""));
+    Array.from(c.rank.keys()).sort((a, b) => c.rank[a] - c.rank[b])
+      .forEach(k => sel.add(new Option(c.labels[k], String(k))));
+    sel.dataset.col = name;
+    filters.appendChild(sel);
+    return sel;
+  });
+
+  let rows = new Uint32Array(0), sortCol = -1, sortDir = 1;
+
+  function applyFilter() {
+    const q = query.value.trim().toLowerCase();
+    const text = cols.filter(c => !c.num).map(c => ({codes: c.codes,
+      hit: Uint8Array.from(c.labels, l => !q || l.toLowerCase().includes(q))}));
+    const fixed = selects.filter(s => s.value !== "").map(s => ({codes: byName[s.dataset.col].codes, k: +s.value}));
+    const out = new Uint32Array(n);
+    let m = 0;
+    for (let i = 0; i < n; i++) {
+      if (fixed.some(f => f.codes[i] !== f.k)) continue;
+      if (q && !text.some(t => t.hit[t.codes[i]])) continue;
+      out[m++] = i;
+    }
+    rows = out.slice(0, m);
+    applySort();
+  }
+
+  function applySort() {
+    if (sortCol >= 0) {
+      const c = cols[sortCol];
+      const key = c.num ? (i => c.v[i]) : (i => c.rank[c.codes[i]]);
+      rows.sort((a, b) => {
+        const x = key(a), y = key(b);
+        if (Number.isNaN(x)) return Number.isNaN(y) ? 0 : 1;
+        if (Number.isNaN(y)) return -1;
+        return (x - y) * sortDir || a - b;
+      });
+    }
+    root.querySelectorAll("th").forEach((th, j) =>
+      th.textContent = cols[j].name + (j === sortCol ? (sortDir > 0 ? " \\u25b2" : " \\u25bc") : ""));
+    count.textContent = `${rows.length} von ${n} Zeilen`;
+    scroll.scrollTop = 0;
+    draw();
+    if (options.onChange) options.onChange(api);
+  }
+
+  function draw() {
+    const first = Math.max(0, Math.floor(scroll.scrollTop / ROW) - OVERSCAN);
+    const last = Math.min(rows.length, first + Math.ceil(scroll.clientHeight / ROW) + 2 * OVERSCAN);
+    let html = `<tr class="vt-spacer" style="height:${first * ROW}px"><td colspan="${cols.length}"></td></tr>`;
+    for (let r = first; r < last; r++) {
+      const i = rows[r];
+      html += "<tr>" + cols.map(c => {
+        const t = c.text(i);
+        return c.name.startsWith("Status") ? `<td class="st-${esc(t)}">${esc(t)}</td>` : `<td>${esc(t)}</td>`;
+      }).join("") + "</tr>";
+    }
+    html += `<tr class="vt-spacer" style="height:${(rows.length - last) * ROW}px"><td colspan="${cols.length}"></td></tr>`;
+    body.innerHTML = html;
+  }
+
+  let pending = false;
+  scroll.addEventListener("scroll", () => {
+    if (pending) return;
+    pending = true;
+    requestAnimationFrame(() => { pending = false; draw(); });
+  });
+  root.querySelectorAll("th").forEach(th => th.addEventListener("click", () => {
+    const j = Number(th.dataset.col);
+    sortDir = sortCol === j ? -sortDir : 1;
+    sortCol = j;
+    applySort();
+  }));
+  query.addEventListener("input", applyFilter);
+  selects.forEach(s => s.addEventListener("change", applyFilter));
+
+  const api = {
+    select(name, label) {
+      const s = selects.find(s => s.dataset.col === name), c = byName[name];
+      if (!s) return;
+      const k = c.labels.indexOf(label);
+      s.value = k < 0 ? "" : String(k);
+      applyFilter();
+    },
+    selected(name) {
+      const s = selects.find(s => s.dataset.col === name);
+      return s && s.value !== "" ? byName[name].labels[+s.value] : null;
+    },
+  };
+  applyFilter();
+  return api;
+}
+"""
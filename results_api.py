@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Query API and CLI over the validation outputs.
+
+validate_nandrad writes one directory per case variant,
+
+    <out_dir>/Case{case}_{variant}/Case{case}_{variant}_{metric}_{kind}.tsv
+
+(kind: hourly, monthly_sum, yearly_sum, hourly_global_max, ...) plus the
+per-case tables aggregates, validation_report and solver_stats. open_run()
+indexes such a directory once and answers queries from the index instead of
+the individual files:
+
+    run = open_run("validation_results")
+    run.checks(case="9*", status="FAIL")               # all FAILs of the 9xx cases
+    run.aggregates(metric="heating_*", engine="NANDRAD")
+    view = run.hourly("600", "v1", "Heizenergie")      # memory-mapped hourly matrix
+    view.column("NANDRAD"), view.frame()
+
+<out_dir>/.results_index/ holds
+- files.tsv: one row per output file (case, variant, metric, kind, size, mtime),
+- aggregates.tsv, checks.tsv, solver_stats.tsv: the per-case tables of all
+  cases concatenated,
+- hourly/: the hourly TSVs as .npy matrices (converted on first access),
+  opened with mmap so only the touched columns are read, with a content
+  hash per series (hourly_hashes(), see compare_results.py).
+
+Opening a run lists the case directories (no file is read) and re-reads
+only the per-case tables whose size or modification time changed.
+Filters accept a value, a list of values or shell patterns ("9*").
+
+    python results_api.py checks --case "9*" --status FAIL
+    python results_api.py aggregates --metric "heating_*" --engine NANDRAD --tsv
+    python results_api.py hourly -c 600 -m Lufttemperatur
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from run_all_validations import setup_logging
+
+
+INDEX_DIR = ".results_index"
+RUN_DIR_REGEX = re.compile(r"Case(\w+?)_(v\d\w*)")
+FILE_COLUMNS = ["case", "variant", "metric", "kind", "file", "size", "mtime_ns"]
+# Only empty fields are missing values ("N/A" is a check status)
+READ_OPTIONS = dict(sep="\t", keep_default_na=False, na_values=[""])
+
+# Per-case tables (whole file name after the prefix) and the consolidated index table of each
+TABLE_KINDS = {"aggregates": "aggregates", "validation_report": "checks", "solver_stats": "solver_stats"}
+OTHER_TABLE_KINDS = ("agreement_stats", "render", "stream")
+# Per-metric outputs, longest suffix first
+SERIES_KINDS = ("hourly_global_mean", "hourly_global_max", "hourly_global_min",
+                "monthly_mean_points", "monthly_max_points", "monthly_min_points",
+                "monthly_integral", "monthly_max", "monthly_sum", "yearly_sum", "hourly")
+
+Filter = Union[None, str, Sequence[str]]
+
+
+# =========================
+# File names
+# =========================
+
+def output_path(out_dir: Union[str, Path], case: str, variant: str, metric: str, kind: str) -> Path:
+    """Path of a validate_nandrad output; metric is empty for the per-case tables."""
+    tag = f"Case{case}_{variant}"
+    name = f"{tag}_{metric}_{kind}.tsv" if metric else f"{tag}_{kind}.tsv"
+    return Path(out_dir) / tag / name
+
+
+def split_name(rest: str) -> tuple[str, str]:
+    """(metric, kind) of a file name without the 'Case{case}_{variant}_' prefix and '.tsv'."""
+    if rest in TABLE_KINDS or rest in OTHER_TABLE_KINDS:
+        return "", rest
+    for kind in SERIES_KINDS:
+        if rest.endswith("_" + kind):
+            return rest[:-len(kind) - 1], kind
+    return rest, ""
+
+
+def _match(values: pd.Series, pattern: Filter) -> pd.Series:
+    """Rows whose value equals one of the given values or matches one of the shell patterns."""
+    if pattern is None:
+        return pd.Series(True, index=values.index)
+    patterns = [pattern] if isinstance(pattern, str) else list(pattern)
+    text = values.astype(str)
+    mask = pd.Series(False, index=values.index)
+    for p in patterns:
+        if any(ch in p for ch in "*?["):
+            mask |= text.str.match(fnmatch.translate(p))
+        else:
+            mask |= text == p
+    return mask
+
+
+def _write_tsv(df: pd.DataFrame, path: Path) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    df.to_csv(tmp, sep="\t", index=False)
+    os.replace(tmp, path)
+
+
+# =========================
+# Hourly views
+# =========================
+
+@dataclass
+class HourlyView:
+    """Hourly matrix of one metric (rows: hours, columns: engines), memory-mapped from the index."""
+    case: str
+    variant: str
+    metric: str
+    columns: list[str]
+    times: np.ndarray       # datetime64[ns], memory-mapped
+    values: np.ndarray      # float64 (hours x engines), memory-mapped
+
+    def column(self, engine: str) -> np.ndarray:
+        return self.values[:, self.columns.index(engine)]
+
+    def frame(self, engines: Filter = None) -> pd.DataFrame:
+        """The matrix (or the selected engines) as DataFrame; reads only those columns."""
+        names = pd.Series(self.columns)
+        idx = np.flatnonzero(_match(names, engines).to_numpy())
+        return pd.DataFrame(self.values[:, idx], index=pd.DatetimeIndex(self.times, name="Datetime"),
+                            columns=[self.columns[i] for i in idx])
+
+
+# =========================
+# Run
+# =========================
+
+class ResultsRun:
+    """Indexed view of one validation output directory (see open_run)."""
+
+    def __init__(self, out_dir: Path, refresh: bool = True):
+        self.out_dir = Path(out_dir)
+        self.index_dir = self.out_dir / INDEX_DIR
+        self.files = self._read_index("files.tsv", FILE_COLUMNS)
+        self.tables = {name: self._read_index(f"{name}.tsv") for name in TABLE_KINDS.values()}
+        if refresh:
+            self.refresh()
+
+    def _read_index(self, name: str, columns: Optional[list[str]] = None) -> pd.DataFrame:
+        path = self.index_dir / name
+        if path.exists():
+            if name == "files.tsv":
+                return pd.read_csv(path, sep="\t", dtype=str, keep_default_na=False).astype(
+                    {"size": "int64", "mtime_ns": "int64"})
+            return pd.read_csv(path, dtype={"case": str, "variant": str}, **READ_OPTIONS)
+        return pd.DataFrame(columns=columns or ["case", "variant"])
+
+    def scan(self) -> pd.DataFrame:
+        """Index rows of all output files (directory listing and stat only)."""
+        rows = []
+        if self.out_dir.is_dir():
+            for run_dir in os.scandir(self.out_dir):
+                m = RUN_DIR_REGEX.fullmatch(run_dir.name)
+                if not m or not run_dir.is_dir():
+                    continue
+                prefix = run_dir.name + "_"
+                for entry in os.scandir(run_dir.path):
+                    if not (entry.name.startswith(prefix) and entry.name.endswith(".tsv")):
+                        continue
+                    metric, kind = split_name(entry.name[len(prefix):-len(".tsv")])
+                    st = entry.stat()
+                    rows.append((m.group(1), m.group(2), metric, kind, f"{run_dir.name}/{entry.name}",
+                                 st.st_size, st.st_mtime_ns))
+        files = pd.DataFrame(rows, columns=FILE_COLUMNS)
+        return files.sort_values(["case", "variant", "kind", "metric"], kind="stable").reset_index(drop=True)
+
+    def refresh(self) -> int:
+        """Update the index from the output directory; re-reads only changed per-case tables.
+
+        Returns the number of re-read tables.
+        """
+        files = self.scan()
+        known = set(zip(self.files["file"], self.files["size"], self.files["mtime_ns"]))
+        changed = files[[(f, s, t) not in known for f, s, t in zip(files["file"], files["size"], files["mtime_ns"])]]
+        removed = set(self.files["file"]) - set(files["file"])
+        if changed.empty and not removed:
+            return 0
+
+        n_read = 0
+        stale = pd.concat([changed, self.files[self.files["file"].isin(removed)]])
+        for kind, name in TABLE_KINDS.items():
+            table = self.tables[name]
+            of_kind = stale[stale["kind"] == kind]
+            stale_runs = set(zip(of_kind["case"], of_kind["variant"]))
+            if stale_runs and not table.empty:
+                keep = [(c, v) not in stale_runs for c, v in zip(table["case"], table["variant"])]
+                table = table[keep]
+            frames = [table] if not table.empty else []
+            for row in changed[changed["kind"] == kind].itertuples(index=False):
+                df = pd.read_csv(self.out_dir / row.file, **READ_OPTIONS)
+                df = df.drop(columns=["case", "Case"], errors="ignore")
+                df.insert(0, "variant", row.variant)
+                df.insert(0, "case", row.case)
+                frames.append(df)
+                n_read += 1
+            self.tables[name] = (pd.concat(frames, ignore_index=True) if frames
+                                 else pd.DataFrame(columns=["case", "variant"]))
+
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        for name, table in self.tables.items():
+            _write_tsv(table, self.index_dir / f"{name}.tsv")
+        _write_tsv(files, self.index_dir / "files.tsv")
+        self.files = files
+        logging.info("Results index %s: %d file(s), %d table(s) re-read", self.index_dir, len(files), n_read)
+        return n_read
+
+    # -------------------------
+    # Queries
+    # -------------------------
+
+    @staticmethod
+    def _select(df: pd.DataFrame, **filters: Filter) -> pd.DataFrame:
+        mask = pd.Series(True, index=df.index)
+        for column, pattern in filters.items():
+            if pattern is not None and column in df.columns:
+                mask &= _match(df[column], pattern)
+        return df[mask].reset_index(drop=True)
+
+    def runs(self, case: Filter = None, variant: Filter = None) -> pd.DataFrame:
+        """All (case, variant) pairs with outputs."""
+        return self._select(self.files[["case", "variant"]].drop_duplicates(), case=case, variant=variant)
+
+    def list_files(self, case: Filter = None, variant: Filter = None, metric: Filter = None,
+                   kind: Filter = None) -> pd.DataFrame:
+        return self._select(self.files, case=case, variant=variant, metric=metric, kind=kind)
+
+    def aggregates(self, case: Filter = None, variant: Filter = None, metric: Filter = None,
+                   engine: Filter = None) -> pd.DataFrame:
+        """Long aggregates table (case, variant, metric, engine, value)."""
+        return self._select(self.tables["aggregates"], case=case, variant=variant, metric=metric, engine=engine)
+
+    def checks(self, case: Filter = None, variant: Filter = None, metric: Filter = None,
+               status: Filter = None) -> pd.DataFrame:
+        """Rows of the per-case validation reports (Metrik, values, Ref Min/Max, Status per engine)."""
+        return self._select(self.tables["checks"], case=case, variant=variant, Metrik=metric, Status=status)
+
+    def solver_stats(self, case: Filter = None, variant: Filter = None, engine: Filter = None,
+                     statistic: Filter = None) -> pd.DataFrame:
+        return self._select(self.tables["solver_stats"], case=case, variant=variant, engine=engine,
+                            statistic=statistic)
+
+    def _hourly_cache(self, case: str, variant: str, metric: str) -> tuple[Path, dict]:
+        """Cache path stem and metadata (columns, series hashes) of one hourly output, converting the
+        TSV if the cache is missing or older than the file."""
+        rows = self.list_files(case=case, variant=variant, kind="hourly")
+        rows = rows[rows["metric"] == metric]
+        if rows.empty:
+            raise KeyError(f"No hourly output {metric} for Case {case} ({variant})")
+        row = rows.iloc[0]
+        cache = self.index_dir / "hourly" / f"Case{case}_{variant}_{metric}"
+        meta_path = cache.with_suffix(".json")
+        stamp = [int(row["size"]), int(row["mtime_ns"])]
+        meta = json.loads(meta_path.read_text(encoding="utf-8")) if meta_path.exists() else {}
+        if meta.get("source") != stamp or "hashes" not in meta:
+            df = pd.read_csv(self.out_dir / row["file"], sep="\t", index_col=0, parse_dates=True)
+            values = np.asfortranarray(df.to_numpy(dtype="float64"))
+            times = df.index.to_numpy(dtype="datetime64[ns]")
+            cache.parent.mkdir(parents=True, exist_ok=True)
+            np.save(cache.with_suffix(".values.npy"), np.ascontiguousarray(values))
+            np.save(cache.with_suffix(".times.npy"), times)
+            # content hash per series (time stamps + values), used to skip identical series in comparisons
+            times_hash = hashlib.sha1(times.tobytes()).digest()
+            meta = {
+                "source": stamp,
+                "columns": [str(c) for c in df.columns],
+                "hashes": [hashlib.sha1(times_hash + values[:, j].tobytes()).hexdigest()
+                           for j in range(values.shape[1])],
+            }
+            meta_path.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+        return cache, meta
+
+    def hourly_hashes(self, case: str, variant: str, metric: str) -> dict[str, str]:
+        """Content hash of each series (engine) of one hourly output."""
+        _, meta = self._hourly_cache(case, variant, metric)
+        return dict(zip(meta["columns"], meta["hashes"]))
+
+    def hourly(self, case: str, variant: str, metric: str) -> HourlyView:
+        """Memory-mapped hourly matrix of one metric; the TSV is converted on first access."""
+        cache, meta = self._hourly_cache(case, variant, metric)
+        return HourlyView(case=case, variant=variant, metric=metric, columns=meta["columns"],
+                          times=np.load(cache.with_suffix(".times.npy"), mmap_mode="r"),
+                          values=np.load(cache.with_suffix(".values.npy"), mmap_mode="r"))
+
+    def hourly_views(self, case: Filter = None, variant: Filter = None,
+                     metric: Filter = None) -> Iterator[HourlyView]:
+        """Hourly views of all matching outputs, opened one at a time."""
+        for row in self.list_files(case=case, variant=variant, metric=metric, kind="hourly").itertuples(index=False):
+            yield self.hourly(row.case, row.variant, row.metric)
+
+
+def open_run(out_dir: Union[str, Path] = "validation_results", refresh: bool = True) -> ResultsRun:
+    """Open (and with refresh=True update) the index of a validation output directory."""
+    return ResultsRun(Path(out_dir), refresh=refresh)
+
+
+# =========================
+# CLI
+# =========================
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Query validation outputs (checks, aggregates, solver statistics, hourly values) "
+                    "from the results index."
+    )
+    parser.add_argument("table", choices=["checks", "aggregates", "solver", "files", "runs", "hourly"],
+                        help="What to query")
+    parser.add_argument("--out-dir", type=Path, default=Path.cwd() / "validation_results",
+                        help="Validation output directory (default: validation_results)")
+    parser.add_argument("-c", "--case", action="append", default=None,
+                        help="Case or shell pattern, e.g. 600 or '9*' (repeatable)")
+    parser.add_argument("-v", "--variant", action="append", default=None, help="Variant or pattern (repeatable)")
+    parser.add_argument("-m", "--metric", action="append", default=None,
+                        help="Metric (aggregates: e.g. heating_Jan; checks: Metrik; hourly/files: file name part)")
+    parser.add_argument("-e", "--engine", action="append", default=None, help="Engine or pattern (repeatable)")
+    parser.add_argument("-s", "--status", action="append", default=None, help="Check status (checks only)")
+    parser.add_argument("--statistic", action="append", default=None, help="Solver statistic (solver only)")
+    parser.add_argument("--kind", action="append", default=None, help="Output kind (files only), e.g. hourly")
+    parser.add_argument("--no-refresh", action="store_true", help="Answer from the existing index only")
+    parser.add_argument("--tsv", action="store_true", help="Write TSV instead of an aligned table")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    setup_logging()
+    args = parse_args(argv)
+    run = open_run(args.out_dir, refresh=not args.no_refresh)
+
+    if args.table == "checks":
+        df = run.checks(args.case, args.variant, args.metric, args.status)
+    elif args.table == "aggregates":
+        df = run.aggregates(args.case, args.variant, args.metric, args.engine)
+    elif args.table == "solver":
+        df = run.solver_stats(args.case, args.variant, args.engine, args.statistic)
+    elif args.table == "files":
+        df = run.list_files(args.case, args.variant, args.metric, args.kind)
+    elif args.table == "runs":
+        df = run.runs(args.case, args.variant)
+    else:
+        frames = [view.frame(args.engine).add_prefix(f"{view.case}_{view.variant}_{view.metric}: ")
+                  for view in run.hourly_views(args.case, args.variant, args.metric)]
+        df = pd.concat(frames, axis=1).reset_index() if frames else pd.DataFrame()
+
+    if args.tsv:
+        df.to_csv(sys.stdout, sep="\t", index=False)
+    elif df.empty:
+        logging.info("No matching rows.")
+    else:
+        with pd.option_context("display.max_rows", None, "display.width", 200):
+            print(df.to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
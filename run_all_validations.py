@@ -4,23 +4,63 @@
 """
 Batch runner for BESTEST validation suite.
 
-Discovers all available NANDRAD test cases, runs validate_nandrad.py for each,
-collects per-case validation reports, and generates an overview report (TSV + HTML).
+Discovers all available NANDRAD test cases and runs them as a staged pipeline
+
+    generate -> simulate -> validate -> render -> summarize
+
+with bounded queues between the stages, so that case N+1 is simulated while
+case N is validated and case N-1 rendered. Each of the middle stages is a
+validate_nandrad.py --stage run; several cases are simulated concurrently
+(solver threads per case are planned from the measured runtimes of earlier
+runs, see scheduler.py). The summary checks all per-case aggregates against
+the reference bands in one vectorized pass and generates an overview report
+(TSV + HTML).
+
+Completed stages are recorded in <out-dir>/suite_state.tsv. With --resume an
+interrupted suite continues with the first stage not yet completed for each
+case (interrupted NANDRAD runs continue from their restart point); a stage
+counts as not completed if the case's project file changed after it.
+
+With --quick only the simulate stage runs, for NANDRAD only (EnergyPlus
+does not depend on the solver build); the annual, peak and free-float
+aggregates are read straight from the NANDRAD results (only the needed
+columns) and the overview is written to <out-dir>/quick/.
+
+With --site DIR the static result site (overview, case dashboards, search
+index) is updated afterwards; only pages with changed inputs are rebuilt
+(build_site.py).
 """
 
 from __future__ import annotations
 
 import argparse
+import json
+import queue
 import re
-import shutil
 import subprocess
 import sys
 import logging
+import threading
+import time
 from pathlib import Path
-from typing import Optional, Sequence
+from typing import Callable, Optional, Sequence
 
 import pandas as pd
 
+from build_site import build_site
+from extract_references import ensure_references
+from generate_nandrad_cases import CASES as GENERATED_CASES, generate_cases, write_if_changed
+from program_references import (ProgramMatrix, load_program_matrix, program_ranks,
+                                sensitivity_bands, to_program_report)
+from reference_checks import (AGGREGATE_COLUMNS, ANNUAL_METRICS, REPORT_COLUMNS, SENSITIVITY_BASES,
+                              check_references, delta_aggregates, load_reference_table, read_aggregates,
+                              to_report)
+from report_tables import TABLE_CSS, TABLE_SCRIPT, html_table, md_rows, md_table, table_json
+from scheduler import (Scaling, append_history, available_cores, fit_scaling, history_from_stats, load_history,
+                       run_scheduled)
+from solver_stats import STATS_COLUMNS, read_solver_stats, to_solver_report
+from validate_nandrad import nandrad_aggregates, read_nandrad_hourly, restart_point
+
 
 # ---------------------------------------------------------------------------
 # Logging
@@ -71,8 +111,14 @@ def run_single_case(
     skip_run: bool,
     out_dir: Path,
     data_dir: Path,
+    threads: Optional[int] = None,
+    stage: str = "all",
+    resume: bool = False,
+    plot_files: bool = False,
+    ep_sqlite: bool = False,
+    skip_energyplus: bool = False,
 ) -> tuple[str, int, str]:
-    """Run validate_nandrad.py for one case. Returns (case, returncode, stderr)."""
+    """Run validate_nandrad.py (one stage) for one case. Returns (case, returncode, stderr)."""
     cmd = [
         sys.executable, "validate_nandrad.py",
         f"-c={case}",
@@ -84,20 +130,147 @@ def run_single_case(
     ]
     if skip_run:
         cmd.append("--skip-run")
-
-    logging.info("Running Case %s ...", case)
+    elif threads:
+        cmd.append(f"--nandrad-threads={threads}")
+    if resume and not skip_run:
+        cmd.append("--resume")
+    if plot_files:
+        cmd.append("--plot-files")
+    if ep_sqlite:
+        cmd.append("--ep-sqlite")
+    if skip_energyplus:
+        cmd.append("--skip-energyplus")
+    if stage != "all":
+        cmd.append(f"--stage={stage}")
+
+    logging.info("Running Case %s (%s) ...", case, stage)
     result = subprocess.run(cmd, capture_output=True, text=True)
     if result.returncode != 0:
-        logging.warning("Case %s exited with code %d", case, result.returncode)
+        logging.warning("Case %s (%s) exited with code %d", case, stage, result.returncode)
         if result.stderr:
             # Show last few lines of stderr
             for line in result.stderr.strip().splitlines()[-5:]:
                 logging.warning("  stderr: %s", line)
     else:
-        logging.info("Case %s finished successfully.", case)
+        logging.info("Case %s (%s) finished successfully.", case, stage)
     return case, result.returncode, result.stderr
 
 
+# ---------------------------------------------------------------------------
+# Suite state (--resume)
+# ---------------------------------------------------------------------------
+
+SUITE_STATE = "suite_state.tsv"
+STATE_COLUMNS = ["case", "variant", "stage", "finished"]
+
+
+class SuiteState:
+    """Completed pipeline stages per case, appended to suite_state.tsv as they finish."""
+
+    def __init__(self, out_dir: Path, variant: str, cases: list[str], resume: bool):
+        self.path = out_dir / SUITE_STATE
+        self.variant = variant
+        self._lock = threading.Lock()
+        state = pd.DataFrame(columns=STATE_COLUMNS)
+        if self.path.exists():
+            state = pd.read_csv(self.path, sep="\t", dtype={"case": str, "variant": str, "stage": str})
+        if not resume:
+            # a fresh run of these cases forgets their earlier stages
+            state = state[~(state["case"].isin(cases) & (state["variant"] == variant))]
+        if not resume or not self.path.exists():
+            # mark() only appends rows, so the file must start with the header
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            state.to_csv(self.path, sep="\t", index=False)
+        own = state[state["variant"] == variant]
+        self.finished = {(c, st): float(t) for c, st, t in own[["case", "stage", "finished"]].itertuples(index=False)}
+
+    def is_done(self, case: str, stage: str, changed: float = 0.0) -> bool:
+        """True if the stage finished for the case after `changed` (mtime of its inputs)."""
+        return self.finished.get((case, stage), -1.0) > changed
+
+    def mark(self, case: str, stage: str) -> None:
+        with self._lock:
+            self.finished[(case, stage)] = time.time()
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(f"{case}\t{self.variant}\t{stage}\t{self.finished[(case, stage)]:.3f}\n")
+
+
+# ---------------------------------------------------------------------------
+# Pipeline
+# ---------------------------------------------------------------------------
+
+def run_pipeline(
+    cases: list[str],
+    run_stage: Callable[[str, str, Optional[int]], tuple[str, int, str]],
+    cores: int,
+    post_jobs: int,
+    scaling: dict[str, Scaling],
+    max_threads: Optional[int] = None,
+    queue_size: int = 4,
+) -> dict[str, int]:
+    """Run simulate -> validate -> render for all cases with bounded queues between the stages.
+
+    run_stage(case, stage, threads) returns (case, returncode, stderr). The
+    simulate stage is scheduled on `cores - 2 * post_jobs` cores (see
+    scheduler.run_scheduled); validate and render each run `post_jobs`
+    workers. A full queue blocks the stage in front of it, so no stage runs
+    more than `queue_size` cases ahead of the next one. Returns the exit
+    code per case (simulate/validate; render failures are only logged).
+    """
+    to_validate: queue.Queue = queue.Queue(maxsize=queue_size)
+    to_render: queue.Queue = queue.Queue(maxsize=queue_size)
+    exit_codes: dict[str, int] = {}
+    render_failed: list[str] = []
+
+    def simulate(case: str, threads: int) -> int:
+        try:
+            _, rc, _ = run_stage(case, "simulate", threads)
+        except Exception as exc:
+            logging.error("Case %s (simulate) could not be started: %s", case, exc)
+            rc = 1
+        exit_codes[case] = rc
+        to_validate.put(case)
+        return rc
+
+    def post_worker(stage: str, inbox: queue.Queue, outbox: Optional[queue.Queue]) -> None:
+        while (case := inbox.get()) is not None:
+            if exit_codes.get(case) == 0:
+                try:
+                    _, rc, _ = run_stage(case, stage, None)
+                except Exception as exc:
+                    logging.error("Case %s (%s) could not be started: %s", case, stage, exc)
+                    rc = 1
+                if stage == "render":
+                    if rc != 0:
+                        render_failed.append(case)
+                else:
+                    exit_codes[case] = rc
+            if outbox is not None:
+                outbox.put(case)
+
+    validators = [threading.Thread(target=post_worker, args=("validate", to_validate, to_render), daemon=True)
+                  for _ in range(post_jobs)]
+    renderers = [threading.Thread(target=post_worker, args=("render", to_render, None), daemon=True)
+                 for _ in range(post_jobs)]
+    for worker in validators + renderers:
+        worker.start()
+
+    start = time.perf_counter()
+    run_scheduled(cases, simulate, cores=max(cores - 2 * post_jobs, 1), scaling=scaling, max_threads=max_threads)
+    logging.info("Simulate stage finished after %.0f s", time.perf_counter() - start)
+
+    for stage_queue, workers in ((to_validate, validators), (to_render, renderers)):
+        for _ in workers:
+            stage_queue.put(None)
+        for worker in workers:
+            worker.join()
+    logging.info("Pipeline finished after %.0f s", time.perf_counter() - start)
+
+    if render_failed:
+        logging.warning("Rendering failed for Case(s): %s", ", ".join(sorted(render_failed)))
+    return exit_codes
+
+
 # ---------------------------------------------------------------------------
 # BESTEST case descriptions
 # ---------------------------------------------------------------------------
@@ -226,56 +399,130 @@ def get_case_info(case: str) -> tuple[str, str]:
 # Result collection
 # ---------------------------------------------------------------------------
 
-def collect_results(
+def collect_aggregates(
     cases: list[str],
     variant: str,
     out_dir: Path,
     exit_codes: dict[str, int],
+) -> tuple[pd.DataFrame, dict[str, str]]:
+    """Read Case*_aggregates.tsv written by validate_nandrad.py for all cases.
+
+    Returns the concatenated aggregates and {case: status} for cases
+    without readable aggregates.
+    """
+    frames: list[pd.DataFrame] = []
+    failed: dict[str, str] = {}
+    for case in cases:
+        agg_path = out_dir / f"Case{case}_{variant}" / f"Case{case}_{variant}_aggregates.tsv"
+        if not agg_path.exists():
+            # Case had an error or produced no results
+            failed[case] = "ERROR" if exit_codes.get(case, 1) != 0 else "N/A"
+            continue
+        try:
+            frames.append(read_aggregates(agg_path))
+        except Exception as exc:
+            logging.warning("Failed to read aggregates for Case %s: %s", case, exc)
+            failed[case] = "ERROR"
+
+    aggregates = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=AGGREGATE_COLUMNS)
+    return aggregates, failed
+
+
+def collect_results(
+    cases: list[str],
+    aggregates: pd.DataFrame,
+    failed: dict[str, str],
+    references: pd.DataFrame,
 ) -> pd.DataFrame:
-    """Read per-case validation_report.tsv files into a combined DataFrame."""
-    rows: list[dict] = []
+    """Check all aggregates against the references in one vectorized pass.
+
+    Returns the combined overview rows. Cases without aggregates or without
+    any reference band get a single placeholder row.
+    """
+    report = to_report(check_references(aggregates, references))
+
+    placeholders = pd.DataFrame([
+        {"Case": case, "Metrik": "(keine Ergebnisse)", "Status": failed.get(case, "N/A")}
+        for case in cases
+        if case in failed or case not in set(report["Case"])
+    ], columns=REPORT_COLUMNS).fillna("")
+
+    combined = pd.concat([report, placeholders], ignore_index=True)
+    combined["Case"] = pd.Categorical(combined["Case"], categories=cases, ordered=True)
+    combined = combined.sort_values("Case", kind="stable").reset_index(drop=True)
+    combined["Case"] = combined["Case"].astype(str)
+    return combined
+
+
+def quick_keys(case: str) -> tuple[str, ...]:
+    """NANDRAD series needed for the quick annual/peak (or free-float) checks of a case."""
+    return ("air_temp",) if case.upper().endswith("FF") else ("heating", "cooling")
+
+
+def collect_quick_aggregates(
+    cases: list[str],
+    variant: str,
+    data_dir: Path,
+    out_dir: Path,
+    exit_codes: dict[str, int],
+) -> tuple[pd.DataFrame, dict[str, str]]:
+    """Aggregates straight from the NANDRAD results, without the per-case validation (--quick).
+
+    Only the heating/cooling (or free-float air temperature) column of each
+    case is parsed and only the annual, peak and free-float metrics are kept
+    (no monthly sums). EnergyPlus/TRNSYS values do not depend on the solver
+    and are taken from the aggregates of the last full run, if there is one.
+    """
+    frames: list[pd.DataFrame] = []
+    failed: dict[str, str] = {}
     for case in cases:
-        report_path = out_dir / f"Case{case}_{variant}" / f"Case{case}_{variant}_validation_report.tsv"
-        if not report_path.exists():
-            # Case had an error or produced no report
-            rows.append({
-                "Case": case,
-                "Metrik": "(keine Ergebnisse)",
-                "NANDRAD": "",
-                "EnergyPlus": "",
-                "TRNSYS": "",
-                "Ref Min": "",
-                "Ref Max": "",
-                "Status": "ERROR" if exit_codes.get(case, 1) != 0 else "N/A",
-            })
+        if exit_codes.get(case, 0) != 0:
+            failed[case] = "ERROR"
             continue
         try:
-            df = pd.read_csv(report_path, sep="\t")
-            for _, row in df.iterrows():
-                rows.append({
-                    "Case": case,
-                    "Metrik": row.get("Metrik", ""),
-                    "NANDRAD": row.get("NANDRAD", ""),
-                    "EnergyPlus": row.get("EnergyPlus", ""),
-                    "TRNSYS": row.get("TRNSYS", ""),
-                    "Ref Min": row.get("Ref Min", ""),
-                    "Ref Max": row.get("Ref Max", ""),
-                    "Status": row.get("Status", "N/A"),
-                })
+            hourly = read_nandrad_hourly(data_dir / "nandrad" / f"Case{case}_{variant}" / "results", case,
+                                         quick_keys(case))
         except Exception as exc:
-            logging.warning("Failed to read report for Case %s: %s", case, exc)
-            rows.append({
-                "Case": case,
-                "Metrik": "(Fehler beim Lesen)",
-                "NANDRAD": "",
-                "EnergyPlus": "",
-                "TRNSYS": "",
-                "Ref Min": "",
-                "Ref Max": "",
-                "Status": "ERROR",
-            })
+            logging.warning("Failed to read NANDRAD results for Case %s: %s", case, exc)
+            failed[case] = "ERROR"
+            continue
+        if not hourly:
+            failed[case] = "N/A"
+            continue
+        frames.append(nandrad_aggregates(case, hourly))
 
-    return pd.DataFrame(rows)
+        agg_path = out_dir / f"Case{case}_{variant}" / f"Case{case}_{variant}_aggregates.tsv"
+        if agg_path.exists():
+            previous = read_aggregates(agg_path)
+            frames.append(previous[previous["engine"] != "NANDRAD"])
+
+    aggregates = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=AGGREGATE_COLUMNS)
+    return aggregates[aggregates["metric"].isin(ANNUAL_METRICS)].reset_index(drop=True), failed
+
+
+def read_all_solver_stats(cases: list[str], variant: str, out_dir: Path) -> pd.DataFrame:
+    """Read Case*_solver_stats.tsv of all cases into one long table."""
+    frames = []
+    for case in cases:
+        path = out_dir / f"Case{case}_{variant}" / f"Case{case}_{variant}_solver_stats.tsv"
+        if path.exists():
+            try:
+                frames.append(read_solver_stats(path))
+            except Exception as exc:
+                logging.warning("Failed to read solver statistics for Case %s: %s", case, exc)
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=STATS_COLUMNS)
+
+
+def collect_sensitivity(aggregates: pd.DataFrame, matrix: ProgramMatrix) -> pd.DataFrame:
+    """Check sensitivity deltas (e.g. 610-600) derived from the case aggregates.
+
+    No simulation results are re-read; the deltas come from the aggregates
+    of the validated cases and are checked against the min/max of the
+    published program deltas.
+    """
+    report = to_report(check_references(delta_aggregates(aggregates), sensitivity_bands(matrix)))
+    report.insert(1, "Basis", report["Case"].map(SENSITIVITY_BASES))
+    return report
 
 
 # ---------------------------------------------------------------------------
@@ -318,6 +565,9 @@ def write_overview_md(
     summary: pd.DataFrame,
     path: Path,
     variant: str,
+    programs: Optional[pd.DataFrame] = None,
+    sensitivity: Optional[pd.DataFrame] = None,
+    solver: Optional[pd.DataFrame] = None,
 ) -> None:
     """Generate a GitHub-compatible Markdown overview report."""
 
@@ -325,6 +575,8 @@ def write_overview_md(
     total_pass = int((summary["Ergebnis"] == "PASS").sum())
     total_fail = int((summary["Ergebnis"] == "FAIL").sum())
     total_error = int((summary["Ergebnis"] == "ERROR").sum())
+    results = summary["Ergebnis"].replace({"FAIL": "**FAIL**", "ERROR": "**ERROR**"})
+    titles = summary["Case"].astype(str).map(lambda c: get_case_info(c)[0])
 
     lines: list[str] = []
     lines.append(f"# BESTEST Validation Overview ({variant})")
@@ -337,38 +589,54 @@ def write_overview_md(
     lines.append("")
     lines.append("| Case | Beschreibung | Metriken | PASS | FAIL | SKIP | Ergebnis |")
     lines.append("|------|-------------|----------|------|------|------|----------|")
-    for _, row in summary.iterrows():
-        c_title, _ = get_case_info(str(row["Case"]))
-        res = row["Ergebnis"]
-        emoji = {"PASS": "PASS", "FAIL": "**FAIL**", "ERROR": "**ERROR**"}.get(res, res)
-        lines.append(
-            f'| {row["Case"]} | {c_title} | {row["Metriken"]} '
-            f'| {row["PASS"]} | {row["FAIL"]} | {row["SKIP/N/A"]} | {emoji} |'
-        )
+    lines.extend(md_rows(pd.DataFrame({
+        "Case": summary["Case"], "Beschreibung": titles, "Metriken": summary["Metriken"], "PASS": summary["PASS"],
+        "FAIL": summary["FAIL"], "SKIP": summary["SKIP/N/A"], "Ergebnis": results,
+    })).tolist() if not summary.empty else [])
     lines.append("")
 
-    # Detail sections per case
+    # Detail sections per case: all metric rows at once, then split by case
     lines.append("## Details")
     lines.append("")
-    for case, grp in combined.groupby("Case", sort=False):
+    case_results = dict(zip(summary["Case"], results))
+    detail_columns = ["Metrik", "NANDRAD", "EnergyPlus", "TRNSYS", "Ref Min", "Ref Max", "Status"]
+    rows = md_rows(combined.reindex(columns=detail_columns)) if not combined.empty else pd.Series(dtype=str)
+    for case, case_rows in rows.groupby(combined["Case"], sort=False):
         c_title, c_desc = get_case_info(str(case))
-        case_res = summary.loc[summary["Case"] == case, "Ergebnis"].iloc[0]
-        res_label = {"PASS": "PASS", "FAIL": "**FAIL**", "ERROR": "**ERROR**"}.get(case_res, case_res)
-
-        lines.append(f"### Case {case} — {c_title} {res_label}")
+        lines.append(f"### Case {case} — {c_title} {case_results[case]}")
         if c_desc:
             lines.append(f"_{c_desc}_")
         lines.append("")
         lines.append("| Metrik | NANDRAD | EnergyPlus | TRNSYS | Ref Min | Ref Max | Status |")
         lines.append("|--------|---------|------------|--------|---------|---------|--------|")
-        for _, row in grp.iterrows():
-            st = str(row["Status"])
-            st_fmt = f"**{st}**" if st == "FAIL" else st
-            lines.append(
-                f'| {row["Metrik"]} | {row["NANDRAD"]} '
-                f'| {row.get("EnergyPlus", "")} | {row.get("TRNSYS", "")} '
-                f'| {row["Ref Min"]} | {row["Ref Max"]} | {st_fmt} |'
-            )
+        lines.extend(case_rows.tolist())
+        lines.append("")
+
+    # Sensitivity deltas between cases
+    if sensitivity is not None and not sensitivity.empty:
+        lines.append("## Sensitivitätstests")
+        lines.append("")
+        lines.append("Differenz Case minus Basis-Case, Referenzband aus den Programmergebnissen.")
+        lines.append("")
+        lines.extend(md_table(sensitivity))
+        lines.append("")
+
+    # NANDRAD among the individual reference programs
+    if programs is not None and not programs.empty:
+        lines.append("## Vergleich mit den Referenzprogrammen")
+        lines.append("")
+        lines.append("Rang: Position von NANDRAD unter allen Programmergebnissen (1 = kleinster Wert).")
+        lines.append("")
+        lines.extend(md_table(programs))
+        lines.append("")
+
+    # Runtime and solver effort per case
+    if solver is not None and not solver.empty:
+        lines.append("## Rechenaufwand")
+        lines.append("")
+        lines.append("Laufzeiten und Solverstatistik (NANDRAD-Log, EnergyPlus eplusout.end/.err).")
+        lines.append("")
+        lines.extend(md_table(solver))
         lines.append("")
 
     path.write_text("\n".join(lines), encoding="utf-8")
@@ -380,8 +648,17 @@ def write_overview_html(
     summary: pd.DataFrame,
     path: Path,
     variant: str,
+    programs: Optional[pd.DataFrame] = None,
+    sensitivity: Optional[pd.DataFrame] = None,
+    solver: Optional[pd.DataFrame] = None,
 ) -> None:
-    """Generate a self-contained HTML overview report."""
+    """Generate a self-contained HTML overview report.
+
+    The metric rows of all cases are embedded once as column-wise JSON and
+    rendered in the browser (report_tables.TABLE_SCRIPT); #case-{N} selects
+    a case and shows its description and comparison figure. The element
+    #case-links maps cases to further pages (filled in by build_site.py).
+    """
 
     total_cases = len(summary)
     total_pass = (summary["Ergebnis"] == "PASS").sum()
@@ -412,73 +689,60 @@ def write_overview_html(
         return "#fff3cd"
 
     # Summary table rows
-    summary_rows = []
-    for _, row in summary.iterrows():
-        res = row["Ergebnis"]
-        bg = _result_bg(res)
-        clr = _result_color(res)
-        c_title, _ = get_case_info(str(row["Case"]))
-        summary_rows.append(
-            f'<tr>'
-            f'<td><a href="#case-{row["Case"]}">{row["Case"]}</a></td>'
-            f'<td>{c_title}</td>'
-            f'<td>{row["Metriken"]}</td>'
-            f'<td>{row["PASS"]}</td>'
-            f'<td>{row["FAIL"]}</td>'
-            f'<td>{row["SKIP/N/A"]}</td>'
-            f'<td style="background:{bg};color:{clr};font-weight:bold;">{res}</td>'
-            f'</tr>'
-        )
-
-    # Per-case detail sections
-    detail_sections = []
-    for case, grp in combined.groupby("Case", sort=False):
-        case_res = summary.loc[summary["Case"] == case, "Ergebnis"].iloc[0]
-        res_bg = _result_bg(case_res)
-        res_clr = _result_color(case_res)
-        c_title, c_desc = get_case_info(str(case))
-
-        metric_rows = []
-        for _, row in grp.iterrows():
-            st = str(row["Status"])
-            bg = _status_bg(st)
-            metric_rows.append(
-                f'<tr>'
-                f'<td>{row["Metrik"]}</td>'
-                f'<td>{row["NANDRAD"]}</td>'
-                f'<td>{row.get("EnergyPlus", "")}</td>'
-                f'<td>{row.get("TRNSYS", "")}</td>'
-                f'<td>{row["Ref Min"]}</td>'
-                f'<td>{row["Ref Max"]}</td>'
-                f'<td style="background:{bg};font-weight:bold;">{st}</td>'
-                f'</tr>'
-            )
+    case_ids = summary["Case"].astype(str)
+    info = case_ids.map(get_case_info)
+    res = summary["Ergebnis"].astype(str)
+    summary_rows = "".join(
+        '<tr><td><a href="#case-' + case_ids + '">' + case_ids + "</a></td>"
+        + "<td>" + info.str[0] + "</td>"
+        + "<td>" + summary["Metriken"].astype(str) + "</td>"
+        + "<td>" + summary["PASS"].astype(str) + "</td>"
+        + "<td>" + summary["FAIL"].astype(str) + "</td>"
+        + "<td>" + summary["SKIP/N/A"].astype(str) + "</td>"
+        + '<td style="background:' + res.map(_result_bg) + ";color:" + res.map(_result_color)
+        + ';font-weight:bold;">' + res + "</td></tr>"
+    )
 
-        desc_html = f'<p style="color:#555;margin:4px 0 8px 0;">{c_desc}</p>' if c_desc else ""
+    # Per-case details (shown above the metric table when a case is selected)
+    case_info = {
+        case: {
+            "title": title,
+            "description": desc,
+            "result": result,
+            "background": _result_bg(result),
+            "color": _result_color(result),
+            "comparison": f"comparison/Case{case}_{variant}_comprehensive_comparison.svg",
+        }
+        for case, (title, desc), result in zip(case_ids, info, res)
+    }
+    case_json = json.dumps(case_info, ensure_ascii=False).replace("</", "<\\/")
+
+    # Sensitivity deltas between cases
+    sensitivity_html = ""
+    if sensitivity is not None and not sensitivity.empty:
+        sensitivity_html = f"""
+<h2>Sensitivitätstests</h2>
+<p class="subtitle">Differenz Case minus Basis-Case, Referenzband aus den Programmergebnissen.</p>
+{html_table(sensitivity, _status_bg)}
+"""
 
-        # Embed comparison SVG if available
-        svg_name = f"Case{case}_{variant}_comprehensive_comparison.svg"
-        svg_html = (
-            f'<div style="margin:12px 0;">'
-            f'<img src="comparison/{svg_name}" alt="Case {case} Comparison" '
-            f'style="max-width:100%;border:1px solid #ddd;border-radius:4px;">'
-            f'</div>'
-        )
+    # NANDRAD among the individual reference programs
+    program_html = ""
+    if programs is not None and not programs.empty:
+        program_html = f"""
+<h2>Vergleich mit den Referenzprogrammen</h2>
+<p class="subtitle">Rang: Position von NANDRAD unter allen Programmergebnissen (1 = kleinster Wert).</p>
+{html_table(programs)}
+"""
 
-        detail_sections.append(f"""
-<details id="case-{case}">
-<summary style="cursor:pointer;font-size:1.15em;margin:12px 0 4px;">
-  Case {case} &mdash; {c_title}
-  <span style="background:{res_bg};color:{res_clr};padding:2px 8px;border-radius:4px;font-weight:bold;font-size:0.9em;">{case_res}</span>
-</summary>
-{desc_html}<table>
-<thead><tr><th>Metrik</th><th>NANDRAD</th><th>EnergyPlus</th><th>TRNSYS</th><th>Ref Min</th><th>Ref Max</th><th>Status</th></tr></thead>
-<tbody>
-{"".join(metric_rows)}
-</tbody>
-</table>
-{svg_html}
-</details>""")
+    # Runtime and solver effort per case
+    solver_html = ""
+    if solver is not None and not solver.empty:
+        solver_html = f"""
+<h2>Rechenaufwand</h2>
+<p class="subtitle">Laufzeiten und Solverstatistik (NANDRAD-Log, EnergyPlus eplusout.end/.err).</p>
+{html_table(solver)}
+"""
 
     html = f"""<!DOCTYPE html>
 <html lang="de">
@@ -500,8 +764,9 @@ th {{ background: #f0f0f0; }}
 tr:hover {{ background: #f9f9f9; }}
 a {{ color: #0056b3; text-decoration: none; }}
 a:hover {{ text-decoration: underline; }}
-details {{ margin-bottom: 4px; }}
-details > table {{ margin-top: 4px; }}
+#case-panel h3 {{ margin: 12px 0 4px; }}
+#case-panel .result {{ padding: 2px 8px; border-radius: 4px; font-weight: bold; font-size: 0.9em; }}
+{TABLE_CSS}
 </style>
 </head>
 <body>
@@ -517,12 +782,48 @@ details > table {{ margin-top: 4px; }}
 <table>
 <thead><tr><th>Case</th><th>Beschreibung</th><th>Metriken</th><th>PASS</th><th>FAIL</th><th>SKIP/N/A</th><th>Ergebnis</th></tr></thead>
 <tbody>
-{"".join(summary_rows)}
+{summary_rows}
 </tbody>
 </table>
 
-<h2>Details</h2>
-{"".join(detail_sections)}
+<h2 id="details">Details</h2>
+<div id="case-panel"></div>
+<div id="metrics"></div>
+{sensitivity_html}
+{program_html}
+{solver_html}
+<script id="overview-data" type="application/json">{table_json(combined)}</script>
+<script id="case-info" type="application/json">{case_json}</script>
+<script id="case-links" type="application/json">{{}}</script>
+<script>{TABLE_SCRIPT}
+const CASES = JSON.parse(document.getElementById("case-info").textContent);
+const LINKS = JSON.parse(document.getElementById("case-links").textContent);
+const panel = document.getElementById("case-panel");
+
+function showCase(table) {{
+  const c = table.selected("Case"), info = c && CASES[c];
+  if (!info) {{ panel.innerHTML = ""; return; }}
+  const link = LINKS[c] ? ` &mdash; <a href="${{LINKS[c]}}">Dashboard</a>` : "";
+  panel.innerHTML = `<h3>Case ${{c}} &mdash; ${{info.title}} <span class="result" ` +
+    `style="background:${{info.background}};color:${{info.color}};">${{info.result}}</span>${{link}}</h3>` +
+    (info.description ? `<p style="color:#555;margin:4px 0 8px 0;">${{info.description}}</p>` : "") +
+    `<div style="margin:12px 0;"><img src="${{info.comparison}}" alt="Case ${{c}} Comparison" ` +
+    `style="max-width:100%;border:1px solid #ddd;border-radius:4px;" onerror="this.remove()"></div>`;
+}}
+
+const table = VirtualTable(document.getElementById("metrics"),
+  JSON.parse(document.getElementById("overview-data").textContent),
+  {{selects: ["Case", "Status"], placeholder: "Case oder Metrik ...", onChange: showCase}});
+
+function fromHash() {{
+  const m = location.hash.match(/^#case-(.+)$/);
+  if (!m) return;
+  table.select("Case", decodeURIComponent(m[1]));
+  document.getElementById("details").scrollIntoView();
+}}
+window.addEventListener("hashchange", fromHash);
+fromHash();
+</script>
 </body>
 </html>"""
 
@@ -555,11 +856,35 @@ def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     parser.add_argument("--out-dir", type=Path,
                         default=Path.cwd() / "validation_results",
                         help="Output directory")
+    parser.add_argument("--cores", type=int, default=available_cores(),
+                        help="Cores shared by concurrent cases and solver threads (default: all)")
+    parser.add_argument("--max-threads", type=int, default=None,
+                        help="Upper limit of NANDRAD solver threads per case")
+    parser.add_argument("--post-jobs", type=int, default=None,
+                        help="Workers of the validate and the render stage each (default: cores / 8, at least 1)")
+    parser.add_argument("--queue-size", type=int, default=4,
+                        help="Capacity of the queues between the pipeline stages (default: 4)")
+    parser.add_argument("--plot-files", action="store_true",
+                        help="Also write the separate hourly HTML / monthly SVG files per case (see validate_nandrad)")
+    parser.add_argument("--ep-sqlite", action="store_true",
+                        help="EnergyPlus also writes eplusout.sql; the validation reads it instead of the ESO "
+                             "(see validate_nandrad)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted suite: skip completed stages, resume interrupted NANDRAD runs")
+    parser.add_argument("--quick", action="store_true",
+                        help="Only simulate NANDRAD and check annual/peak/free-float metrics (no per-case outputs, "
+                             "EnergyPlus is not rerun); overview in <out-dir>/quick/")
+    parser.add_argument("--site", type=Path, default=None,
+                        help="Also update the static result site in this directory (see build_site.py)")
+    parser.add_argument("--generate", action="store_true",
+                        help="Regenerate the NANDRAD files of generated cases first (generate_nandrad_cases.py)")
     args = parser.parse_args(argv)
     # Resolve relative paths to absolute so they work from any subprocess cwd
     args.nandrad_exec = args.nandrad_exec.resolve()
     args.data_dir = args.data_dir.resolve()
     args.out_dir = args.out_dir.resolve()
+    if args.site is not None:
+        args.site = args.site.resolve()
     return args
 
 
@@ -575,6 +900,13 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
     out_dir = args.out_dir
     out_dir.mkdir(parents=True, exist_ok=True)
 
+    # 0. Refresh reference TSVs if the workbook or program tables changed
+    try:
+        if ensure_references(args.data_dir):
+            logging.info("Reference TSVs regenerated in %s", args.data_dir / "reference")
+    except Exception as exc:
+        logging.warning("Could not refresh reference TSVs, using existing files: %s", exc)
+
     # 1. Discover cases
     all_cases = discover_cases(args.data_dir, variant)
     if not all_cases:
@@ -593,10 +925,26 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
 
     logging.info("Cases to process (%d): %s", len(cases), ", ".join(cases))
 
-    # 3. Run each case
-    exit_codes: dict[str, int] = {}
-    for case in cases:
-        case_id, rc, _ = run_single_case(
+    # 3. Generate stage: only rewrites files whose content changed
+    if args.generate and not args.skip_run:
+        generated = [c for c in cases if c in GENERATED_CASES]
+        written = sum(w for _, w in generate_cases(generated, str(args.data_dir / "nandrad"), args.cores))
+        logging.info("Generated %d case(s), %d rewritten", len(generated), written)
+
+    # 4. Simulate -> validate -> render pipeline, solver threads planned from earlier runtimes
+    state = SuiteState(out_dir, variant, cases, args.resume)
+    # cases simulated from t=0 in this run; only their runtimes go into the history
+    timed: set[str] = set()
+
+    def run_stage(case: str, stage: str, threads: Optional[int]) -> tuple[str, int, str]:
+        if stage == "simulate" and args.skip_run:
+            return case, 0, ""
+        project = args.data_dir / "nandrad" / f"Case{case}_{variant}.nandrad"
+        if args.resume and state.is_done(case, stage, project.stat().st_mtime if project.exists() else 0.0):
+            logging.info("Case %s (%s) already done, skipped.", case, stage)
+            return case, 0, ""
+        resumed = stage == "simulate" and args.resume and restart_point(project) is not None
+        result = run_single_case(
             case=case,
             variant=variant,
             windows=args.windows,
@@ -604,30 +952,78 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
             skip_run=args.skip_run,
             out_dir=out_dir,
             data_dir=args.data_dir,
+            threads=threads,
+            stage=stage,
+            resume=args.resume,
+            plot_files=args.plot_files,
+            ep_sqlite=args.ep_sqlite,
+            skip_energyplus=args.quick,
+        )
+        if result[1] == 0:
+            state.mark(case, stage)
+            if stage == "simulate" and not resumed:
+                timed.add(case)
+        return result
+
+    scaling = fit_scaling(load_history(out_dir), cases)
+    if args.quick:
+        finished = run_scheduled(cases, lambda case, threads: run_stage(case, "simulate", threads),
+                                 cores=args.cores, scaling=scaling, max_threads=args.max_threads)
+        exit_codes = {case_id: rc for case_id, rc, _ in finished.values()}
+    else:
+        exit_codes = run_pipeline(
+            cases,
+            run_stage,
+            cores=args.cores,
+            post_jobs=args.post_jobs or max(args.cores // 8, 1),
+            scaling=scaling,
+            max_threads=args.max_threads,
+            queue_size=args.queue_size,
         )
-        exit_codes[case_id] = rc
 
-    # 4. Collect results
-    combined = collect_results(cases, variant, out_dir, exit_codes)
+    # 5. Summarize stage: collect results
+    ref_dir = args.data_dir / "reference"
+    if args.quick:
+        aggregates, failed = collect_quick_aggregates(cases, variant, args.data_dir, out_dir, exit_codes)
+    else:
+        aggregates, failed = collect_aggregates(cases, variant, out_dir, exit_codes)
+    combined = collect_results(cases, aggregates, failed, load_reference_table(ref_dir))
+    matrix = load_program_matrix(ref_dir)
+    programs = to_program_report(program_ranks(matrix, aggregates))
+    sensitivity = collect_sensitivity(aggregates, matrix)
+    solver_stats = read_all_solver_stats(cases, variant, out_dir)
+    solver = to_solver_report(solver_stats)
+    if not args.skip_run:
+        # skipped (--resume) and resumed runs would add old or partial runtimes to the Amdahl fit
+        append_history(out_dir, history_from_stats(solver_stats[solver_stats["case"].isin(timed)]))
     if combined.empty:
         logging.error("No validation results found.")
         return 1
 
-    # 5. Build summary
+    # 6. Build summary
     summary = build_summary(combined)
 
-    # 6. Write reports
-    write_overview_tsv(combined, out_dir / "overview_report.tsv")
-    write_overview_html(combined, summary, out_dir / "overview_report.html", variant)
-    write_overview_md(combined, summary, out_dir / "overview_report.md", variant)
-
-    # Copy overview to project root for easy access
-    project_root = Path(__file__).resolve().parent
-    for ext in ("html", "tsv", "md"):
-        shutil.copy2(out_dir / f"overview_report.{ext}", project_root / f"overview_report.{ext}")
-    logging.info("Copied overview reports to %s", project_root)
-
-    # 7. Print summary to console
+    # 7. Write reports
+    report_dir = out_dir / "quick" if args.quick else out_dir
+    report_dir.mkdir(parents=True, exist_ok=True)
+    write_overview_tsv(combined, report_dir / "overview_report.tsv")
+    write_overview_tsv(programs, report_dir / "overview_programs.tsv")
+    write_overview_tsv(sensitivity, report_dir / "overview_sensitivity.tsv")
+    write_overview_tsv(solver, report_dir / "overview_solver.tsv")
+    write_overview_html(combined, summary, report_dir / "overview_report.html", variant, programs, sensitivity, solver)
+    write_overview_md(combined, summary, report_dir / "overview_report.md", variant, programs, sensitivity, solver)
+
+    # Copy overview to project root for easy access (not for quick looks); unchanged files are not touched
+    if not args.quick:
+        project_root = Path(__file__).resolve().parent
+        copied = sum(write_if_changed(project_root / f"overview_report.{ext}",
+                                      (out_dir / f"overview_report.{ext}").read_bytes())
+                     for ext in ("html", "tsv", "md"))
+        logging.info("Copied %d changed overview report(s) to %s", copied, project_root)
+        if args.site:
+            build_site(args.site, out_dir, project_root / "comparison", variant=variant)
+
+    # 8. Print summary to console
     n_pass = (summary["Ergebnis"] == "PASS").sum()
     n_fail = (summary["Ergebnis"] == "FAIL").sum()
     n_error = (summary["Ergebnis"] == "ERROR").sum()
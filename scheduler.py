@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Core scheduler for the validation suite: solver threads vs. concurrent cases.
+
+NandradSolver can use several threads per case, but the speed-up of a
+single-zone BESTEST case flattens quickly, while independent cases scale
+almost perfectly. For a suite the best throughput (cases per hour) is
+therefore reached with one thread per case as long as there are at least as
+many pending cases as free cores; only the tail of the suite, when cores
+would otherwise idle, hands out more threads per case.
+
+The per-case scaling is taken from earlier runs (runtime_history.tsv in the
+output folder, one row per NANDRAD run: case, threads, seconds) and modelled
+with Amdahl's law
+
+    t(p) = t1 * (s + (1 - s) / p)
+
+fitted per case by least squares when runs with at least two thread counts
+exist; otherwise the serial fraction defaults to DEFAULT_SERIAL_FRACTION.
+Unknown cases are assumed to take the median single-thread runtime. Cases
+are started longest first so that long cases do not end up in the tail.
+
+Used by run_all_validations.py (--cores, --max-threads).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional, TypeVar
+
+import numpy as np
+import pandas as pd
+
+
+T = TypeVar("T")
+
+HISTORY_FILE = "runtime_history.tsv"
+HISTORY_COLUMNS = ["case", "threads", "seconds"]
+
+DEFAULT_SERIAL_FRACTION = 0.3   # assumed when a case was only run with one thread count
+DEFAULT_SECONDS = 60.0          # single-thread runtime assumed without any history
+MIN_EFFICIENCY = 0.6            # parallel efficiency below which no more threads are added
+
+
+# =========================
+# Scaling model
+# =========================
+
+@dataclass(frozen=True)
+class Scaling:
+    t1: float       # single-thread runtime [s]
+    serial: float   # serial fraction s (Amdahl)
+
+    def runtime(self, threads: int) -> float:
+        return self.t1 * (self.serial + (1.0 - self.serial) / threads)
+
+    def efficiency(self, threads: int) -> float:
+        return self.t1 / (threads * self.runtime(threads))
+
+
+def available_cores() -> int:
+    """Cores usable by this process (CPU affinity where supported)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def load_history(out_dir: Path) -> pd.DataFrame:
+    path = out_dir / HISTORY_FILE
+    if not path.exists():
+        return pd.DataFrame(columns=HISTORY_COLUMNS)
+    df = pd.read_csv(path, sep="\t", dtype={"case": str})
+    return df.dropna(subset=["threads", "seconds"])
+
+
+def append_history(out_dir: Path, runs: pd.DataFrame) -> None:
+    """Append measured runs (case, threads, seconds) to the runtime history."""
+    if runs.empty:
+        return
+    path = out_dir / HISTORY_FILE
+    runs[HISTORY_COLUMNS].to_csv(path, sep="\t", index=False, mode="a", header=not path.exists())
+    logging.info("Runtime history: %s (+%d runs)", path, len(runs))
+
+
+def history_from_stats(stats: pd.DataFrame) -> pd.DataFrame:
+    """NANDRAD runs (case, threads, seconds) from a long solver statistics table (solver_stats.py)."""
+    nandrad = stats[stats["engine"] == "NANDRAD"]
+    wide = nandrad.pivot_table(index="case", columns="statistic", values="value", aggfunc="last")
+    if "threads" not in wide.columns:
+        return pd.DataFrame(columns=HISTORY_COLUMNS)
+    seconds = wide["process_time_s"] if "process_time_s" in wide.columns else pd.Series(np.nan, index=wide.index)
+    if "wall_time_s" in wide.columns:
+        seconds = seconds.fillna(wide["wall_time_s"])
+    runs = pd.DataFrame({"threads": wide["threads"], "seconds": seconds}).dropna()
+    runs["threads"] = runs["threads"].astype(int)
+    return runs.rename_axis("case").reset_index()[HISTORY_COLUMNS]
+
+
+def _fit_case(runs: pd.DataFrame) -> Optional[tuple[float, Optional[float]]]:
+    """(t1, serial) of one case; serial is None if it cannot be identified from the runs."""
+    per_threads = runs.groupby("threads")["seconds"].median()
+    per_threads = per_threads[(per_threads.index > 0) & (per_threads > 0)]
+    if per_threads.empty:
+        return None
+    if len(per_threads) == 1:
+        return None if per_threads.index[0] != 1 else (float(per_threads.iloc[0]), None)
+
+    # t(p) = a + b / p  with a = t1 * s, b = t1 * (1 - s)
+    p = per_threads.index.to_numpy(dtype=float)
+    A = np.column_stack([np.ones_like(p), 1.0 / p])
+    (a, b), *_ = np.linalg.lstsq(A, per_threads.to_numpy(), rcond=None)
+    a, b = max(a, 0.0), max(b, 0.0)
+    if a + b <= 0.0:
+        return None
+    return float(a + b), float(a / (a + b))
+
+
+def fit_scaling(history: pd.DataFrame, cases: list[str]) -> dict[str, Scaling]:
+    """Scaling model for each case from the runtime history (defaults for unknown cases)."""
+    fitted: dict[str, tuple[Optional[float], Optional[float]]] = {}
+    for case, runs in history.groupby("case"):
+        fit = _fit_case(runs)
+        fitted[str(case)] = fit if fit is not None else (None, None)
+
+    serials = [s for _, s in fitted.values() if s is not None]
+    serial_default = float(np.median(serials)) if serials else DEFAULT_SERIAL_FRACTION
+
+    # single-thread runtime of cases only run with p > 1 threads, using the default serial fraction
+    for case, runs in history.groupby("case"):
+        t1, serial = fitted[str(case)]
+        if t1 is None:
+            run = runs.sort_values("threads").iloc[-1]
+            fitted[str(case)] = (float(run["seconds"]) / Scaling(1.0, serial_default).runtime(int(run["threads"])),
+                                 None)
+
+    known = [t1 for t1, _ in fitted.values() if t1 is not None and t1 > 0]
+    t1_default = float(np.median(known)) if known else DEFAULT_SECONDS
+
+    scaling: dict[str, Scaling] = {}
+    for case in cases:
+        t1, serial = fitted.get(case, (None, None))
+        scaling[case] = Scaling(t1 if t1 else t1_default, serial if serial is not None else serial_default)
+    return scaling
+
+
+# =========================
+# Scheduling
+# =========================
+
+def plan_threads(
+    scaling: Scaling,
+    free: int,
+    pending: int,
+    max_threads: Optional[int] = None,
+    min_efficiency: float = MIN_EFFICIENCY,
+) -> int:
+    """Threads for the next case, given free cores and the number of cases still waiting (incl. this one)."""
+    if pending >= free:
+        return 1
+    threads = max(1, free // pending)
+    if max_threads:
+        threads = min(threads, max_threads)
+    while threads > 1 and scaling.efficiency(threads) < min_efficiency:
+        threads -= 1
+    return threads
+
+
+def run_scheduled(
+    cases: list[str],
+    launch: Callable[[str, int], T],
+    cores: int,
+    scaling: dict[str, Scaling],
+    max_threads: Optional[int] = None,
+    min_efficiency: float = MIN_EFFICIENCY,
+) -> dict[str, T]:
+    """
+    Run launch(case, threads) for all cases without using more than `cores` threads at a time.
+    Cases are started longest first; returns {case: result of launch}.
+    """
+    queue = sorted(cases, key=lambda c: scaling[c].t1, reverse=True)
+    results: dict[str, T] = {}
+    running: dict[Future, tuple[str, int]] = {}
+    free = cores
+
+    with ThreadPoolExecutor(max_workers=max(cores, 1)) as pool:
+        while queue or running:
+            while queue and (free > 0 or not running):
+                case = queue.pop(0)
+                threads = min(plan_threads(scaling[case], free, len(queue) + 1, max_threads, min_efficiency),
+                              max(free, 1))
+                logging.info("Scheduling Case %s with %d thread(s) (expected %.0f s, %d core(s) free)",
+                             case, threads, scaling[case].runtime(threads), free)
+                running[pool.submit(launch, case, threads)] = (case, threads)
+                free -= threads
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                case, threads = running.pop(future)
+                free += threads
+                results[case] = future.result()
+    return {case: results[case] for case in cases}
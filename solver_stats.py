@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Solver statistics of NANDRAD and EnergyPlus runs.
+
+NANDRAD writes its integrator statistics into <project>/log/summary.txt
+(key=value lines) and the screen log <project>/log/screenlog.txt;
+EnergyPlus writes eplusout.end (completion line with warning/error counts
+and elapsed time) and eplusout.err. Both are reduced to a long table
+(case x engine x statistic -> value) that is stored per case next to the
+aggregates and summarized in the overview report.
+
+Statistic keys:
+- wall_time_s         solver wall-clock time [s] (as reported by the solver)
+- process_time_s      wall time of the solver process, measured by the caller [s]
+- threads             solver threads the process was started with
+- steps               integrator steps
+- rhs_evals           right-hand-side (model) evaluations
+- nonlin_iters        nonlinear (Newton) iterations
+- nonlin_conv_fails   nonlinear convergence failures
+- lin_iters           linear (Krylov) iterations
+- lin_conv_fails      linear convergence failures
+- jac_evals           Jacobian evaluations
+- error_test_fails    local error test failures
+- warnings            warnings (EnergyPlus)
+- severe_errors       severe and fatal errors (EnergyPlus)
+- output_size_MB      size of eplusout.eso [MB] (EnergyPlus)
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+
+STATS_COLUMNS = ["case", "engine", "statistic", "value"]
+
+# statistic key -> report label; order defines report order
+STATISTICS: dict[str, str] = {
+    "wall_time_s":       "Laufzeit [s]",
+    "process_time_s":    "Prozesszeit [s]",
+    "threads":           "Threads",
+    "steps":             "Zeitschritte",
+    "rhs_evals":         "Modellauswertungen",
+    "nonlin_iters":      "Nichtlin. Iterationen",
+    "nonlin_conv_fails": "Nichtlin. Konvergenzfehler",
+    "lin_iters":         "Lin. Iterationen",
+    "lin_conv_fails":    "Lin. Konvergenzfehler",
+    "jac_evals":         "Jacobi-Auswertungen",
+    "error_test_fails":  "Fehlertest-Fehlschläge",
+    "warnings":          "Warnungen",
+    "severe_errors":     "Schwere Fehler",
+    "output_size_MB":    "Ausgabegröße [MB]",
+}
+
+# Normalized log keys (lower case, no blanks/underscores) -> statistic key.
+# Checked in order; the first match wins.
+_NANDRAD_KEYS: list[tuple[re.Pattern, str]] = [(re.compile(p), k) for p, k in (
+    (r"^wallclocktime", "wall_time_s"),
+    (r"^(integrator)?steps$", "steps"),
+    (r"^integrator(rhs|function)evals?$", "rhs_evals"),
+    (r"nonlin\w*convfails?$", "nonlin_conv_fails"),
+    (r"nonlin\w*iter", "nonlin_iters"),
+    (r"errortestfails?$", "error_test_fails"),
+    (r"jac\w*evals?$", "jac_evals"),
+    (r"^(les|lin)\w*convfails?$", "lin_conv_fails"),
+    (r"^(les|lin)\w*iter", "lin_iters"),
+)]
+
+_KEY_VALUE = re.compile(r"^\s*([A-Za-z][\w .()/-]*?)\s*[=:]\s*([-+]?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?)\s*(?:s|sec)?\s*$")
+_EP_TIME = re.compile(r"(\d+)hr\s+(\d+)min\s+([\d.]+)sec")
+
+
+# =========================
+# NANDRAD
+# =========================
+
+def _normalize(key: str) -> str:
+    return re.sub(r"[\s_\-.()/]", "", key).lower()
+
+
+def parse_nandrad_log(text: str) -> dict[str, float]:
+    """Map 'Key=Value' / 'Key : Value' lines of a NANDRAD log to statistic keys."""
+    stats: dict[str, float] = {}
+    for line in text.splitlines():
+        m = _KEY_VALUE.match(line)
+        if not m:
+            continue
+        key = _normalize(m.group(1))
+        for pattern, stat in _NANDRAD_KEYS:
+            if pattern.search(key):
+                stats.setdefault(stat, float(m.group(2)))
+                break
+    return stats
+
+
+def nandrad_stats(
+    case: str,
+    project_dir: Path,
+    process_time_s: Optional[float] = None,
+    threads: Optional[int] = None,
+) -> pd.DataFrame:
+    """Solver statistics of a NANDRAD project directory (summary.txt first, then screenlog.txt)."""
+    stats: dict[str, float] = {}
+    for name in ("summary.txt", "screenlog.txt"):
+        path = project_dir / "log" / name
+        if path.exists():
+            for stat, value in parse_nandrad_log(path.read_text(encoding="utf-8", errors="replace")).items():
+                stats.setdefault(stat, value)
+    if process_time_s is not None:
+        stats["process_time_s"] = process_time_s
+    if threads:
+        stats["threads"] = float(threads)
+    if not stats:
+        logging.warning("No NANDRAD solver statistics found in %s", project_dir / "log")
+    return _long(case, "NANDRAD", stats)
+
+
+# =========================
+# EnergyPlus
+# =========================
+
+def _ep_seconds(text: str) -> Optional[float]:
+    m = _EP_TIME.search(text)
+    return int(m.group(1)) * 3600.0 + int(m.group(2)) * 60.0 + float(m.group(3)) if m else None
+
+
+def energyplus_stats(case: str, energy_dir: Path, process_time_s: Optional[float] = None) -> pd.DataFrame:
+    """Statistics from eplusout.end (counts, elapsed time), eplusout.err (counts, run time) and the size
+    of eplusout.eso."""
+    stats: dict[str, float] = {}
+    end_path = energy_dir / "eplusout.end"
+    if end_path.exists():
+        text = end_path.read_text(encoding="latin1", errors="replace")
+        if (m := re.search(r"(\d+)\s+Warning", text)):
+            stats["warnings"] = float(m.group(1))
+        if (m := re.search(r"(\d+)\s+Severe", text)):
+            stats["severe_errors"] = float(m.group(1))
+        if (seconds := _ep_seconds(text)) is not None:
+            stats["wall_time_s"] = seconds
+
+    err_path = energy_dir / "eplusout.err"
+    if err_path.exists():
+        text = err_path.read_text(encoding="latin1", errors="replace")
+        stats.setdefault("warnings", float(len(re.findall(r"\*\* Warning \*\*", text))))
+        stats.setdefault("severe_errors", float(len(re.findall(r"\*\*\s+(?:Severe|Fatal)\s+\*\*", text))))
+        if "wall_time_s" not in stats and (seconds := _ep_seconds(text.split("Run Time")[-1])) is not None:
+            stats["wall_time_s"] = seconds
+
+    eso_path = energy_dir / "eplusout.eso"
+    if eso_path.exists():
+        stats["output_size_MB"] = eso_path.stat().st_size / 1e6
+
+    if process_time_s is not None:
+        stats["process_time_s"] = process_time_s
+    return _long(case, "EnergyPlus", stats)
+
+
+# =========================
+# Tables
+# =========================
+
+def _long(case: str, engine: str, stats: dict[str, float]) -> pd.DataFrame:
+    ordered = [k for k in STATISTICS if k in stats]
+    return pd.DataFrame({
+        "case": case,
+        "engine": engine,
+        "statistic": ordered,
+        "value": [stats[k] for k in ordered],
+    }, columns=STATS_COLUMNS)
+
+
+def read_solver_stats(path: Path) -> pd.DataFrame:
+    """Load a solver statistics TSV written by validate_nandrad."""
+    df = pd.read_csv(path, sep="\t", dtype={"case": str})
+    df["case"] = df["case"].str.strip()
+    return df
+
+
+def to_solver_report(stats: pd.DataFrame) -> pd.DataFrame:
+    """One row per case, one column per engine and statistic ('NANDRAD Laufzeit [s]', ...)."""
+    if stats.empty:
+        return pd.DataFrame(columns=["Case"])
+    stats = stats.drop_duplicates(["case", "engine", "statistic"], keep="last")
+    wide = stats.pivot(index="case", columns=["engine", "statistic"], values="value")
+    order = [(e, s) for e in ("NANDRAD", "EnergyPlus") for s in STATISTICS if (e, s) in wide.columns]
+    wide = wide[order]
+    wide.columns = [f"{e} {STATISTICS[s]}" for e, s in order]
+    wide = wide.reindex(pd.unique(stats["case"]))
+    for col in wide.columns:
+        values = wide[col]
+        wide[col] = values.round(2) if col.endswith("[s]") else values.round().astype("Int64")
+    return wide.astype(object).where(wide.notna(), "").rename_axis("Case").reset_index()
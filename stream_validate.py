@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Live validation of a NANDRAD run while NandradSolver is still writing.
+
+NandradSolver appends to its results/*.tsv files as the simulation
+progresses. This script tails the hourly heating/cooling loads (free-float
+cases: the air temperature), keeps running monthly sums and peaks and checks
+
+- every completed month against monthly-references.tsv,
+- the running annual energy and peak loads (free-float: running maximum and
+  minimum temperature) against the annual bands as soon as they leave them
+  (these values only grow or fall, so leaving the band is final),
+- the remaining annual metrics once the year is complete.
+
+Values are aligned as in validate_nandrad.py and tested with
+reference_checks.checked_value(), so a completed stream gives the same
+PASS/FAIL as the full validation. A
+value is "clearly" out of band if it lies more than --margin band widths
+(at least --margin x 10 % of the upper bound) outside; with --stop-on-fail
+the solver is terminated at the first such value.
+
+Writes validation_results/Case{N}_{variant}/Case{N}_{variant}_stream.tsv.
+
+Run:
+    python stream_validate.py -c 600 --nandrad-exec bin/NandradSolver --stop-on-fail
+    python stream_validate.py -c 600 --attach      # watch a run started elsewhere
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import subprocess
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from reference_checks import METRICS, MONTHS, checked_value, load_reference_table
+from run_all_validations import setup_logging
+from validate_nandrad import NANDRAD_SERIES, W_TO_KW, build_hourly_index, nandrad_command
+
+
+CHECK_COLUMNS = ["hour", "metric", "value", "ref_min", "ref_max", "status", "clear", "final"]
+
+
+# =========================
+# Tailing
+# =========================
+
+class TsvTail:
+    """Incrementally read one column of a TSV file that is still being written."""
+
+    def __init__(self, path: Path, needle: str):
+        self.path = path
+        self.needle = needle
+        self._pos = 0
+        self._rest = b""
+        self._col: Optional[int] = None
+
+    def poll(self) -> list[float]:
+        """Values of all complete rows appended since the last call."""
+        if not self.path.exists():
+            return []
+        with open(self.path, "rb") as f:
+            f.seek(self._pos)
+            chunk = f.read()
+            self._pos = f.tell()
+        *lines, self._rest = (self._rest + chunk).split(b"\n")
+
+        values: list[float] = []
+        for line in lines:
+            fields = line.decode("utf-8", errors="replace").rstrip("\r").split("\t")
+            if self._col is None:
+                hits = [i for i, c in enumerate(fields) if self.needle in c]
+                if len(hits) != 1:
+                    raise LookupError(f"Expected one column containing '{self.needle}' in {self.path}: {fields}")
+                self._col = hits[0]
+                continue
+            try:
+                values.append(float(fields[self._col]))
+            except (IndexError, ValueError):
+                values.append(np.nan)
+        return values
+
+
+# =========================
+# Incremental checks
+# =========================
+
+@dataclass
+class Check:
+    hour: int          # hours of the year processed when the check was made
+    metric: str
+    value: float
+    ref_min: float
+    ref_max: float
+    status: str        # PASS / FAIL
+    clear: bool        # outside the band by more than the margin
+    final: bool        # value cannot change any more
+
+
+class StreamValidator:
+    """Running monthly/annual aggregates of one case, checked against the reference bands."""
+
+    def __init__(self, case: str, references: pd.DataFrame, year: int = 2021, margin: float = 0.5):
+        refs = references[(references["case"] == case)].dropna(subset=["ref_min", "ref_max"])
+        self.bands = {m: (lo, hi) for m, lo, hi in refs[["metric", "ref_min", "ref_max"]].itertuples(index=False)}
+        self.margin = margin
+        self.free_float = case.upper().endswith("FF")
+        self.keys = ("air_temp",) if self.free_float else ("heating", "cooling")
+
+        # hour of the year -> month (0..11) on the validation index, and the end hour of every month
+        months = build_hourly_index(year).month.to_numpy() - 1
+        self.months = months
+        self.month_end = np.searchsorted(months, np.arange(12), side="right")
+
+        self.rows = dict.fromkeys(self.keys, 0)
+        self.monthly = {k: np.zeros(12) for k in self.keys}
+        self.peak = dict.fromkeys(self.keys, -np.inf)
+        self.low = dict.fromkeys(self.keys, np.inf)
+        self.checks: list[Check] = []
+        self._checked: set[str] = set()
+        self._new = 0
+
+    @property
+    def hours(self) -> int:
+        return min(self._hours(k) for k in self.keys)
+
+    def _hours(self, key: str) -> int:
+        return min(max(self.rows[key] - 1, 0), len(self.months))
+
+    @property
+    def complete(self) -> bool:
+        return self.hours >= len(self.months)
+
+    def feed(self, key: str, values: list[float]) -> None:
+        """Add rows of one series; row 0 and rows beyond the index are skipped as in validate_nandrad."""
+        first = self.rows[key]
+        self.rows[key] += len(values)
+        hours = np.arange(first, first + len(values)) - 1
+        keep = (hours >= 0) & (hours < len(self.months))
+        v = np.nan_to_num(np.asarray(values, dtype=float)[keep])
+        if not len(v):
+            return
+        if key != "air_temp":
+            v = v * W_TO_KW
+        self.monthly[key] += np.bincount(self.months[hours[keep]], weights=v, minlength=12)
+        self.peak[key] = max(self.peak[key], v.max())
+        self.low[key] = min(self.low[key], v.min())
+        self._check_running(key)
+
+    @staticmethod
+    def _tested(metric: str, value: float) -> float:
+        """Value tested against the band, as in reference_checks.check_references."""
+        return float(checked_value(metric, value))
+
+    def _check(self, metric: str, value: float, final: bool, hour: Optional[int] = None) -> Optional[Check]:
+        if metric in self._checked or metric not in self.bands:
+            return None
+        lo, hi = self.bands[metric]
+        tested = self._tested(metric, value)
+        tol = self.margin * max(hi - lo, abs(hi) * 0.1)
+        status = "PASS" if lo <= tested <= hi else "FAIL"
+        shown = round(float(value), METRICS.get(metric, ("", 4))[1])
+        check = Check(self.hours if hour is None else hour, metric, shown, lo, hi, status,
+                      clear=not (lo - tol <= tested <= hi + tol), final=final)
+        if final:
+            self._checked.add(metric)
+        self.checks.append(check)
+        return check
+
+    def _check_running(self, key: str) -> None:
+        hour = self._hours(key)
+        if key == "air_temp":
+            band = self.bands.get("temp_max")
+            if band and self._tested("temp_max", self.peak[key]) > band[1]:
+                self._check("temp_max", self.peak[key], final=True, hour=hour)
+            band = self.bands.get("temp_min")
+            if band and self._tested("temp_min", self.low[key]) < band[0]:
+                self._check("temp_min", self.low[key], final=True, hour=hour)
+            return
+
+        for m in range(int(np.searchsorted(self.month_end, hour, side="right"))):
+            self._check(f"{key}_{MONTHS[m]}", self.monthly[key][m], final=True, hour=hour)
+        # annual energy and peak only grow: above the band is final before the year is complete
+        for metric, value in ((key, self.monthly[key].sum() / 1000.0), (f"peak_{key}", self.peak[key])):
+            band = self.bands.get(metric)
+            if band and self._tested(metric, value) > band[1]:
+                self._check(metric, value, final=True, hour=hour)
+
+    def finish(self) -> None:
+        """Check all remaining metrics (only meaningful once the year is complete)."""
+        if self.free_float:
+            k = "air_temp"
+            n = max(self._hours(k), 1)
+            self._check("temp_max", self.peak[k], final=True)
+            self._check("temp_min", self.low[k], final=True)
+            self._check("temp_avg", self.monthly[k].sum() / n, final=True)
+            return
+        for key in self.keys:
+            self._check(key, self.monthly[key].sum() / 1000.0, final=True)
+            self._check(f"peak_{key}", self.peak[key], final=True)
+
+    def new_checks(self) -> list[Check]:
+        checks = self.checks[self._new:]
+        self._new = len(self.checks)
+        return checks
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame([asdict(c) for c in self.checks], columns=CHECK_COLUMNS)
+
+
+# =========================
+# Watching
+# =========================
+
+def open_tails(results_dir: Path, case: str, keys: Sequence[str]) -> dict[str, TsvTail]:
+    nz = "Back Zone(ID=3)." if case == "960" else ""
+    tails = {}
+    for key in keys:
+        name, quantity, needle = NANDRAD_SERIES[key]
+        tails[key] = TsvTail(results_dir / name, f"{nz}{quantity}" if nz else needle)
+    return tails
+
+
+def log_check(check: Check, validator: StreamValidator) -> None:
+    month = MONTHS[validator.months[min(check.hour, len(validator.months)) - 1]] if check.hour else "-"
+    logging.log(logging.INFO if check.status == "PASS" else logging.WARNING,
+                "%-16s %10.4g  [%g, %g]  %s%s  (data up to %s)", check.metric, check.value, check.ref_min,
+                check.ref_max, check.status, " (clearly out of band)" if check.clear else "", month)
+
+
+def watch(
+    tails: dict[str, TsvTail],
+    validator: StreamValidator,
+    proc: Optional[subprocess.Popen] = None,
+    interval: float = 1.0,
+    idle: float = 60.0,
+    stop_on_fail: bool = False,
+) -> bool:
+    """Feed new rows to the validator until the year is complete or the run ends.
+
+    Without a process (attach mode) the run counts as ended after `idle`
+    seconds without new rows. Returns True if the solver was stopped early.
+    """
+    last_data = time.monotonic()
+    while True:
+        running = proc is not None and proc.poll() is None
+        for key, tail in tails.items():
+            values = tail.poll()
+            if values:
+                validator.feed(key, values)
+                last_data = time.monotonic()
+
+        for check in validator.new_checks():
+            log_check(check, validator)
+            if check.status == "FAIL" and check.clear and stop_on_fail and running:
+                logging.error("Stopping NandradSolver after %d h: %s clearly out of band", check.hour, check.metric)
+                proc.terminate()
+                proc.wait()
+                return True
+
+        if validator.complete:
+            return False
+        if proc is not None and not running:
+            return False
+        if proc is None and time.monotonic() - last_data > idle:
+            logging.warning("No new results for %.0f s, stopping to watch.", idle)
+            return False
+        time.sleep(interval)
+
+
+# =========================
+# CLI
+# =========================
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Validate a NANDRAD run while the solver is still running.")
+    parser.add_argument("-c", "--case", default="600", help="Test case (e.g., 600, 600FF)")
+    parser.add_argument("-v", "--variant", default="v1", help="Variant label (default: v1)")
+    parser.add_argument("-y", "--year", type=int, default=2021, help="Calendar year for hourly index")
+    parser.add_argument("--data-dir", type=Path, default=Path.cwd() / "data", help="Root data directory")
+    parser.add_argument("--out-dir", type=Path, default=Path.cwd() / "validation_results",
+                        help="Output root directory")
+    parser.add_argument("--nandrad-exec", type=Path,
+        default=(Path("C:/Program Files/VICUS-Software/VICUS/NandradSolver.exe") if os.name == "nt"
+                 else Path.cwd() / "bin" / "NandradSolver")
+    )
+    parser.add_argument("--nandrad-threads", type=int, default=None,
+                        help="Number of NANDRAD solver threads (default: solver default)")
+    parser.add_argument("--attach", action="store_true",
+                        help="Do not start the solver, watch the results of a run started elsewhere")
+    parser.add_argument("--stop-on-fail", action="store_true",
+                        help="Terminate the solver as soon as a value is clearly out of band")
+    parser.add_argument("--margin", type=float, default=0.5,
+                        help="Distance outside the band, in band widths, that counts as clearly out (default: 0.5)")
+    parser.add_argument("--interval", type=float, default=1.0, help="Polling interval [s] (default: 1)")
+    parser.add_argument("--idle", type=float, default=60.0,
+                        help="Attach mode: stop watching after this many seconds without new rows (default: 60)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    setup_logging()
+
+    case, variant = str(args.case), str(args.variant)
+    nandrad_root = args.data_dir / "nandrad"
+    nandrad_file = nandrad_root / f"Case{case}_{variant}.nandrad"
+    results_dir = nandrad_root / f"Case{case}_{variant}" / "results"
+
+    validator = StreamValidator(case, load_reference_table(args.data_dir / "reference"), args.year, args.margin)
+    if not validator.bands:
+        logging.error("No reference bands for Case %s", case)
+        return 2
+    tails = open_tails(results_dir, case, validator.keys)
+
+    proc = None
+    if not args.attach:
+        if not nandrad_file.exists() or not args.nandrad_exec.exists():
+            logging.error("NANDRAD project or solver not found: %s, %s", nandrad_file, args.nandrad_exec)
+            return 2
+        # results of an earlier run must not be mistaken for new rows
+        for tail in tails.values():
+            tail.path.unlink(missing_ok=True)
+        cmd = nandrad_command(args.nandrad_exec, nandrad_file, args.nandrad_threads)
+        logging.info("NANDRAD: %s", " ".join(cmd))
+        proc = subprocess.Popen(cmd, cwd=nandrad_root, stdout=subprocess.DEVNULL)
+
+    start = time.perf_counter()
+    try:
+        stopped = watch(tails, validator, proc, args.interval, args.idle, args.stop_on_fail)
+    except (LookupError, KeyboardInterrupt):
+        if proc is not None and proc.poll() is None:
+            proc.terminate()
+        raise
+    if proc is not None and not stopped:
+        proc.wait()
+    if validator.complete:
+        validator.finish()
+        for check in validator.new_checks():
+            log_check(check, validator)
+    else:
+        logging.warning("Results end after %d of %d hours; annual metrics not checked.",
+                        validator.hours, len(validator.months))
+
+    checks = validator.to_frame()
+    out_dir = args.out_dir / f"Case{case}_{variant}"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out_tsv = out_dir / f"Case{case}_{variant}_stream.tsv"
+    checks.to_csv(out_tsv, sep="\t", index=False)
+
+    n_fail = int((checks["status"] == "FAIL").sum())
+    logging.info("Done after %.0f s (%d h simulated): %d checks, %d FAIL%s. Results: %s",
+                 time.perf_counter() - start, validator.hours, len(checks), n_fail,
+                 ", solver stopped early" if stopped else "", out_tsv)
+    if proc is not None and not stopped and proc.returncode != 0:
+        logging.error("NandradSolver exited with code %d", proc.returncode)
+        return 1
+    return 1 if n_fail else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Parametric sweeps over NANDRAD BESTEST cases.
+
+Builds the cartesian product of parameter ranges on top of a base case
+(Case600 or Case900), renders every variant on the fly with the patch
+helpers of generate_nandrad_cases.py, runs NandradSolver on a bounded
+worker pool and streams only the annual and peak loads into one TSV.
+
+Per variant only the ideal heating/cooling load outputs are kept in the
+project, the climate file path is made absolute and the variant directory
+is deleted once the solver has finished (unless --keep), so a sweep of
+thousands of variants does not leave intermediate files behind. Variants
+with an OK row in the results TSV are skipped, so an interrupted sweep can
+simply be restarted; failed or interrupted variants keep their directory,
+lose their FAIL row and continue from their NANDRAD restart point.
+
+Parameters (--param NAME=start:stop:count or NAME=v1,v2,...):
+- wall_insulation    wall insulation layer thickness [m]
+- roof_insulation    roof insulation layer thickness [m]
+- shgc               normal-incidence SHGC of the window (angle curve scaled)
+- u_window           window thermal transmittance [W/m2K]
+- heating_setpoint   constant heating set point [C]
+- cooling_setpoint   constant cooling set point [C]
+
+Run:
+    python sweep_nandrad.py --base 600 \\
+        --param wall_insulation=0.05:0.25:5 --param shgc=0.3,0.5,0.7 \\
+        --param heating_setpoint=18:22:5 --jobs 16 --out sweep_results.tsv
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import logging
+import os
+import shutil
+import subprocess
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from generate_nandrad_cases import (
+    ElementIndex,
+    NANDRAD_DIR,
+    Patch,
+    build_case,
+    load_template,
+    set_thermostat,
+    update_roof_insulation,
+    update_wall_insulation_high_mass,
+    update_wall_insulation_low_mass,
+    write_if_changed,
+)
+from run_all_validations import setup_logging
+from validate_nandrad import nandrad_aggregates, nandrad_command, read_nandrad_hourly, restart_point
+
+
+BASE_TEMPLATES = {"600": "Case600_v1.nandrad", "900": "Case900_v1.nandrad"}
+
+# Quantities kept in the variant projects; everything else is pruned
+KEPT_OUTPUTS = ("IdealHeatingLoad", "IdealCoolingLoad")
+RESULT_COLUMNS = ["heating_MWh", "cooling_MWh", "peak_heating_kW", "peak_cooling_kW", "runtime_s", "status"]
+
+
+# =========================
+# Base case
+# =========================
+
+@dataclass(frozen=True)
+class BaseCase:
+    """Template of a sweep and the template values the parameters start from."""
+    case: str
+    template: str
+    heating_setpoint: float
+    cooling_setpoint: float
+    shgc_curve: tuple[float, ...]
+    shgc_hemis: float
+    pruned_outputs: tuple[int, ...]
+
+    @property
+    def high_mass(self) -> bool:
+        return self.case.startswith("9")
+
+
+def _setpoints(text: str) -> dict[str, float]:
+    """Parse 'CoolingSetpointSchedule [C]:27;HeatingSetpointSchedule [C]:20;'."""
+    values = {}
+    for item in filter(None, (s.strip() for s in text.split(";"))):
+        name, _, value = item.rpartition(":")
+        values[name.split(" ")[0]] = float(value)
+    return values
+
+
+def load_base_case(case: str, nandrad_dir: str = NANDRAD_DIR) -> BaseCase:
+    """Read the template once and collect what the parameter patches need."""
+    if case not in BASE_TEMPLATES:
+        raise ValueError(f"Unknown base case '{case}', expected one of {', '.join(BASE_TEMPLATES)}")
+    template = BASE_TEMPLATES[case]
+    index = ElementIndex(load_template(template, nandrad_dir).getroot())
+
+    thermostat = next(e.text for e in index.select("DailyCycle/Values")
+                      if "CoolingSetpointSchedule" in (e.text or ""))
+    setpoints = _setpoints(thermostat)
+    curve = index.select("WindowGlazingSystem/LinearSplineParameter/Y")[0].text.split()
+
+    # Keep the first definition of every kept quantity (the "All zones" one)
+    seen: set[str] = set()
+    pruned = []
+    for i, definition in enumerate(index.select("Outputs/Definitions/OutputDefinition"), start=1):
+        quantity = definition.findtext("Quantity", "").strip()
+        if quantity in KEPT_OUTPUTS and quantity not in seen:
+            seen.add(quantity)
+        else:
+            pruned.append(i)
+
+    return BaseCase(
+        case=case,
+        template=template,
+        heating_setpoint=setpoints["HeatingSetpointSchedule"],
+        cooling_setpoint=setpoints["CoolingSetpointSchedule"],
+        shgc_curve=tuple(float(v) for v in curve),
+        shgc_hemis=float(index.select("WindowGlazingSystem@SHGCHemis")[0].text),
+        pruned_outputs=tuple(pruned),
+    )
+
+
+# =========================
+# Parameters
+# =========================
+
+def _shgc_patches(base: BaseCase, shgc: float) -> list[Patch]:
+    """Scale the angle-dependent SHGC curve (and the hemispherical SHGC) to a new normal value."""
+    factor = shgc / base.shgc_curve[0]
+    curve = " ".join(f"{v * factor:.4g}" for v in base.shgc_curve) + " "
+    return [
+        Patch("set_text", "WindowGlazingSystem/LinearSplineParameter/Y", (curve,)),
+        Patch("set_text", "WindowGlazingSystem@SHGCHemis", (f"{base.shgc_hemis * factor:.4g}",)),
+    ]
+
+
+def _wall_patches(base: BaseCase, thickness: float) -> list[Patch]:
+    if base.high_mass:
+        return update_wall_insulation_high_mass(thickness)
+    return update_wall_insulation_low_mass(thickness, mat_id=1010002)
+
+
+# parameter name -> (unit, patch builder (base, value) -> patches)
+PARAMETERS: dict[str, tuple[str, Callable[[BaseCase, float], list[Patch]]]] = {
+    "wall_insulation": ("m", _wall_patches),
+    "roof_insulation": ("m", lambda base, v: update_roof_insulation(v)),
+    "shgc":            ("---", _shgc_patches),
+    "u_window":        ("W/m2K", lambda base, v: [
+        Patch("set_text", "WindowGlazingSystem@ThermalTransmittance", (f"{v:g}",))]),
+    "heating_setpoint": ("C", None),
+    "cooling_setpoint": ("C", None),
+}
+
+
+def parse_param(spec: str) -> tuple[str, list[float]]:
+    """Parse NAME=start:stop:count (inclusive linspace) or NAME=v1,v2,..."""
+    name, sep, values = spec.partition("=")
+    name = name.strip()
+    if not sep or name not in PARAMETERS:
+        raise ValueError(f"Invalid parameter '{spec}', expected NAME=start:stop:count or NAME=v1,v2 "
+                         f"with NAME one of {', '.join(PARAMETERS)}")
+    if ":" in values:
+        start, stop, count = values.split(":")
+        return name, [round(v, 6) for v in np.linspace(float(start), float(stop), int(count))]
+    return name, [float(v) for v in values.split(",") if v.strip()]
+
+
+def variant_patches(base: BaseCase, params: dict[str, float], epw: Path) -> list[Patch]:
+    """All patches of one sweep variant on top of the base template."""
+    patches = [Patch("set_text", "ClimateFilePath", (str(epw.resolve()),))]
+    # Remove from the back so the remaining positions stay valid
+    patches += [Patch("remove", f"Outputs/Definitions/OutputDefinition[{i}]")
+                for i in reversed(base.pruned_outputs)]
+    for name, value in params.items():
+        builder = PARAMETERS[name][1]
+        if builder is not None:
+            patches += builder(base, value)
+    if "heating_setpoint" in params or "cooling_setpoint" in params:
+        patches += set_thermostat(heating=params.get("heating_setpoint", base.heating_setpoint),
+                                  cooling=params.get("cooling_setpoint", base.cooling_setpoint))
+    return patches
+
+
+def iter_variants(grid: dict[str, list[float]]) -> Iterator[tuple[int, dict[str, float]]]:
+    """Lazily enumerate (variant id, parameters) over the cartesian product."""
+    names = list(grid)
+    for i, values in enumerate(itertools.product(*grid.values())):
+        yield i, dict(zip(names, values))
+
+
+# =========================
+# Running
+# =========================
+
+def read_loads(results_dir: Path, case: str) -> dict[str, float]:
+    """Annual [MWh] and peak [kW] ideal loads over the same hours as validate_nandrad."""
+    hourly = read_nandrad_hourly(results_dir, case, ("heating", "cooling"))
+    if len(hourly) < 2:
+        raise FileNotFoundError(f"Missing ideal load outputs in {results_dir}")
+    values = nandrad_aggregates(case, hourly).set_index("metric")["value"]
+    return {f"{prefix}{kind}_{unit}": float(values[f"{prefix}{kind}"])
+            for kind in ("heating", "cooling") for prefix, unit in (("", "MWh"), ("peak_", "kW"))}
+
+
+def run_variant(
+    base: BaseCase,
+    variant_id: int,
+    params: dict[str, float],
+    exec_path: Path,
+    work_dir: Path,
+    epw: Path,
+    nandrad_dir: str = NANDRAD_DIR,
+    keep: bool = False,
+) -> dict[str, object]:
+    """Generate, simulate and reduce one variant; returns its results row."""
+    name = f"v{variant_id:06d}"
+    project = work_dir / f"{name}.nandrad"
+    row: dict[str, object] = {"id": variant_id, **params}
+    start = time.perf_counter()
+    finished = False
+    try:
+        # unchanged bytes keep the project mtime, so a variant interrupted by a crash resumes
+        write_if_changed(str(project), build_case(base.template, variant_patches(base, params, epw), nandrad_dir))
+        restart = restart_point(project) is not None
+        if restart:
+            logging.info("Resuming variant %s from its restart point", name)
+        subprocess.run(nandrad_command(exec_path.resolve(), project.resolve(), restart=restart), check=True,
+                       cwd=work_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        finished = True
+        row.update(read_loads(work_dir / name / "results", base.case))
+        row["status"] = "OK"
+    except (OSError, subprocess.CalledProcessError, LookupError, ValueError, pd.errors.ParserError) as e:
+        logging.warning("Variant %s failed: %s", name, e)
+        row["status"] = "FAIL"
+    finally:
+        # a run that did not finish (solver failure, Ctrl-C) keeps its restart point
+        if finished and not keep:
+            shutil.rmtree(work_dir / name, ignore_errors=True)
+            project.unlink(missing_ok=True)
+    row["runtime_s"] = round(time.perf_counter() - start, 3)
+    return row
+
+
+def completed_ids(out: Path) -> set[int]:
+    """Variant ids with an OK row in the results TSV; rows of failed variants are dropped from the file.
+
+    Failed variants are simulated again by the next sweep (from their
+    restart point, if the solver left one), so they only keep the new row.
+    """
+    if not out.exists() or out.stat().st_size == 0:
+        return set()
+    lines = out.read_text(encoding="utf-8").splitlines(keepends=True)
+    status = lines[0].rstrip("\n").split("\t").index("status")
+    ok = [line for line in lines[1:] if line.rstrip("\n").split("\t")[status] == "OK"]
+    if len(ok) < len(lines) - 1:
+        out.write_text("".join(lines[:1] + ok), encoding="utf-8")
+    return {int(line.split("\t", 1)[0]) for line in ok}
+
+
+def run_sweep(
+    base: BaseCase,
+    grid: dict[str, list[float]],
+    exec_path: Path,
+    work_dir: Path,
+    out: Path,
+    epw: Path,
+    jobs: int,
+    nandrad_dir: str = NANDRAD_DIR,
+    keep: bool = False,
+) -> int:
+    """Run all variants without an OK row in out; rows are appended as variants finish.
+
+    At most 2 * jobs variants are queued at once, so memory stays flat for
+    any sweep size. Returns the number of failed variants.
+    """
+    columns = ["id", *grid, *RESULT_COLUMNS]
+    done = completed_ids(out)
+    total = int(np.prod([len(v) for v in grid.values()]))
+    todo = ((i, p) for i, p in iter_variants(grid) if i not in done)
+    logging.info("Sweep over %d variant(s), %d already done, %d worker(s)", total, len(done), jobs)
+
+    work_dir.mkdir(parents=True, exist_ok=True)
+    new_file = not out.exists() or out.stat().st_size == 0
+    n_done = n_failed = 0
+    with out.open("w" if new_file else "a", encoding="utf-8") as f, ThreadPoolExecutor(max_workers=jobs) as pool:
+        if new_file:
+            f.write("\t".join(columns) + "\n")
+        running = set()
+
+        def _submit() -> None:
+            for variant_id, params in itertools.islice(todo, 2 * jobs - len(running)):
+                running.add(pool.submit(run_variant, base, variant_id, params, exec_path,
+                                        work_dir, epw, nandrad_dir, keep))
+
+        _submit()
+        while running:
+            finished, running = wait(running, return_when=FIRST_COMPLETED)
+            _submit()
+            for fut in finished:
+                row = fut.result()
+                f.write("\t".join(_fmt(row.get(c)) for c in columns) + "\n")
+                n_done += 1
+                n_failed += row["status"] != "OK"
+            f.flush()
+            logging.info("%d/%d variant(s) finished (%d failed)", len(done) + n_done, total, n_failed)
+    return n_failed
+
+
+def _fmt(value: object) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return f"{value:.6g}"
+    return str(value)
+
+
+# =========================
+# CLI
+# =========================
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Parametric sweep over NANDRAD BESTEST case parameters.")
+    parser.add_argument("--base", default="600", choices=list(BASE_TEMPLATES), help="Base case of the sweep")
+    parser.add_argument("-p", "--param", action="append", default=[], metavar="NAME=RANGE",
+                        help=f"Parameter range, NAME=start:stop:count or NAME=v1,v2 "
+                             f"(NAME: {', '.join(PARAMETERS)}); repeatable")
+    parser.add_argument("--nandrad-exec", type=Path,
+        default=(Path("C:/Program Files/VICUS-Software/VICUS/NandradSolver.exe") if os.name == "nt"
+                 else Path.cwd() / "bin" / "NandradSolver")
+    )
+    parser.add_argument("--nandrad-dir", default=NANDRAD_DIR, help="Directory with the templates")
+    parser.add_argument("--epw", type=Path, default=Path.cwd() / "data" / "climate" / "725650TYCST.epw",
+                        help="Path to the EPW file")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Number of concurrent solver runs (default: CPU count)")
+    parser.add_argument("--work-dir", type=Path, default=Path.cwd() / "sweep_work",
+                        help="Directory for the temporary variant projects")
+    parser.add_argument("--out", type=Path, default=Path.cwd() / "sweep_results.tsv",
+                        help="Results TSV (appended to; finished variants are skipped)")
+    parser.add_argument("--keep", action="store_true", help="Keep variant projects and solver outputs")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    setup_logging()
+
+    try:
+        grid = dict(parse_param(spec) for spec in args.param)
+    except ValueError as e:
+        logging.error("%s", e)
+        return 2
+    if not grid:
+        logging.error("No parameters given (use --param NAME=RANGE)")
+        return 2
+    if not args.nandrad_exec.exists():
+        logging.error("NANDRAD solver not found: %s", args.nandrad_exec)
+        return 2
+
+    base = load_base_case(args.base, args.nandrad_dir)
+    failed = run_sweep(base, grid, args.nandrad_exec, args.work_dir, args.out, args.epw,
+                       max(1, args.jobs), args.nandrad_dir, args.keep)
+    logging.info("Results: %s", args.out)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
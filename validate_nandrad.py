@@ -11,6 +11,10 @@ Validation runner for NANDRAD / EnergyPlus / TRNSYS comparisons.
 - Writes where maxima occur (global & per-month) for all series.
 - Writes where minima occur (global & per-month) for Air Temperature.
 - Writes mean Air Temperature as TSV (global per series + monthly per series).
+- Computes hourly agreement statistics (MBE, NMBE, RMSE, CV(RMSE), r, max |Δ|) per engine pair.
+- Can run as single pipeline stage (--stage simulate|validate|render); the
+  validate stage writes all TSVs and a render list, the render stage draws
+  the HTML/SVG plots from them (used by run_all_validations.py).
 
 Key improvements:
 - No global variables; explicit data flow.
@@ -27,16 +31,26 @@ import locale
 import logging
 import os
 import subprocess
+import time
+import warnings
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 from typing import Optional, Sequence
 
 import esoreader
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import plotly.express as px
 
+from case_dashboard import CaseDashboard
+from energyplus_sql import SqlOutput, index_sql
+from monthly_charts import MonthlyCharts
+from prune_energyplus_outputs import prepare_idf
+from reference_checks import METRICS, aggregates_from_hourly, check_references, load_reference_table, to_report
+from report_tables import html_rows
+from solver_stats import energyplus_stats, nandrad_stats, read_solver_stats
+
 
 # =========================
 # Constants & utils
@@ -105,7 +119,7 @@ def read_reference(path: Path) -> pd.DataFrame:
 
 @dataclass(frozen=True)
 class LoadedData:
-    eso: Optional[esoreader.Eso]
+    eso: Optional[esoreader.Eso | SqlOutput]
     trnsys: Optional[pd.DataFrame]
     air_temp: pd.DataFrame
     cooling: pd.DataFrame
@@ -121,22 +135,30 @@ class LoadedData:
 
 
 @dataclass(frozen=True)
-class AnnualReferences:
-    annual: pd.DataFrame       # from annual-references.tsv (Case indexed)
-    free_float: pd.DataFrame   # from free-float-references.tsv (Case indexed)
+class SharedData:
+    """Comparison data of a case that is the same for all NANDRAD variants."""
+    eso: Optional[esoreader.Eso | SqlOutput]
+    trnsys: Optional[pd.DataFrame]
+    reference: pd.DataFrame
 
 
-def load_all(nandrad_dir: Path, eso_file: Path, trnsys_file: Path, reference_file: Path) -> LoadedData:
-    """Load all required datasets for validation.
+def load_shared(eso_file: Path, trnsys_file: Path, reference_file: Path,
+                sql_file: Optional[Path] = None) -> SharedData:
+    """Load EnergyPlus, TRNSYS and the monthly reference table once per case.
 
     EnergyPlus (ESO) and TRNSYS results are optional — if the files are
-    missing the corresponding field in LoadedData will be None and
-    process_and_validate() will produce NANDRAD-only outputs.
+    missing the corresponding field will be None and process_and_validate()
+    will produce NANDRAD-only outputs. An eplusout.sql (sql_file) that is not
+    older than the ESO is used instead of the ESO (indexed lookups, no full parse).
     """
-    logging.info("%sLoading data...%s", Ansi.OKBLUE, Ansi.ENDC)
+    logging.info("%sLoading comparison data...%s", Ansi.OKBLUE, Ansi.ENDC)
 
     eso = None
-    if eso_file.exists():
+    if sql_file is not None and sql_file.exists() and (
+            not eso_file.exists() or sql_file.stat().st_mtime >= eso_file.stat().st_mtime):
+        eso = SqlOutput(sql_file)
+        logging.info("EnergyPlus results from %s", sql_file)
+    elif eso_file.exists():
         eso = esoreader.read_from_path(str(eso_file))
     else:
         logging.warning("%sEnergyPlus ESO not found (%s) — continuing without E+ data.%s",
@@ -149,13 +171,19 @@ def load_all(nandrad_dir: Path, eso_file: Path, trnsys_file: Path, reference_fil
         logging.warning("%sTRNSYS output not found (%s) — continuing without TRNSYS data.%s",
                         Ansi.WARNING, trnsys_file, Ansi.ENDC)
 
+    return SharedData(eso, trnsys, read_reference(reference_file))
+
+
+def load_nandrad(nandrad_dir: Path, shared: SharedData) -> LoadedData:
+    """Load the NANDRAD results of one variant on top of the shared comparison data."""
+    logging.info("%sLoading NANDRAD results: %s%s", Ansi.OKBLUE, nandrad_dir, Ansi.ENDC)
+
     air_temp    = read_tsv(nandrad_dir / "results/AirTemperature-Hourly.tsv")
     cooling     = read_tsv(nandrad_dir / "results/IdealCoolingLoad-mean-Hourly.tsv")
     heating     = read_tsv(nandrad_dir / "results/IdealHeatingLoad-mean-Hourly.tsv")
     window      = read_tsv(nandrad_dir / "results/WindowOutputs.tsv")
     ventilation = read_tsv(nandrad_dir / "results/VentilationHeatLoad-mean-Hourly.tsv")
     radiation   = read_tsv(nandrad_dir / "results/RadiationLoadsOutputs.tsv")
-    reference   = read_reference(reference_file)
 
     # Load shading factors (optional - may not exist for all cases)
     direct_shading = None
@@ -181,30 +209,13 @@ def load_all(nandrad_dir: Path, eso_file: Path, trnsys_file: Path, reference_fil
         diffuse_sw_radiation = read_tsv(diffuse_sw_path)
         logging.info("Loaded DiffuseShortWaveRadiation data")
 
-    return LoadedData(eso, trnsys, air_temp, cooling, heating, window, ventilation, radiation, reference,
-                      direct_shading, diffuse_shading, direct_sw_radiation, diffuse_sw_radiation)
-
+    return LoadedData(shared.eso, shared.trnsys, air_temp, cooling, heating, window, ventilation, radiation,
+                      shared.reference, direct_shading, diffuse_shading, direct_sw_radiation, diffuse_sw_radiation)
 
-def load_annual_references(ref_dir: Path) -> Optional[AnnualReferences]:
-    """Load annual and free-float reference TSV files if they exist."""
-    annual_path = ref_dir / "annual-references.tsv"
-    ff_path = ref_dir / "free-float-references.tsv"
 
-    if not annual_path.exists():
-        logging.warning("Annual reference file not found: %s", annual_path)
-        return None
-
-    annual = pd.read_csv(annual_path, sep="\t").set_index("Case")
-    annual.index = annual.index.astype(str).str.strip()
-
-    if ff_path.exists():
-        ff = pd.read_csv(ff_path, sep="\t").set_index("Case")
-        ff.index = ff.index.astype(str).str.strip()
-    else:
-        ff = pd.DataFrame()
-        logging.warning("Free-float reference file not found: %s", ff_path)
-
-    return AnnualReferences(annual=annual, free_float=ff)
+def load_all(nandrad_dir: Path, eso_file: Path, trnsys_file: Path, reference_file: Path) -> LoadedData:
+    """Load all required datasets for validating a single variant."""
+    return load_nandrad(nandrad_dir, load_shared(eso_file, trnsys_file, reference_file))
 
 
 # =========================
@@ -222,8 +233,10 @@ def col_by_substring(df: pd.DataFrame, needle: str) -> pd.Series:
     return pd.to_numeric(s, errors="coerce")
 
 
-def eso_series(eso: esoreader.Eso, var: str, key: Optional[str], frequency: str = "Hourly") -> pd.Series:
-    """Extract a single numeric Series from ESO by variable name and optional key."""
+def eso_series(eso: esoreader.Eso | SqlOutput, var: str, key: Optional[str], frequency: str = "Hourly") -> pd.Series:
+    """Extract a single numeric Series from ESO (or eplusout.sql) by variable name and optional key."""
+    if isinstance(eso, SqlOutput):
+        return pd.Series(eso.series(var, key, frequency))
     try:
         df = eso.to_frame(var, frequency=frequency, key=(key if key else ""))
     except Exception as e:
@@ -252,47 +265,110 @@ def trnsys_series(trnsys_df: pd.DataFrame, col: str) -> pd.Series:
 # Plotting & exports
 # =========================
 
-def save_hourly_outputs(df: pd.DataFrame, out_tsv: Path, out_html: Path, title: str, y_label: str) -> None:
-    """Save hourly TSV and interactive HTML line plot."""
+def save_hourly_outputs(
+    df: pd.DataFrame,
+    out_tsv: Path,
+    out_html: Optional[Path],
+    title: str,
+    y_label: str,
+    render_jobs: Optional[list[dict]] = None,
+) -> None:
+    """Save hourly TSV and interactive HTML line plot (deferred to render_jobs if given, none without out_html)."""
     df.to_csv(out_tsv, sep="\t", index=True, index_label="Datetime")
     logging.info("Saved hourly TSV: %s", out_tsv)
 
+    if out_html is None:
+        return
+    if render_jobs is not None:
+        render_jobs.append(dict(kind="hourly", source=out_tsv.name, target=out_html.name,
+                                title=title, label=y_label, is_max=False))
+        return
+    save_hourly_html(df, out_html, title, y_label)
+
+
+def save_hourly_html(df: pd.DataFrame, out_html: Path, title: str, y_label: str) -> None:
+    """Save interactive HTML line plot of hourly series."""
     fig = px.line(df, x=df.index, y=df.columns, template="plotly_white", title=title)
     fig.update_layout(yaxis_title=y_label, xaxis_title="")
     fig.write_html(out_html)
     logging.info("Saved hourly HTML: %s", out_html)
 
 
-def save_monthly_bar_with_ref(df_m: pd.DataFrame, title: str, case: str, variant: str, out_svg: Path, is_max_value: bool = False) -> None:
-    """Save monthly bar chart with optional min/max overlays."""
-    plt.style.use("seaborn-v0_8-whitegrid")
-    fig, ax = plt.subplots(figsize=(10, 6))
-    
+def monthly_title(title: str, is_max_value: bool = False) -> str:
+    """Chart title of monthly sums (energies) or monthly maxima (loads)."""
     title = title.replace("W/m²", "Wh/m²")
     if (is_max_value):
         title = title.replace("energie", "last")
         title = title.replace("h]", "]")
+    return title
+
+
+def save_monthly_bar_with_ref(
+    df_m: pd.DataFrame,
+    title: str,
+    case: str,
+    variant: str,
+    out_svg: Path,
+    is_max_value: bool = False,
+    charts: Optional[MonthlyCharts] = None,
+) -> None:
+    """Save monthly bar chart with optional min/max overlays (charts: reused templates, see monthly_charts)."""
+    title = monthly_title(title, is_max_value)
+    (charts or MonthlyCharts()).save(df_m, f"{title} | Fall {case}", title, out_svg)
+
+
+def set_month_locale() -> None:
+    """Month labels of the monthly tables/charts (German, English fallback)."""
+    try:
+        locale.setlocale(locale.LC_TIME, "de_DE.UTF-8")
+    except locale.Error:
+        try:
+            locale.setlocale(locale.LC_TIME, "English_United States.1252")
+        except locale.Error:
+            pass
 
-    plot_cols = [c for c in df_m.columns if c not in ("min", "max")]
-    df_m[plot_cols].plot(kind="bar", ax=ax, width=0.8, legend=True)
 
-    if {"min", "max"}.issubset(df_m.columns):
-        xs = np.arange(len(df_m.index))
-        ax.plot(xs, df_m["min"].values, linestyle="None", color="black",
-                marker="_", markersize=10, mew=2, label="Reference Min")
-        ax.plot(xs, df_m["max"].values, linestyle="None", color="black",
-                marker="+", markersize=10, mew=2, label="Reference Max")
+# Deferred plots of the validate stage, rendered by the render stage
+RENDER_COLUMNS = ["kind", "source", "target", "title", "label", "is_max"]
 
-    ax.set_title(f"{title} | Fall {case}")
-    ax.set_xlabel("Monat")
-    ax.set_ylabel(title)
-    ax.tick_params(axis="x", rotation=45)
-    ax.legend()
-    fig.tight_layout()
 
-    fig.savefig(out_svg, format="svg")
-    plt.close(fig)
-    logging.info("Saved monthly SVG: %s", out_svg)
+def save_render_jobs(jobs: list[dict], output_dir: Path, case: str, variant: str) -> None:
+    out_tsv = output_dir / f"Case{case}_{variant}_render.tsv"
+    pd.DataFrame(jobs, columns=RENDER_COLUMNS).to_csv(out_tsv, sep="\t", index=False)
+    logging.info("Saved render list: %s", out_tsv)
+
+
+def render_outputs(output_dir: Path, case: str, variant: str, charts: Optional[MonthlyCharts] = None) -> int:
+    """Draw the plots listed in Case{case}_{variant}_render.tsv from the written TSVs.
+
+    Returns the number of plots that could not be rendered. The render list
+    is removed once all plots are written.
+    """
+    jobs_tsv = output_dir / f"Case{case}_{variant}_render.tsv"
+    ensure_exists(jobs_tsv)
+    jobs = pd.read_csv(jobs_tsv, sep="\t", keep_default_na=False)
+    set_month_locale()
+    charts = charts or MonthlyCharts()
+
+    failed = 0
+    for job in jobs.itertuples(index=False):
+        try:
+            if job.kind == "hourly":
+                df = pd.read_csv(output_dir / job.source, sep="\t", index_col="Datetime", parse_dates=True,
+                                 float_precision="round_trip").rename_axis(None)
+                save_hourly_html(df, output_dir / job.target, job.title, job.label)
+            else:
+                df_m = pd.read_csv(output_dir / job.source, sep="\t", index_col=0, float_precision="round_trip")
+                if job.is_max:
+                    df_m.index = pd.to_datetime(df_m.index).strftime("%b")
+                save_monthly_bar_with_ref(df_m, job.title, case, variant, output_dir / job.target, bool(job.is_max),
+                                          charts)
+        except Exception as e:
+            failed += 1
+            logging.error("%sCould not render %s: %s%s", Ansi.FAIL, job.target, e, Ansi.ENDC)
+    if not failed:
+        jobs_tsv.unlink()
+    return failed
 
 
 # =========================
@@ -434,240 +510,168 @@ def _save_mean_air_temperature(
 
 
 # =========================
-# Reference checking
+# Hourly agreement statistics
 # =========================
 
-def _check_range(value: float, ref_min: float, ref_max: float) -> str:
-    """Return 'PASS' if value is within [ref_min, ref_max], else 'FAIL'."""
-    if pd.isna(ref_min) or pd.isna(ref_max):
-        return "SKIP"
-    if ref_min <= value <= ref_max:
-        return "PASS"
-    return "FAIL"
+ENGINES = ("NANDRAD", "EnergyPlus", "TRNSYS")
+ENGINE_PAIRS = (("NANDRAD", "EnergyPlus"), ("NANDRAD", "TRNSYS"), ("EnergyPlus", "TRNSYS"))
 
 
-def check_annual_references(
-    nandrad_annual_heating_kwh: float,
-    nandrad_annual_cooling_kwh: float,
-    case: str,
-    annual_refs: pd.DataFrame,
-    ep_annual_heating_kwh: Optional[float] = None,
-    ep_annual_cooling_kwh: Optional[float] = None,
-    trnsys_annual_heating_kwh: Optional[float] = None,
-    trnsys_annual_cooling_kwh: Optional[float] = None,
-) -> list[dict]:
-    """Compare annual heating/cooling totals against reference bands.
-
-    Annual references are in MWh, values come in kWh -> convert.
+def stack_hourly(
+    hourly: dict[str, pd.DataFrame],
+    columns: Sequence[str] = ENGINES,
+) -> tuple[list[str], np.ndarray]:
+    """Stack hourly comparison frames into one (metric x hour x column) matrix.
+
+    All frames share the index from build_hourly_index(). Columns missing from
+    a frame are stored as NaN so that their statistics drop out.
     """
-    results = []
-    nandrad_heating_mwh = nandrad_annual_heating_kwh / 1000.0
-    nandrad_cooling_mwh = nandrad_annual_cooling_kwh / 1000.0
-
-    if case in annual_refs.index:
-        row = annual_refs.loc[case]
-        # Annual heating
-        results.append({
-            "metric": "Jährliche Heizenergie [MWh]",
-            "case": case,
-            "nandrad_value": round(nandrad_heating_mwh, 4),
-            "ep_value": round(ep_annual_heating_kwh / 1000.0, 4) if ep_annual_heating_kwh is not None else "",
-            "trnsys_value": round(trnsys_annual_heating_kwh / 1000.0, 4) if trnsys_annual_heating_kwh is not None else "",
-            "ref_min": row.get("heating_min"),
-            "ref_max": row.get("heating_max"),
-            "status": _check_range(nandrad_heating_mwh,
-                                   row.get("heating_min", float("nan")),
-                                   row.get("heating_max", float("nan"))),
-        })
-        # Annual cooling
-        results.append({
-            "metric": "Jährliche Kühlenergie [MWh]",
-            "case": case,
-            "nandrad_value": round(nandrad_cooling_mwh, 4),
-            "ep_value": round(ep_annual_cooling_kwh / 1000.0, 4) if ep_annual_cooling_kwh is not None else "",
-            "trnsys_value": round(trnsys_annual_cooling_kwh / 1000.0, 4) if trnsys_annual_cooling_kwh is not None else "",
-            "ref_min": row.get("cooling_min"),
-            "ref_max": row.get("cooling_max"),
-            "status": _check_range(nandrad_cooling_mwh,
-                                   row.get("cooling_min", float("nan")),
-                                   row.get("cooling_max", float("nan"))),
-        })
-    else:
-        logging.info("No annual references for Case %s", case)
+    metrics = list(hourly)
+    n_hours = max((len(df) for df in hourly.values()), default=0)
+    matrix = np.full((len(metrics), n_hours, len(columns)), np.nan)
+    for i, metric in enumerate(metrics):
+        df = hourly[metric]
+        for j, engine in enumerate(columns):
+            if engine not in df.columns:
+                continue
+            values = pd.to_numeric(df[engine], errors="coerce").to_numpy(dtype=float)
+            matrix[i, :len(values), j] = values
+    return metrics, matrix
+
+
+def compute_agreement_stats(
+    hourly: dict[str, pd.DataFrame],
+    pairs: Sequence[tuple[str, str]] = ENGINE_PAIRS,
+) -> pd.DataFrame:
+    """Compute hourly agreement statistics for every column pair and metric.
+
+    Pairs default to the engine pairs; the variant comparison passes pairs
+    of variant columns instead. For each pair (a, b) the second is the reference:
+    MBE = mean(a - b), NMBE = MBE / mean(b), RMSE, CV(RMSE) = RMSE / mean(b),
+    Pearson r and the maximum absolute hourly deviation, all over the hours
+    where both columns have a value. All metrics and pairs are evaluated
+    together as NumPy reductions over the stacked hourly matrix.
+    """
+    cols = ["Metrik", "Paar", "N", "MBE", "NMBE [%]", "RMSE", "CV(RMSE) [%]", "r", "Max |Δ|"]
+    if not hourly:
+        return pd.DataFrame(columns=cols)
+
+    columns = list(dict.fromkeys(c for pair in pairs for c in pair))
+    metrics, matrix = stack_hourly(hourly, columns)
+    ia = [columns.index(a) for a, _ in pairs]
+    ib = [columns.index(b) for _, b in pairs]
+    a = matrix[:, :, ia]                       # (metric, hour, pair)
+    b = matrix[:, :, ib]
+    # joint mask: every reduction sees the same hours on both sides
+    valid = ~np.isnan(a) & ~np.isnan(b)
+    a = np.where(valid, a, np.nan)
+    b = np.where(valid, b, np.nan)
+    err = a - b
+
+    # Pairs with a missing engine are all-NaN slices; their statistics stay NaN.
+    with warnings.catch_warnings(), np.errstate(invalid="ignore", divide="ignore"):
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        n = np.sum(~np.isnan(err), axis=1)
+        mbe = np.nanmean(err, axis=1)
+        rmse = np.sqrt(np.nanmean(err ** 2, axis=1))
+        max_abs = np.nanmax(np.abs(err), axis=1)
+        mean_b = np.nanmean(b, axis=1)
+        scale = np.where(np.abs(mean_b) > 1e-12, mean_b, np.nan)
+        nmbe = mbe / scale * 100.0
+        cv_rmse = rmse / np.abs(scale) * 100.0
+        da = a - np.nanmean(a, axis=1, keepdims=True)
+        db = b - np.nanmean(b, axis=1, keepdims=True)
+        r = np.nansum(da * db, axis=1) / np.sqrt(np.nansum(da ** 2, axis=1) * np.nansum(db ** 2, axis=1))
+
+    pair_labels = [f"{x} – {y}" for x, y in pairs]
+    df = pd.DataFrame({
+        "Metrik": np.repeat(metrics, len(pairs)),
+        "Paar": np.tile(pair_labels, len(metrics)),
+        "N": n.ravel(),
+        "MBE": mbe.ravel(),
+        "NMBE [%]": nmbe.ravel(),
+        "RMSE": rmse.ravel(),
+        "CV(RMSE) [%]": cv_rmse.ravel(),
+        "r": r.ravel(),
+        "Max |Δ|": max_abs.ravel(),
+    }, columns=cols)
+    df = df[df["N"] > 0].reset_index(drop=True)
+    return df.round(4)
+
+
+def save_agreement_stats(stats: pd.DataFrame, output_dir: Path, case: str, variant: str) -> None:
+    """Write hourly agreement statistics as TSV."""
+    out_tsv = output_dir / f"Case{case}_{variant}_agreement_stats.tsv"
+    stats.to_csv(out_tsv, sep="\t", index=False)
+    logging.info("Saved agreement statistics: %s", out_tsv)
 
-    return results
 
+# =========================
+# Reference checking
+# =========================
 
-def check_peak_references(
-    nandrad_peak_heating_kw: float,
-    nandrad_peak_cooling_kw: float,
-    case: str,
-    annual_refs: pd.DataFrame,
-    ep_peak_heating_kw: Optional[float] = None,
-    ep_peak_cooling_kw: Optional[float] = None,
-    trnsys_peak_heating_kw: Optional[float] = None,
-    trnsys_peak_cooling_kw: Optional[float] = None,
-) -> list[dict]:
-    """Compare peak heating/cooling loads against reference bands (kW)."""
-    results = []
-    if case in annual_refs.index:
-        row = annual_refs.loc[case]
-        results.append({
-            "metric": "Spitzenheizlast [kW]",
-            "case": case,
-            "nandrad_value": round(nandrad_peak_heating_kw, 4),
-            "ep_value": round(ep_peak_heating_kw, 4) if ep_peak_heating_kw is not None else "",
-            "trnsys_value": round(trnsys_peak_heating_kw, 4) if trnsys_peak_heating_kw is not None else "",
-            "ref_min": row.get("peak_heating_min"),
-            "ref_max": row.get("peak_heating_max"),
-            "status": _check_range(nandrad_peak_heating_kw,
-                                   row.get("peak_heating_min", float("nan")),
-                                   row.get("peak_heating_max", float("nan"))),
-        })
-        results.append({
-            "metric": "Spitzenkühllast [kW]",
-            "case": case,
-            "nandrad_value": round(nandrad_peak_cooling_kw, 4),
-            "ep_value": round(ep_peak_cooling_kw, 4) if ep_peak_cooling_kw is not None else "",
-            "trnsys_value": round(trnsys_peak_cooling_kw, 4) if trnsys_peak_cooling_kw is not None else "",
-            "ref_min": row.get("peak_cooling_min"),
-            "ref_max": row.get("peak_cooling_max"),
-            "status": _check_range(nandrad_peak_cooling_kw,
-                                   row.get("peak_cooling_min", float("nan")),
-                                   row.get("peak_cooling_max", float("nan"))),
-        })
-    return results
+def validation_tables_html(report: pd.DataFrame, agreement: Optional[pd.DataFrame] = None) -> str:
+    """Pass/fail summary, validation table and (if given) agreement table as an HTML fragment."""
+    df = report.drop(columns=["Case"], errors="ignore")
 
+    # Count pass/fail
+    n_pass = (df["Status"] == "PASS").sum()
+    n_fail = (df["Status"] == "FAIL").sum()
+    n_skip = (df["Status"] == "SKIP").sum()
+    n_total = len(df)
 
-def check_free_float_references(
-    nandrad_temp_max: float,
-    nandrad_temp_min: float,
-    nandrad_temp_avg: float,
-    case: str,
-    ff_refs: pd.DataFrame,
-    ep_temp_max: Optional[float] = None,
-    ep_temp_min: Optional[float] = None,
-    ep_temp_avg: Optional[float] = None,
-    trnsys_temp_max: Optional[float] = None,
-    trnsys_temp_min: Optional[float] = None,
-    trnsys_temp_avg: Optional[float] = None,
-) -> list[dict]:
-    """Compare free-float temperatures against reference bands."""
-    results = []
-    if ff_refs.empty or case not in ff_refs.index:
-        logging.info("No free-float references for Case %s", case)
-        return results
-
-    row = ff_refs.loc[case]
-    results.append({
-        "metric": "Max. Lufttemperatur [°C]",
-        "case": case,
-        "nandrad_value": round(nandrad_temp_max, 2),
-        "ep_value": round(ep_temp_max, 2) if ep_temp_max is not None else "",
-        "trnsys_value": round(trnsys_temp_max, 2) if trnsys_temp_max is not None else "",
-        "ref_min": row.get("temp_max_min"),
-        "ref_max": row.get("temp_max_max"),
-        "status": _check_range(nandrad_temp_max,
-                               row.get("temp_max_min", float("nan")),
-                               row.get("temp_max_max", float("nan"))),
-    })
-    results.append({
-        "metric": "Min. Lufttemperatur [°C]",
-        "case": case,
-        "nandrad_value": round(nandrad_temp_min, 2),
-        "ep_value": round(ep_temp_min, 2) if ep_temp_min is not None else "",
-        "trnsys_value": round(trnsys_temp_min, 2) if trnsys_temp_min is not None else "",
-        "ref_min": row.get("temp_min_min"),
-        "ref_max": row.get("temp_min_max"),
-        "status": _check_range(nandrad_temp_min,
-                               row.get("temp_min_min", float("nan")),
-                               row.get("temp_min_max", float("nan"))),
-    })
-    results.append({
-        "metric": "Mittl. Lufttemperatur [°C]",
-        "case": case,
-        "nandrad_value": round(nandrad_temp_avg, 2),
-        "ep_value": round(ep_temp_avg, 2) if ep_temp_avg is not None else "",
-        "trnsys_value": round(trnsys_temp_avg, 2) if trnsys_temp_avg is not None else "",
-        "ref_min": row.get("temp_avg_min"),
-        "ref_max": row.get("temp_avg_max"),
-        "status": _check_range(nandrad_temp_avg,
-                               row.get("temp_avg_min", float("nan")),
-                               row.get("temp_avg_max", float("nan"))),
-    })
-    return results
-
-
-def check_monthly_references(
-    df_hourly: pd.DataFrame,
-    case: str,
-    monthly_refs: pd.DataFrame,
-    ref_suffix: str,
-    metric_label: str,
-) -> list[dict]:
-    """Compare NANDRAD monthly sums against monthly reference bands."""
-    results = []
-    min_col = f"Case{case}_{ref_suffix}_min"
-    max_col = f"Case{case}_{ref_suffix}_max"
-
-    if min_col not in monthly_refs.columns or max_col not in monthly_refs.columns:
-        return results
-
-    month_labels = ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
-                    "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
-    df_m = df_hourly.resample("ME").sum()
-
-    for i, (_, row_m) in enumerate(df_m.iterrows()):
-        if i >= 12:
-            break
-        nandrad_val = row_m.get("NANDRAD", 0.0)
-        ref_min_val = monthly_refs.loc[monthly_refs.index == month_labels[i], min_col]
-        ref_max_val = monthly_refs.loc[monthly_refs.index == month_labels[i], max_col]
-        if ref_min_val.empty or ref_max_val.empty:
-            continue
-        r_min = float(ref_min_val.iloc[0])
-        r_max = float(ref_max_val.iloc[0])
-        rounded_val = round(float(nandrad_val), 2)
-        ep_val = row_m.get("EnergyPlus", None)
-        trn_val = row_m.get("TRNSYS", None)
-        results.append({
-            "metric": f"{metric_label} {month_labels[i]} [kWh]",
-            "case": case,
-            "nandrad_value": rounded_val,
-            "ep_value": round(float(ep_val), 2) if ep_val is not None and pd.notna(ep_val) else "",
-            "trnsys_value": round(float(trn_val), 2) if trn_val is not None and pd.notna(trn_val) else "",
-            "ref_min": r_min,
-            "ref_max": r_max,
-            "status": _check_range(rounded_val, r_min, r_max),
-        })
-    return results
+    row_style = df["Status"].map({"PASS": "background-color: #d4edda;",
+                                  "FAIL": "background-color: #f8d7da;"}).fillna("background-color: #e2e3e5;")
+
+    agreement_html = ""
+    if agreement is not None and not agreement.empty:
+        stats_rows = html_rows(agreement.astype(object).where(agreement.notna(), ""))
+        agreement_html = f"""
+<h2>Stündliche Übereinstimmung</h2>
+<p>Zweite Engine des Paares ist die Referenz (NMBE und CV(RMSE) bezogen auf deren Mittelwert).</p>
+<table>
+<thead><tr>{"".join(f"<th>{c}</th>" for c in agreement.columns)}</tr></thead>
+<tbody>
+{stats_rows}
+</tbody>
+</table>"""
+
+    return f"""<div class="summary">
+  <span class="pass">PASS: {n_pass}</span> &bull;
+  <span class="fail">FAIL: {n_fail}</span> &bull;
+  <span class="skip">SKIP: {n_skip}</span> &bull;
+  Total: {n_total}
+</div>
+<table>
+<thead><tr>{"".join(f"<th>{c}</th>" for c in df.columns)}</tr></thead>
+<tbody>
+{html_rows(df, row_style=row_style)}
+</tbody>
+</table>{agreement_html}"""
 
 
 def generate_validation_report(
-    results: list[dict],
+    report: pd.DataFrame,
     output_dir: Path,
     case: str,
     variant: str,
+    agreement: Optional[pd.DataFrame] = None,
+    html: bool = True,
 ) -> None:
-    """Write validation summary as TSV and styled HTML table."""
-    if not results:
+    """Write validation summary as TSV and (html=True) styled HTML table.
+
+    The report rows come from reference_checks.to_report(); the 'Status'
+    column refers to NANDRAD, EnergyPlus and TRNSYS have their own status
+    columns. If agreement statistics are given, they are appended to the
+    HTML report as a second table.
+    """
+    if report.empty:
         return
 
-    df = pd.DataFrame(results)
-    cols = ["metric", "nandrad_value", "ep_value", "trnsys_value", "ref_min", "ref_max", "status"]
-    # Ensure columns exist (older result dicts may lack ep/trnsys)
-    for c in ("ep_value", "trnsys_value"):
-        if c not in df.columns:
-            df[c] = ""
-    df = df[cols].rename(columns={
-        "metric": "Metrik",
-        "nandrad_value": "NANDRAD",
-        "ep_value": "EnergyPlus",
-        "trnsys_value": "TRNSYS",
-        "ref_min": "Ref Min",
-        "ref_max": "Ref Max",
-        "status": "Status",
-    })
+    df = report.drop(columns=["Case"], errors="ignore")
+    n_pass = (df["Status"] == "PASS").sum()
+    n_fail = (df["Status"] == "FAIL").sum()
+    n_total = len(df)
 
     # TSV
     tsv_path = output_dir / f"Case{case}_{variant}_validation_report.tsv"
@@ -675,28 +679,9 @@ def generate_validation_report(
     logging.info("Saved validation report TSV: %s", tsv_path)
 
     # HTML
-    html_path = output_dir / f"Case{case}_{variant}_validation_report.html"
-
-    # Count pass/fail
-    n_pass = (df["Status"] == "PASS").sum()
-    n_fail = (df["Status"] == "FAIL").sum()
-    n_skip = (df["Status"] == "SKIP").sum()
-    n_total = len(df)
-
-    def _row_color(status: str) -> str:
-        if status == "PASS":
-            return "background-color: #d4edda;"
-        elif status == "FAIL":
-            return "background-color: #f8d7da;"
-        return "background-color: #e2e3e5;"
-
-    html_rows = []
-    for _, row in df.iterrows():
-        style = _row_color(row["Status"])
-        cells = "".join(f'<td style="{style}">{v}</td>' for v in row)
-        html_rows.append(f"<tr>{cells}</tr>")
-
-    html = f"""<!DOCTYPE html>
+    if html:
+        html_path = output_dir / f"Case{case}_{variant}_validation_report.html"
+        page = f"""<!DOCTYPE html>
 <html lang="de">
 <head>
 <meta charset="utf-8">
@@ -715,23 +700,11 @@ td {{ padding: 8px; border-bottom: 1px solid #dee2e6; }}
 </head>
 <body>
 <h1>ASHRAE 140 Validation Report &mdash; Case {case} ({variant})</h1>
-<div class="summary">
-  <span class="pass">PASS: {n_pass}</span> &bull;
-  <span class="fail">FAIL: {n_fail}</span> &bull;
-  <span class="skip">SKIP: {n_skip}</span> &bull;
-  Total: {n_total}
-</div>
-<table>
-<thead><tr>{"".join(f"<th>{c}</th>" for c in df.columns)}</tr></thead>
-<tbody>
-{"".join(html_rows)}
-</tbody>
-</table>
+{validation_tables_html(report, agreement)}
 </body>
 </html>"""
-
-    html_path.write_text(html, encoding="utf-8")
-    logging.info("Saved validation report HTML: %s", html_path)
+        html_path.write_text(page, encoding="utf-8")
+        logging.info("Saved validation report HTML: %s", html_path)
 
     # Summary log
     if n_fail > 0:
@@ -740,6 +713,77 @@ td {{ padding: 8px; border-bottom: 1px solid #dee2e6; }}
         logging.info("%s%sValidation: %d/%d PASS%s", Ansi.OKGREEN, Ansi.BOLD, n_pass, n_total, Ansi.ENDC)
 
 
+def save_aggregates(aggregates: pd.DataFrame, output_dir: Path, case: str, variant: str) -> None:
+    """Write scalar aggregates (case, metric, engine, value) as TSV for suite-level checking."""
+    out_tsv = output_dir / f"Case{case}_{variant}_aggregates.tsv"
+    aggregates.to_csv(out_tsv, sep="\t", index=False)
+    logging.info("Saved aggregates: %s", out_tsv)
+
+
+def save_solver_stats(stats: pd.DataFrame, output_dir: Path, case: str, variant: str) -> None:
+    """Write solver statistics (case, engine, statistic, value) as TSV for the overview."""
+    out_tsv = output_dir / f"Case{case}_{variant}_solver_stats.tsv"
+    stats.to_csv(out_tsv, sep="\t", index=False)
+    logging.info("Saved solver statistics: %s", out_tsv)
+
+
+# =========================
+# Quick aggregates
+# =========================
+
+# series key -> (results file, quantity of multi-zone cases, column needle of single-zone cases)
+NANDRAD_SERIES = {
+    "heating": ("IdealHeatingLoad-mean-Hourly.tsv", "IdealHeatingLoad", "Heating"),
+    "cooling": ("IdealCoolingLoad-mean-Hourly.tsv", "IdealCoolingLoad", "Cooling"),
+    "air_temp": ("AirTemperature-Hourly.tsv", "AirTemperature", "AirTemperature"),
+}
+
+
+def read_tsv_column(path: Path, needle: str) -> pd.Series:
+    """Like col_by_substring(read_tsv(path), needle), but only the matching column is parsed."""
+    ensure_exists(path)
+    header = pd.read_csv(path, sep="\t", nrows=0).columns
+    return col_by_substring(pd.read_csv(path, sep="\t", usecols=[c for c in header if needle in c] or [0]),
+                            needle)
+
+
+def read_nandrad_hourly(
+    results_dir: Path, case: str, keys: Sequence[str] = tuple(NANDRAD_SERIES)
+) -> dict[str, np.ndarray]:
+    """Hourly NANDRAD series (loads in W, air temperature in C) on the validation index.
+
+    Uses the same columns and alignment as validate_variant(); missing files are skipped.
+    """
+    nz = "Back Zone(ID=3)." if case == "960" else ""
+    hourly = {}
+    for key in keys:
+        name, quantity, needle = NANDRAD_SERIES[key]
+        path = results_dir / name
+        if not path.exists():
+            continue
+        series = read_tsv_column(path, f"{nz}{quantity}" if nz else needle)
+        hourly[key] = series.to_numpy(dtype=float)[1:HOURS_PER_YEAR - 1]
+    return hourly
+
+
+def nandrad_aggregates(case: str, hourly: dict[str, np.ndarray], year: int = 2021) -> pd.DataFrame:
+    """Aggregates in the reference_checks layout from the hourly NANDRAD series."""
+    idx = build_hourly_index(year)
+
+    def _frame(key: str, conv: float = 1.0) -> Optional[pd.DataFrame]:
+        if key not in hourly:
+            return None
+        return pd.DataFrame({"NANDRAD": hourly[key] * conv}, index=idx).fillna(0.0)
+
+    return aggregates_from_hourly(
+        case,
+        heating=_frame("heating", W_TO_KW),
+        cooling=_frame("cooling", W_TO_KW),
+        air_temp=_frame("air_temp"),
+        free_float=case.upper().endswith("FF"),
+    )
+
+
 # =========================
 # Core validation step
 # =========================
@@ -767,12 +811,17 @@ def process_and_validate(
     create_monthly_summary: bool = False,
     unit: str = "",
     ref_suffix: str = "",
-    results_collector: Optional[list] = None,
+    hourly_collector: Optional[dict] = None,
+    render_jobs: Optional[list[dict]] = None,
+    charts: Optional[MonthlyCharts] = None,
+    plot_files: bool = True,
+    dashboard: Optional[CaseDashboard] = None,
 ) -> Optional[pd.DataFrame]:
     """Produce hourly comparison (NANDRAD vs EnergyPlus vs TRNSYS) and optional monthly summaries.
 
     Returns the hourly DataFrame if successful, None otherwise.
-    If results_collector is provided, appends monthly pass/fail dicts to it.
+    If hourly_collector is provided, stores the hourly DataFrame under its title (with unit).
+    If render_jobs is provided, plots are not drawn but appended to it (see render_outputs).
     """
     logging.info("%s--- Validating: %s %s", Ansi.OKCYAN, title, Ansi.ENDC)
     try:
@@ -815,7 +864,13 @@ def process_and_validate(
 
         out_tsv  = output_dir / f"Case{case}_{variant}_{base}_hourly.tsv"
         out_html = output_dir / f"Case{case}_{variant}_{base}_hourly.html"
-        save_hourly_outputs(df_hourly, out_tsv, out_html, title, y_axis_label)
+        save_hourly_outputs(df_hourly, out_tsv, out_html if plot_files else None, title, y_axis_label, render_jobs)
+        if hourly_collector is not None:
+            # trnsys_conv=0. marks a placeholder TRNSYS column, not a result
+            hourly_collector[title] = (df_hourly.drop(columns="TRNSYS", errors="ignore") if trnsys_conv == 0
+                                       else df_hourly)
+        if dashboard is not None:
+            dashboard.add_hourly(title, y_axis_label, df_hourly)
 
         # --- Always write max points (global + monthly) ---
         _save_max_points(
@@ -845,14 +900,7 @@ def process_and_validate(
 
         # --- Monthly summaries (sum) and optional reference bands ---
         if create_monthly_summary:
-            # Try to get English month labels (Linux/Windows)
-            try:
-                locale.setlocale(locale.LC_TIME, "de_DE.UTF-8")
-            except locale.Error:
-                try:
-                    locale.setlocale(locale.LC_TIME, "English_United States.1252")
-                except locale.Error:
-                    pass
+            set_month_locale()
 
             df_y = df_hourly.resample("YE").sum()
 
@@ -879,7 +927,13 @@ def process_and_validate(
             logging.info("Saved monthly TSV (sum): %s", out_m_sum)
 
             out_svg = output_dir / f"Case{case}_{variant}_{base}_monthly_mean.svg"
-            save_monthly_bar_with_ref(df_m, title, case, variant, out_svg)
+            if dashboard is not None:
+                dashboard.add_monthly(monthly_title(title), df_m)
+            if plot_files and render_jobs is None:
+                save_monthly_bar_with_ref(df_m, title, case, variant, out_svg, charts=charts)
+            elif plot_files:
+                render_jobs.append(dict(kind="monthly", source=out_m_sum.name, target=out_svg.name,
+                                        title=title, label="", is_max=False))
 
             # Additional monthly exports matching original behavior
             df_m_integral = df_hourly.resample("ME").sum()
@@ -894,18 +948,16 @@ def process_and_validate(
                 df_m_max.to_csv(sep="\t")
             )
 
+            out_max_svg = output_dir / f"Case{case}_{variant}_{base}_monthly_max.svg"
             df_m_max = df_hourly.resample("ME").max()
             df_m_max.index = df_m_max.index.strftime("%b")
-            save_monthly_bar_with_ref(df_m_max, title, case, variant,
-                              output_dir / f"Case{case}_{variant}_{base}_monthly_max.svg", True)
-
-            # --- Monthly reference checks ---
-            if results_collector is not None and ref_suffix:
-                monthly_results = check_monthly_references(
-                    df_hourly, case, data.reference, ref_suffix,
-                    metric_label=base,
-                )
-                results_collector.extend(monthly_results)
+            if dashboard is not None:
+                dashboard.add_monthly(monthly_title(title, True), df_m_max, "Maximum")
+            if plot_files and render_jobs is None:
+                save_monthly_bar_with_ref(df_m_max, title, case, variant, out_max_svg, True, charts)
+            elif plot_files:
+                render_jobs.append(dict(kind="monthly", source=f"Case{case}_{variant}_{base}_monthly_max.tsv",
+                                        target=out_max_svg.name, title=title, label="", is_max=True))
 
         return df_hourly
 
@@ -917,438 +969,520 @@ def process_and_validate(
 
 
 # =========================
-# Simulation runners
-# =========================
-
-def run_energyplus(exec_path: Path, idf_file: Path, weather_file: Path, workdir: Path) -> None:
-    """Run EnergyPlus with provided IDF and EPW."""
-    ensure_exists(exec_path, "executable")
-    ensure_exists(idf_file)
-    ensure_exists(weather_file)
-    ensure_exists(workdir, "folder")
-
-    cmd = [str(exec_path), "-w", str(weather_file), str(idf_file)]
-    logging.info("%sEnergyPlus:%s %s", Ansi.BOLD, Ansi.ENDC, " ".join(cmd))
-    subprocess.run(cmd, check=True, cwd=workdir)
-
-
-def run_nandrad(exec_path: Path, nandrad_file: Path, workdir: Path) -> None:
-    """Run NANDRAD solver with input file."""
-    ensure_exists(exec_path, "executable")
-    ensure_exists(nandrad_file)
-    ensure_exists(workdir, "folder")
-
-    cmd = [str(exec_path), "-x", str(nandrad_file)]
-    logging.info("%sNANDRAD:%s %s", Ansi.BOLD, Ansi.ENDC, " ".join(cmd))
-    subprocess.run(cmd, check=True, cwd=workdir)
-
-
-# =========================
-# CLI
+# Variant validation
 # =========================
 
-def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
-    parser = argparse.ArgumentParser(description="Run and validate NANDRAD / EnergyPlus / TRNSYS outputs.")
-    parser.add_argument("-c", "--case", default="600", help="Test case (e.g., 600, 630)")
-    parser.add_argument("-v", "--variant", default="v2", help="Variant label (e.g., v1)")
-    parser.add_argument("-y", "--year", type=int, default=2021, help="Calendar year for hourly index")
-    parser.add_argument("-w", "--windows",
-        default="ZONE SUBSURFACE 1",
-        help="Comma-separated EP window keys (e.g., 'ZONE SUBSURFACE 1,ZONE SUBSURFACE 2')"
-    )
-    parser.add_argument("--data-dir", type=Path, default=Path.cwd() / "data", help="Root data directory")
-    parser.add_argument("--out-dir", type=Path, default=Path.cwd() / "validation_results", help="Output root directory")
-    parser.add_argument("--ep-exec", type=Path,
-        default=(Path("C:/EnergyPlusV9-0-1/energyplus.exe") if os.name == "nt"
-                 else Path("/home/hirth/Applikationen/EnergyPlus-9-0-1/energyplus"))
-    )
-    parser.add_argument("--nandrad-exec", type=Path,
-        default=(Path("C:/Program Files/VICUS-Software/VICUS/NandradSolver.exe") if os.name == "nt"
-                 else Path.cwd() / "bin" / "NandradSolver")
-    )
-    parser.add_argument("--epw", type=Path, default=Path.cwd() / "data" / "climate" / "725650TYCST.epw",
-                        help="Path to the EPW file")
-    parser.add_argument("--skip-run", action="store_true", help="Skip running simulations; only read/validate")
-    parser.add_argument("-q", "--quiet", action="store_true", default=True, help="Reduce log verbosity")
-    return parser.parse_args(argv)
-
+@dataclass
+class VariantResult:
+    """What the multi-variant comparison needs from one validated variant."""
+    variant: str
+    aggregates: pd.DataFrame
+    hourly: dict[str, pd.DataFrame]
+    runtime_s: Optional[float] = None
 
-# =========================
-# Main
-# =========================
 
-def main(argv: Optional[Sequence[str]] = None) -> int:
-    args = parse_args(argv)
-    setup_logging(quiet=args.quiet)
-
-    case = str(args.case)
-    variant = str(args.variant)
-    year = int(args.year)
-    window_keys = [w.strip() for w in args.windows.split(",") if w.strip()]
-
-    # Resolve folders and files
-    data_dir = args.data_dir
-    out_dir = args.out_dir / f"Case{case}_{variant}"
+def validate_variant(
+    *,
+    case: str,
+    variant: str,
+    year: int,
+    window_keys: Sequence[str],
+    data: LoadedData,
+    references: pd.DataFrame,
+    out_dir: Path,
+    render: bool = True,
+    charts: Optional[MonthlyCharts] = None,
+    plot_files: bool = True,
+    dashboard: bool = False,
+) -> VariantResult:
+    """Validate one NANDRAD variant against the (shared) comparison data.
+
+    Writes all per-variant outputs to out_dir and returns the aggregates and
+    aligned hourly frames for the variant comparison. With render=False the
+    HTML/SVG plots are only listed in Case*_render.tsv (see render_outputs).
+    With dashboard=True the validation table and all hourly and monthly
+    series go into Case*_dashboard.html (see case_dashboard); plot_files=False
+    then skips the separate HTML/SVG plots and validation report HTML.
+    """
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    nandrad_dir   = data_dir / "nandrad" / f"Case{case}_{variant}"
-    nandrad_file  = data_dir / "nandrad" / f"Case{case}_{variant}.nandrad"
-    energy_dir    = data_dir / "energyplus"
-    idf_file      = energy_dir / f"Case{case}_{variant}.idf"
-    eso_file      = energy_dir / "eplusout.eso"
-    trnsys_file   = data_dir / "trnsys" / f"CASE{case}" / f"CASE{case}.out"
-    reference_tbl = data_dir / "reference" / "monthly-references.tsv"
-    epw_file      = args.epw
-
-    try:
-        if not args.skip_run:
-            logging.info("%s--- Running simulations ---%s", Ansi.BOLD, Ansi.ENDC)
-            if idf_file.exists() and args.ep_exec.exists():
-                run_energyplus(args.ep_exec, idf_file, epw_file, workdir=energy_dir)
-            else:
-                logging.warning("%sSkipping EnergyPlus (IDF or executable not found).%s",
-                                Ansi.WARNING, Ansi.ENDC)
-            if nandrad_file.exists() and args.nandrad_exec.exists():
-                run_nandrad(args.nandrad_exec, nandrad_file, workdir=nandrad_dir.parent)
-            else:
-                logging.warning("%sSkipping NANDRAD (file or executable not found).%s",
-                                Ansi.WARNING, Ansi.ENDC)
-            logging.info("%sSimulations finished.%s", Ansi.OKGREEN, Ansi.ENDC)
-        else:
-            logging.info("Skipping simulation runs (--skip-run).")
-
-        # Load outputs
-        data = load_all(nandrad_dir, eso_file, trnsys_file, reference_tbl)
-
-        # Load annual/peak/free-float references
-        annual_refs = load_annual_references(data_dir / "reference")
-
-        # Collector for pass/fail results
-        validation_results: list[dict] = []
-
-        # For multi-zone cases (e.g. 960 sunspace), prefix NANDRAD column
-        # searches to select only the conditioned zone.
-        # Column pattern: "Case 960.Back Zone(ID=3).IdealHeatingLoad-average [W]"
-        nz = "Back Zone(ID=3)." if case == "960" else ""
+    # Collector for aligned hourly series (agreement statistics)
+    hourly_series: dict[str, pd.DataFrame] = {}
+    render_jobs: Optional[list[dict]] = None if render else []
+    case_dashboard = CaseDashboard(case, variant) if dashboard else None
+
+    # For multi-zone cases (e.g. 960 sunspace), prefix NANDRAD column
+    # searches to select only the conditioned zone.
+    # Column pattern: "Case 960.Back Zone(ID=3).IdealHeatingLoad-average [W]"
+    nz = "Back Zone(ID=3)." if case == "960" else ""
+
+    logging.info("%s--- Generating validation for Case %s %s ---%s",
+                 Ansi.BOLD, case, variant, Ansi.ENDC)
+    validate = partial(process_and_validate, output_dir=out_dir, case=case, variant=variant, year=year,
+                       data=data, hourly_collector=hourly_series, render_jobs=render_jobs,
+                       charts=charts or MonthlyCharts(), plot_files=plot_files, dashboard=case_dashboard)
+
+    # --- Air Temperature (hourly; outputs min, max, mean TSVs) ---
+    df_air_temp = validate(
+        title="Lufttemperatur",
+        y_axis_label="Temperatur [°C]",
+        nandrad_df=data.air_temp,
+        nandrad_col_substr=f"{nz}AirTemperature",
+        ep_var="Zone Mean Air Temperature",
+        ep_key="ZONE ONE",
+        trnsys_col="Tzone",
+        unit="C",
+    )
 
-        logging.info("%s--- Generating validation for Case %s %s ---%s",
-                     Ansi.BOLD, case, variant, Ansi.ENDC)
+    # --- Zone Windows Total Transmitted (monthly with ref) ---
+    validate(
+        title="Transmittierte kurzwellige Strahlung Fenster",
+        y_axis_label="Strahlung [W/m²]",
+        nandrad_df=data.window,
+        nandrad_col_substr="WindowSolarRadiationFluxSum",
+        ep_var="Zone Windows Total Transmitted Solar Radiation Rate",
+        ep_key="ZONE ONE",
+        trnsys_col="QTransmitted",
+        nandrad_conv=(1.0 / 12.0),
+        ep_conv=(1.0 / 12.0),
+        trnsys_conv=1000.0,
+        create_monthly_summary=True,
+        unit="W/m²",
+        ref_suffix="",
+    )
 
-        # --- Air Temperature (hourly; outputs min, max, mean TSVs) ---
-        df_air_temp = process_and_validate(
-            title="Lufttemperatur",
-            y_axis_label="Temperatur [°C]",
-            output_dir=out_dir,
-            case=case,
-            variant=variant,
-            year=year,
-            data=data,
-            nandrad_df=data.air_temp,
-            nandrad_col_substr=f"{nz}AirTemperature",
-            ep_var="Zone Mean Air Temperature",
-            ep_key="ZONE ONE",
-            trnsys_col="Tzone",
-            unit="C",
-            results_collector=validation_results,
-        )
+    # --- Absorbed window radiation (kept close to original intent) ---
+    validate(
+        title="Absorbierte kurzwellige Strahlung Raumluft",
+        y_axis_label="Wärmelast [W/m²]",
+        nandrad_df=data.window,
+        nandrad_col_substr="WindowSolarRadiationFluxSum",
+        ep_var="Zone Windows Total Heat Loss Energy",
+        ep_key="ZONE ONE",
+        trnsys_col="QTransmitted",
+        ep_conv=(1.0 / 3600.0),  # J -> W
+        unit="W/m²",
+    )
 
-        # --- Zone Windows Total Transmitted (monthly with ref) ---
-        process_and_validate(
-            title="Transmittierte kurzwellige Strahlung Fenster",
-            y_axis_label="Strahlung [W/m²]",
-            output_dir=out_dir,
-            case=case,
-            variant=variant,
-            year=year,
-            data=data,
+    # --- Per-window heat conduction (hourly) ---
+    for win_key in window_keys:
+        validate(
+            title=f"Wärmeleitung Fenster ({win_key})",
+            y_axis_label="Wärmestrom [W/m²]",
             nandrad_df=data.window,
-            nandrad_col_substr="WindowSolarRadiationFluxSum",
-            ep_var="Zone Windows Total Transmitted Solar Radiation Rate",
-            ep_key="ZONE ONE",
-            trnsys_col="QTransmitted",
+            nandrad_col_substr=f"{nz}WindowHeatConductionLoad",
+            ep_var="Surface Window Net Heat Transfer Rate",
+            ep_key=win_key.upper(),
+            trnsys_col="QTransmitted",  # placeholder as in original
+            trnsys_conv=0.0,
+            ep_subtract_var="Zone Windows Total Transmitted Solar Radiation Rate",
+            ep_subtract_key="ZONE ONE",
+            ep_subtract_conv=(1.0 / 12.0),
             nandrad_conv=(1.0 / 12.0),
-            ep_conv=(1.0 / 12.0),
-            trnsys_conv=1000.0,
-            create_monthly_summary=True,
+            ep_conv=(1.0 / 6.0),
             unit="W/m²",
-            ref_suffix="",
         )
 
-        # --- Absorbed window radiation (kept close to original intent) ---
-        process_and_validate(
-            title="Absorbierte kurzwellige Strahlung Raumluft",
-            y_axis_label="Wärmelast [W/m²]",
-            output_dir=out_dir,
-            case=case,
-            variant=variant,
-            year=year,
-            data=data,
-            nandrad_df=data.window,
-            nandrad_col_substr="WindowSolarRadiationFluxSum",
-            ep_var="Zone Windows Total Heat Loss Energy",
-            ep_key="ZONE ONE",
-            trnsys_col="QTransmitted",
-            ep_conv=(1.0 / 3600.0),  # J -> W
-            unit="W/m²",
-        )
+    # --- Heating Load (monthly with ref) ---
+    df_heating = validate(
+        title="Heizenergie",
+        y_axis_label="Energie [kWh]",
+        nandrad_df=data.heating,
+        nandrad_col_substr=f"{nz}IdealHeatingLoad" if nz else "Heating",
+        ep_var="Zone Air System Sensible Heating Energy",
+        ep_key=None,
+        trnsys_col="Qheat",
+        ep_conv=J_TO_KWH,
+        nandrad_conv=W_TO_KW,
+        create_monthly_summary=True,
+        unit="kWh",
+        ref_suffix="heating",
+    )
 
-        # --- Per-window heat conduction (hourly) ---
-        for win_key in window_keys:
-            process_and_validate(
-                title=f"Wärmeleitung Fenster ({win_key})",
-                y_axis_label="Wärmestrom [W/m²]",
-                output_dir=out_dir,
-                case=case,
-                variant=variant,
-                year=year,
-                data=data,
-                nandrad_df=data.window,
-                nandrad_col_substr=f"{nz}WindowHeatConductionLoad",
-                ep_var="Surface Window Net Heat Transfer Rate",
-                ep_key=win_key.upper(),
-                trnsys_col="QTransmitted",  # placeholder as in original
-                trnsys_conv=0.0,
-                ep_subtract_var="Zone Windows Total Transmitted Solar Radiation Rate",
-                ep_subtract_key="ZONE ONE",
-                ep_subtract_conv=(1.0 / 12.0),
-                nandrad_conv=(1.0 / 12.0),
-                ep_conv=(1.0 / 6.0),
-                unit="W/m²",
-            )
+    # --- Cooling Load (monthly with ref) ---
+    df_cooling = validate(
+        title="Kühlenergie",
+        y_axis_label="Energie [kWh]",
+        nandrad_df=data.cooling,
+        nandrad_col_substr=f"{nz}IdealCoolingLoad" if nz else "Cooling",
+        ep_var="Zone Air System Sensible Cooling Energy",
+        ep_key="ZONE ONE",
+        trnsys_col="Qcool",
+        ep_conv=J_TO_KWH,
+        nandrad_conv=W_TO_KW,
+        create_monthly_summary=True,
+        unit="kWh",
+        ref_suffix="cooling",
+    )
 
-        # --- Heating Load (monthly with ref) ---
-        df_heating = process_and_validate(
-            title="Heizenergie",
-            y_axis_label="Energie [kWh]",
-            output_dir=out_dir,
-            case=case,
-            variant=variant,
-            year=year,
-            data=data,
-            nandrad_df=data.heating,
-            nandrad_col_substr=f"{nz}IdealHeatingLoad" if nz else "Heating",
-            ep_var="Zone Air System Sensible Heating Energy",
-            ep_key=None,
-            trnsys_col="Qheat",
-            ep_conv=J_TO_KWH,
-            nandrad_conv=W_TO_KW,
+    # --- Short-wave radiation onto exterior surfaces ---
+    validate(
+        title="Kurzwellige Strahlungslasten Horizontal",
+        y_axis_label="Strahlung [W/m²]",
+        nandrad_df=data.radiation,
+        nandrad_col_substr="GlobalSWRadOnPlane(id=2000000)",
+        ep_var="Surface Outside Face Incident Solar Radiation Rate per Area",
+        ep_key="ZONE SURFACE ROOF",
+        trnsys_col="SolarH",
+        trnsys_conv=1000., # TRNSYS' output unit is not kJ, it is kW/m²!!!
+        ep_conv=1.,
+        nandrad_conv=1.,
+        create_monthly_summary=True,
+        unit="W/m²",
+        ref_suffix="",
+    )
+    
+    validate(
+        title="Kurzwellige direkte Strahlungslasten Horizontal",
+        y_axis_label="Strahlung [W/m²]",
+        nandrad_df=data.radiation,
+        nandrad_col_substr="DirectSWRadOnPlane(id=2000000)",
+        ep_var="Surface Outside Face Incident Beam Solar Radiation Rate per Area",
+        ep_key="ZONE SURFACE ROOF",
+        trnsys_col="SolarH",
+        trnsys_conv=0., # TRNSYS' output unit is not kJ, it is kW/m²!!!
+        ep_conv=1.,
+        nandrad_conv=1.,
+        create_monthly_summary=True,
+        unit="W/m²",
+        ref_suffix="",
+    )
+            
+    validate(
+        title="Kurzwellige diffuse Strahlungslasten Horizontal",
+        y_axis_label="Strahlung [W/m²]",
+        nandrad_df=data.radiation,
+        nandrad_col_substr="DiffuseSWRadOnPlane(id=2000000)",
+        ep_var="Surface Outside Face Incident Solar Radiation Rate per Area",
+        ep_key="ZONE SURFACE ROOF",
+        ep_subtract_key="ZONE SURFACE ROOF",
+        ep_subtract_var="Surface Outside Face Incident Beam Solar Radiation Rate per Area",
+        ep_subtract_conv=1.,
+        trnsys_col="SolarH",
+        trnsys_conv=0., # TRNSYS' output unit is not kJ, it is kW/m²!!!
+        ep_conv=1.,
+        nandrad_conv=1.,
+        create_monthly_summary=True,
+        unit="W/m²",
+        ref_suffix="",
+    )
+    
+    validate(
+        title="Kurzwellige Strahlungslasten Nord",
+        y_axis_label="Strahlung [W/m²]",
+        nandrad_df=data.radiation,
+        nandrad_col_substr="GlobalSWRadOnPlane(id=2000001)",
+        ep_var="Surface Outside Face Incident Solar Radiation Rate per Area",
+        ep_key="ZONE SURFACE NORTH",
+        trnsys_col="SolarN",
+        trnsys_conv=1000., # TRNSYS' output unit is not kJ, it is kW/m²!!!
+        ep_conv=1.,
+        nandrad_conv=1.,
+        create_monthly_summary=True,
+        unit="W/m²",
+        ref_suffix="",
+    )
+            
+    validate(
+        title="Kurzwellige Strahlungslasten Ost",
+        y_axis_label="Strahlung [W/m²]",
+        nandrad_df=data.radiation,
+        nandrad_col_substr="2000002",
+        ep_var="Surface Outside Face Incident Solar Radiation Rate per Area",
+        ep_key="ZONE SURFACE EAST",
+        trnsys_col="SolarE",
+        trnsys_conv=1000., # TRNSYS' output unit is not kJ, it is kW/m²!!!
+        ep_conv=1.,
+        nandrad_conv=1.,
+        create_monthly_summary=True,
+        unit="W/m²",
+        ref_suffix="",
+    )
+    
+    validate(
+        title="Kurzwellige Strahlungslasten Süd",
+        y_axis_label="Strahlung [W/m²]",
+        nandrad_df=data.radiation,
+        nandrad_col_substr="2000003",
+        ep_var="Surface Outside Face Incident Solar Radiation Rate per Area",
+        ep_key="ZONE SURFACE SOUTH",
+        trnsys_col="SolarS",
+        trnsys_conv=1000., # TRNSYS' output unit is not kJ, it is kW/m²!!!
+        ep_conv=1.,
+        nandrad_conv=1.,
+        create_monthly_summary=True,
+        unit="W/m²",
+        ref_suffix="",
+    )
+            
+    validate(
+        title="Kurzwellige Strahlungslasten West",
+        y_axis_label="Strahlung [W/m²]",
+        nandrad_df=data.radiation,
+        nandrad_col_substr="2000004",
+        ep_var="Surface Outside Face Incident Solar Radiation Rate per Area",
+        ep_key="ZONE SURFACE WEST",
+        trnsys_col="SolarW",
+        trnsys_conv=1000., # TRNSYS' output unit is not kJ, it is kW/m²!!!
+        ep_conv=1.,
+        nandrad_conv=1.,
+        create_monthly_summary=True,
+        unit="W/m²",
+        ref_suffix="",
+    )
+    
+    validate(
+        title="Kurzwellige direkte Strahlungslasten Nord",
+        y_axis_label="Strahlung [W/m²]",
+        nandrad_df=data.radiation,
+        nandrad_col_substr="DirectSWRadOnPlane(id=2000001)",
+        ep_var="Surface Outside Face Incident Beam Solar Radiation Rate per Area",
+        ep_key="ZONE SURFACE NORTH",
+        trnsys_col="SolarN",
+        trnsys_conv=0., # we don't want to see trnsys results
+        ep_conv=1.,
+        nandrad_conv=1.,
+        create_monthly_summary=True,
+        unit="W/m²",
+        ref_suffix="",
+    )
+    
+    validate(
+        title="Kurzwellige diffuse Strahlungslasten Nord",
+        y_axis_label="Strahlung [W/m²]",
+        nandrad_df=data.radiation,
+        nandrad_col_substr="DiffuseSWRadOnPlane(id=2000001)",
+        ep_var="Surface Outside Face Incident Solar Radiation Rate per Area",
+        ep_key="ZONE SURFACE NORTH",
+        ep_subtract_key="ZONE SURFACE NORTH",
+        ep_subtract_var="Surface Outside Face Incident Beam Solar Radiation Rate per Area",
+        ep_subtract_conv=1.,
+        trnsys_col="SolarN",
+        trnsys_conv=0., # we have no trnsys results
+        ep_conv=1.,
+        nandrad_conv=1.,
+        create_monthly_summary=True,
+        unit="W/m²",
+        ref_suffix="",
+    )
+
+    # --- Direct Shading Factor comparisons ---
+    if data.direct_shading is not None:
+        # Window left (ZONE SUBSURFACE 1)
+        validate(
+            title="Direkter Verschattungsfaktor Fenster links",
+            y_axis_label="Shading Factor [-]",
+            nandrad_df=data.direct_shading,
+            nandrad_col_substr="Window left",
+            ep_var="Surface Outside Face Sunlit Fraction",
+            ep_key="ZONE SUBSURFACE 1",
+            trnsys_col="Tzone",  # placeholder
+            trnsys_conv=0.,
+            ep_conv=1.,
+            nandrad_conv=1.,
             create_monthly_summary=True,
-            unit="kWh",
-            ref_suffix="heating",
-            results_collector=validation_results,
+            unit="-",
+            ref_suffix="",
         )
-
-        # --- Cooling Load (monthly with ref) ---
-        df_cooling = process_and_validate(
-            title="Kühlenergie",
-            y_axis_label="Energie [kWh]",
-            output_dir=out_dir,
-            case=case,
-            variant=variant,
-            year=year,
-            data=data,
-            nandrad_df=data.cooling,
-            nandrad_col_substr=f"{nz}IdealCoolingLoad" if nz else "Cooling",
-            ep_var="Zone Air System Sensible Cooling Energy",
-            ep_key="ZONE ONE",
-            trnsys_col="Qcool",
-            ep_conv=J_TO_KWH,
-            nandrad_conv=W_TO_KW,
+        # Window right (ZONE SUBSURFACE 2)
+        validate(
+            title="Direkter Verschattungsfaktor Fenster rechts",
+            y_axis_label="Shading Factor [-]",
+            nandrad_df=data.direct_shading,
+            nandrad_col_substr="Window right",
+            ep_var="Surface Outside Face Sunlit Fraction",
+            ep_key="ZONE SUBSURFACE 2",
+            trnsys_col="Tzone",  # placeholder
+            trnsys_conv=0.,
+            ep_conv=1.,
+            nandrad_conv=1.,
             create_monthly_summary=True,
-            unit="kWh",
-            ref_suffix="cooling",
-            results_collector=validation_results,
+            unit="-",
+            ref_suffix="",
+        )
+        # Wall South
+        validate(
+            title="Direkter Verschattungsfaktor Wand Süd",
+            y_axis_label="Shading Factor [-]",
+            nandrad_df=data.direct_shading,
+            nandrad_col_substr="Wall South",
+            ep_var="Surface Outside Face Sunlit Fraction",
+            ep_key="ZONE SURFACE SOUTH",
+            trnsys_col="Tzone",  # placeholder
+            trnsys_conv=0.,
+            ep_conv=1.,
+            nandrad_conv=1.,
+            create_monthly_summary=True,
+            unit="-",
+            ref_suffix="",
         )
 
-        # --- Short-wave radiation onto exterior surfaces ---
-        process_and_validate(
-            title="Kurzwellige Strahlungslasten Horizontal",
-            y_axis_label="Strahlung [W/m²]",
-            output_dir=out_dir,
-            case=case,
-            variant=variant,
-            year=year,
-            data=data,
-            nandrad_df=data.radiation,
-            nandrad_col_substr="GlobalSWRadOnPlane(id=2000000)",
-            ep_var="Surface Outside Face Incident Solar Radiation Rate per Area",
-            ep_key="ZONE SURFACE ROOF",
-            trnsys_col="SolarH",
-            trnsys_conv=1000., # TRNSYS' output unit is not kJ, it is kW/m²!!!
+    # --- Diffuse Shading Factor ---
+    # EnergyPlus has Debug Surface Solar Shading Model DifShdgRatioIsoSky
+    if data.diffuse_shading is not None:
+        # Window left
+        validate(
+            title="Diffuser Verschattungsfaktor Fenster links",
+            y_axis_label="Shading Factor [-]",
+            nandrad_df=data.diffuse_shading,
+            nandrad_col_substr="Window left",
+            ep_var="Debug Surface Solar Shading Model DifShdgRatioIsoSky",
+            ep_key="ZONE SUBSURFACE 1",
+            trnsys_col="Tzone",  # placeholder
+            trnsys_conv=0.,
             ep_conv=1.,
             nandrad_conv=1.,
             create_monthly_summary=True,
-            unit="W/m²",
+            unit="-",
             ref_suffix="",
         )
-        
-        process_and_validate(
-            title="Kurzwellige direkte Strahlungslasten Horizontal",
-            y_axis_label="Strahlung [W/m²]",
-            output_dir=out_dir,
-            case=case,
-            variant=variant,
-            year=year,
-            data=data,
-            nandrad_df=data.radiation,
-            nandrad_col_substr="DirectSWRadOnPlane(id=2000000)",
-            ep_var="Surface Outside Face Incident Beam Solar Radiation Rate per Area",
-            ep_key="ZONE SURFACE ROOF",
-            trnsys_col="SolarH",
-            trnsys_conv=0., # TRNSYS' output unit is not kJ, it is kW/m²!!!
+        # Window right
+        validate(
+            title="Diffuser Verschattungsfaktor Fenster rechts",
+            y_axis_label="Shading Factor [-]",
+            nandrad_df=data.diffuse_shading,
+            nandrad_col_substr="Window right",
+            ep_var="Debug Surface Solar Shading Model DifShdgRatioIsoSky",
+            ep_key="ZONE SUBSURFACE 2",
+            trnsys_col="Tzone",
+            trnsys_conv=0.,
             ep_conv=1.,
             nandrad_conv=1.,
             create_monthly_summary=True,
-            unit="W/m²",
+            unit="-",
             ref_suffix="",
         )
-                
-        process_and_validate(
-            title="Kurzwellige diffuse Strahlungslasten Horizontal",
-            y_axis_label="Strahlung [W/m²]",
-            output_dir=out_dir,
-            case=case,
-            variant=variant,
-            year=year,
-            data=data,
-            nandrad_df=data.radiation,
-            nandrad_col_substr="DiffuseSWRadOnPlane(id=2000000)",
-            ep_var="Surface Outside Face Incident Solar Radiation Rate per Area",
-            ep_key="ZONE SURFACE ROOF",
-            ep_subtract_key="ZONE SURFACE ROOF",
-            ep_subtract_var="Surface Outside Face Incident Beam Solar Radiation Rate per Area",
-            ep_subtract_conv=1.,
-            trnsys_col="SolarH",
-            trnsys_conv=0., # TRNSYS' output unit is not kJ, it is kW/m²!!!
+        # Wall South
+        validate(
+            title="Diffuser Verschattungsfaktor Wand Süd",
+            y_axis_label="Shading Factor [-]",
+            nandrad_df=data.diffuse_shading,
+            nandrad_col_substr="Wall South",
+            ep_var="Debug Surface Solar Shading Model DifShdgRatioIsoSky",
+            ep_key="ZONE SURFACE SOUTH",
+            trnsys_col="Tzone",
+            trnsys_conv=0.,
             ep_conv=1.,
             nandrad_conv=1.,
             create_monthly_summary=True,
-            unit="W/m²",
+            unit="-",
             ref_suffix="",
         )
-        
-        process_and_validate(
-            title="Kurzwellige Strahlungslasten Nord",
+        logging.info("%sDiffuse shading factors: Window=%.3f, Wall South=%.3f%s",
+                    Ansi.OKCYAN,
+                    data.diffuse_shading.iloc[0, 1] if len(data.diffuse_shading.columns) > 1 else 0,
+                    data.diffuse_shading.iloc[0, 3] if len(data.diffuse_shading.columns) > 3 else 0,
+                    Ansi.ENDC)
+
+    # --- Total Short Wave Radiation (imposed) comparisons ---
+    # EnergyPlus only provides total incident solar for windows, not split into beam/diffuse
+    # So we compare NANDRAD's total (Direct + Diffuse) with EP's total incident
+    if data.direct_sw_radiation is not None and data.diffuse_sw_radiation is not None:
+        # Create combined total radiation dataframe
+        total_sw_radiation = data.direct_sw_radiation.copy()
+        for col in total_sw_radiation.columns[1:]:  # Skip time column
+            # Find matching column in diffuse data
+            for diffuse_col in data.diffuse_sw_radiation.columns[1:]:
+                if col.split('(')[0] == diffuse_col.split('(')[0]:  # Match by name prefix
+                    total_sw_radiation[col] = data.direct_sw_radiation[col] + data.diffuse_sw_radiation[diffuse_col]
+                    break
+
+        # Window left - Total
+        validate(
+            title="Gesamte kurzwellige Strahlung Fenster links",
             y_axis_label="Strahlung [W/m²]",
-            output_dir=out_dir,
-            case=case,
-            variant=variant,
-            year=year,
-            data=data,
-            nandrad_df=data.radiation,
-            nandrad_col_substr="GlobalSWRadOnPlane(id=2000001)",
+            nandrad_df=total_sw_radiation,
+            nandrad_col_substr="Window left",
             ep_var="Surface Outside Face Incident Solar Radiation Rate per Area",
-            ep_key="ZONE SURFACE NORTH",
-            trnsys_col="SolarN",
-            trnsys_conv=1000., # TRNSYS' output unit is not kJ, it is kW/m²!!!
+            ep_key="ZONE SUBSURFACE 1",
+            trnsys_col="Tzone",  # placeholder
+            trnsys_conv=0.,
             ep_conv=1.,
             nandrad_conv=1.,
             create_monthly_summary=True,
             unit="W/m²",
             ref_suffix="",
         )
-                
-        process_and_validate(
-            title="Kurzwellige Strahlungslasten Ost",
+        # Window right - Total
+        validate(
+            title="Gesamte kurzwellige Strahlung Fenster rechts",
             y_axis_label="Strahlung [W/m²]",
-            output_dir=out_dir,
-            case=case,
-            variant=variant,
-            year=year,
-            data=data,
-            nandrad_df=data.radiation,
-            nandrad_col_substr="2000002",
+            nandrad_df=total_sw_radiation,
+            nandrad_col_substr="Window right",
             ep_var="Surface Outside Face Incident Solar Radiation Rate per Area",
-            ep_key="ZONE SURFACE EAST",
-            trnsys_col="SolarE",
-            trnsys_conv=1000., # TRNSYS' output unit is not kJ, it is kW/m²!!!
+            ep_key="ZONE SUBSURFACE 2",
+            trnsys_col="Tzone",  # placeholder
+            trnsys_conv=0.,
             ep_conv=1.,
             nandrad_conv=1.,
             create_monthly_summary=True,
             unit="W/m²",
             ref_suffix="",
         )
-        
-        process_and_validate(
-            title="Kurzwellige Strahlungslasten Süd",
+
+    # --- Direct Short Wave Radiation on windows ---
+    if data.direct_sw_radiation is not None:
+        # Window left - Direct
+        validate(
+            title="Direkte kurzwellige Strahlung Fenster links",
             y_axis_label="Strahlung [W/m²]",
-            output_dir=out_dir,
-            case=case,
-            variant=variant,
-            year=year,
-            data=data,
-            nandrad_df=data.radiation,
-            nandrad_col_substr="2000003",
-            ep_var="Surface Outside Face Incident Solar Radiation Rate per Area",
-            ep_key="ZONE SURFACE SOUTH",
-            trnsys_col="SolarS",
-            trnsys_conv=1000., # TRNSYS' output unit is not kJ, it is kW/m²!!!
+            nandrad_df=data.direct_sw_radiation,
+            nandrad_col_substr="Window left",
+            ep_var="Surface Outside Face Incident Beam Solar Radiation Rate per Area",
+            ep_key="ZONE SUBSURFACE 1",
+            trnsys_col="Tzone",
+            trnsys_conv=0.,
             ep_conv=1.,
             nandrad_conv=1.,
             create_monthly_summary=True,
             unit="W/m²",
             ref_suffix="",
         )
-                
-        process_and_validate(
-            title="Kurzwellige Strahlungslasten West",
+        # Window right - Direct
+        validate(
+            title="Direkte kurzwellige Strahlung Fenster rechts",
             y_axis_label="Strahlung [W/m²]",
-            output_dir=out_dir,
-            case=case,
-            variant=variant,
-            year=year,
-            data=data,
-            nandrad_df=data.radiation,
-            nandrad_col_substr="2000004",
-            ep_var="Surface Outside Face Incident Solar Radiation Rate per Area",
-            ep_key="ZONE SURFACE WEST",
-            trnsys_col="SolarW",
-            trnsys_conv=1000., # TRNSYS' output unit is not kJ, it is kW/m²!!!
+            nandrad_df=data.direct_sw_radiation,
+            nandrad_col_substr="Window right",
+            ep_var="Surface Outside Face Incident Beam Solar Radiation Rate per Area",
+            ep_key="ZONE SUBSURFACE 2",
+            trnsys_col="Tzone",
+            trnsys_conv=0.,
             ep_conv=1.,
             nandrad_conv=1.,
             create_monthly_summary=True,
             unit="W/m²",
             ref_suffix="",
         )
-        
-        process_and_validate(
-            title="Kurzwellige direkte Strahlungslasten Nord",
+
+    # --- Diffuse Short Wave Radiation on windows (Sky + Ground) ---
+    if data.diffuse_sw_radiation is not None:
+        # Window left - Diffuse
+        validate(
+            title="Diffuse kurzwellige Strahlung Fenster links",
             y_axis_label="Strahlung [W/m²]",
-            output_dir=out_dir,
-            case=case,
-            variant=variant,
-            year=year,
-            data=data,
-            nandrad_df=data.radiation,
-            nandrad_col_substr="DirectSWRadOnPlane(id=2000001)",
-            ep_var="Surface Outside Face Incident Beam Solar Radiation Rate per Area",
-            ep_key="ZONE SURFACE NORTH",
-            trnsys_col="SolarN",
-            trnsys_conv=0., # we don't want to see trnsys results
+            nandrad_df=data.diffuse_sw_radiation,
+            nandrad_col_substr="Window left",
+            ep_var="Surface Outside Face Incident Sky Diffuse Solar Radiation Rate per Area",
+            ep_key="ZONE SUBSURFACE 1",
+            trnsys_col="Tzone",
+            trnsys_conv=0.,
             ep_conv=1.,
             nandrad_conv=1.,
             create_monthly_summary=True,
             unit="W/m²",
             ref_suffix="",
         )
-        
-        process_and_validate(
-            title="Kurzwellige diffuse Strahlungslasten Nord",
+        # Window right - Diffuse
+        validate(
+            title="Diffuse kurzwellige Strahlung Fenster rechts",
             y_axis_label="Strahlung [W/m²]",
-            output_dir=out_dir,
-            case=case,
-            variant=variant,
-            year=year,
-            data=data,
-            nandrad_df=data.radiation,
-            nandrad_col_substr="DiffuseSWRadOnPlane(id=2000001)",
-            ep_var="Surface Outside Face Incident Solar Radiation Rate per Area",
-            ep_key="ZONE SURFACE NORTH",
-            ep_subtract_key="ZONE SURFACE NORTH",
-            ep_subtract_var="Surface Outside Face Incident Beam Solar Radiation Rate per Area",
-            ep_subtract_conv=1.,
-            trnsys_col="SolarN",
-            trnsys_conv=0., # we have no trnsys results
+            nandrad_df=data.diffuse_sw_radiation,
+            nandrad_col_substr="Window right",
+            ep_var="Surface Outside Face Incident Sky Diffuse Solar Radiation Rate per Area",
+            ep_key="ZONE SUBSURFACE 2",
+            trnsys_col="Tzone",
+            trnsys_conv=0.,
             ep_conv=1.,
             nandrad_conv=1.,
             create_monthly_summary=True,
@@ -1356,367 +1490,392 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
             ref_suffix="",
         )
 
-        # --- Direct Shading Factor comparisons ---
-        if data.direct_shading is not None:
-            # Window left (ZONE SUBSURFACE 1)
-            process_and_validate(
-                title="Direkter Verschattungsfaktor Fenster links",
-                y_axis_label="Shading Factor [-]",
-                output_dir=out_dir,
-                case=case,
-                variant=variant,
-                year=year,
-                data=data,
-                nandrad_df=data.direct_shading,
-                nandrad_col_substr="Window left",
-                ep_var="Surface Outside Face Sunlit Fraction",
-                ep_key="ZONE SUBSURFACE 1",
-                trnsys_col="Tzone",  # placeholder
-                trnsys_conv=0.,
-                ep_conv=1.,
-                nandrad_conv=1.,
-                create_monthly_summary=True,
-                unit="-",
-                ref_suffix="",
-            )
-            # Window right (ZONE SUBSURFACE 2)
-            process_and_validate(
-                title="Direkter Verschattungsfaktor Fenster rechts",
-                y_axis_label="Shading Factor [-]",
-                output_dir=out_dir,
-                case=case,
-                variant=variant,
-                year=year,
-                data=data,
-                nandrad_df=data.direct_shading,
-                nandrad_col_substr="Window right",
-                ep_var="Surface Outside Face Sunlit Fraction",
-                ep_key="ZONE SUBSURFACE 2",
-                trnsys_col="Tzone",  # placeholder
-                trnsys_conv=0.,
-                ep_conv=1.,
-                nandrad_conv=1.,
-                create_monthly_summary=True,
-                unit="-",
-                ref_suffix="",
-            )
-            # Wall South
-            process_and_validate(
-                title="Direkter Verschattungsfaktor Wand Süd",
-                y_axis_label="Shading Factor [-]",
-                output_dir=out_dir,
-                case=case,
-                variant=variant,
-                year=year,
-                data=data,
-                nandrad_df=data.direct_shading,
-                nandrad_col_substr="Wall South",
-                ep_var="Surface Outside Face Sunlit Fraction",
-                ep_key="ZONE SURFACE SOUTH",
-                trnsys_col="Tzone",  # placeholder
-                trnsys_conv=0.,
-                ep_conv=1.,
-                nandrad_conv=1.,
-                create_monthly_summary=True,
-                unit="-",
-                ref_suffix="",
-            )
+    # ==========================================================
+    # ASHRAE 140 Reference Checking
+    # ==========================================================
+    aggregates = aggregates_from_hourly(
+        case,
+        heating=df_heating,
+        cooling=df_cooling,
+        air_temp=df_air_temp,
+        free_float=case.upper().endswith("FF"),
+    )
+    save_aggregates(aggregates, out_dir, case, variant)
+    report = to_report(check_references(aggregates, references))
+
+    # Hourly agreement statistics across engine pairs
+    agreement = compute_agreement_stats(hourly_series)
+    save_agreement_stats(agreement, out_dir, case, variant)
+
+    # Generate validation summary report
+    generate_validation_report(
+        report=report,
+        output_dir=out_dir,
+        case=case,
+        variant=variant,
+        agreement=agreement,
+        html=plot_files,
+    )
+    if case_dashboard is not None:
+        tables = validation_tables_html(report, agreement) if not report.empty else ""
+        case_dashboard.write(out_dir / f"Case{case}_{variant}_dashboard.html", tables)
+    if render_jobs is not None:
+        save_render_jobs(render_jobs, out_dir, case, variant)
+
+    return VariantResult(variant, aggregates, hourly_series)
+
+
+# Annual metrics of the variant comparison and hourly series written side by side
+VARIANT_METRICS = ("heating", "cooling", "peak_heating", "peak_cooling", "temp_max", "temp_min", "temp_avg")
+VARIANT_HOURLY = {
+    "Lufttemperatur [C]": "Temperatur [°C]",
+    "Heizenergie [kWh]": "Energie [kWh]",
+    "Kühlenergie [kWh]": "Energie [kWh]",
+}
+
+
+def compare_variants(results: Sequence[VariantResult], references: pd.DataFrame, out_dir: Path, case: str) -> None:
+    """Compare the NANDRAD variants of one case with each other.
+
+    The first variant is the baseline. Writes to out_dir:
+    - Case{case}_variants_annual.tsv: annual, peak and free-float metrics per
+      variant next to EnergyPlus/TRNSYS and the reference band, the deviation
+      of every variant from the baseline and the NANDRAD runtime;
+    - Case{case}_variants_agreement_stats.tsv: hourly agreement of every
+      variant with the baseline and with EnergyPlus;
+    - hourly TSV/HTML of air temperature, heating and cooling of all variants.
+    """
+    if not results:
+        return
+    out_dir.mkdir(parents=True, exist_ok=True)
+    variants = [r.variant for r in results]
+    base = variants[0]
+
+    # --- Annual comparison ---
+    agg = pd.concat([r.aggregates.assign(variant=r.variant) for r in results], ignore_index=True)
+    agg = agg[agg["metric"].isin(VARIANT_METRICS)]
+    own = (agg[agg["engine"] == "NANDRAD"]
+           .pivot_table(index="metric", columns="variant", values="value", aggfunc="last")
+           .reindex(columns=variants))
+    others = (agg[(agg["engine"] != "NANDRAD") & (agg["variant"] == base)]
+              .pivot_table(index="metric", columns="engine", values="value", aggfunc="last"))
+    bands = (references[references["case"] == case]
+             .drop_duplicates("metric", keep="last")
+             .set_index("metric")[["ref_min", "ref_max"]]
+             .rename(columns={"ref_min": "Ref Min", "ref_max": "Ref Max"}))
+    table = own.join(others).join(bands)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for v in variants[1:]:
+            table[f"Abw. {v} [%]"] = np.where(table[base].abs() > 1e-12,
+                                              (table[v] - table[base]) / table[base].abs() * 100.0, np.nan)
+    table = table.reindex([m for m in VARIANT_METRICS if m in table.index]).round(4)
+    table.index = table.index.map({k: label for k, (label, _) in METRICS.items()})
+    if any(r.runtime_s is not None for r in results):
+        table.loc["Laufzeit NANDRAD [s]"] = pd.Series({r.variant: r.runtime_s for r in results}).round(2)
+
+    out_annual = out_dir / f"Case{case}_variants_annual.tsv"
+    table.rename_axis("Metrik").to_csv(out_annual, sep="\t")
+    logging.info("Saved variant comparison: %s", out_annual)
+
+    # --- Hourly comparison (NANDRAD column of every variant, EnergyPlus of the baseline) ---
+    titles = [t for t in results[0].hourly if all(t in r.hourly for r in results)]
+    hourly: dict[str, pd.DataFrame] = {}
+    for title in titles:
+        frame = pd.DataFrame({r.variant: r.hourly[title]["NANDRAD"] for r in results})
+        if "EnergyPlus" in results[0].hourly[title].columns:
+            frame["EnergyPlus"] = results[0].hourly[title]["EnergyPlus"]
+        hourly[title] = frame
+
+    pairs = [(v, base) for v in variants[1:]] + [(v, "EnergyPlus") for v in variants]
+    stats = compute_agreement_stats(hourly, pairs)
+    out_stats = out_dir / f"Case{case}_variants_agreement_stats.tsv"
+    stats.to_csv(out_stats, sep="\t", index=False)
+    logging.info("Saved variant agreement statistics: %s", out_stats)
+
+    for title, y_label in VARIANT_HOURLY.items():
+        if title not in hourly:
+            continue
+        name = title.split(" [")[0].replace(" ", "_")
+        save_hourly_outputs(hourly[title],
+                            out_dir / f"Case{case}_variants_{name}_hourly.tsv",
+                            out_dir / f"Case{case}_variants_{name}_hourly.html",
+                            f"{title} — {', '.join(variants)}", y_label)
 
-        # --- Diffuse Shading Factor ---
-        # EnergyPlus has Debug Surface Solar Shading Model DifShdgRatioIsoSky
-        if data.diffuse_shading is not None:
-            # Window left
-            process_and_validate(
-                title="Diffuser Verschattungsfaktor Fenster links",
-                y_axis_label="Shading Factor [-]",
-                output_dir=out_dir,
-                case=case,
-                variant=variant,
-                year=year,
-                data=data,
-                nandrad_df=data.diffuse_shading,
-                nandrad_col_substr="Window left",
-                ep_var="Debug Surface Solar Shading Model DifShdgRatioIsoSky",
-                ep_key="ZONE SUBSURFACE 1",
-                trnsys_col="Tzone",  # placeholder
-                trnsys_conv=0.,
-                ep_conv=1.,
-                nandrad_conv=1.,
-                create_monthly_summary=True,
-                unit="-",
-                ref_suffix="",
-            )
-            # Window right
-            process_and_validate(
-                title="Diffuser Verschattungsfaktor Fenster rechts",
-                y_axis_label="Shading Factor [-]",
-                output_dir=out_dir,
-                case=case,
-                variant=variant,
-                year=year,
-                data=data,
-                nandrad_df=data.diffuse_shading,
-                nandrad_col_substr="Window right",
-                ep_var="Debug Surface Solar Shading Model DifShdgRatioIsoSky",
-                ep_key="ZONE SUBSURFACE 2",
-                trnsys_col="Tzone",
-                trnsys_conv=0.,
-                ep_conv=1.,
-                nandrad_conv=1.,
-                create_monthly_summary=True,
-                unit="-",
-                ref_suffix="",
-            )
-            # Wall South
-            process_and_validate(
-                title="Diffuser Verschattungsfaktor Wand Süd",
-                y_axis_label="Shading Factor [-]",
-                output_dir=out_dir,
-                case=case,
-                variant=variant,
-                year=year,
-                data=data,
-                nandrad_df=data.diffuse_shading,
-                nandrad_col_substr="Wall South",
-                ep_var="Debug Surface Solar Shading Model DifShdgRatioIsoSky",
-                ep_key="ZONE SURFACE SOUTH",
-                trnsys_col="Tzone",
-                trnsys_conv=0.,
-                ep_conv=1.,
-                nandrad_conv=1.,
-                create_monthly_summary=True,
-                unit="-",
-                ref_suffix="",
-            )
-            logging.info("%sDiffuse shading factors: Window=%.3f, Wall South=%.3f%s",
-                        Ansi.OKCYAN,
-                        data.diffuse_shading.iloc[0, 1] if len(data.diffuse_shading.columns) > 1 else 0,
-                        data.diffuse_shading.iloc[0, 3] if len(data.diffuse_shading.columns) > 3 else 0,
-                        Ansi.ENDC)
-
-        # --- Total Short Wave Radiation (imposed) comparisons ---
-        # EnergyPlus only provides total incident solar for windows, not split into beam/diffuse
-        # So we compare NANDRAD's total (Direct + Diffuse) with EP's total incident
-        if data.direct_sw_radiation is not None and data.diffuse_sw_radiation is not None:
-            # Create combined total radiation dataframe
-            total_sw_radiation = data.direct_sw_radiation.copy()
-            for col in total_sw_radiation.columns[1:]:  # Skip time column
-                # Find matching column in diffuse data
-                for diffuse_col in data.diffuse_sw_radiation.columns[1:]:
-                    if col.split('(')[0] == diffuse_col.split('(')[0]:  # Match by name prefix
-                        total_sw_radiation[col] = data.direct_sw_radiation[col] + data.diffuse_sw_radiation[diffuse_col]
-                        break
-
-            # Window left - Total
-            process_and_validate(
-                title="Gesamte kurzwellige Strahlung Fenster links",
-                y_axis_label="Strahlung [W/m²]",
-                output_dir=out_dir,
-                case=case,
-                variant=variant,
-                year=year,
-                data=data,
-                nandrad_df=total_sw_radiation,
-                nandrad_col_substr="Window left",
-                ep_var="Surface Outside Face Incident Solar Radiation Rate per Area",
-                ep_key="ZONE SUBSURFACE 1",
-                trnsys_col="Tzone",  # placeholder
-                trnsys_conv=0.,
-                ep_conv=1.,
-                nandrad_conv=1.,
-                create_monthly_summary=True,
-                unit="W/m²",
-                ref_suffix="",
-            )
-            # Window right - Total
-            process_and_validate(
-                title="Gesamte kurzwellige Strahlung Fenster rechts",
-                y_axis_label="Strahlung [W/m²]",
-                output_dir=out_dir,
-                case=case,
-                variant=variant,
-                year=year,
-                data=data,
-                nandrad_df=total_sw_radiation,
-                nandrad_col_substr="Window right",
-                ep_var="Surface Outside Face Incident Solar Radiation Rate per Area",
-                ep_key="ZONE SUBSURFACE 2",
-                trnsys_col="Tzone",  # placeholder
-                trnsys_conv=0.,
-                ep_conv=1.,
-                nandrad_conv=1.,
-                create_monthly_summary=True,
-                unit="W/m²",
-                ref_suffix="",
-            )
 
-        # --- Direct Short Wave Radiation on windows ---
-        if data.direct_sw_radiation is not None:
-            # Window left - Direct
-            process_and_validate(
-                title="Direkte kurzwellige Strahlung Fenster links",
-                y_axis_label="Strahlung [W/m²]",
-                output_dir=out_dir,
-                case=case,
-                variant=variant,
-                year=year,
-                data=data,
-                nandrad_df=data.direct_sw_radiation,
-                nandrad_col_substr="Window left",
-                ep_var="Surface Outside Face Incident Beam Solar Radiation Rate per Area",
-                ep_key="ZONE SUBSURFACE 1",
-                trnsys_col="Tzone",
-                trnsys_conv=0.,
-                ep_conv=1.,
-                nandrad_conv=1.,
-                create_monthly_summary=True,
-                unit="W/m²",
-                ref_suffix="",
-            )
-            # Window right - Direct
-            process_and_validate(
-                title="Direkte kurzwellige Strahlung Fenster rechts",
-                y_axis_label="Strahlung [W/m²]",
-                output_dir=out_dir,
-                case=case,
-                variant=variant,
-                year=year,
-                data=data,
-                nandrad_df=data.direct_sw_radiation,
-                nandrad_col_substr="Window right",
-                ep_var="Surface Outside Face Incident Beam Solar Radiation Rate per Area",
-                ep_key="ZONE SUBSURFACE 2",
-                trnsys_col="Tzone",
-                trnsys_conv=0.,
-                ep_conv=1.,
-                nandrad_conv=1.,
-                create_monthly_summary=True,
-                unit="W/m²",
-                ref_suffix="",
-            )
+# =========================
+# Simulation runners
+# =========================
 
-        # --- Diffuse Short Wave Radiation on windows (Sky + Ground) ---
-        if data.diffuse_sw_radiation is not None:
-            # Window left - Diffuse
-            process_and_validate(
-                title="Diffuse kurzwellige Strahlung Fenster links",
-                y_axis_label="Strahlung [W/m²]",
-                output_dir=out_dir,
-                case=case,
-                variant=variant,
-                year=year,
-                data=data,
-                nandrad_df=data.diffuse_sw_radiation,
-                nandrad_col_substr="Window left",
-                ep_var="Surface Outside Face Incident Sky Diffuse Solar Radiation Rate per Area",
-                ep_key="ZONE SUBSURFACE 1",
-                trnsys_col="Tzone",
-                trnsys_conv=0.,
-                ep_conv=1.,
-                nandrad_conv=1.,
-                create_monthly_summary=True,
-                unit="W/m²",
-                ref_suffix="",
-            )
-            # Window right - Diffuse
-            process_and_validate(
-                title="Diffuse kurzwellige Strahlung Fenster rechts",
-                y_axis_label="Strahlung [W/m²]",
-                output_dir=out_dir,
-                case=case,
-                variant=variant,
-                year=year,
-                data=data,
-                nandrad_df=data.diffuse_sw_radiation,
-                nandrad_col_substr="Window right",
-                ep_var="Surface Outside Face Incident Sky Diffuse Solar Radiation Rate per Area",
-                ep_key="ZONE SUBSURFACE 2",
-                trnsys_col="Tzone",
-                trnsys_conv=0.,
-                ep_conv=1.,
-                nandrad_conv=1.,
-                create_monthly_summary=True,
-                unit="W/m²",
-                ref_suffix="",
-            )
+def run_energyplus(
+    exec_path: Path, idf_file: Path, weather_file: Path, workdir: Path, output_dir: Optional[Path] = None
+) -> None:
+    """Run EnergyPlus with provided IDF and EPW (output_dir: separate output folder, default: workdir)."""
+    ensure_exists(exec_path, "executable")
+    ensure_exists(idf_file)
+    ensure_exists(weather_file)
+    ensure_exists(workdir, "folder")
 
-        # ==========================================================
-        # ASHRAE 140 Reference Checking
-        # ==========================================================
-        is_ff = case.upper().endswith("FF")
+    cmd = [str(exec_path), "-w", str(weather_file)]
+    if output_dir is not None:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        cmd += ["-d", str(output_dir)]
+    cmd.append(str(idf_file))
+    logging.info("%sEnergyPlus:%s %s", Ansi.BOLD, Ansi.ENDC, " ".join(cmd))
+    subprocess.run(cmd, check=True, cwd=workdir)
+
+
+# NandradSolver has no project setting for restart output: its solver framework
+# writes the integrator state to <project>/var/restart.bin at regular intervals
+# during every run, and --restart continues from that file. run_nandrad()
+# warns if a run left no such file, since --resume then starts at t=0.
+RESTART_FILE = Path("var") / "restart.bin"
+
+
+def nandrad_command(
+    exec_path: Path, nandrad_file: Path, threads: Optional[int] = None, restart: bool = False
+) -> list[str]:
+    """NandradSolver command line (threads: solver parallel threads, default: solver default;
+    restart: continue from the last restart point)."""
+    cmd = [str(exec_path), "-x", str(nandrad_file)]
+    if threads:
+        cmd.append(f"--parallel-threads={threads}")
+    if restart:
+        cmd.append("--restart")
+    return cmd
+
+
+def restart_point(nandrad_file: Path) -> Optional[Path]:
+    """Restart data left behind by an interrupted run of nandrad_file, None if there is nothing to resume.
+
+    The run is partial if <project>/var/restart.bin is newer than the project
+    file and than log/summary.txt, which the solver writes when it finishes.
+    """
+    project_dir = nandrad_file.with_suffix("")
+    restart = project_dir / RESTART_FILE
+    if not restart.exists() or not nandrad_file.exists():
+        return None
+    saved = restart.stat().st_mtime
+    summary = project_dir / "log" / "summary.txt"
+    if nandrad_file.stat().st_mtime > saved or (summary.exists() and summary.stat().st_mtime >= saved):
+        return None
+    return restart
+
+
+def run_nandrad(
+    exec_path: Path,
+    nandrad_file: Path,
+    workdir: Path,
+    threads: Optional[int] = None,
+    resume: bool = False,
+) -> None:
+    """Run NANDRAD solver with input file (threads: solver parallel threads, default: solver default).
+
+    With resume, an interrupted earlier run (see restart_point) is continued
+    from its last restart point instead of starting again at t=0.
+    """
+    ensure_exists(exec_path, "executable")
+    ensure_exists(nandrad_file)
+    ensure_exists(workdir, "folder")
+
+    restart = resume and restart_point(nandrad_file) is not None
+    if restart:
+        logging.info("Resuming interrupted NANDRAD run of %s", nandrad_file.name)
+    elif resume:
+        logging.info("No restart point for %s, NANDRAD starts at t=0", nandrad_file.name)
+    cmd = nandrad_command(exec_path, nandrad_file, threads, restart)
+    logging.info("%sNANDRAD:%s %s", Ansi.BOLD, Ansi.ENDC, " ".join(cmd))
+    subprocess.run(cmd, check=True, cwd=workdir)
+    if not (nandrad_file.with_suffix("") / RESTART_FILE).exists():
+        logging.warning("%sNANDRAD wrote no %s for %s; --resume cannot continue interrupted runs "
+                        "with this solver.%s", Ansi.WARNING, RESTART_FILE.as_posix(), nandrad_file.name, Ansi.ENDC)
+
+
+# =========================
+# CLI
+# =========================
+
+STAGES = ("all", "simulate", "validate", "render")
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run and validate NANDRAD / EnergyPlus / TRNSYS outputs.")
+    parser.add_argument("-c", "--case", default="600", help="Test case (e.g., 600, 630)")
+    parser.add_argument("-v", "--variant", default="v2", help="Variant label (e.g., v1)")
+    parser.add_argument("--variants", default=None,
+        help="Comma-separated variants validated together and compared (e.g., 'v1,v1_detailed,v1_dynamic'); "
+             "overrides --variant"
+    )
+    parser.add_argument("-y", "--year", type=int, default=2021, help="Calendar year for hourly index")
+    parser.add_argument("-w", "--windows",
+        default="ZONE SUBSURFACE 1",
+        help="Comma-separated EP window keys (e.g., 'ZONE SUBSURFACE 1,ZONE SUBSURFACE 2')"
+    )
+    parser.add_argument("--data-dir", type=Path, default=Path.cwd() / "data", help="Root data directory")
+    parser.add_argument("--out-dir", type=Path, default=Path.cwd() / "validation_results", help="Output root directory")
+    parser.add_argument("--ep-exec", type=Path,
+        default=(Path("C:/EnergyPlusV9-0-1/energyplus.exe") if os.name == "nt"
+                 else Path("/home/hirth/Applikationen/EnergyPlus-9-0-1/energyplus"))
+    )
+    parser.add_argument("--nandrad-exec", type=Path,
+        default=(Path("C:/Program Files/VICUS-Software/VICUS/NandradSolver.exe") if os.name == "nt"
+                 else Path.cwd() / "bin" / "NandradSolver")
+    )
+    parser.add_argument("--nandrad-threads", type=int, default=None,
+                        help="Number of NANDRAD solver threads (default: solver default)")
+    parser.add_argument("--epw", type=Path, default=Path.cwd() / "data" / "climate" / "725650TYCST.epw",
+                        help="Path to the EPW file")
+    parser.add_argument("--ep-all-outputs", action="store_true",
+                        help="Run the IDF with all its Output:Variable entries (default: only those the validation "
+                             "reads, see prune_energyplus_outputs.py)")
+    parser.add_argument("--ep-sqlite", action="store_true",
+                        help="Let EnergyPlus also write eplusout.sql (Output:SQLite) and read the results from it "
+                             "(indexed lookups instead of parsing the ESO)")
+    parser.add_argument("--skip-run", action="store_true", help="Skip running simulations; only read/validate")
+    parser.add_argument("--skip-energyplus", action="store_true",
+                        help="Only run NANDRAD; EnergyPlus results of an earlier run are used as they are")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted NANDRAD run from its last restart point")
+    parser.add_argument("--stage", choices=STAGES, default="all",
+                        help="Run only one pipeline stage: simulate (solvers + solver statistics), "
+                             "validate (TSVs, reports, render list) or render (HTML/SVG plots)")
+    parser.add_argument("--plot-files", action="store_true",
+                        help="Also write the separate hourly HTML, monthly SVG and validation report HTML files "
+                             "(default: everything in Case*_dashboard.html)")
+    parser.add_argument("--svg-precision", type=int, default=None,
+                        help="Round coordinates in the monthly SVG charts to this many decimals (smaller files)")
+    parser.add_argument("-q", "--quiet", action="store_true", default=True, help="Reduce log verbosity")
+    return parser.parse_args(argv)
 
-        # Helper to safely extract optional column values from a DataFrame
-        def _col_val(df, col, func):
-            if df is not None and col in df.columns:
-                return float(func(df[col]))
-            return None
 
-        if annual_refs is not None:
-            if is_ff and df_air_temp is not None:
-                # Free-float cases: check temperature extremes
-                nandrad_temps = df_air_temp["NANDRAD"]
-                validation_results.extend(check_free_float_references(
-                    nandrad_temp_max=float(nandrad_temps.max()),
-                    nandrad_temp_min=float(nandrad_temps.min()),
-                    nandrad_temp_avg=float(nandrad_temps.mean()),
-                    case=case,
-                    ff_refs=annual_refs.free_float,
-                    ep_temp_max=_col_val(df_air_temp, "EnergyPlus", pd.Series.max),
-                    ep_temp_min=_col_val(df_air_temp, "EnergyPlus", pd.Series.min),
-                    ep_temp_avg=_col_val(df_air_temp, "EnergyPlus", pd.Series.mean),
-                    trnsys_temp_max=_col_val(df_air_temp, "TRNSYS", pd.Series.max),
-                    trnsys_temp_min=_col_val(df_air_temp, "TRNSYS", pd.Series.min),
-                    trnsys_temp_avg=_col_val(df_air_temp, "TRNSYS", pd.Series.mean),
-                ))
+# =========================
+# Main
+# =========================
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    setup_logging(quiet=args.quiet)
+
+    case = str(args.case)
+    variants = [v.strip() for v in args.variants.split(",") if v.strip()] if args.variants else [str(args.variant)]
+    year = int(args.year)
+    window_keys = [w.strip() for w in args.windows.split(",") if w.strip()]
+
+    # Resolve folders and files (EnergyPlus/TRNSYS/references are shared by all variants)
+    data_dir = args.data_dir
+    nandrad_root  = data_dir / "nandrad"
+    energy_dir    = data_dir / "energyplus"
+    idf_file      = energy_dir / f"Case{case}_{variants[0]}.idf"
+    ep_out_dir    = energy_dir / f"Case{case}"   # per case, so concurrent cases do not share eplusout.*
+    eso_file      = energy_dir / "eplusout.eso"
+    trnsys_file   = data_dir / "trnsys" / f"CASE{case}" / f"CASE{case}.out"
+    reference_tbl = data_dir / "reference" / "monthly-references.tsv"
+    epw_file      = args.epw
+
+    charts = MonthlyCharts(svg_precision=args.svg_precision)
+
+    if args.stage == "render":
+        failed = 0
+        for variant in variants:
+            try:
+                failed += render_outputs(args.out_dir / f"Case{case}_{variant}", case, variant, charts)
+            except FileNotFoundError as e:
+                logging.error("%sMissing file: %s%s", Ansi.FAIL, e, Ansi.ENDC)
+                failed += 1
+        return 0 if not failed else 1
+
+    def write_solver_stats(variant: str) -> None:
+        # keep the statistics of the run that produced the results when only validating
+        stats_tsv = args.out_dir / f"Case{case}_{variant}" / f"Case{case}_{variant}_solver_stats.tsv"
+        if variant not in runtimes and ep_stats is None and stats_tsv.exists():
+            return
+        stats = nandrad_stats(case, nandrad_root / f"Case{case}_{variant}", runtimes.get(variant),
+                              args.nandrad_threads if variant in runtimes else None)
+        if ep_stats is not None:
+            stats = pd.concat([stats, ep_stats], ignore_index=True)
+        elif args.skip_energyplus and stats_tsv.exists():
+            # EnergyPlus was not rerun, its statistics of the earlier run stay valid
+            earlier = read_solver_stats(stats_tsv)
+            stats = pd.concat([stats, earlier[earlier["engine"] == "EnergyPlus"]], ignore_index=True)
+        stats_tsv.parent.mkdir(parents=True, exist_ok=True)
+        save_solver_stats(stats, stats_tsv.parent, case, variant)
+
+    try:
+        runtimes: dict[str, float] = {}
+        ep_stats = None
+        if not args.skip_run and args.stage in ("all", "simulate"):
+            logging.info("%s--- Running simulations ---%s", Ansi.BOLD, Ansi.ENDC)
+            if args.skip_energyplus:
+                logging.info("Skipping EnergyPlus (--skip-energyplus).")
+            elif idf_file.exists() and args.ep_exec.exists():
+                run_idf = prepare_idf(idf_file, ep_out_dir, prune=not args.ep_all_outputs, sqlite=args.ep_sqlite)
+                start = time.perf_counter()
+                run_energyplus(args.ep_exec, run_idf, epw_file, workdir=energy_dir, output_dir=ep_out_dir)
+                # eplusout.end/.err are only read right after a run (legacy runs share energy_dir)
+                ep_stats = energyplus_stats(case, ep_out_dir, time.perf_counter() - start)
+                if args.ep_sqlite and (ep_out_dir / "eplusout.sql").exists():
+                    index_sql(ep_out_dir / "eplusout.sql")   # once here instead of in every validate stage
             else:
-                # Non-FF cases: check annual heating/cooling totals and peaks
-                if df_heating is not None:
-                    annual_heating_kwh = float(df_heating["NANDRAD"].sum())
-                    peak_heating_kw = float(df_heating["NANDRAD"].max())
+                logging.warning("%sSkipping EnergyPlus (IDF or executable not found).%s",
+                                Ansi.WARNING, Ansi.ENDC)
+            for variant in variants:
+                nandrad_file = nandrad_root / f"Case{case}_{variant}.nandrad"
+                if nandrad_file.exists() and args.nandrad_exec.exists():
+                    start = time.perf_counter()
+                    run_nandrad(args.nandrad_exec, nandrad_file, workdir=nandrad_root, threads=args.nandrad_threads,
+                                resume=args.resume)
+                    runtimes[variant] = time.perf_counter() - start
                 else:
-                    annual_heating_kwh = 0.0
-                    peak_heating_kw = 0.0
+                    logging.warning("%sSkipping NANDRAD %s (file or executable not found).%s",
+                                    Ansi.WARNING, variant, Ansi.ENDC)
+            logging.info("%sSimulations finished.%s", Ansi.OKGREEN, Ansi.ENDC)
+        else:
+            logging.info("Skipping simulation runs (--skip-run/--stage %s).", args.stage)
 
-                if df_cooling is not None:
-                    annual_cooling_kwh = float(df_cooling["NANDRAD"].sum())
-                    peak_cooling_kw = float(df_cooling["NANDRAD"].max())
-                else:
-                    annual_cooling_kwh = 0.0
-                    peak_cooling_kw = 0.0
-
-                validation_results.extend(check_annual_references(
-                    nandrad_annual_heating_kwh=annual_heating_kwh,
-                    nandrad_annual_cooling_kwh=annual_cooling_kwh,
-                    case=case,
-                    annual_refs=annual_refs.annual,
-                    ep_annual_heating_kwh=_col_val(df_heating, "EnergyPlus", pd.Series.sum),
-                    ep_annual_cooling_kwh=_col_val(df_cooling, "EnergyPlus", pd.Series.sum),
-                    trnsys_annual_heating_kwh=_col_val(df_heating, "TRNSYS", pd.Series.sum),
-                    trnsys_annual_cooling_kwh=_col_val(df_cooling, "TRNSYS", pd.Series.sum),
-                ))
-                validation_results.extend(check_peak_references(
-                    nandrad_peak_heating_kw=peak_heating_kw,
-                    nandrad_peak_cooling_kw=peak_cooling_kw,
-                    case=case,
-                    annual_refs=annual_refs.annual,
-                    ep_peak_heating_kw=_col_val(df_heating, "EnergyPlus", pd.Series.max),
-                    ep_peak_cooling_kw=_col_val(df_cooling, "EnergyPlus", pd.Series.max),
-                    trnsys_peak_heating_kw=_col_val(df_heating, "TRNSYS", pd.Series.max),
-                    trnsys_peak_cooling_kw=_col_val(df_cooling, "TRNSYS", pd.Series.max),
-                ))
-
-        # Generate validation summary report
-        if validation_results:
-            generate_validation_report(
-                results=validation_results,
-                output_dir=out_dir,
+        if args.stage == "simulate":
+            for variant in variants:
+                write_solver_stats(variant)
+            return 0
+
+        # Load comparison data and annual/peak/free-float/monthly reference bands once
+        if (ep_out_dir / "eplusout.eso").exists():
+            eso_file = ep_out_dir / "eplusout.eso"
+        shared = load_shared(eso_file, trnsys_file, reference_tbl, ep_out_dir / "eplusout.sql")
+        references = load_reference_table(data_dir / "reference")
+
+        results: list[VariantResult] = []
+        for variant in variants:
+            try:
+                data = load_nandrad(nandrad_root / f"Case{case}_{variant}", shared)
+            except FileNotFoundError as e:
+                if len(variants) == 1:
+                    raise
+                logging.error("%sSkipping variant %s: %s%s", Ansi.FAIL, variant, e, Ansi.ENDC)
+                continue
+            result = validate_variant(
                 case=case,
                 variant=variant,
+                year=year,
+                window_keys=window_keys,
+                data=data,
+                references=references,
+                out_dir=args.out_dir / f"Case{case}_{variant}",
+                render=args.stage == "all",
+                charts=charts,
+                plot_files=args.plot_files,
+                dashboard=True,
             )
+            result.runtime_s = runtimes.get(variant)
+            results.append(result)
+            write_solver_stats(variant)
+
+        out_dir = args.out_dir / f"Case{case}_{variants[0]}"
+        if len(variants) > 1:
+            out_dir = args.out_dir / f"Case{case}_variants"
+            compare_variants(results, references, out_dir, case)
 
         logging.info("%s%sValidation finished successfully!%s", Ansi.OKGREEN, Ansi.BOLD, Ansi.ENDC)
         logging.info("Results: %s", out_dir)
-        return 0
+        return 0 if len(results) == len(variants) else 1
 
     except FileNotFoundError as e:
         logging.error("%sMissing file/executable: %s%s", Ansi.FAIL, e, Ansi.ENDC)